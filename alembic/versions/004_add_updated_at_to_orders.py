@@ -0,0 +1,44 @@
+"""Add updated_at to orders table
+
+Revision ID: 004
+Revises: 85471114549d
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: str | None = "85471114549d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add updated_at column to orders for incremental trigger book catch-up."""
+    op.add_column(
+        "orders",
+        sa.Column(
+            "updated_at", sa.DateTime(), nullable=True, server_default=sa.func.now()
+        ),
+    )
+
+    # Existing orders were last touched no earlier than their latest timestamp
+    op.execute(
+        "UPDATE orders SET updated_at = "
+        "GREATEST(created_at, COALESCE(filled_at, created_at), "
+        "COALESCE(triggered_at, created_at))"
+    )
+
+    op.create_index("idx_orders_updated_at", "orders", ["updated_at"])
+
+
+def downgrade() -> None:
+    """Remove updated_at column from orders table."""
+    op.drop_index("idx_orders_updated_at", table_name="orders")
+    op.drop_column("orders", "updated_at")
@@ -0,0 +1,226 @@
+"""
+Response cache and conditional GET support for polled market-data routes.
+
+Dashboards poll routes such as ``/stock/price/{symbol}`` constantly, and
+most responses are byte-identical between polls. This ASGI middleware keeps
+the rendered body of successful GET responses for a per-route TTL, keyed on
+path and query parameters, and serves repeats without calling the endpoint.
+
+Every cached response carries a strong ETag (a hash of the body) and a
+``Cache-Control`` max-age matching its remaining lifetime; a request whose
+``If-None-Match`` matches the current ETag gets an empty 304.
+
+TTLs follow the quote cache: quotes live for its default TTL, chain-derived
+data for at most 30 seconds, and slow-changing data for at least 5 minutes.
+"""
+
+import hashlib
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.adapters.cache import QuoteCache, get_global_cache
+from app.core.config import settings
+
+_API_PREFIX = "/api/v1/trading"
+
+
+def quote_ttl() -> float:
+    """TTL for quote-derived responses: the quote cache's default TTL."""
+    return get_global_cache().default_ttl
+
+
+def chain_ttl() -> float:
+    """TTL for chain-derived responses, capped like cached option chains."""
+    return min(get_global_cache().default_ttl, 30.0)
+
+
+def reference_ttl() -> float:
+    """TTL for slow-changing data, floored like cached expiration dates."""
+    return max(get_global_cache().default_ttl, 300.0)
+
+
+@dataclass(frozen=True)
+class CachedRoute:
+    """A GET route whose responses may be cached."""
+
+    pattern: re.Pattern[str]
+    ttl: Callable[[], float]
+
+
+DEFAULT_CACHED_ROUTES = [
+    CachedRoute(re.compile(rf"^{_API_PREFIX}/stock/price/[^/]+$"), quote_ttl),
+    CachedRoute(re.compile(rf"^{_API_PREFIX}/options/strikes/[^/]+$"), chain_ttl),
+    CachedRoute(
+        re.compile(rf"^{_API_PREFIX}/options/expirations/[^/]+$"), reference_ttl
+    ),
+    CachedRoute(re.compile(rf"^{_API_PREFIX}/stock/info/[^/]+$"), reference_ttl),
+    CachedRoute(re.compile(rf"^{_API_PREFIX}/market/hours$"), quote_ttl),
+]
+
+
+def _strong_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCache:
+    """Rendered responses keyed on path and sorted query string."""
+
+    def __init__(self, max_size: int = 5000) -> None:
+        self.store = QuoteCache(default_ttl=quote_ttl(), max_size=max_size)
+        self.not_modified = 0
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        entry = self.store.get(key)
+        return entry if isinstance(entry, dict) else None
+
+    def put(self, key: str, entry: dict[str, Any], ttl: float) -> None:
+        self.store.put(key, entry, ttl)
+
+    def clear(self) -> None:
+        self.store.clear()
+        self.not_modified = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics, including 304s served."""
+        return {**self.store.get_stats(), "not_modified": self.not_modified}
+
+
+response_cache = ResponseCache(max_size=settings.RESPONSE_CACHE_MAX_SIZE)
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the global response cache."""
+    return response_cache
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware caching successful GET responses for configured routes.
+
+    Args:
+        app: The wrapped ASGI application
+        routes: Cacheable routes and their TTLs
+        cache: Storage for rendered responses, the global cache by default
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: list[CachedRoute] | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        self.app = app
+        self.routes = DEFAULT_CACHED_ROUTES if routes is None else routes
+        self.cache = cache or response_cache
+
+    def _match(self, scope: Scope) -> CachedRoute | None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return None
+        for route in self.routes:
+            if route.pattern.match(scope["path"]):
+                return route
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = self._match(scope)
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        query = urlencode(sorted(parse_qsl(scope["query_string"].decode())))
+        key = f"{scope['path']}?{query}"
+        headers = dict(scope["headers"])
+        if_none_match = headers.get(b"if-none-match", b"").decode() or None
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            max_age = max(0.0, entry["expires_at"] - time.time())
+            await self._send_cached(send, entry, if_none_match, max_age)
+            return
+
+        # Miss: capture the rendered response while passing it through
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            if start["status"] != 200:
+                await send(start)
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            ttl = route.ttl()
+            response_headers = [
+                (name, value)
+                for name, value in start.get("headers", [])
+                if name.lower() not in (b"etag", b"cache-control")
+            ]
+            entry = {
+                "body": body,
+                "headers": response_headers,
+                "etag": _strong_etag(body),
+                "expires_at": time.time() + ttl,
+            }
+            self.cache.put(key, entry, ttl)
+            await self._send_cached(send, entry, if_none_match, ttl)
+
+        await self.app(scope, receive, capture)
+
+    async def _send_cached(
+        self,
+        send: Send,
+        entry: dict[str, Any],
+        if_none_match: str | None,
+        max_age: float,
+    ) -> None:
+        etag: str = entry["etag"]
+        validators = [
+            (b"etag", etag.encode()),
+            (b"cache-control", f"max-age={int(max_age)}".encode()),
+        ]
+        if _etag_matches(if_none_match, etag):
+            self.cache.not_modified += 1
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": validators}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        headers = [
+            (name, value)
+            for name, value in entry["headers"]
+            if name.lower() != b"content-length"
+        ]
+        headers.append((b"content-length", str(len(entry["body"])).encode()))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": headers + validators,
+            }
+        )
+        await send({"type": "http.response.body", "body": entry["body"]})
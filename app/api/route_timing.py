@@ -0,0 +1,120 @@
+"""
+Per-route timing middleware.
+
+Times every API request, splits it into database, adapter, Greeks,
+serialization and remaining time, and reports each route's total and phase
+times to the global ``PerformanceMonitor`` under ``route:<METHOD> <path>``
+and ``route:<METHOD> <path>:<phase>``. Routes are reported by their path
+template, so ``/stock/price/AAPL`` and ``/stock/price/MSFT`` share one entry.
+Requests that never reach a route (404s, response-cache hits) share a single
+``route:<METHOD> <unmatched>`` entry, so arbitrary paths cannot grow the
+monitor without bound.
+"""
+
+import time
+from collections import defaultdict
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.request_timing import (
+    PHASES,
+    finish_request_timing,
+    start_request_timing,
+)
+from app.services.performance_benchmarks import (
+    PerformanceMonitor,
+    get_performance_monitor,
+)
+
+ROUTE_PREFIX = "route:"
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteTimingMiddleware:
+    """
+    ASGI middleware reporting per-route phase timings.
+
+    Args:
+        app: The wrapped ASGI application
+        monitor: Where timings are recorded, the global monitor by default
+        path_prefix: Only requests under this path are timed
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        monitor: PerformanceMonitor | None = None,
+        path_prefix: str = "/api/",
+    ) -> None:
+        self.app = app
+        self.monitor = monitor or get_performance_monitor()
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        timing, token = start_request_timing()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            finish_request_timing(token)
+            total = time.perf_counter() - timing.started
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            operation = f"{ROUTE_PREFIX}{scope['method']} {path}"
+            breakdown = timing.breakdown_ms(total)
+
+            success = status < 500
+            self.monitor.record_timing(
+                operation,
+                total * 1000,
+                success=success,
+                metadata={"status": status, "phases": breakdown},
+            )
+            for phase, duration_ms in breakdown.items():
+                self.monitor.record_timing(f"{operation}:{phase}", duration_ms, success)
+
+
+def route_breakdown(monitor: PerformanceMonitor | None = None) -> dict[str, Any]:
+    """
+    Summarize recorded route timings.
+
+    Returns:
+        Per route: request count, average and p95 latency, and the average
+        milliseconds spent in each phase, slowest routes first
+    """
+    monitor = monitor or get_performance_monitor()
+    stats = monitor.get_all_stats()
+    routes: dict[str, dict[str, Any]] = defaultdict(dict)
+    for operation, operation_stats in stats.items():
+        if not operation.startswith(ROUTE_PREFIX) or not operation_stats:
+            continue
+        name = operation[len(ROUTE_PREFIX) :]
+        route, _, phase = name.rpartition(":")
+        if phase in (*PHASES, "other"):
+            routes[route].setdefault("phases_ms", {})[phase] = operation_stats[
+                "avg_latency_ms"
+            ]
+        else:
+            routes[name].update(
+                {
+                    "requests": operation_stats["total_operations"],
+                    "error_rate": operation_stats["error_rate"],
+                    "avg_ms": operation_stats["avg_latency_ms"],
+                    "p95_ms": operation_stats.get(
+                        "p95_latency_ms", operation_stats["max_latency_ms"]
+                    ),
+                }
+            )
+    return dict(sorted(routes.items(), key=lambda item: -item[1].get("avg_ms", 0.0)))
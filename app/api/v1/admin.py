@@ -0,0 +1,79 @@
+"""
+Admin endpoints for production diagnostics.
+
+Every endpoint requires the ``X-Admin-Token`` header to match the
+``ADMIN_API_TOKEN`` setting, and the router is disabled while that setting
+is empty.
+"""
+
+import secrets
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.api.route_timing import route_breakdown
+from app.core.config import settings
+from app.core.sampling_profiler import get_sampling_profiler
+
+
+def require_admin_token(
+    x_admin_token: Annotated[str | None, Header()] = None,
+) -> None:
+    """Reject requests without the configured admin token."""
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin endpoints are disabled; set ADMIN_API_TOKEN to enable them",
+        )
+    if x_admin_token is None or not secrets.compare_digest(
+        x_admin_token, settings.ADMIN_API_TOKEN
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/api/v1/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10.0, gt=0, description="How long to sample"),
+    include_idle: bool = Query(False, description="Keep samples of idle threads"),
+) -> PlainTextResponse:
+    """
+    Sample the stacks of every thread in the API process for ``seconds``.
+
+    Returns:
+        Collapsed stacks (``frame;frame;... count`` per line), ready for
+        flamegraph.pl, speedscope or inferno
+    """
+    try:
+        result = await get_sampling_profiler().profile_async(seconds, include_idle)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
+    return PlainTextResponse(
+        result.collapsed(),
+        headers={
+            "X-Profile-Samples": str(result.samples),
+            "X-Profile-Duration": f"{result.duration_seconds:.3f}",
+        },
+    )
+
+
+@router.get("/timing")
+async def timing() -> dict[str, Any]:
+    """
+    Get per-route latency and average time spent in each phase.
+
+    Returns:
+        Dict of routes, slowest first, with request counts, average and p95
+        latency, and average db/adapter/greeks/serialization/other milliseconds
+    """
+    return {"routes": route_breakdown()}
@@ -6,17 +6,40 @@ allowing both AI agents (via MCP) and web clients (via REST API)
 to access the same trading functionality.
 """
 
+import asyncio
+import json
 import logging
-from typing import Any
-
-from fastapi import APIRouter, HTTPException, Query
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Annotated, Any
+
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from app.core.exceptions import NotFoundError
+from app.api.responses import FastJSONResponse, dumps, fast_json
+from app.core.config import settings
+from app.core.exceptions import InputValidationError, NotFoundError
 from app.core.id_utils import validate_optional_account_id
 from app.core.service_factory import get_trading_service
-from app.schemas.orders import OrderCondition, OrderCreate, OrderType
+from app.schemas.orders import (
+    BulkOrderCreate,
+    OrderAssetClass,
+    OrderCondition,
+    OrderCreate,
+    OrderStatus,
+    OrderType,
+)
 from app.schemas.users import UserCreate, UserProfile, UserProfileSummary, UserUpdate
+from app.services.event_stream import get_event_stream_hub
+from app.utils.chain_shaping import shape_chain
 
 router = APIRouter(prefix="/api/v1/trading", tags=["trading"])
 logger = logging.getLogger(__name__)
@@ -62,6 +85,50 @@ async def health_check() -> dict[str, str]:
     return {"status": "healthy", "message": "Trading system is operational"}
 
 
+@router.get("/health/database")
+async def database_pool_health() -> dict[str, Any]:
+    """
+    Get connection pool usage for the primary and any read replicas.
+
+    Returns:
+        Dict containing per-engine pool metrics and read routing counts
+    """
+    from app.storage.database import get_pool_metrics
+
+    return get_pool_metrics()
+
+
+@router.get("/health/mcp")
+async def mcp_runtime_health() -> dict[str, Any]:
+    """
+    Get MCP tool runtime statistics.
+
+    Returns:
+        Dict containing trading service pool hit rate and construction counts,
+        and async bridge call timings
+    """
+    from app.core.async_bridge import get_async_bridge
+    from app.services.trading_service_pool import get_trading_service_pool
+
+    return {
+        "service_pool": get_trading_service_pool().get_stats(),
+        "async_bridge": get_async_bridge().get_stats(),
+    }
+
+
+@router.get("/health/response-cache")
+async def response_cache_health() -> dict[str, Any]:
+    """
+    Get response cache statistics.
+
+    Returns:
+        Dict containing cached response hits, misses and 304s served
+    """
+    from app.api.response_cache import get_response_cache
+
+    return get_response_cache().get_stats()
+
+
 @router.get("/account/balance")
 async def get_account_balance(
     account_id: str | None = Query(
@@ -155,7 +222,8 @@ async def get_account_info(
         ) from e
 
 
-@router.get("/portfolio")
+@router.get("/portfolio", response_class=FastJSONResponse)
+@fast_json
 async def get_portfolio(
     account_id: str | None = Query(
         None, description="Optional 10-character account ID"
@@ -224,7 +292,8 @@ async def get_portfolio(
         ) from e
 
 
-@router.get("/portfolio/summary")
+@router.get("/portfolio/summary", response_class=FastJSONResponse)
+@fast_json
 async def get_portfolio_summary(
     account_id: str | None = Query(
         None, description="Optional 10-character account ID"
@@ -357,7 +426,7 @@ async def create_account(account_data: AccountCreate) -> dict[str, Any]:
 
         from app.core.id_utils import generate_account_id
         from app.models.database.trading import Account as DBAccount
-        from app.storage.database import get_async_session
+        from app.storage.database import get_async_session, replica_router
 
         async for db in get_async_session():
             # Check for existing account with same owner
@@ -387,6 +456,7 @@ async def create_account(account_data: AccountCreate) -> dict[str, Any]:
             db.add(new_account)
             await db.commit()
             await db.refresh(new_account)
+            replica_router.record_write(new_account.id)
 
             return {
                 "success": True,
@@ -424,7 +494,8 @@ async def create_account(account_data: AccountCreate) -> dict[str, Any]:
         ) from e
 
 
-@router.get("/account/details")
+@router.get("/account/details", response_class=FastJSONResponse)
+@fast_json
 async def get_account_details(
     account_id: str | None = Query(
         None, description="Optional 10-character account ID"
@@ -516,7 +587,8 @@ async def get_account_details(
         ) from e
 
 
-@router.get("/positions")
+@router.get("/positions", response_class=FastJSONResponse)
+@fast_json
 async def get_positions(
     account_id: str | None = Query(
         None, description="Optional 10-character account ID"
@@ -739,6 +811,13 @@ async def list_tools() -> dict[str, Any]:
             "method": "GET",
             "description": "Get detailed company information and fundamentals",
         },
+        {
+            "name": "get_batch_quotes",
+            "endpoint": "/api/v1/trading/quotes/batch",
+            "method": "GET",
+            "parameters": "?symbols={symbol}&symbols={symbol}&include_greeks={true|false}",
+            "description": "Get columnar quotes, with option Greeks, for many symbols",
+        },
         {
             "name": "search_stocks",
             "endpoint": "/api/v1/trading/stocks/search",
@@ -952,20 +1031,121 @@ async def create_order(order_data: OrderCreate) -> dict[str, Any]:
         ) from e
 
 
-@router.get("/orders")
+@router.post("/orders/bulk")
+async def create_orders_bulk(bulk_data: BulkOrderCreate) -> dict[str, Any]:
+    """
+    Create many orders in one request.
+
+    All orders are validated and quoted together and written in a single
+    transaction. Each order succeeds or fails on its own.
+
+    Args:
+        bulk_data: Orders to create
+
+    Returns:
+        Dict containing one result per order, in request order
+
+    Raises:
+        HTTPException: If the batch cannot be processed
+    """
+    try:
+        service = get_trading_service()
+        results = await service.create_orders_bulk(bulk_data.orders)
+
+        created = sum(1 for result in results if result.success)
+        return {
+            "success": created == len(results),
+            "results": [result.model_dump(mode="json") for result in results],
+            "submitted": len(results),
+            "created": created,
+            "failed": len(results) - created,
+            "message": f"Created {created} of {len(results)} orders",
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": str(e),
+                "message": f"Failed to create orders: {e!s}",
+            },
+        ) from e
+
+
+# Order history filters shared by the paginated and export endpoints
+OrderStatusFilter = Annotated[
+    list[OrderStatus] | None, Query(description="Filter by status")
+]
+OrderAssetClassFilter = Annotated[
+    OrderAssetClass | None,
+    Query(description="Filter by asset class (stock or option)"),
+]
+CreatedAfterFilter = Annotated[
+    datetime | None, Query(description="Only orders created at or after this time")
+]
+CreatedBeforeFilter = Annotated[
+    datetime | None, Query(description="Only orders created before this time")
+]
+
+
+async def _get_order_history(
+    asset_class: OrderAssetClass | None,
+    limit: int | None,
+    cursor: str | None,
+    status: list[OrderStatus] | None,
+    start: datetime | None,
+    end: datetime | None,
+) -> dict[str, Any]:
+    """
+    Fetch one keyset page of order history as a response payload.
+
+    Without a limit or cursor the whole history is returned, as it was before
+    the history was paginated.
+    """
+    service = get_trading_service()
+    page = await service.get_orders_page(
+        limit=limit,
+        cursor=cursor,
+        status=status,
+        asset_class=asset_class,
+        created_after=start,
+        created_before=end,
+    )
+    return page.to_history_payload()
+
+
+@router.get("/orders", response_class=FastJSONResponse)
+@fast_json
 async def get_orders(
     account_id: str | None = Query(
         None, description="Optional 10-character account ID"
     ),
+    limit: int | None = Query(
+        None,
+        ge=1,
+        le=1000,
+        description="Orders per page; without limit or cursor, all orders",
+    ),
+    cursor: str | None = Query(None, description="next_cursor from the last page"),
+    status: OrderStatusFilter = None,
+    asset_class: OrderAssetClassFilter = None,
+    start: CreatedAfterFilter = None,
+    end: CreatedBeforeFilter = None,
 ) -> dict[str, Any]:
     """
-    Get all orders for the account.
+    Get the account's orders, newest first, one page at a time.
 
     Args:
         account_id: Optional 10-character account ID. If not provided, uses default account.
+        limit: Maximum orders to return; without limit or cursor, all orders
+        cursor: Cursor returned as next_cursor by the previous page
+        status: Only include orders in these statuses
+        asset_class: Only include stock or option orders
+        start: Only include orders created at or after this time
+        end: Only include orders created before this time
 
     Returns:
-        Dict containing list of orders
+        Dict containing the page of orders and the cursor for the next one
 
     Raises:
         HTTPException: If orders cannot be retrieved
@@ -974,40 +1154,15 @@ async def get_orders(
         # Validate account_id parameter
         account_id = validate_account_id_param(account_id)
 
-        service = get_trading_service()
-        orders = await service.get_orders()
-
-        orders_data = []
-        for order in orders:
-            orders_data.append(
-                {
-                    "id": order.id,
-                    "symbol": order.symbol,
-                    "quantity": order.quantity,
-                    "order_type": order.order_type,
-                    "condition": order.condition,
-                    "price": order.price,
-                    "stop_price": order.stop_price,
-                    "status": order.status,
-                    "created_at": order.created_at.isoformat()
-                    if order.created_at
-                    else None,
-                    "filled_at": order.filled_at.isoformat()
-                    if order.filled_at
-                    else None,
-                }
-            )
-
+        result = await _get_order_history(
+            asset_class, limit, cursor, status, start, end
+        )
         account_msg = f" for account {account_id}" if account_id else ""
-        return {
-            "success": True,
-            "orders": orders_data,
-            "count": len(orders_data),
-            "message": f"Retrieved {len(orders_data)} orders{account_msg}",
-        }
+        result["message"] = f"Retrieved {result['count']} orders{account_msg}"
+        return result
     except Exception as e:
         raise HTTPException(
-            status_code=500,
+            status_code=422 if isinstance(e, InputValidationError) else 500,
             detail={
                 "success": False,
                 "error": str(e),
@@ -1017,64 +1172,70 @@ async def get_orders(
         ) from e
 
 
+@router.get("/orders/export")
+async def export_orders(
+    status: OrderStatusFilter = None,
+    asset_class: OrderAssetClassFilter = None,
+    start: CreatedAfterFilter = None,
+    end: CreatedBeforeFilter = None,
+) -> StreamingResponse:
+    """
+    Stream the account's full order history as newline-delimited JSON.
+
+    Orders are read in keyset batches while the response is being sent, so
+    the export never holds the whole history in memory.
+    """
+    service = get_trading_service()
+
+    async def _lines() -> AsyncIterator[bytes]:
+        async for order in service.stream_orders(
+            status=status,
+            asset_class=asset_class,
+            created_after=start,
+            created_before=end,
+        ):
+            yield json.dumps(order.to_history_dict(), default=str).encode() + b"\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
 # ==================== ORDER HISTORY ENDPOINTS ====================
 
 
-@router.get("/orders/stocks")
-async def get_stock_orders() -> dict[str, Any]:
+@router.get("/orders/stocks", response_class=FastJSONResponse)
+@fast_json
+async def get_stock_orders(
+    limit: int | None = Query(
+        None,
+        ge=1,
+        le=1000,
+        description="Orders per page; without limit or cursor, all orders",
+    ),
+    cursor: str | None = Query(None, description="next_cursor from the last page"),
+    status: OrderStatusFilter = None,
+    start: CreatedAfterFilter = None,
+    end: CreatedBeforeFilter = None,
+) -> dict[str, Any]:
     """
-    Retrieve a list of recent stock order history and their statuses.
+    Retrieve a page of recent stock order history and their statuses.
 
     Mirrors MCP tool: stock_orders
 
     Returns:
-        Dict containing list of stock orders
+        Dict containing list of stock orders and the next page cursor
 
     Raises:
         HTTPException: If stock orders cannot be retrieved
     """
     try:
-        service = get_trading_service()
-        all_orders = await service.get_orders()
-
-        # Filter for stock orders only (exclude options)
-        stock_orders = [
-            order
-            for order in all_orders
-            if order.symbol and not getattr(order, "is_option", False)
-        ]
-
-        # Convert orders to serializable format
-        orders_data = []
-        for order in stock_orders:
-            orders_data.append(
-                {
-                    "id": order.id,
-                    "symbol": order.symbol,
-                    "quantity": order.quantity,
-                    "order_type": order.order_type,
-                    "condition": order.condition,
-                    "price": order.price,
-                    "stop_price": order.stop_price,
-                    "status": order.status,
-                    "created_at": order.created_at.isoformat()
-                    if order.created_at
-                    else None,
-                    "filled_at": order.filled_at.isoformat()
-                    if order.filled_at
-                    else None,
-                }
-            )
-
-        return {
-            "success": True,
-            "orders": orders_data,
-            "count": len(orders_data),
-            "message": f"Retrieved {len(orders_data)} stock orders",
-        }
+        result = await _get_order_history(
+            OrderAssetClass.STOCK, limit, cursor, status, start, end
+        )
+        result["message"] = f"Retrieved {result['count']} stock orders"
+        return result
     except Exception as e:
         raise HTTPException(
-            status_code=500,
+            status_code=422 if isinstance(e, InputValidationError) else 500,
             detail={
                 "success": False,
                 "error": str(e),
@@ -1083,62 +1244,40 @@ async def get_stock_orders() -> dict[str, Any]:
         ) from e
 
 
-@router.get("/orders/options")
-async def get_options_orders() -> dict[str, Any]:
+@router.get("/orders/options", response_class=FastJSONResponse)
+@fast_json
+async def get_options_orders(
+    limit: int | None = Query(
+        None,
+        ge=1,
+        le=1000,
+        description="Orders per page; without limit or cursor, all orders",
+    ),
+    cursor: str | None = Query(None, description="next_cursor from the last page"),
+    status: OrderStatusFilter = None,
+    start: CreatedAfterFilter = None,
+    end: CreatedBeforeFilter = None,
+) -> dict[str, Any]:
     """
-    Retrieve a list of recent options order history and their statuses.
+    Retrieve a page of recent options order history and their statuses.
 
     Mirrors MCP tool: options_orders
 
     Returns:
-        Dict containing list of options orders
+        Dict containing list of options orders and the next page cursor
 
     Raises:
         HTTPException: If options orders cannot be retrieved
     """
     try:
-        service = get_trading_service()
-        all_orders = await service.get_orders()
-
-        # Filter for options orders only
-        option_orders = [
-            order
-            for order in all_orders
-            if getattr(order, "is_option", False)
-            or (order.symbol and ("_" in order.symbol or len(order.symbol) > 5))
-        ]
-
-        # Convert orders to serializable format
-        orders_data = []
-        for order in option_orders:
-            orders_data.append(
-                {
-                    "id": order.id,
-                    "symbol": order.symbol,
-                    "quantity": order.quantity,
-                    "order_type": order.order_type,
-                    "condition": order.condition,
-                    "price": order.price,
-                    "stop_price": order.stop_price,
-                    "status": order.status,
-                    "created_at": order.created_at.isoformat()
-                    if order.created_at
-                    else None,
-                    "filled_at": order.filled_at.isoformat()
-                    if order.filled_at
-                    else None,
-                }
-            )
-
-        return {
-            "success": True,
-            "orders": orders_data,
-            "count": len(orders_data),
-            "message": f"Retrieved {len(orders_data)} options orders",
-        }
+        result = await _get_order_history(
+            OrderAssetClass.OPTION, limit, cursor, status, start, end
+        )
+        result["message"] = f"Retrieved {result['count']} options orders"
+        return result
     except Exception as e:
         raise HTTPException(
-            status_code=500,
+            status_code=422 if isinstance(e, InputValidationError) else 500,
             detail={
                 "success": False,
                 "error": str(e),
@@ -1280,9 +1419,20 @@ async def get_open_option_orders() -> dict[str, Any]:
 # ==================== OPTIONS TRADING INFO ENDPOINTS ====================
 
 
-@router.get("/options/chain/{underlying}")
+@router.get("/options/chain/{underlying}", response_class=FastJSONResponse)
+@fast_json
 async def get_option_chain(
-    underlying: str, expiration_date: str | None = Query(None)
+    underlying: str,
+    expiration_date: str | None = Query(None),
+    fields: str | None = Query(
+        None, description="Comma-separated contract fields, e.g. symbol,strike,bid"
+    ),
+    strike_window: int | None = Query(
+        None, ge=1, description="Strikes to keep on each side of the stock price"
+    ),
+    encoding: str = Query(
+        "records", pattern="^(records|table)$", description="records or table"
+    ),
 ) -> dict[str, Any]:
     """
     Get complete options chain for an underlying stock.
@@ -1292,6 +1442,10 @@ async def get_option_chain(
     Args:
         underlying: Stock symbol (e.g., "AAPL")
         expiration_date: Optional expiration date filter in YYYY-MM-DD format
+        fields: Optional contract fields to return
+        strike_window: Optional number of strikes to keep around the stock price
+        encoding: "records" (one object per contract) or "table" (one list
+            per field)
 
     Returns:
         Dict containing options chain data
@@ -1309,59 +1463,23 @@ async def get_option_chain(
 
             exp_date = datetime.strptime(expiration_date, "%Y-%m-%d").date()
 
-        chain = await service.get_options_chain(underlying, exp_date)
-
-        # Convert to serializable format
-        calls_data = []
-        puts_data = []
-
-        for option_quote in chain.calls:
-            calls_data.append(
-                {
-                    "symbol": option_quote.symbol,
-                    "strike": option_quote.strike,
-                    "expiration": option_quote.expiration_date.isoformat()
-                    if option_quote.expiration_date
-                    else None,
-                    "price": option_quote.price,
-                    "bid": option_quote.bid,
-                    "ask": option_quote.ask,
-                    "volume": option_quote.volume,
-                    "open_interest": option_quote.open_interest,
-                    "implied_volatility": option_quote.iv,
-                }
-            )
-
-        for option_quote in chain.puts:
-            puts_data.append(
-                {
-                    "symbol": option_quote.symbol,
-                    "strike": option_quote.strike,
-                    "expiration": option_quote.expiration_date.isoformat()
-                    if option_quote.expiration_date
-                    else None,
-                    "price": option_quote.price,
-                    "bid": option_quote.bid,
-                    "ask": option_quote.ask,
-                    "volume": option_quote.volume,
-                    "open_interest": option_quote.open_interest,
-                    "implied_volatility": option_quote.iv,
-                }
-            )
+        chain = shape_chain(
+            await service.get_options_chain(underlying, exp_date),
+            fields,
+            strike_window,
+            encoding,
+        )
 
         return {
             "success": True,
             "underlying": underlying,
             "expiration_filter": expiration_date,
-            "chain": {
-                "calls": calls_data,
-                "puts": puts_data,
-                "calls_count": len(calls_data),
-                "puts_count": len(puts_data),
-            },
-            "message": f"Options chain for {underlying}: {len(calls_data)} calls, {len(puts_data)} puts",
+            "chain": chain,
+            "message": f"Options chain for {underlying}: {chain['calls_count']} calls, {chain['puts_count']} puts",
         }
 
+    except InputValidationError:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving options chain for {underlying}: {e}")
         raise HTTPException(
@@ -1474,11 +1592,21 @@ async def get_option_greeks(
         ) from e
 
 
-@router.get("/options/find/{symbol}")
+@router.get("/options/find/{symbol}", response_class=FastJSONResponse)
+@fast_json
 async def find_options_endpoint(
     symbol: str,
     expiration_date: str | None = Query(None),
     option_type: str | None = Query(None),
+    fields: str | None = Query(
+        None, description="Comma-separated contract fields, e.g. symbol,strike_price"
+    ),
+    strike_window: int | None = Query(
+        None, ge=1, description="Strikes to keep on each side of the stock price"
+    ),
+    encoding: str = Query(
+        "records", pattern="^(records|table)$", description="records or table"
+    ),
 ) -> dict[str, Any]:
     """
     Find tradable options for a stock with optional filtering.
@@ -1489,6 +1617,10 @@ async def find_options_endpoint(
         symbol: Stock symbol (e.g., "AAPL")
         expiration_date: Optional expiration date filter in YYYY-MM-DD format
         option_type: Optional filter for "call" or "put"
+        fields: Optional contract fields to return
+        strike_window: Optional number of strikes to keep around the stock price
+        encoding: "records" (one object per contract) or "table" (one list
+            per field)
 
     Returns:
         Dict containing tradable options
@@ -1499,7 +1631,7 @@ async def find_options_endpoint(
     try:
         service = get_trading_service()
         options_data = await service.find_tradable_options(
-            symbol, expiration_date, option_type
+            symbol, expiration_date, option_type, fields, strike_window, encoding
         )
 
         return {
@@ -1510,7 +1642,7 @@ async def find_options_endpoint(
                 "option_type": option_type,
             },
             "options": options_data,
-            "message": f"Found {len(options_data.get('options', []))} tradable options for {symbol}",
+            "message": f"Found {options_data.get('total_found', 0)} tradable options for {symbol}",
         }
 
     except Exception as e:
@@ -1849,6 +1981,54 @@ async def get_stock_price(symbol: str) -> dict[str, Any]:
         ) from e
 
 
+SymbolsQuery = Annotated[
+    list[str], Query(description="Stock and/or option symbols", min_length=1)
+]
+
+
+@router.get("/quotes/batch", response_class=FastJSONResponse)
+@fast_json
+async def get_batch_quotes(
+    symbols: SymbolsQuery,
+    include_greeks: bool = Query(True, description="Calculate option Greeks"),
+) -> dict[str, Any]:
+    """
+    Get quotes for many stocks and options with one adapter call.
+
+    Mirrors MCP tool: batch_quotes
+
+    Args:
+        symbols: Stock and/or option symbols
+        include_greeks: Whether to calculate Greeks for option symbols
+
+    Returns:
+        Dict containing one list per field and per-symbol errors
+
+    Raises:
+        HTTPException: If the quotes cannot be retrieved
+    """
+    try:
+        service = get_trading_service()
+        result = await service.get_quotes_batch(symbols, include_greeks)
+
+        return {
+            "success": True,
+            **result,
+            "message": f"Quoted {result['count']} of {len(symbols)} symbols",
+        }
+    except InputValidationError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": False,
+                "error": str(e),
+                "message": f"Failed to get batch quotes: {e!s}",
+            },
+        ) from e
+
+
 @router.get("/stock/info/{symbol}")
 async def get_stock_info(symbol: str) -> dict[str, Any]:
     """
@@ -1960,7 +2140,8 @@ async def get_market_hours() -> dict[str, Any]:
         ) from e
 
 
-@router.get("/stock/history/{symbol}")
+@router.get("/stock/history/{symbol}", response_class=FastJSONResponse)
+@fast_json
 async def get_price_history(
     symbol: str,
     period: str = Query(
@@ -2987,6 +3168,70 @@ async def option_debit_spread(
         ) from e
 
 
+class PayoffLegRequest(BaseModel):
+    """One leg of a payoff diagram request."""
+
+    symbol: str = Field(..., description="Stock or option symbol")
+    quantity: int = Field(..., description="Shares or contracts, negative for short")
+    price: float | None = Field(
+        None, ge=0, description="Premium or cost per share (options default to 0)"
+    )
+
+
+class PayoffRequest(BaseModel):
+    """Schema for payoff diagram requests."""
+
+    legs: list[PayoffLegRequest] = Field(..., min_length=1, description="Legs")
+    points: int = Field(101, ge=2, le=1001, description="Points on the price grid")
+
+
+@router.post("/options/payoff", response_class=FastJSONResponse)
+@fast_json
+async def option_payoff(payoff_request: PayoffRequest) -> dict[str, Any]:
+    """
+    Get the expiration payoff diagram of a set of stock and option legs.
+
+    Args:
+        payoff_request: Legs and the number of points on the price grid
+
+    Returns:
+        Dict with net premium, max profit and loss (None when unbounded),
+        exact breakevens and the payoff curve
+
+    Raises:
+        InputValidationError: If the legs have no single expiration payoff
+    """
+    from app.schemas.orders import OrderLeg, OrderType
+    from app.services.payoff import PayoffProfile
+
+    try:
+        legs = [
+            OrderLeg(
+                asset=leg.symbol,  # type: ignore[arg-type]  # Validator will convert str to Asset
+                quantity=abs(leg.quantity),
+                order_type=OrderType.BUY if leg.quantity > 0 else OrderType.SELL,
+                price=leg.price,
+            )
+            for leg in payoff_request.legs
+            if leg.quantity != 0
+        ]
+    except ValueError as e:
+        raise InputValidationError(str(e)) from e
+
+    profile = PayoffProfile.from_order_legs(legs)
+    if profile is None:
+        raise InputValidationError(
+            "Payoff needs options on one expiration and a price for every stock leg"
+        )
+
+    return {
+        "success": True,
+        "legs": len(legs),
+        "payoff": profile.to_dict(payoff_request.points),
+        "message": f"Expiration payoff for {len(legs)} legs",
+    }
+
+
 # =============================================================================
 # Order Cancellation Endpoints (4 endpoints) - Mirrors Set 7 MCP Tools
 # =============================================================================
@@ -3382,3 +3627,118 @@ async def get_user_accounts(user_id: str) -> list[dict[str, Any]]:
                 "user_id": user_id,
             },
         ) from e
+
+
+# ============================================================================
+# STREAMING ENDPOINTS
+# ============================================================================
+
+StreamSymbolsQuery = Annotated[
+    list[str] | None, Query(description="Symbols to stream quotes for")
+]
+
+
+def _stream_subscription(
+    account_id: str | None, symbols: list[str] | None
+) -> tuple[str | None, list[str]]:
+    try:
+        account_id = validate_optional_account_id(account_id)
+    except ValueError as e:
+        raise InputValidationError(str(e)) from e
+    return account_id, [s for symbol in symbols or [] for s in symbol.split(",") if s]
+
+
+@router.websocket("/stream/ws")
+async def stream_websocket(
+    websocket: WebSocket,
+    account_id: str | None = None,
+    symbols: StreamSymbolsQuery = None,
+) -> None:
+    """
+    Stream order state transitions and quote ticks over a WebSocket.
+
+    Each message is a JSON object with a "type" of "order", "quote",
+    "dropped" (messages lost because the client fell behind) or "heartbeat".
+    Clients may send {"action": "subscribe" | "unsubscribe", "symbols": [...]}
+    to change their quote symbols.
+    """
+    try:
+        account_id, symbol_list = _stream_subscription(account_id, symbols)
+    except InputValidationError as e:
+        await websocket.close(code=1008, reason=str(e.detail))
+        return
+
+    await websocket.accept()
+    hub = get_event_stream_hub()
+    subscriber = hub.subscribe(account_id, symbol_list)
+
+    async def _receive_commands() -> None:
+        while True:
+            command = await websocket.receive_json()
+            action = command.get("action") if isinstance(command, dict) else None
+            if action == "subscribe":
+                hub.update_symbols(subscriber, add=command.get("symbols", []))
+            elif action == "unsubscribe":
+                hub.update_symbols(subscriber, remove=command.get("symbols", []))
+
+    receiver = asyncio.create_task(_receive_commands())
+    try:
+        while not receiver.done():
+            batch = await subscriber.next_batch(settings.STREAM_HEARTBEAT_SECONDS)
+            for message in batch or [{"type": "heartbeat"}]:
+                await websocket.send_bytes(dumps(message))
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        receiver.cancel()
+        hub.unsubscribe(subscriber)
+
+
+@router.get("/stream/events")
+async def stream_events(
+    request: Request,
+    account_id: str | None = Query(None, description="Only this account's orders"),
+    symbols: StreamSymbolsQuery = None,
+) -> StreamingResponse:
+    """
+    Stream order state transitions and quote ticks as server-sent events.
+
+    Events are named "order", "quote" and "dropped"; a comment line is sent
+    as a keepalive when nothing happens for a while.
+    """
+    account_id, symbol_list = _stream_subscription(account_id, symbols)
+    hub = get_event_stream_hub()
+    subscriber = hub.subscribe(account_id, symbol_list)
+
+    async def _events() -> AsyncIterator[bytes]:
+        try:
+            while not await request.is_disconnected():
+                batch = await subscriber.next_batch(settings.STREAM_HEARTBEAT_SECONDS)
+                if not batch:
+                    yield b": keepalive\n\n"
+                for message in batch:
+                    yield (
+                        f"event: {message['type']}\ndata: ".encode()
+                        + dumps(message)
+                        + b"\n\n"
+                    )
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/health/streams")
+async def stream_health() -> dict[str, Any]:
+    """
+    Get streaming statistics.
+
+    Returns:
+        Dict containing subscriber counts and per-client delivered, dropped
+        and coalesced message counts
+    """
+    return get_event_stream_hub().get_stats()
@@ -0,0 +1,135 @@
+"""
+Bridge for running coroutines from synchronous code.
+
+Synchronous MCP tools need to call async services. Starting a new thread and
+event loop per call is expensive: the async engine is thread-local, so every
+call would also build a fresh engine and connection pool. The bridge instead
+runs one long-lived event loop on a daemon thread and submits coroutines to
+it, so all synchronous callers share a single engine and its warm pool.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Coroutine
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class BridgeStats:
+    """Counters for coroutines run through the bridge."""
+
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    total_time: float = 0.0
+
+    @property
+    def avg_time_ms(self) -> float:
+        return self.total_time / self.calls * 1000 if self.calls else 0.0
+
+
+class AsyncLoopBridge:
+    """
+    A persistent event loop on a background thread.
+
+    Args:
+        timeout: Seconds to wait for a submitted coroutine before giving up
+    """
+
+    def __init__(self, timeout: float = 30.0):
+        self.timeout = timeout
+        self.stats = BridgeStats()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(
+                    target=run, name="async-bridge", daemon=True
+                )
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def in_bridge_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """
+        Run a coroutine on the bridge loop and wait for its result.
+
+        Raises:
+            RuntimeError: If called from the bridge loop itself, which would
+                deadlock
+            TimeoutError: If the coroutine does not finish within the timeout
+        """
+        if self.in_bridge_thread():
+            coro.close()
+            raise RuntimeError("Cannot block on the async bridge from its own loop")
+
+        loop = self._ensure_loop()
+        start = time.perf_counter()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as e:
+            future.cancel()
+            self.stats.timeouts += 1
+            raise TimeoutError(
+                f"Async operation timed out after {self.timeout:g} seconds"
+            ) from e
+        except Exception:
+            self.stats.errors += 1
+            raise
+        finally:
+            self.stats.calls += 1
+            self.stats.total_time += time.perf_counter() - start
+
+    def shutdown(self) -> None:
+        """Stop the loop and wait for its thread to exit."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=self.timeout)
+        loop.close()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get bridge call statistics."""
+        return {
+            "running": self._loop is not None and self._loop.is_running(),
+            "calls": self.stats.calls,
+            "errors": self.stats.errors,
+            "timeouts": self.stats.timeouts,
+            "avg_time_ms": self.stats.avg_time_ms,
+        }
+
+
+# Global bridge shared by all synchronous callers
+async_bridge = AsyncLoopBridge()
+
+
+def get_async_bridge() -> AsyncLoopBridge:
+    """Get the global async bridge."""
+    return async_bridge
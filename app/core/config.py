@@ -46,9 +46,73 @@ class Settings(BaseSettings):
     MCP_HTTP_PORT: int = int(os.getenv("MCP_HTTP_PORT", "2081"))
     MCP_HTTP_URL: str = os.getenv("MCP_HTTP_URL", "http://localhost:2081")
 
+    # Read replicas: comma-separated URLs; reads stay on the primary for this
+    # many seconds after an account's own writes
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    DATABASE_REPLICA_STICKY_SECONDS: float = float(
+        os.getenv("DATABASE_REPLICA_STICKY_SECONDS", "5")
+    )
+
     # Quote Adapter Configuration
     QUOTE_ADAPTER_TYPE: str = os.getenv("QUOTE_ADAPTER_TYPE", "test")
 
+    # Order Execution Engine trigger book snapshots (empty path disables them)
+    TRIGGER_SNAPSHOT_PATH: str = os.getenv("TRIGGER_SNAPSHOT_PATH", "")
+    TRIGGER_SNAPSHOT_INTERVAL_SECONDS: float = float(
+        os.getenv("TRIGGER_SNAPSHOT_INTERVAL_SECONDS", "60")
+    )
+
+    # Order queue write-ahead log (empty path keeps the queue in memory only)
+    ORDER_QUEUE_WAL_PATH: str = os.getenv("ORDER_QUEUE_WAL_PATH", "")
+    ORDER_QUEUE_WAL_GROUP_COMMIT_MS: float = float(
+        os.getenv("ORDER_QUEUE_WAL_GROUP_COMMIT_MS", "0")
+    )
+
+    # In-memory portfolio valuations (0 disables them and always sums in SQL)
+    PORTFOLIO_VALUATION_RECONCILE_SECONDS: float = float(
+        os.getenv("PORTFOLIO_VALUATION_RECONCILE_SECONDS", "30")
+    )
+
+    # Per-account TradingService pool for MCP tool calls
+    TRADING_SERVICE_POOL_SIZE: int = int(os.getenv("TRADING_SERVICE_POOL_SIZE", "64"))
+    TRADING_SERVICE_POOL_IDLE_SECONDS: float = float(
+        os.getenv("TRADING_SERVICE_POOL_IDLE_SECONDS", "600")
+    )
+
+    # Cached market-data GET responses with ETag/304 support
+    RESPONSE_CACHE_ENABLED: bool = (
+        os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    )
+    RESPONSE_CACHE_MAX_SIZE: int = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "5000"))
+
+    # WebSocket/SSE streams: per-client buffer, quote poll interval, keepalives
+    STREAM_BUFFER_SIZE: int = int(os.getenv("STREAM_BUFFER_SIZE", "1000"))
+    STREAM_QUOTE_INTERVAL_SECONDS: float = float(
+        os.getenv("STREAM_QUOTE_INTERVAL_SECONDS", "1.0")
+    )
+    STREAM_HEARTBEAT_SECONDS: float = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+
+    # Profiling: admin endpoints require this token in X-Admin-Token and are
+    # disabled while it is empty
+    ADMIN_API_TOKEN: str = os.getenv("ADMIN_API_TOKEN", "")
+    ROUTE_TIMING_ENABLED: bool = (
+        os.getenv("ROUTE_TIMING_ENABLED", "true").lower() == "true"
+    )
+    PROFILER_INTERVAL_MS: float = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+    PROFILER_MAX_SECONDS: float = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+
+    # Monte Carlo VaR: worker processes (0 = one per CPU), used only when
+    # paths x legs reaches the threshold
+    MONTE_CARLO_WORKERS: int = int(os.getenv("MONTE_CARLO_WORKERS", "0"))
+    MONTE_CARLO_PARALLEL_MIN_CELLS: int = int(
+        os.getenv("MONTE_CARLO_PARALLEL_MIN_CELLS", "20000000")
+    )
+
+    # EWMA covariance store shared by the risk calculators (empty path keeps
+    # it in memory only)
+    COVARIANCE_STORE_PATH: str = os.getenv("COVARIANCE_STORE_PATH", "")
+    COVARIANCE_EWMA_DECAY: float = float(os.getenv("COVARIANCE_EWMA_DECAY", "0.94"))
+
     # Test Data Configuration
     TEST_SCENARIO: str = os.getenv("TEST_SCENARIO", "ui_testing")
     TEST_DATE: str = os.getenv("TEST_DATE", "2025-07-30")
@@ -38,6 +38,16 @@ class ConflictError(CustomException):
         super().__init__(status_code=409, detail=detail)
 
 
+class TooManyRequestsError(CustomException):
+    """Exception raised when a request is shed under load."""
+
+    def __init__(self, detail: str = "Too many requests", retry_after: int = 1):
+        super().__init__(
+            status_code=429, detail=detail, headers={"Retry-After": str(retry_after)}
+        )
+        self.retry_after = retry_after
+
+
 class InputValidationError(CustomException):
     """Exception raised for input validation failures."""
 
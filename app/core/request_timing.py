@@ -0,0 +1,119 @@
+"""
+Per-request phase timing.
+
+While a request is being timed, code on its hot paths reports how long it
+spent in each phase: database statements, quote adapter calls, Greeks
+calculations and response serialization. Phases are exclusive, so time spent
+in the database inside an adapter call counts as database time only.
+
+Outside a timed request every hook is a single context variable lookup.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PHASES = ("db", "adapter", "greeks", "serialization")
+
+
+@dataclass
+class RequestTiming:
+    """Time spent in each phase of one request, in seconds."""
+
+    started: float = field(default_factory=time.perf_counter)
+    phases: dict[str, float] = field(default_factory=dict)
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def breakdown_ms(self, total_seconds: float) -> dict[str, float]:
+        """Phase times in milliseconds, plus the unaccounted remainder."""
+        breakdown = {phase: self.phases.get(phase, 0.0) * 1000 for phase in PHASES}
+        accounted = sum(self.phases.values())
+        breakdown["other"] = max(0.0, total_seconds - accounted) * 1000
+        return breakdown
+
+
+@dataclass
+class _OpenPhase:
+    """A phase in progress and the time its nested phases have claimed."""
+
+    nested_seconds: float = 0.0
+
+
+_current_timing: ContextVar[RequestTiming | None] = ContextVar(
+    "request_timing", default=None
+)
+_open_phases: ContextVar[tuple[_OpenPhase, ...]] = ContextVar(
+    "request_timing_phases", default=()
+)
+
+
+def current_request_timing() -> RequestTiming | None:
+    """Get the timing of the request being handled in this context, if any."""
+    return _current_timing.get()
+
+
+def start_request_timing() -> tuple[RequestTiming, Token[RequestTiming | None]]:
+    """Begin timing a request; pass the token to finish_request_timing."""
+    timing = RequestTiming()
+    return timing, _current_timing.set(timing)
+
+
+def finish_request_timing(token: Token[RequestTiming | None]) -> None:
+    _current_timing.reset(token)
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    """
+    Attribute the enclosed time to ``phase`` of the current request.
+
+    Usable as a context manager or, for synchronous functions, a decorator.
+    """
+    timing = _current_timing.get()
+    if timing is None:
+        yield
+        return
+
+    parents = _open_phases.get()
+    current = _OpenPhase()
+    token = _open_phases.set((*parents, current))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _open_phases.reset(token)
+        timing.add(phase, elapsed - current.nested_seconds)
+        if parents:
+            parents[-1].nested_seconds += elapsed
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(
+    conn: Any, cursor: Any, statement: Any, parameters: Any, context: Any, *args: Any
+) -> None:
+    if _current_timing.get() is not None and context is not None:
+        context._timing_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _finish_statement(
+    conn: Any, cursor: Any, statement: Any, parameters: Any, context: Any, *args: Any
+) -> None:
+    timing = _current_timing.get()
+    started = getattr(context, "_timing_started", None)
+    if timing is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    timing.add("db", elapsed)
+    parents = _open_phases.get()
+    if parents:
+        parents[-1].nested_seconds += elapsed
@@ -0,0 +1,195 @@
+"""
+On-demand sampling profiler.
+
+A background thread snapshots the Python stack of every thread in the
+process at a fixed interval for a bounded number of seconds, and counts
+identical stacks. Nothing is instrumented, so the profiled code runs at
+full speed; the cost is one stack walk per thread per interval.
+
+Results are in the collapsed stack format (``thread;module:func;... count``)
+read by flamegraph.pl, speedscope and inferno.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from types import FrameType
+from typing import Any
+
+from app.core.config import settings
+
+# Leaf frames of threads that are blocked waiting for work
+_IDLE_LEAVES = frozenset(
+    {
+        "selectors:EpollSelector.select",
+        "selectors:KqueueSelector.select",
+        "selectors:PollSelector.select",
+        "selectors:SelectSelector.select",
+        "threading:Condition.wait",
+        "threading:Event.wait",
+        "threading:Thread._wait_for_tstate_lock",
+        "queue:Queue.get",
+        "concurrent.futures.thread:_worker",
+    }
+)
+
+
+@dataclass
+class ProfileResult:
+    """Stacks collected by one profiling run."""
+
+    duration_seconds: float
+    interval_ms: float
+    samples: int
+    stacks: Counter[str]
+
+    def collapsed(self) -> str:
+        """The stacks in collapsed format, most frequent first."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def to_dict(self, top: int = 20) -> dict[str, Any]:
+        return {
+            "duration_seconds": self.duration_seconds,
+            "interval_ms": self.interval_ms,
+            "samples": self.samples,
+            "distinct_stacks": len(self.stacks),
+            "top_stacks": [
+                {"stack": stack, "count": count}
+                for stack, count in self.stacks.most_common(top)
+            ],
+        }
+
+
+def _frame_name(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads in the process.
+
+    Args:
+        interval: Seconds between samples
+        max_seconds: Longest run allowed
+        max_depth: Frames kept per stack, innermost first
+    """
+
+    def __init__(
+        self, interval: float = 0.005, max_seconds: float = 60.0, max_depth: int = 128
+    ) -> None:
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.max_depth = max_depth
+        self._running = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._running.locked()
+
+    def _sample(
+        self, stacks: Counter[str], exclude: set[int], include_idle: bool
+    ) -> int:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        sampled = 0
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id in exclude:
+                continue
+            frames: list[str] = []
+            current: FrameType | None = frame
+            while current is not None and len(frames) < self.max_depth:
+                frames.append(_frame_name(current))
+                current = current.f_back
+            if not include_idle and frames and frames[0] in _IDLE_LEAVES:
+                continue
+            frames.append(names.get(thread_id, f"thread-{thread_id}"))
+            stacks[";".join(reversed(frames))] += 1
+            sampled += 1
+        return sampled
+
+    def _run(
+        self,
+        seconds: float,
+        stacks: Counter[str],
+        counts: list[int],
+        exclude: set[int],
+        include_idle: bool,
+    ) -> None:
+        exclude = exclude | {threading.get_ident()}
+        deadline = time.perf_counter() + seconds
+        try:
+            while time.perf_counter() < deadline:
+                counts[0] += self._sample(stacks, exclude, include_idle)
+                time.sleep(self.interval)
+        finally:
+            # Released by the sampling thread itself, so the lock is held
+            # exactly as long as a run is sampling, even if the caller
+            # waiting for it was cancelled
+            self._running.release()
+
+    def _start(
+        self, seconds: float, exclude: set[int], include_idle: bool
+    ) -> tuple[threading.Thread, Counter[str], list[int], float]:
+        if seconds <= 0 or seconds > self.max_seconds:
+            raise ValueError(
+                f"Profile duration must be between 0 and {self.max_seconds} seconds"
+            )
+        if not self._running.acquire(blocking=False):
+            raise RuntimeError("A profiling run is already in progress")
+        stacks: Counter[str] = Counter()
+        counts = [0]
+        thread = threading.Thread(
+            target=self._run,
+            args=(seconds, stacks, counts, exclude, include_idle),
+            name="sampling-profiler",
+            daemon=True,
+        )
+        try:
+            thread.start()
+        except BaseException:
+            self._running.release()
+            raise
+        return thread, stacks, counts, time.perf_counter()
+
+    def _result(
+        self, stacks: Counter[str], counts: list[int], started: float
+    ) -> ProfileResult:
+        return ProfileResult(
+            duration_seconds=time.perf_counter() - started,
+            interval_ms=self.interval * 1000,
+            samples=counts[0],
+            stacks=stacks,
+        )
+
+    def profile(self, seconds: float, include_idle: bool = False) -> ProfileResult:
+        """Profile for ``seconds``, blocking the calling thread (not sampled)."""
+        thread, stacks, counts, started = self._start(
+            seconds, {threading.get_ident()}, include_idle
+        )
+        thread.join()
+        return self._result(stacks, counts, started)
+
+    async def profile_async(
+        self, seconds: float, include_idle: bool = False
+    ) -> ProfileResult:
+        """Profile for ``seconds`` while the event loop keeps running."""
+        thread, stacks, counts, started = self._start(seconds, set(), include_idle)
+        await asyncio.to_thread(thread.join)
+        return self._result(stacks, counts, started)
+
+
+# Global profiler instance
+sampling_profiler = SamplingProfiler(
+    interval=settings.PROFILER_INTERVAL_MS / 1000,
+    max_seconds=settings.PROFILER_MAX_SECONDS,
+)
+
+
+def get_sampling_profiler() -> SamplingProfiler:
+    """Get the global sampling profiler."""
+    return sampling_profiler
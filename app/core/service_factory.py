@@ -23,10 +23,23 @@ def create_trading_service(account_owner: str = "UI_TESTER_WES") -> "TradingServ
     Returns:
         Configured TradingService instance
     """
+    from app.core.config import settings
+    from app.services.event_stream import get_event_stream_hub
+    from app.services.portfolio_valuation import get_portfolio_valuation_store
     from app.services.trading_service import TradingService
 
     quote_adapter = _get_quote_adapter()
-    return TradingService(quote_adapter=quote_adapter, account_owner=account_owner)
+    valuation_store = (
+        get_portfolio_valuation_store()
+        if settings.PORTFOLIO_VALUATION_RECONCILE_SECONDS > 0
+        else None
+    )
+    return TradingService(
+        quote_adapter=quote_adapter,
+        account_owner=account_owner,
+        valuation_store=valuation_store,
+        event_hub=get_event_stream_hub(),
+    )
 
 
 def _get_quote_adapter() -> QuoteAdapter:
@@ -13,7 +13,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.api.response_cache import ResponseCacheMiddleware
+from app.api.route_timing import RouteTimingMiddleware
+from app.api.v1.admin import router as admin_router
 from app.api.v1.trading import router as trading_router
+from app.core.config import settings
 from app.core.service_factory import register_services
 
 # Load environment variables
@@ -38,6 +42,12 @@ app = FastAPI(
     version="0.1.0",
 )
 
+# Serve repeated market-data polls from cache, with ETag/304 support.
+# Added before CORS so it runs inside it: cached entries never hold the
+# per-origin CORS headers, which are set on every response on the way out
+if settings.RESPONSE_CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware)
+
 # Add CORS middleware to allow frontend to access API
 app.add_middleware(
     CORSMiddleware,
@@ -56,11 +66,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route phase timings, reported to the performance monitor
+if settings.ROUTE_TIMING_ENABLED:
+    app.add_middleware(RouteTimingMiddleware)
+
 # Register services (dependency injection)
 register_services()
 
 # Include API routes
 app.include_router(trading_router)
+app.include_router(admin_router)
 
 
 # Basic health endpoint
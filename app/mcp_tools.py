@@ -3,26 +3,33 @@ MCP Tools for Open Paper Trading
 Trading tools for AI agents including account and portfolio management
 """
 
-import asyncio
+import secrets
 
 # Import for type annotation
 from typing import TYPE_CHECKING, Any
 
 from fastmcp import Context, FastMCP
 
+from app.core.async_bridge import get_async_bridge
+from app.core.config import settings
 from app.core.id_utils import validate_optional_account_id
-from app.core.service_factory import create_trading_service, get_trading_service
+from app.core.sampling_profiler import get_sampling_profiler
+from app.core.service_factory import get_trading_service
 from app.core.user_context import user_context_manager
+from app.services.trading_service_pool import get_trading_service_pool
+from app.utils.chain_shaping import shape_chain
 
 if TYPE_CHECKING:
+    from app.schemas.orders import OrderAssetClass
     from app.services.trading_service import TradingService
 
 
 def get_fresh_trading_service(account_id: str | None = None) -> "TradingService":
-    """Get a fresh TradingService instance for MCP tool calls.
+    """Get a TradingService instance for MCP tool calls.
 
-    This creates a new instance instead of using the singleton to avoid
-    thread-local database session issues in the async execution context.
+    Services come from a per-account pool, so adapters and their caches stay
+    warm across calls. Pooled services hold no session of their own; each
+    call opens its own operation scope.
 
     Args:
         account_id: Account ID to determine account owner, defaults to UI_TESTER_WES
@@ -36,55 +43,16 @@ def get_fresh_trading_service(account_id: str | None = None) -> "TradingService"
     elif account_id and account_id != "UITESTER01":
         account_owner = account_id  # Use account_id as owner for unknown accounts
 
-    return create_trading_service(account_owner)
+    return get_trading_service_pool().get(account_owner)
 
 
 def run_async_safely(coro):
-    """Safely run async coroutine in sync context"""
-    try:
-        # Try to get existing event loop
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is running, we need to run in a new thread with a new event loop
-            import threading
-
-            result_container = []
-            exception_container = []
-
-            def run_in_new_loop():
-                """Run coroutine in a new event loop in a separate thread"""
-                try:
-                    # Create a new event loop for this thread
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        result = new_loop.run_until_complete(coro)
-                        result_container.append(result)
-                    finally:
-                        new_loop.close()
-                except Exception as e:
-                    exception_container.append(e)
-
-            # Run in a separate thread
-            thread = threading.Thread(target=run_in_new_loop)
-            thread.start()
-            thread.join(timeout=30)  # 30 second timeout
-
-            if thread.is_alive():
-                raise TimeoutError("Async operation timed out after 30 seconds")
-
-            if exception_container:
-                raise exception_container[0]
-
-            if result_container:
-                return result_container[0]
-            else:
-                raise RuntimeError("No result returned from async operation")
-        else:
-            return loop.run_until_complete(coro)
-    except RuntimeError:
-        # No event loop, create new one
-        return asyncio.run(coro)
+    """Safely run async coroutine in sync context
+
+    Coroutines run on one persistent background event loop, so every tool
+    call reuses the same async engine and connection pool.
+    """
+    return get_async_bridge().run(coro)
 
 
 # Initialize FastMCP instance
@@ -132,6 +100,46 @@ def health_check() -> str:
     return "MCP Server is healthy and operational"
 
 
+@mcp.tool
+async def profile_server(
+    admin_token: str, seconds: float = 10.0, include_idle: bool = False
+) -> dict[str, Any]:
+    """Sample the MCP server's stacks for a number of seconds (admin only)
+
+    Returns collapsed stacks (one "frame;frame;... count" per line) for
+    flamegraph tooling.
+
+    Args:
+        admin_token: The server's ADMIN_API_TOKEN
+        seconds: How long to sample
+        include_idle: Keep samples of threads waiting for work
+    """
+    if not settings.ADMIN_API_TOKEN or not secrets.compare_digest(
+        admin_token, settings.ADMIN_API_TOKEN
+    ):
+        return {
+            "success": False,
+            "error": "Invalid admin token or ADMIN_API_TOKEN not set",
+            "message": "Profiling requires the admin token",
+        }
+    try:
+        result = await get_sampling_profiler().profile_async(seconds, include_idle)
+
+        return {
+            "success": True,
+            **result.to_dict(),
+            "collapsed": result.collapsed(),
+            "message": f"Collected {result.samples} samples over {seconds}s",
+        }
+
+    except (ValueError, RuntimeError) as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Failed to profile server: {e!s}",
+        }
+
+
 @mcp.tool
 def get_account_balance(account_id: str | None = None) -> dict[str, Any]:
     """Get the current account balance and basic account information
@@ -397,13 +405,10 @@ def account_details(account_id: str | None = None) -> dict[str, Any]:
 
         service = get_trading_service()
         account_info = run_async_safely(service.get_account_info(account_id))
-        portfolio = run_async_safely(service.get_portfolio(account_id))
 
-        # Calculate additional details
-        positions_count = len(portfolio.positions)
-        invested_value = sum(
-            pos.quantity * (pos.current_price or 0) for pos in portfolio.positions
-        )
+        # Totals come from the account's cached valuation
+        positions_count = account_info["positions_count"]
+        invested_value = account_info["invested_value"]
         buying_power = account_info["cash_balance"] * 2  # 2:1 margin (simplified)
 
         account_msg = f" for account {account_id}" if account_id else ""
@@ -593,6 +598,62 @@ def stock_info(symbol: str) -> dict[str, Any]:
         }
 
 
+@mcp.tool
+def batch_quotes(symbols: list[str], include_greeks: bool = True) -> dict[str, Any]:
+    """Get prices for many stocks and options in one call
+
+    Returns columns (one list per field, one entry per symbol) instead of one
+    object per symbol. Options also get strike, expiration, type and Greeks.
+
+    Args:
+        symbols: Stock and/or option symbols (e.g., ["AAPL", "AAPL240119C00150000"])
+        include_greeks: Whether to calculate Greeks for option symbols
+    """
+    try:
+        service = get_trading_service()
+        result = run_async_safely(service.get_quotes_batch(symbols, include_greeks))
+
+        return {
+            "success": True,
+            **result,
+            "message": f"Quoted {result['count']} of {len(symbols)} symbols",
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "symbols": symbols,
+            "message": f"Failed to get batch quotes: {e!s}",
+        }
+
+
+@mcp.tool
+def batch_stock_info(symbols: list[str]) -> dict[str, Any]:
+    """Get company information and fundamentals for many stocks in one call
+
+    Args:
+        symbols: Stock ticker symbols (e.g., ["AAPL", "MSFT"])
+    """
+    try:
+        service = get_trading_service()
+        info = run_async_safely(service.get_stock_info_batch(symbols))
+
+        return {
+            "success": True,
+            "info": info,
+            "message": f"Company information retrieved for {len(info)} symbols",
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "symbols": symbols,
+            "message": f"Failed to get batch stock info: {e!s}",
+        }
+
+
 @mcp.tool
 def search_stocks_tool(query: str) -> dict[str, Any]:
     """Search for stocks by symbol or company name
@@ -752,57 +813,55 @@ def stock_level2_data(symbol: str) -> dict[str, Any]:
         }
 
 
+def _order_history_page(
+    account_id: str | None,
+    asset_class: "OrderAssetClass",
+    limit: int | None,
+    cursor: str | None,
+    status: list[str] | None,
+) -> dict[str, Any]:
+    """Fetch one keyset page of an account's stock or options order history."""
+    from app.schemas.orders import OrderStatus
+
+    if account_id:
+        service = get_trading_service_pool().get(account_id)
+    else:
+        service = get_trading_service()
+    page = run_async_safely(
+        service.get_orders_page(
+            limit=limit,
+            cursor=cursor,
+            status=[OrderStatus(value.lower()) for value in status] if status else None,
+            asset_class=asset_class,
+        )
+    )
+
+    return page.to_history_payload()
+
+
 @mcp.tool
-def stock_orders(account_id: str | None = None) -> dict[str, Any]:
-    """Retrieve a list of recent stock order history and their statuses
+def stock_orders(
+    account_id: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    status: list[str] | None = None,
+) -> dict[str, Any]:
+    """Retrieve a page of recent stock order history and their statuses
 
     Args:
         account_id: Account ID to retrieve orders for (optional, defaults to primary account)
+        limit: Maximum orders to return (up to 1000); without limit or cursor, all orders
+        cursor: next_cursor from a previous call, to fetch the following page
+        status: Only include orders in these statuses (e.g. ["pending", "filled"])
     """
-    try:
-        if account_id:
-            from app.services.trading_service import TradingService
-
-            service = TradingService(account_owner=account_id)
-        else:
-            service = get_trading_service()
-        all_orders = run_async_safely(service.get_orders())
-
-        # Filter for stock orders only (exclude options)
-        stock_orders = [
-            order
-            for order in all_orders
-            if order.symbol and not getattr(order, "is_option", False)
-        ]
-
-        # Convert orders to serializable format
-        orders_data = []
-        for order in stock_orders:
-            orders_data.append(
-                {
-                    "id": order.id,
-                    "symbol": order.symbol,
-                    "quantity": order.quantity,
-                    "order_type": order.order_type,
-                    "condition": order.condition,
-                    "price": order.price,
-                    "stop_price": order.stop_price,
-                    "status": order.status,
-                    "created_at": order.created_at.isoformat()
-                    if order.created_at
-                    else None,
-                    "filled_at": order.filled_at.isoformat()
-                    if order.filled_at
-                    else None,
-                }
-            )
+    from app.schemas.orders import OrderAssetClass
 
-        return {
-            "success": True,
-            "orders": orders_data,
-            "count": len(orders_data),
-            "message": f"Retrieved {len(orders_data)} stock orders",
-        }
+    try:
+        result = _order_history_page(
+            account_id, OrderAssetClass.STOCK, limit, cursor, status
+        )
+        result["message"] = f"Retrieved {result['count']} stock orders"
+        return result
 
     except Exception as e:
         return {
@@ -813,57 +872,28 @@ def stock_orders(account_id: str | None = None) -> dict[str, Any]:
 
 
 @mcp.tool
-def options_orders(account_id: str | None = None) -> dict[str, Any]:
-    """Retrieve a list of recent options order history and their statuses
+def options_orders(
+    account_id: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    status: list[str] | None = None,
+) -> dict[str, Any]:
+    """Retrieve a page of recent options order history and their statuses
 
     Args:
         account_id: Account ID to retrieve orders for (optional, defaults to primary account)
+        limit: Maximum orders to return (up to 1000); without limit or cursor, all orders
+        cursor: next_cursor from a previous call, to fetch the following page
+        status: Only include orders in these statuses (e.g. ["pending", "filled"])
     """
-    try:
-        if account_id:
-            from app.services.trading_service import TradingService
-
-            service = TradingService(account_owner=account_id)
-        else:
-            service = get_trading_service()
-        all_orders = run_async_safely(service.get_orders())
-
-        # Filter for options orders only
-        option_orders = [
-            order
-            for order in all_orders
-            if getattr(order, "is_option", False)
-            or (order.symbol and ("_" in order.symbol or len(order.symbol) > 5))
-        ]
-
-        # Convert orders to serializable format
-        orders_data = []
-        for order in option_orders:
-            orders_data.append(
-                {
-                    "id": order.id,
-                    "symbol": order.symbol,
-                    "quantity": order.quantity,
-                    "order_type": order.order_type,
-                    "condition": order.condition,
-                    "price": order.price,
-                    "stop_price": order.stop_price,
-                    "status": order.status,
-                    "created_at": order.created_at.isoformat()
-                    if order.created_at
-                    else None,
-                    "filled_at": order.filled_at.isoformat()
-                    if order.filled_at
-                    else None,
-                }
-            )
+    from app.schemas.orders import OrderAssetClass
 
-        return {
-            "success": True,
-            "orders": orders_data,
-            "count": len(orders_data),
-            "message": f"Retrieved {len(orders_data)} options orders",
-        }
+    try:
+        result = _order_history_page(
+            account_id, OrderAssetClass.OPTION, limit, cursor, status
+        )
+        result["message"] = f"Retrieved {result['count']} options orders"
+        return result
 
     except Exception as e:
         return {
@@ -882,9 +912,7 @@ def open_stock_orders(account_id: str | None = None) -> dict[str, Any]:
     """
     try:
         if account_id:
-            from app.services.trading_service import TradingService
-
-            service = TradingService(account_owner=account_id)
+            service = get_trading_service_pool().get(account_id)
         else:
             service = get_trading_service()
         all_orders = run_async_safely(service.get_orders())
@@ -943,9 +971,7 @@ def open_option_orders(account_id: str | None = None) -> dict[str, Any]:
     """
     try:
         if account_id:
-            from app.services.trading_service import TradingService
-
-            service = TradingService(account_owner=account_id)
+            service = get_trading_service_pool().get(account_id)
         else:
             service = get_trading_service()
         all_orders = run_async_safely(service.get_orders())
@@ -998,16 +1024,24 @@ def open_option_orders(account_id: str | None = None) -> dict[str, Any]:
 
 
 @mcp.tool
-def option_chain(underlying: str, expiration_date: str | None = None) -> dict[str, Any]:
+def option_chain(
+    underlying: str,
+    expiration_date: str | None = None,
+    fields: str | None = None,
+    strike_window: int | None = None,
+    encoding: str = "records",
+) -> dict[str, Any]:
     """Get complete options chain for an underlying stock
 
     Args:
         underlying: Stock symbol (e.g., "AAPL")
         expiration_date: Optional expiration date filter in YYYY-MM-DD format
+        fields: Optional comma-separated contract fields (e.g., "symbol,strike,bid,ask")
+        strike_window: Optional number of strikes to keep on each side of the stock price
+        encoding: "records" (one object per contract) or "table" (one list per field)
     """
     try:
         service = get_trading_service()
-
         # Parse expiration date if provided
         exp_date = None
         if expiration_date:
@@ -1015,57 +1049,19 @@ def option_chain(underlying: str, expiration_date: str | None = None) -> dict[st
 
             exp_date = datetime.strptime(expiration_date, "%Y-%m-%d").date()
 
-        chain = run_async_safely(service.get_options_chain(underlying, exp_date))
-
-        # Convert to serializable format
-        calls_data = []
-        puts_data = []
-
-        for option_quote in chain.calls:
-            calls_data.append(
-                {
-                    "symbol": option_quote.symbol,
-                    "strike": option_quote.strike,
-                    "expiration": option_quote.expiration_date.isoformat()
-                    if option_quote.expiration_date
-                    else None,
-                    "price": option_quote.price,
-                    "bid": option_quote.bid,
-                    "ask": option_quote.ask,
-                    "volume": option_quote.volume,
-                    "open_interest": option_quote.open_interest,
-                    "implied_volatility": option_quote.iv,
-                }
-            )
-
-        for option_quote in chain.puts:
-            puts_data.append(
-                {
-                    "symbol": option_quote.symbol,
-                    "strike": option_quote.strike,
-                    "expiration": option_quote.expiration_date.isoformat()
-                    if option_quote.expiration_date
-                    else None,
-                    "price": option_quote.price,
-                    "bid": option_quote.bid,
-                    "ask": option_quote.ask,
-                    "volume": option_quote.volume,
-                    "open_interest": option_quote.open_interest,
-                    "implied_volatility": option_quote.iv,
-                }
-            )
+        chain = shape_chain(
+            run_async_safely(service.get_options_chain(underlying, exp_date)),
+            fields,
+            strike_window,
+            encoding,
+        )
 
         return {
             "success": True,
             "underlying": underlying,
             "expiration_filter": expiration_date,
-            "chain": {
-                "calls": calls_data,
-                "puts": puts_data,
-                "calls_count": len(calls_data),
-                "puts_count": len(puts_data),
-            },
-            "message": f"Options chain for {underlying}: {len(calls_data)} calls, {len(puts_data)} puts",
+            "chain": chain,
+            "message": f"Options chain for {underlying}: {chain['calls_count']} calls, {chain['puts_count']} puts",
         }
 
     except Exception as e:
@@ -1149,7 +1145,12 @@ def option_greeks(
 
 @mcp.tool
 def find_options(
-    symbol: str, expiration_date: str | None = None, option_type: str | None = None
+    symbol: str,
+    expiration_date: str | None = None,
+    option_type: str | None = None,
+    fields: str | None = None,
+    strike_window: int | None = None,
+    encoding: str = "records",
 ) -> dict[str, Any]:
     """Find tradable options for a stock with optional filtering
 
@@ -1157,11 +1158,16 @@ def find_options(
         symbol: Stock symbol (e.g., "AAPL")
         expiration_date: Optional expiration date filter in YYYY-MM-DD format
         option_type: Optional filter for "call" or "put"
+        fields: Optional comma-separated contract fields (e.g., "symbol,strike_price,delta")
+        strike_window: Optional number of strikes to keep on each side of the stock price
+        encoding: "records" (one object per contract) or "table" (one list per field)
     """
     try:
         service = get_trading_service()
         options_data = run_async_safely(
-            service.find_tradable_options(symbol, expiration_date, option_type)
+            service.find_tradable_options(
+                symbol, expiration_date, option_type, fields, strike_window, encoding
+            )
         )
 
         return {
@@ -1172,7 +1178,7 @@ def find_options(
                 "option_type": option_type,
             },
             "options": options_data,
-            "message": f"Found {len(options_data.get('options', []))} tradable options for {symbol}",
+            "message": f"Found {options_data.get('total_found', 0)} tradable options for {symbol}",
         }
 
     except Exception as e:
@@ -1778,6 +1784,65 @@ def sell_stock_stop_limit(
         }
 
 
+@mcp.tool
+def submit_orders_bulk(
+    orders: list[dict[str, Any]], account_id: str | None = None
+) -> dict[str, Any]:
+    """Place many stock orders at once and report the outcome of each
+
+    Args:
+        orders: Orders to place. Each needs "symbol", "order_type" ("buy" or
+            "sell") and "quantity"; "price", "condition" ("market", "limit",
+            "stop", "stop_limit") and "stop_price" are optional
+        account_id: Account ID for the orders (optional, defaults to primary account)
+    """
+    try:
+        from pydantic import ValidationError
+
+        from app.schemas.orders import BulkOrderResult, OrderCreate
+
+        service = get_fresh_trading_service(account_id)
+
+        # Orders that fail schema validation are reported without submitting
+        results: list[BulkOrderResult | None] = [None] * len(orders)
+        valid: list[tuple[int, OrderCreate]] = []
+        for index, order in enumerate(orders):
+            try:
+                valid.append((index, OrderCreate(**order)))
+            except ValidationError as e:
+                results[index] = BulkOrderResult(
+                    index=index, success=False, error=str(e)
+                )
+
+        submitted = run_async_safely(
+            service.create_orders_bulk([order for _, order in valid])
+        )
+        for (index, _), result in zip(valid, submitted, strict=True):
+            results[index] = result.model_copy(update={"index": index})
+
+        results_data = [
+            result.model_dump(mode="json") for result in results if result is not None
+        ]
+        created = sum(1 for result in results_data if result["success"])
+        return {
+            "success": created == len(results_data),
+            "results": results_data,
+            "submitted": len(results_data),
+            "created": created,
+            "failed": len(results_data) - created,
+            "account_id": account_id,
+            "message": f"Created {created} of {len(results_data)} orders",
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "account_id": account_id,
+            "message": f"Failed to submit orders: {e!s}",
+        }
+
+
 # ============================================================================
 # SET 6: OPTIONS TRADING TOOLS (4 tools)
 # ============================================================================
@@ -2076,9 +2141,7 @@ def cancel_stock_order_by_id(
     """
     try:
         if account_id:
-            from app.services.trading_service import TradingService
-
-            service = TradingService(account_owner=account_id)
+            service = get_trading_service_pool().get(account_id)
         else:
             service = get_trading_service()
         result = run_async_safely(service.cancel_order(order_id))
@@ -2119,9 +2182,7 @@ def cancel_option_order_by_id(
     """
     try:
         if account_id:
-            from app.services.trading_service import TradingService
-
-            service = TradingService(account_owner=account_id)
+            service = get_trading_service_pool().get(account_id)
         else:
             service = get_trading_service()
         result = run_async_safely(service.cancel_order(order_id))
@@ -2159,9 +2220,7 @@ def cancel_all_stock_orders_tool(account_id: str | None = None) -> dict[str, Any
     """
     try:
         if account_id:
-            from app.services.trading_service import TradingService
-
-            service = TradingService(account_owner=account_id)
+            service = get_trading_service_pool().get(account_id)
         else:
             service = get_trading_service()
         result = run_async_safely(service.cancel_all_stock_orders())
@@ -2198,9 +2257,7 @@ def cancel_all_option_orders_tool(account_id: str | None = None) -> dict[str, An
     """
     try:
         if account_id:
-            from app.services.trading_service import TradingService
-
-            service = TradingService(account_owner=account_id)
+            service = get_trading_service_pool().get(account_id)
         else:
             service = get_trading_service()
         result = run_async_safely(service.cancel_all_option_orders())
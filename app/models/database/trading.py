@@ -139,6 +139,9 @@ class Order(Base):
     )
     created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
     filled_at: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[DateTime | None] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=True
+    )
 
     # Advanced order trigger fields
     stop_price: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -563,6 +566,7 @@ Index("idx_orders_symbol_type", Order.symbol, Order.order_type)
 # Trigger-based order indexes for monitoring
 Index("idx_orders_stop_price", Order.stop_price)
 Index("idx_orders_triggered_at", Order.triggered_at)
+Index("idx_orders_updated_at", Order.updated_at)
 Index(
     "idx_orders_trigger_fields",
     Order.stop_price,
@@ -9,6 +9,7 @@ This module contains all Pydantic models for order management:
 
 from datetime import datetime
 from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
@@ -60,6 +61,13 @@ class OrderTimeInForce(str, Enum):
     FOK = "fok"  # Fill or kill
 
 
+class OrderAssetClass(str, Enum):
+    """Asset class filter for order history."""
+
+    STOCK = "stock"
+    OPTION = "option"
+
+
 class OrderSide(str, Enum):
     """Order side for multi-leg orders."""
 
@@ -155,6 +163,21 @@ class Order(BaseModel, OrderValidationMixin):
             price=self.price,
         )
 
+    def to_history_dict(self) -> dict[str, Any]:
+        """Serialize for order history responses."""
+        return {
+            "id": self.id,
+            "symbol": self.symbol,
+            "quantity": self.quantity,
+            "order_type": self.order_type,
+            "condition": self.condition,
+            "price": self.price,
+            "stop_price": self.stop_price,
+            "status": self.status,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "filled_at": self.filled_at.isoformat() if self.filled_at else None,
+        }
+
     @field_validator("stop_price")
     @classmethod
     def validate_stop_price_requirement(
@@ -187,6 +210,27 @@ class Order(BaseModel, OrderValidationMixin):
         return v
 
 
+class OrderPage(BaseModel):
+    """One page of order history, newest first."""
+
+    orders: list[Order] = Field(default_factory=list, description="Orders on this page")
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page, None on the last page"
+    )
+    has_more: bool = Field(False, description="Whether more orders follow")
+
+    def to_history_payload(self) -> dict[str, Any]:
+        """Order history response payload for this page."""
+        orders = [order.to_history_dict() for order in self.orders]
+        return {
+            "success": True,
+            "orders": orders,
+            "count": len(orders),
+            "next_cursor": self.next_cursor,
+            "has_more": self.has_more,
+        }
+
+
 class MultiLegOrder(BaseModel):
     """Multi-leg order for complex strategies."""
 
@@ -340,3 +384,18 @@ class MultiLegOrderCreate(BaseModel):
         OrderCondition.MARKET, description="Order condition"
     )
     limit_price: float | None = Field(None, description="Net limit price")
+
+
+class BulkOrderCreate(BaseModel):
+    """Create several simple orders in one request."""
+
+    orders: list[OrderCreate] = Field(..., description="Orders to submit")
+
+
+class BulkOrderResult(BaseModel):
+    """Outcome of one order in a bulk submission."""
+
+    index: int = Field(..., description="Position of the order in the request")
+    success: bool = Field(..., description="Whether the order was created")
+    order: Order | None = Field(default=None, description="Created order")
+    error: str | None = Field(default=None, description="Why the order was rejected")
@@ -0,0 +1,418 @@
+"""
+Streaming EWMA covariance of daily log returns.
+
+The store keeps a RiskMetrics-style exponentially weighted covariance of the
+symbols it has seen and folds each new daily bar in with a rank-one update,
+O(n²) per bar instead of re-estimating from the full history. Histories
+passed to ``ingest`` are matched against the last prices already seen, so
+only bars after them are applied; symbols seen for the first time are
+backfilled from their history in one vectorized pass.
+
+Returns are taken as zero-mean. Alongside the covariance the store keeps the
+exponential weight of the observations behind each entry, which corrects the
+start-up bias and lets symbols with gaps in their history share one matrix.
+The state is saved to disk atomically so estimates survive restarts.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+# Trailing prices remembered per symbol to find new bars in a history
+ANCHOR_LENGTH = 3
+_INITIAL_CAPACITY = 16
+
+
+@dataclass
+class CovarianceStoreStats:
+    """Covariance store counters."""
+
+    bars_applied: int = 0
+    symbols_backfilled: int = 0
+    saves: int = 0
+
+
+class EWMACovarianceStore:
+    """
+    Exponentially weighted covariance and correlation of daily log returns.
+
+    Args:
+        decay: Weight kept by the previous estimate on each bar (RiskMetrics
+            uses 0.94 for daily data)
+        path: File the state is persisted to; None keeps it in memory only
+    """
+
+    def __init__(self, decay: float = 0.94, path: str | Path | None = None):
+        if not 0.0 < decay < 1.0:
+            raise ValueError("decay must be between 0 and 1")
+        self.decay = decay
+        self.path = Path(path) if path else None
+        self.stats = CovarianceStoreStats()
+        self._lock = threading.RLock()
+        self._index: dict[str, int] = {}
+        self._symbols: list[str] = []
+        # Bias-uncorrected sums; entries past len(symbols) are unused capacity
+        self._cov = np.zeros((_INITIAL_CAPACITY, _INITIAL_CAPACITY))
+        self._weight = np.zeros((_INITIAL_CAPACITY, _INITIAL_CAPACITY))
+        self._observations = np.zeros(_INITIAL_CAPACITY, dtype=int)
+        self._anchors: dict[str, tuple[float, ...]] = {}
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def observations(self, symbol: str) -> int:
+        """Number of returns observed for a symbol."""
+        with self._lock:
+            i = self._index.get(symbol)
+            return 0 if i is None else int(self._observations[i])
+
+    def update(self, bar: dict[str, float]) -> None:
+        """
+        Apply one daily bar of closing prices.
+
+        Symbols seen for the first time only record their price; the others
+        contribute their log return since their previous price.
+        """
+        with self._lock:
+            self._apply_bar(bar)
+            self._autosave()
+
+    def ingest(self, historical_data: dict[str, list[float]]) -> int:
+        """
+        Bring the store up to date with price histories.
+
+        Histories are aligned at their last bar. For symbols already in the
+        store, only prices after the last ones seen are applied, one bar at a
+        time. Symbols that are new, or whose history no longer contains the
+        last prices seen, are (re)estimated from their whole history.
+
+        Returns:
+            Number of bars applied incrementally
+        """
+        with self._lock:
+            fresh: dict[str, list[float]] = {}
+            pending: dict[str, list[float]] = {}
+            for symbol, prices in historical_data.items():
+                if not prices:
+                    continue
+                start = self._new_bars_start(symbol, prices)
+                if start is None:
+                    fresh[symbol] = prices
+                elif start < len(prices):
+                    pending[symbol] = prices[start:]
+
+            depth = max((len(p) for p in pending.values()), default=0)
+            for back in range(depth, 0, -1):
+                self._apply_bar(
+                    {s: p[-back] for s, p in pending.items() if len(p) >= back}
+                )
+
+            if fresh:
+                self._backfill(fresh, historical_data)
+            if depth or fresh:
+                self._autosave()
+            return depth
+
+    def covariance(
+        self, symbols: list[str], default_variance: float | None = None
+    ) -> np.ndarray:
+        """
+        Daily log-return covariance of ``symbols``.
+
+        Pairs never observed together have zero covariance; symbols without
+        observations get ``default_variance`` (NaN when None).
+        """
+        with self._lock:
+            idx, known = self._lookup(symbols)
+            cov = np.zeros((len(symbols), len(symbols)))
+            if known.size:
+                rows = (
+                    (slice(0, len(idx)),) * 2
+                    if idx == list(range(len(idx)))
+                    else np.ix_(idx, idx)
+                )
+                weight = self._weight[rows]
+                observed = weight > 0
+                block = np.zeros_like(weight)
+                np.divide(self._cov[rows], weight, out=block, where=observed)
+                cov[np.ix_(known, known)] = block
+                diagonal = np.diag(observed).copy()
+            else:
+                diagonal = np.zeros(0, dtype=bool)
+            unknown = np.ones(len(symbols), dtype=bool)
+            unknown[known[diagonal]] = False
+            missing = np.flatnonzero(unknown)
+            cov[missing, missing] = (
+                np.nan if default_variance is None else default_variance
+            )
+            return cov
+
+    def correlation(self, symbols: list[str]) -> np.ndarray:
+        """Correlation of ``symbols``; unobserved pairs are uncorrelated."""
+        cov = self.covariance(symbols, default_variance=0.0)
+        vol = np.sqrt(np.diag(cov))
+        scale = np.outer(vol, vol)
+        corr = np.zeros_like(cov)
+        np.divide(cov, scale, out=corr, where=scale > 0)
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+    def volatility(self, symbol: str) -> float | None:
+        """Daily volatility of a symbol, or None before its first return."""
+        with self._lock:
+            i = self._index.get(symbol)
+            if i is None or self._weight[i, i] <= 0:
+                return None
+            return float(np.sqrt(self._cov[i, i] / self._weight[i, i]))
+
+    def save(self, path: str | Path | None = None) -> None:
+        """Atomically write the store to ``path`` (default: its own path)."""
+        target = Path(path) if path else self.path
+        if target is None:
+            raise ValueError("No path to save the covariance store to")
+        with self._lock:
+            n = len(self._symbols)
+            anchors = np.full((n, ANCHOR_LENGTH), np.nan)
+            for symbol, anchor in self._anchors.items():
+                anchors[self._index[symbol], ANCHOR_LENGTH - len(anchor) :] = anchor
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target.with_name(target.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    version=STORE_VERSION,
+                    decay=self.decay,
+                    symbols=np.array(self._symbols, dtype=str),
+                    cov=self._cov[:n, :n],
+                    weight=self._weight[:n, :n],
+                    observations=self._observations[:n],
+                    anchors=anchors,
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, target)
+            self.stats.saves += 1
+
+    def load(self, path: str | Path | None = None) -> bool:
+        """
+        Replace the state with the one saved at ``path``.
+
+        Returns False, leaving the store unchanged, when there is no file or
+        it was written with a different version or decay.
+        """
+        source = Path(path) if path else self.path
+        if source is None or not source.exists():
+            return False
+        with np.load(source, allow_pickle=False) as data:
+            if int(data["version"]) != STORE_VERSION:
+                logger.warning(f"Ignoring covariance store {source}: unknown version")
+                return False
+            if not np.isclose(float(data["decay"]), self.decay):
+                logger.warning(f"Ignoring covariance store {source}: decay differs")
+                return False
+            symbols = [str(s) for s in data["symbols"]]
+            cov, weight = data["cov"], data["weight"]
+            observations, anchors = data["observations"], data["anchors"]
+
+        with self._lock:
+            self._index = {}
+            self._symbols = []
+            self._anchors = {}
+            self._reserve(len(symbols))
+            n = len(symbols)
+            self._cov[:] = 0.0
+            self._weight[:] = 0.0
+            self._observations[:] = 0
+            self._cov[:n, :n] = cov
+            self._weight[:n, :n] = weight
+            self._observations[:n] = observations
+            for i, symbol in enumerate(symbols):
+                self._index[symbol] = i
+                self._symbols.append(symbol)
+                anchor = anchors[i][~np.isnan(anchors[i])]
+                if anchor.size:
+                    self._anchors[symbol] = tuple(float(p) for p in anchor)
+        logger.info(f"Loaded covariance store with {n} symbols from {source}")
+        return True
+
+    def _apply_bar(self, bar: dict[str, float]) -> None:
+        """Rank-one update of the entries of symbols with a return on this bar."""
+        idx = []
+        returns = []
+        for symbol, price in bar.items():
+            if price <= 0:
+                continue
+            anchor = self._anchors.get(symbol)
+            if anchor is not None:
+                idx.append(self._index[symbol])
+                returns.append(np.log(price / anchor[-1]))
+            else:
+                self._add_symbol(symbol)
+            self._anchors[symbol] = ((*anchor, price) if anchor else (price,))[
+                -ANCHOR_LENGTH:
+            ]
+        if not idx:
+            return
+
+        r = np.array(returns)
+        keep = 1.0 - self.decay
+        block = self._block(idx)
+        if block is not None:
+            # Every symbol has a return: update in place, in index order
+            r[idx] = r.copy()
+            cov, weight = self._cov[block, block], self._weight[block, block]
+            cov *= self.decay
+            cov += keep * np.outer(r, r)
+            weight *= self.decay
+            weight += keep
+        else:
+            ix = np.ix_(idx, idx)
+            self._cov[ix] = self.decay * self._cov[ix] + keep * np.outer(r, r)
+            self._weight[ix] = self.decay * self._weight[ix] + keep
+        self._observations[idx] += 1
+        self.stats.bars_applied += 1
+
+    def _backfill(
+        self, fresh: dict[str, list[float]], historical_data: dict[str, list[float]]
+    ) -> None:
+        """
+        Estimate the rows of ``fresh`` symbols from the histories, end-aligned.
+
+        Cross terms with other symbols are taken from their histories; the
+        rest of the matrix is left as it is.
+        """
+        others = [
+            s
+            for s, prices in historical_data.items()
+            if prices and s not in fresh and s in self._index
+        ]
+        columns = list(fresh) + others
+        length = max(len(historical_data[s]) for s in columns)
+        prices = np.full((length, len(columns)), np.nan)
+        for j, symbol in enumerate(columns):
+            series = historical_data[symbol]
+            prices[length - len(series) :, j] = series
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.diff(np.log(prices), axis=0)
+        observed = np.isfinite(returns)
+        returns[~observed] = 0.0
+
+        # Weight of the return t bars before the last one
+        keep = 1.0 - self.decay
+        weights = keep * self.decay ** np.arange(returns.shape[0] - 1, -1, -1)
+        m = len(fresh)
+        cov = (returns[:, :m] * weights[:, None]).T @ returns
+        weight = (observed[:, :m] * weights[:, None]).T @ observed.astype(float)
+
+        for symbol in fresh:
+            self._add_symbol(symbol, reset=True)
+        idx = [self._index[s] for s in columns]
+        rows = idx[:m]
+        self._cov[np.ix_(rows, idx)] = cov
+        self._cov[np.ix_(idx, rows)] = cov.T
+        self._weight[np.ix_(rows, idx)] = weight
+        self._weight[np.ix_(idx, rows)] = weight.T
+        for j, symbol in enumerate(fresh):
+            series = fresh[symbol]
+            self._observations[rows[j]] = int(observed[:, j].sum())
+            self._anchors[symbol] = tuple(series[-ANCHOR_LENGTH:])
+        self.stats.symbols_backfilled += m
+
+    def _new_bars_start(self, symbol: str, prices: list[float]) -> int | None:
+        """Index of the first price after the last ones seen, None if not found."""
+        anchor = self._anchors.get(symbol)
+        if anchor is None:
+            return None
+        size = len(anchor)
+        for end in range(len(prices), size - 1, -1):
+            if tuple(prices[end - size : end]) == anchor:
+                return end
+        return None
+
+    def _add_symbol(self, symbol: str, reset: bool = False) -> None:
+        i = self._index.get(symbol)
+        if i is None:
+            i = len(self._symbols)
+            self._reserve(i + 1)
+            self._index[symbol] = i
+            self._symbols.append(symbol)
+        elif reset:
+            self._cov[i, :] = self._cov[:, i] = 0.0
+            self._weight[i, :] = self._weight[:, i] = 0.0
+            self._observations[i] = 0
+            self._anchors.pop(symbol, None)
+
+    def _reserve(self, size: int) -> None:
+        """Grow the matrices geometrically so adding symbols stays amortized."""
+        capacity = self._cov.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        n = len(self._symbols)
+        for name in ("_cov", "_weight"):
+            grown = np.zeros((capacity, capacity))
+            grown[:n, :n] = getattr(self, name)[:n, :n]
+            setattr(self, name, grown)
+        observations = np.zeros(capacity, dtype=int)
+        observations[:n] = self._observations[:n]
+        self._observations = observations
+
+    def _block(self, idx: list[int]) -> slice | None:
+        """Slice over all symbols when ``idx`` covers every one of them."""
+        n = len(self._symbols)
+        if len(idx) != n or len(set(idx)) != n:
+            return None
+        return slice(0, n)
+
+    def _lookup(self, symbols: list[str]) -> tuple[list[int], np.ndarray]:
+        """Store indices of the known symbols and their positions in ``symbols``."""
+        idx = []
+        positions = []
+        for position, symbol in enumerate(symbols):
+            i = self._index.get(symbol)
+            if i is not None:
+                idx.append(i)
+                positions.append(position)
+        return idx, np.array(positions, dtype=int)
+
+    def _autosave(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.save()
+        except OSError as e:
+            logger.error(f"Failed to save covariance store to {self.path}: {e}")
+
+
+# Global covariance store, shared by the risk and sizing calculators
+covariance_store: EWMACovarianceStore | None = None
+
+
+def get_covariance_store() -> EWMACovarianceStore:
+    """Get the global covariance store, loading its saved state on first use."""
+    global covariance_store
+    if covariance_store is None:
+        covariance_store = EWMACovarianceStore(
+            decay=settings.COVARIANCE_EWMA_DECAY,
+            path=settings.COVARIANCE_STORE_PATH or None,
+        )
+        try:
+            covariance_store.load()
+        except (OSError, KeyError, ValueError) as e:
+            logger.error(f"Failed to load covariance store: {e}")
+    return covariance_store
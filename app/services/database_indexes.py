@@ -65,6 +65,10 @@ class DatabaseIndexManager:
                 ON orders (stop_price, trail_percent, trail_amount) 
                 WHERE stop_price IS NOT NULL OR trail_percent IS NOT NULL OR trail_amount IS NOT NULL
             """,
+            "idx_orders_updated_at": """
+                CREATE INDEX IF NOT EXISTS idx_orders_updated_at
+                ON orders (updated_at)
+            """,
             # Order queue processing indexes
             "idx_orders_status_created_type": """
                 CREATE INDEX IF NOT EXISTS idx_orders_status_created_type 
@@ -0,0 +1,341 @@
+"""
+Server-push streams of order events and quotes.
+
+Clients that watch orders and prices would otherwise poll ``/orders`` and
+``/stock/price`` in a loop. The ``EventStreamHub`` instead fans out the
+orders the trading service creates, fills and cancels, and quotes from a
+single shared poller over the union of subscribed symbols, to each connected
+subscriber.
+
+Each subscriber has a bounded buffer. When a slow client falls behind, the
+oldest messages are dropped and the client is told how many it missed, so
+one stalled connection cannot grow memory without bound. Quote ticks are
+coalesced per symbol: a newer tick replaces one still waiting in the buffer,
+so a client only ever receives the latest price.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from ..core.config import settings
+from ..models.database.trading import Order as DBOrder
+from ..schemas.orders import Order
+
+logger = logging.getLogger(__name__)
+
+QuoteFetcher = Callable[[list[str]], Awaitable[dict[str, dict[str, Any]]]]
+
+# Quote fields compared to decide whether a polled quote is a new tick
+_TICK_FIELDS = ("price", "bid", "ask", "volume")
+
+
+@dataclass
+class SubscriberStats:
+    """Delivery counters for one subscriber."""
+
+    delivered: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+
+
+class StreamSubscriber:
+    """
+    One client's subscription and bounded message buffer.
+
+    Messages may be pushed from any thread; they are consumed on the event
+    loop the subscriber was created on.
+
+    Args:
+        account_id: Only stream order events for this account; None for all
+        symbols: Symbols to stream quotes for
+        max_buffer: Messages held before the oldest are dropped
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self,
+        account_id: str | None = None,
+        symbols: Iterable[str] = (),
+        max_buffer: int = 1000,
+    ) -> None:
+        self.id = next(self._ids)
+        self.account_id = account_id
+        self.symbols = {symbol.upper() for symbol in symbols}
+        self.max_buffer = max_buffer
+        self.stats = SubscriberStats()
+
+        self._buffer: OrderedDict[Any, dict[str, Any]] = OrderedDict()
+        self._pending_drops = 0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def wants_order(self, account_id: str | None) -> bool:
+        return self.account_id is None or self.account_id == account_id
+
+    def wants_quote(self, symbol: str) -> bool:
+        return symbol in self.symbols
+
+    def push(self, message: dict[str, Any], coalesce_key: Any = None) -> None:
+        """
+        Buffer a message, dropping the oldest if the buffer is full.
+
+        Args:
+            message: The message to deliver
+            coalesce_key: Messages with the same key replace each other while
+                undelivered, keeping the original position in the buffer
+        """
+        with self._lock:
+            if coalesce_key is not None and coalesce_key in self._buffer:
+                self._buffer[coalesce_key] = message
+                self.stats.coalesced += 1
+                return
+
+            self._buffer[coalesce_key or ("seq", next(self._seq))] = message
+            while len(self._buffer) > self.max_buffer:
+                self._buffer.popitem(last=False)
+                self._pending_drops += 1
+                self.stats.dropped += 1
+
+        with contextlib.suppress(RuntimeError):  # Loop already closed
+            self._loop.call_soon_threadsafe(self._ready.set)
+
+    def drain(self) -> list[dict[str, Any]]:
+        """Take every buffered message, preceded by a notice of any drops."""
+        with self._lock:
+            messages = list(self._buffer.values())
+            self._buffer.clear()
+            if self._pending_drops:
+                messages.insert(0, {"type": "dropped", "count": self._pending_drops})
+                self._pending_drops = 0
+            self._ready.clear()
+        self.stats.delivered += len(messages)
+        return messages
+
+    async def next_batch(self, timeout: float | None = None) -> list[dict[str, Any]]:
+        """
+        Wait for messages and return all of them.
+
+        Returns:
+            Buffered messages, or an empty list if none arrived within timeout
+        """
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        return self.drain()
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            "id": self.id,
+            "account_id": self.account_id,
+            "symbols": sorted(self.symbols),
+            "buffered": buffered,
+            "delivered": self.stats.delivered,
+            "dropped": self.stats.dropped,
+            "coalesced": self.stats.coalesced,
+        }
+
+
+class EventStreamHub:
+    """
+    Fans out order events and quote ticks to stream subscribers.
+
+    Args:
+        quote_fetcher: Async callable returning ``{symbol: quote_dict}``
+        quote_interval: Seconds between quote polls
+        max_buffer: Default per-subscriber buffer size
+    """
+
+    def __init__(
+        self,
+        quote_fetcher: QuoteFetcher | None = None,
+        quote_interval: float = 1.0,
+        max_buffer: int = 1000,
+    ) -> None:
+        self.quote_fetcher = quote_fetcher or _fetch_service_quotes
+        self.quote_interval = quote_interval
+        self.max_buffer = max_buffer
+
+        self._subscribers: dict[int, StreamSubscriber] = {}
+        self._lock = threading.Lock()
+        self._last_ticks: dict[str, tuple[Any, ...]] = {}
+        self._quote_task: asyncio.Task[None] | None = None
+        self.order_events_published = 0
+        self.quote_ticks_published = 0
+
+    # Subscriptions
+
+    def subscribe(
+        self,
+        account_id: str | None = None,
+        symbols: Iterable[str] = (),
+        max_buffer: int | None = None,
+    ) -> StreamSubscriber:
+        """Register a subscriber on the running event loop."""
+        subscriber = StreamSubscriber(
+            account_id, symbols, max_buffer or self.max_buffer
+        )
+        with self._lock:
+            self._subscribers[subscriber.id] = subscriber
+        self._ensure_quote_poller()
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber) -> None:
+        with self._lock:
+            self._subscribers.pop(subscriber.id, None)
+
+    def update_symbols(
+        self,
+        subscriber: StreamSubscriber,
+        add: Iterable[str] = (),
+        remove: Iterable[str] = (),
+    ) -> None:
+        """Change the symbols a subscriber receives quotes for."""
+        with self._lock:
+            subscriber.symbols |= {symbol.upper() for symbol in add}
+            subscriber.symbols -= {symbol.upper() for symbol in remove}
+        self._ensure_quote_poller()
+
+    def subscribed_symbols(self) -> list[str]:
+        with self._lock:
+            return sorted(
+                set().union(*(sub.symbols for sub in self._subscribers.values()))
+            )
+
+    def _targets(self) -> list[StreamSubscriber]:
+        with self._lock:
+            return list(self._subscribers.values())
+
+    # Order events
+
+    def publish_order(
+        self, event: str, order: Order | DBOrder, account_id: str | None
+    ) -> None:
+        """
+        Publish an order event to the subscribers for its account.
+
+        Args:
+            event: What happened to the order ("created", "filled", "cancelled")
+            order: The order as written to the database
+            account_id: Account the order belongs to
+        """
+        message = {
+            "type": "order",
+            "event": event,
+            "order_id": order.id,
+            "account_id": account_id,
+            "symbol": order.symbol,
+            "order_type": order.order_type.value,
+            "quantity": order.quantity,
+            "price": order.price,
+            "status": order.status.value,
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+        for subscriber in self._targets():
+            if subscriber.wants_order(account_id):
+                subscriber.push(message)
+        self.order_events_published += 1
+
+    # Quotes
+
+    def publish_quote(self, symbol: str, quote: dict[str, Any]) -> bool:
+        """
+        Publish a quote if it differs from the last one sent for the symbol.
+
+        Returns:
+            True if the quote was a new tick
+        """
+        symbol = symbol.upper()
+        tick = tuple(quote.get(name) for name in _TICK_FIELDS)
+        if self._last_ticks.get(symbol) == tick:
+            return False
+        self._last_ticks[symbol] = tick
+
+        message = {
+            "type": "quote",
+            "symbol": symbol,
+            **quote,
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+        for subscriber in self._targets():
+            if subscriber.wants_quote(symbol):
+                subscriber.push(message, coalesce_key=("quote", symbol))
+        self.quote_ticks_published += 1
+        return True
+
+    async def poll_quotes_once(self) -> int:
+        """Fetch quotes for all subscribed symbols and publish new ticks."""
+        symbols = self.subscribed_symbols()
+        if not symbols:
+            return 0
+        quotes = await self.quote_fetcher(symbols)
+        return sum(
+            self.publish_quote(symbol, quote) for symbol, quote in quotes.items()
+        )
+
+    def _ensure_quote_poller(self) -> None:
+        if not self.subscribed_symbols():
+            return
+        if self._quote_task is None or self._quote_task.done():
+            self._quote_task = asyncio.get_running_loop().create_task(
+                self._quote_poller()
+            )
+
+    async def _quote_poller(self) -> None:
+        """Poll quotes while anyone is subscribed to a symbol."""
+        while self.subscribed_symbols():
+            try:
+                await self.poll_quotes_once()
+            except Exception as e:
+                logger.warning(f"Quote stream poll failed: {e}")
+            await asyncio.sleep(self.quote_interval)
+        self._last_ticks.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get stream statistics, per subscriber."""
+        subscribers = self._targets()
+        return {
+            "subscribers": len(subscribers),
+            "symbols": self.subscribed_symbols(),
+            "order_events_published": self.order_events_published,
+            "quote_ticks_published": self.quote_ticks_published,
+            "quote_poller_running": self._quote_task is not None
+            and not self._quote_task.done(),
+            "clients": [subscriber.get_stats() for subscriber in subscribers],
+        }
+
+
+async def _fetch_service_quotes(symbols: list[str]) -> dict[str, dict[str, Any]]:
+    """Fetch quotes for many symbols with one batch call to the trading service."""
+    from ..core.service_factory import get_trading_service
+
+    result = await get_trading_service().get_quotes_batch(symbols, include_greeks=False)
+    columns = result["columns"]
+    fields = [name for name in ("price", "bid", "ask", "volume") if name in columns]
+    return {
+        symbol: {name: columns[name][i] for name in fields}
+        for i, symbol in enumerate(columns["symbol"])
+    }
+
+
+# Global event stream hub, fed by the trading service
+event_stream_hub = EventStreamHub(
+    quote_interval=settings.STREAM_QUOTE_INTERVAL_SECONDS,
+    max_buffer=settings.STREAM_BUFFER_SIZE,
+)
+
+
+def get_event_stream_hub() -> EventStreamHub:
+    """Get the global event stream hub."""
+    return event_stream_hub
@@ -6,8 +6,13 @@ Pure Python implementation adapted from reference implementation, with improveme
 # ruff: noqa: N803, N806  # Allow single-letter variable names for mathematical formulas
 
 import math
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
+import numpy as np
+from scipy.special import ndtr
+
+from app.core.request_timing import timed_phase
 from app.models.assets import Option
 
 if TYPE_CHECKING:
@@ -15,6 +20,7 @@ if TYPE_CHECKING:
     from app.models.quotes import OptionQuote
 
 
+@timed_phase("greeks")
 def calculate_option_greeks(
     option_type: str,
     strike: float,
@@ -328,6 +334,109 @@ def _calculate_all_greeks(
     return greeks
 
 
+@timed_phase("greeks")
+def calculate_option_greeks_batch(
+    option_types: Sequence[str],
+    strikes: Sequence[float],
+    underlying_prices: Sequence[float | None],
+    days_to_expiration: Sequence[int | None],
+    option_prices: Sequence[float | None],
+    dividend_yield: float = 0.0,
+    max_iterations: int = 100,
+    tolerance: float = 1e-6,
+) -> dict[str, np.ndarray]:
+    """
+    Calculate first-order Greeks for many options in one vectorized pass.
+
+    Uses the same Newton-Raphson implied volatility search and Black-Scholes
+    formulas as calculate_option_greeks, applied to whole arrays at once.
+
+    Args:
+        option_types: 'call' or 'put' per option
+        strikes: Strike price per option
+        underlying_prices: Underlying price per option
+        days_to_expiration: Days until expiration per option
+        option_prices: Current option price per option
+        dividend_yield: Annual dividend yield (default 0%)
+
+    Returns:
+        Arrays of iv, delta, gamma, theta, vega and rho; NaN where the inputs
+        are invalid or the implied volatility search fails
+    """
+    n = len(option_types)
+    is_call = np.array([t.lower() == "call" for t in option_types], dtype=bool)
+    is_put = np.array([t.lower() == "put" for t in option_types], dtype=bool)
+    K = np.asarray(strikes, dtype=float)
+    S = np.array([np.nan if p is None else p for p in underlying_prices], dtype=float)
+    days = np.array(
+        [np.nan if d is None else d for d in days_to_expiration], dtype=float
+    )
+    price = np.array([np.nan if p is None else p for p in option_prices], dtype=float)
+    r = 0.02
+    q = dividend_yield
+
+    with np.errstate(invalid="ignore"):
+        valid = (is_call | is_put) & (K > 0) & (S > 0) & (days > 0) & (price > 0)
+    names = ("iv", "delta", "gamma", "theta", "vega", "rho")
+    result = {name: np.full(n, np.nan) for name in names}
+    if not valid.any():
+        return result
+
+    call = is_call[valid]
+    S, K, price = S[valid], K[valid], price[valid]
+    T = days[valid] / 365.0
+    sqrt_T = np.sqrt(T)
+    disc_q = np.exp(-q * T)
+    disc_r = np.exp(-r * T)
+
+    def d1_d2(sigma: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / (sigma * sqrt_T)
+        return d1, d1 - sigma * sqrt_T
+
+    # Newton-Raphson on all options at once, iterating only those still moving
+    sigma = np.full(S.shape, 0.2)
+    active = np.arange(S.size)
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+        s_, k_, t_, sq_ = S[active], K[active], T[active], sqrt_T[active]
+        dq, dr, sig = disc_q[active], disc_r[active], sigma[active]
+        d1 = (np.log(s_ / k_) + (r - q + 0.5 * sig * sig) * t_) / (sig * sq_)
+        d2 = d1 - sig * sq_
+        model = np.where(
+            call[active],
+            s_ * dq * ndtr(d1) - k_ * dr * ndtr(d2),
+            k_ * dr * ndtr(-d2) - s_ * dq * ndtr(-d1),
+        )
+        vega = s_ * dq * np.exp(-0.5 * d1 * d1) / math.sqrt(2 * math.pi) * sq_
+        diff = model - price[active]
+        step = (np.abs(vega) >= 1e-10) & (np.abs(diff) >= tolerance)
+        active = active[step]
+        sigma[active] = np.clip(sig[step] - diff[step] / vega[step], 0.001, 5.0)
+
+    d1, d2 = d1_d2(sigma)
+    pdf_d1 = np.exp(-0.5 * d1 * d1) / math.sqrt(2 * math.pi)
+    cdf_d1, cdf_d2 = ndtr(d1), ndtr(d2)
+    theta_decay = -S * disc_q * pdf_d1 * sigma / (2 * sqrt_T)
+
+    greeks = {
+        "iv": sigma,
+        "delta": np.where(call, disc_q * cdf_d1, disc_q * (cdf_d1 - 1)),
+        "gamma": disc_q * pdf_d1 / (S * sigma * sqrt_T),
+        "vega": S * disc_q * pdf_d1 * sqrt_T,
+        "theta": np.where(
+            call,
+            theta_decay + q * S * disc_q * cdf_d1 - r * K * disc_r * cdf_d2,
+            theta_decay - q * S * disc_q * ndtr(-d1) + r * K * disc_r * ndtr(-d2),
+        )
+        / 365,
+        "rho": np.where(call, K * T * disc_r * cdf_d2, -K * T * disc_r * ndtr(-d2)),
+    }
+    for name in names:
+        result[name][valid] = greeks[name]
+    return result
+
+
 # Helper function to integrate with the quote system
 def update_option_quote_with_greeks(
     option_quote: "OptionQuote",
@@ -0,0 +1,145 @@
+"""
+Unit-of-work scope for service operations.
+
+An operation scope lives for one logical operation (an API request or MCP
+tool call). While it is active, the service shares a single database session
+across nested calls and keeps an identity map of the account and position
+rows it has already loaded, so repeated lookups are answered from memory.
+Position rows flushed inside the scope drop their account's cached positions,
+and every account whose rows were flushed is recorded as written.
+Every SQL statement executed inside the scope is counted, which lets
+benchmarks and tests assert on the number of queries per operation.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.database.trading import Account as DBAccount
+from app.models.database.trading import Position as DBPosition
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+_current_scope: ContextVar["OperationScope | None"] = ContextVar(
+    "operation_scope", default=None
+)
+
+
+@dataclass
+class OperationScope:
+    """Identity map and query counter for one logical operation."""
+
+    name: str
+    query_count: int = 0
+    # Read-only scopes may be served by a read replica
+    read_only: bool = False
+    # Account the operation targets, when the caller named one
+    account_id: str | None = None
+    session: "AsyncSession | None" = None
+    accounts: dict[str, DBAccount] = field(default_factory=dict)
+    account_ids_by_owner: dict[str, str] = field(default_factory=dict)
+    # account_id -> positions paired with their latest cached price
+    positions: dict[str, list[tuple["DBPosition", float | None]]] = field(
+        default_factory=dict
+    )
+    # Accounts whose rows were flushed in this scope
+    written_accounts: set[str] = field(default_factory=set)
+
+    def get_account(
+        self, account_id: str | None = None, owner: str | None = None
+    ) -> DBAccount | None:
+        """Look up an already-loaded account by id or owner."""
+        if account_id is None and owner is not None:
+            account_id = self.account_ids_by_owner.get(owner)
+        if account_id is None:
+            return None
+        return self.accounts.get(account_id)
+
+    def remember_account(self, account: DBAccount) -> None:
+        """Add a loaded account to the identity map."""
+        self.accounts[account.id] = account
+        self.account_ids_by_owner[account.owner] = account.id
+
+    def forget_positions(self, account_id: str) -> None:
+        """Drop cached positions after they were modified."""
+        self.positions.pop(account_id, None)
+
+
+@dataclass
+class OperationQueryStats:
+    """Query counts observed for one operation name."""
+
+    calls: int = 0
+    total_queries: int = 0
+    last_queries: int = 0
+    max_queries: int = 0
+
+    def record(self, query_count: int) -> None:
+        self.calls += 1
+        self.total_queries += query_count
+        self.last_queries = query_count
+        self.max_queries = max(self.max_queries, query_count)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "total_queries": self.total_queries,
+            "last_queries": self.last_queries,
+            "max_queries": self.max_queries,
+            "avg_queries": self.total_queries / self.calls if self.calls else 0.0,
+        }
+
+
+def current_operation_scope() -> OperationScope | None:
+    """Get the operation scope active in this context, if any."""
+    return _current_scope.get()
+
+
+def enter_operation_scope(scope: OperationScope) -> Any:
+    """Make ``scope`` current; returns a token for exit_operation_scope."""
+    return _current_scope.set(scope)
+
+
+def exit_operation_scope(token: Any) -> None:
+    """Restore the scope that was current before enter_operation_scope."""
+    _current_scope.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(*args: Any) -> None:
+    # SQLAlchemy's async greenlets inherit the caller's context, so this sees
+    # the scope of the coroutine that issued the statement
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.query_count += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _forget_written_positions(session: Session, flush_context: Any) -> None:
+    # Runs in the flushing coroutine's context, like _count_query; the
+    # new/dirty/deleted collections still hold the pre-flush state here
+    scope = _current_scope.get()
+    if scope is None or not scope.positions:
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, DBPosition):
+            scope.forget_positions(obj.account_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_written_accounts(session: Session, flush_context: Any) -> None:
+    scope = _current_scope.get()
+    if scope is None:
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, DBAccount):
+            scope.written_accounts.add(obj.id)
+        else:
+            account_id = getattr(obj, "account_id", None)
+            if isinstance(account_id, str):
+                scope.written_accounts.add(account_id)
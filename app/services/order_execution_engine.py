@@ -12,10 +12,12 @@ import logging
 import threading
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any, cast
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.assets import asset_factory
 from ..models.database.trading import Order as DBOrder
@@ -23,9 +25,15 @@ from ..schemas.orders import Order, OrderCondition, OrderStatus, OrderType
 from ..services.order_conversion import order_converter
 from ..services.trading_service import TradingService, _get_quote_adapter
 from ..storage.database import get_async_session
+from .trigger_book_snapshot import SnapshotError, read_snapshot, write_snapshot
 
 logger = logging.getLogger(__name__)
 
+# Catch-up queries re-read this much history before the watermark so that
+# transactions which started before the snapshot but committed after it
+# (and therefore carry an older updated_at) are not missed.
+SNAPSHOT_CATCHUP_OVERLAP = timedelta(seconds=5)
+
 
 class OrderExecutionError(Exception):
     """Error during order execution."""
@@ -127,12 +135,27 @@ class OrderExecutionEngine:
     market data to execute orders when trigger conditions are met.
     """
 
-    def __init__(self, trading_service: TradingService):
+    def __init__(
+        self,
+        trading_service: TradingService,
+        snapshot_path: str | Path | None = None,
+        snapshot_interval: float = 60.0,
+    ):
         self.trading_service = trading_service
         self.is_running = False
         self.monitoring_task: asyncio.Task[None] | None = None
         self.executor = ThreadPoolExecutor(max_workers=4)
 
+        # Trigger book snapshots for fast restarts (disabled without a path)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_task: asyncio.Task[None] | None = None
+        self.last_snapshot_at: datetime | None = None
+        # Database time up to which the trigger book reflects the orders table
+        self._synced_at: datetime | None = None
+        # Orders removed from the book but not yet marked triggered in the DB
+        self._in_flight_orders: set[str] = set()
+
         # Track trigger conditions by symbol
         self.trigger_conditions: dict[str, list[TriggerCondition]] = defaultdict(list)
         self.monitored_symbols: set[str] = set()
@@ -164,12 +187,16 @@ class OrderExecutionEngine:
         logger.info("Starting Order Execution Engine...")
         self.is_running = True
 
-        # Load existing orders from database
-        await self._load_pending_orders()
+        # Restore the trigger book from a snapshot, falling back to a full load
+        if not await self._restore_from_snapshot():
+            await self._load_pending_orders()
 
         # Start monitoring task
         self.monitoring_task = asyncio.create_task(self._monitoring_loop())
 
+        if self.snapshot_path is not None:
+            self.snapshot_task = asyncio.create_task(self._snapshot_loop())
+
         logger.info(
             f"Order Execution Engine started. Monitoring {len(self.monitored_symbols)} symbols"
         )
@@ -187,6 +214,17 @@ class OrderExecutionEngine:
             with contextlib.suppress(asyncio.CancelledError):
                 await self.monitoring_task
 
+        if self.snapshot_task:
+            self.snapshot_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.snapshot_task
+
+        # Leave a fresh snapshot behind for the next start
+        try:
+            await self.save_snapshot()
+        except Exception as e:
+            logger.error(f"Failed to write trigger book snapshot on stop: {e}")
+
         self.executor.shutdown(wait=True)
         logger.info("Order Execution Engine stopped")
 
@@ -337,6 +375,7 @@ class OrderExecutionEngine:
 
                             if should_trigger:
                                 triggered_orders.append((condition, current_price))
+                                self._in_flight_orders.add(condition.order_id)
                                 logger.info(
                                     f"Order {condition.order_id} triggered at price {current_price}"
                                 )
@@ -409,6 +448,8 @@ class OrderExecutionEngine:
                 exc_info=True,
             )
             # Could implement retry logic or dead letter queue here
+        finally:
+            self._in_flight_orders.discard(condition.order_id)
 
     async def _load_order_by_id(self, order_id: str) -> Order | None:
         """Load an order from the database by ID."""
@@ -473,6 +514,9 @@ class OrderExecutionEngine:
                     db_order.filled_at = current_time  # type: ignore[assignment]
 
                     await db.commit()
+                    self.trading_service.publish_order_event(
+                        "filled", db_order, db_order.account_id
+                    )
                     logger.info(f"Updated order {order_id} status to triggered")
                 return
 
@@ -483,6 +527,8 @@ class OrderExecutionEngine:
         """Load pending trigger orders from the database."""
         try:
             async for db in get_async_session():
+                synced_at = await self._get_database_time(db)
+
                 # Load pending orders that can be converted (trigger orders with STOP condition)
                 result = await db.execute(
                     select(DBOrder).where(
@@ -519,12 +565,184 @@ class OrderExecutionEngine:
                         logger.error(f"Failed to load order {db_order.id}: {e}")
                         continue
 
+                self._synced_at = synced_at
                 logger.info(f"Loaded {len(db_orders)} pending trigger orders")
                 return
 
         except Exception as e:
             logger.error(f"Failed to load pending orders: {e}")
 
+    async def _get_database_time(self, db: AsyncSession) -> datetime:
+        """Get the database clock, which is what order updated_at values use."""
+        result = await db.execute(select(func.localtimestamp()))
+        return cast(datetime, result.scalar_one())
+
+    async def _restore_from_snapshot(self) -> bool:
+        """
+        Restore the trigger book from the snapshot file and catch up.
+
+        Returns:
+            True if the book was restored, False if a full load is required
+        """
+        if self.snapshot_path is None or not self.snapshot_path.exists():
+            return False
+
+        try:
+            snapshot = await asyncio.get_running_loop().run_in_executor(
+                self.executor, read_snapshot, self.snapshot_path
+            )
+        except SnapshotError as e:
+            logger.warning(f"Ignoring trigger book snapshot: {e}")
+            return False
+
+        with self._lock:
+            self.trigger_conditions.clear()
+            self.monitored_symbols.clear()
+            for condition in snapshot.conditions:
+                self.trigger_conditions[condition.symbol].append(condition)
+                self.monitored_symbols.add(condition.symbol)
+        self._synced_at = snapshot.watermark
+
+        try:
+            changed = await self._catch_up_orders()
+        except Exception as e:
+            logger.error(f"Trigger book catch-up failed, reloading all orders: {e}")
+            with self._lock:
+                self.trigger_conditions.clear()
+                self.monitored_symbols.clear()
+            self._synced_at = None
+            return False
+
+        logger.info(
+            f"Restored {len(snapshot.conditions)} trigger conditions from snapshot "
+            f"taken at {snapshot.watermark.isoformat()}, caught up {changed} changed orders"
+        )
+        return True
+
+    async def _catch_up_orders(self) -> int:
+        """
+        Apply orders changed since the last sync to the trigger book.
+
+        New pending stop orders are added, and tracked orders that are no
+        longer pending are removed. Raises on database errors so callers can
+        decide whether to fall back to a full load.
+
+        Returns:
+            Number of changed orders examined
+        """
+        if self._synced_at is None:
+            raise OrderExecutionError("Trigger book has never been synced")
+
+        cutoff = self._synced_at - SNAPSHOT_CATCHUP_OVERLAP
+
+        async for db in get_async_session():
+            synced_at = await self._get_database_time(db)
+            result = await db.execute(
+                select(DBOrder).where(DBOrder.updated_at >= cutoff)
+            )
+            db_orders = result.scalars().all()
+
+            with self._lock:
+                tracked = {
+                    condition.order_id
+                    for conditions in self.trigger_conditions.values()
+                    for condition in conditions
+                }
+
+            stale_ids: set[str] = set()
+            for db_order in db_orders:
+                is_trigger_order = (
+                    db_order.status == OrderStatus.PENDING
+                    and db_order.condition == OrderCondition.STOP
+                )
+                if not is_trigger_order:
+                    if db_order.id in tracked:
+                        stale_ids.add(db_order.id)
+                    continue
+                if db_order.id in tracked or db_order.id in self._in_flight_orders:
+                    continue
+                try:
+                    await self.add_order(
+                        Order(
+                            id=db_order.id,
+                            symbol=db_order.symbol,
+                            order_type=db_order.order_type,
+                            quantity=db_order.quantity,
+                            price=db_order.price,
+                            status=db_order.status,
+                            created_at=cast(datetime | None, db_order.created_at),
+                            stop_price=db_order.stop_price,
+                            trail_percent=db_order.trail_percent,
+                            trail_amount=db_order.trail_amount,
+                            condition=db_order.condition or OrderCondition.MARKET,
+                            net_price=db_order.net_price,
+                        )
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to catch up order {db_order.id}: {e}")
+
+            if stale_ids:
+                self._remove_orders(stale_ids)
+
+            self._synced_at = synced_at
+            return len(db_orders)
+
+        return 0
+
+    def _remove_orders(self, order_ids: set[str]) -> None:
+        """Remove several orders from monitoring in a single pass."""
+        with self._lock:
+            for symbol in list(self.trigger_conditions):
+                remaining = [
+                    c
+                    for c in self.trigger_conditions[symbol]
+                    if c.order_id not in order_ids
+                ]
+                if remaining:
+                    self.trigger_conditions[symbol] = remaining
+                else:
+                    del self.trigger_conditions[symbol]
+                    self.monitored_symbols.discard(symbol)
+
+        logger.info(f"Removed {len(order_ids)} orders from monitoring")
+
+    async def save_snapshot(self) -> int:
+        """
+        Write the current trigger book to the snapshot file.
+
+        Returns:
+            Number of trigger conditions written (0 if snapshots are disabled
+            or the book has not been synced with the database yet)
+        """
+        if self.snapshot_path is None or self._synced_at is None:
+            return 0
+
+        with self._lock:
+            conditions = [
+                condition
+                for symbol_conditions in self.trigger_conditions.values()
+                for condition in symbol_conditions
+            ]
+            watermark = self._synced_at
+
+        count = await asyncio.get_running_loop().run_in_executor(
+            self.executor, write_snapshot, self.snapshot_path, conditions, watermark
+        )
+        self.last_snapshot_at = datetime.now()
+        return count
+
+    async def _snapshot_loop(self) -> None:
+        """Periodically catch up with the database and snapshot the trigger book."""
+        while self.is_running:
+            try:
+                await asyncio.sleep(self.snapshot_interval)
+                await self._catch_up_orders()
+                await self.save_snapshot()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error writing trigger book snapshot: {e}", exc_info=True)
+
     def _get_initial_trigger_price(self, order: Order) -> float:
         """Get the initial trigger price for an order."""
         if order.condition == OrderCondition.STOP:
@@ -558,6 +776,9 @@ class OrderExecutionEngine:
             "orders_triggered": self.orders_triggered,
             "last_market_data_update": self.last_market_data_update,
             "symbols": list(self.monitored_symbols),
+            "snapshot_enabled": self.snapshot_path is not None,
+            "last_snapshot_at": self.last_snapshot_at,
+            "synced_at": self._synced_at,
         }
 
     def get_monitored_orders(self) -> dict[str, list[dict[str, Any]]]:
@@ -593,8 +814,15 @@ def get_execution_engine() -> OrderExecutionEngine:
 
 def initialize_execution_engine(
     trading_service: TradingService,
+    snapshot_path: str | Path | None = None,
 ) -> OrderExecutionEngine:
     """Initialize the global execution engine instance."""
+    from ..core.config import settings
+
     global execution_engine
-    execution_engine = OrderExecutionEngine(trading_service)
+    execution_engine = OrderExecutionEngine(
+        trading_service,
+        snapshot_path=snapshot_path or settings.TRIGGER_SNAPSHOT_PATH or None,
+        snapshot_interval=settings.TRIGGER_SNAPSHOT_INTERVAL_SECONDS,
+    )
     return execution_engine
@@ -7,19 +7,35 @@ priority handling, batch processing, and flow control mechanisms.
 
 import asyncio
 import contextlib
-import heapq
 import logging
-from collections import defaultdict
-from collections.abc import Callable
+import math
+from collections import Counter, OrderedDict, defaultdict, deque
+from collections.abc import AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum, IntEnum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from ..core.config import settings
+from ..core.exceptions import TooManyRequestsError
 from ..schemas.orders import Order, OrderType
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from .order_queue_wal import OrderQueueWAL
+
 logger = logging.getLogger(__name__)
 
+# Executes all orders of one account inside the given session. Returns one
+# result per order, in order; an Exception instance marks that order failed.
+# The queue commits the session once after the processor returns. Batching
+# stays off until a caller registers one; none is built in.
+BatchProcessor = Callable[
+    [str | None, list[Order], "AsyncSession"], Awaitable[list[Any]]
+]
+SessionProvider = Callable[[], AsyncIterator["AsyncSession"]]
+
 
 class QueuePriority(IntEnum):
     """Order queue priorities (lower number = higher priority)."""
@@ -53,6 +69,8 @@ class QueuedOrder:
     status: ProcessingStatus = ProcessingStatus.QUEUED
     metadata: dict[str, Any] = field(default_factory=dict)
     callback: Callable[..., Any] | None = None
+    account_id: str | None = None
+    sequence: int | None = None  # write-ahead log sequence number
 
     def __lt__(self, other: "QueuedOrder") -> bool:
         """Priority comparison for heap queue."""
@@ -69,6 +87,18 @@ class BatchConfig:
     max_wait_time_ms: int = 100
     enable_batching: bool = True
     batch_by_symbol: bool = True
+    batch_by_account: bool = True
+
+
+@dataclass
+class AdmissionConfig:
+    """Configuration for admission control and per-account fairness."""
+
+    max_queue_depth: int = 10_000
+    max_account_queue_depth: int | None = None
+    max_in_flight_per_account: int | None = None
+    default_weight: int = 1
+    max_retry_after_seconds: int = 60
 
 
 @dataclass
@@ -82,7 +112,109 @@ class QueueMetrics:
     avg_processing_time_ms: float = 0
     avg_queue_wait_time_ms: float = 0
     throughput_orders_per_sec: float = 0
-    last_reset: datetime = field(default_factory=datetime.utcnow)
+    total_batches: int = 0
+    total_rejected: int = 0
+    last_reset: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+
+class FairQueue:
+    """
+    Per-account sub-queues served by deficit round robin.
+
+    Priorities are strict: an order at a higher QueuePriority is always served
+    before a lower one. Within a priority level, accounts take turns and each
+    turn serves up to ``weight`` orders, so one busy account cannot starve
+    the others. Orders of the same account stay FIFO.
+    """
+
+    def __init__(self, default_weight: int = 1):
+        self.default_weight = default_weight
+        self.weights: dict[str | None, int] = {}
+        self._levels: dict[
+            QueuePriority, OrderedDict[str | None, deque[QueuedOrder]]
+        ] = {}
+        self._deficits: dict[QueuePriority, dict[str | None, int]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def set_weight(self, account_id: str | None, weight: int) -> None:
+        """Set how many orders an account is served per round."""
+        if weight < 1:
+            raise ValueError("Account weight must be at least 1")
+        self.weights[account_id] = weight
+
+    def push(self, queued_order: QueuedOrder) -> None:
+        """Append an order to its account's sub-queue."""
+        level = self._levels.get(queued_order.priority)
+        if level is None:
+            level = self._levels[queued_order.priority] = OrderedDict()
+            self._deficits[queued_order.priority] = {}
+        level.setdefault(queued_order.account_id, deque()).append(queued_order)
+        self._size += 1
+
+    def pop(
+        self, eligible: Callable[[str | None], bool] | None = None
+    ) -> QueuedOrder | None:
+        """
+        Take the next order to serve.
+
+        Args:
+            eligible: Optional filter; accounts it rejects are skipped this
+                time (e.g. because they are at their in-flight limit)
+
+        Returns:
+            The next order, or None if no eligible account has work
+        """
+        for priority in sorted(self._levels):
+            level = self._levels[priority]
+            deficits = self._deficits[priority]
+
+            # Each account is visited at most twice: once to top up its
+            # deficit and once more if it was skipped mid-turn
+            for _ in range(2 * len(level)):
+                account_id, orders = next(iter(level.items()))
+                if eligible is None or eligible(account_id):
+                    if deficits.get(account_id, 0) < 1:
+                        deficits[account_id] = self.weights.get(
+                            account_id, self.default_weight
+                        )
+                    deficits[account_id] -= 1
+                    queued_order = orders.popleft()
+                    self._size -= 1
+
+                    if not orders:
+                        del level[account_id]
+                        deficits.pop(account_id, None)
+                    elif deficits[account_id] < 1:
+                        level.move_to_end(account_id)
+
+                    if not level:
+                        del self._levels[priority]
+                        del self._deficits[priority]
+                    return queued_order
+
+                level.move_to_end(account_id)
+
+        return None
+
+    def remove(self, order_id: str) -> QueuedOrder | None:
+        """Remove a queued order by id."""
+        for priority, level in list(self._levels.items()):
+            for account_id, orders in list(level.items()):
+                for queued_order in orders:
+                    if queued_order.order.id == order_id:
+                        orders.remove(queued_order)
+                        self._size -= 1
+                        if not orders:
+                            del level[account_id]
+                            self._deficits[priority].pop(account_id, None)
+                        if not level:
+                            del self._levels[priority]
+                            del self._deficits[priority]
+                        return queued_order
+        return None
 
 
 class OrderQueue:
@@ -91,7 +223,9 @@ class OrderQueue:
 
     Features:
     - Priority-based order processing
-    - Batch processing for efficiency
+    - Micro-batching by account with one DB transaction per batch
+    - Weighted fair scheduling across accounts with admission control
+    - Optional write-ahead log so accepted orders survive restarts
     - Automatic retry with backoff
     - Flow control and rate limiting
     - Comprehensive metrics and monitoring
@@ -101,12 +235,18 @@ class OrderQueue:
         self,
         max_concurrent_workers: int = 10,
         batch_config: BatchConfig | None = None,
+        session_provider: SessionProvider | None = None,
+        admission_config: AdmissionConfig | None = None,
+        wal: "OrderQueueWAL | None" = None,
     ):
         self.max_workers = max_concurrent_workers
         self.batch_config = batch_config or BatchConfig()
+        self.admission_config = admission_config or AdmissionConfig()
+        self._session_provider = session_provider
+        self.wal = wal
 
         # Queue storage
-        self.priority_queue: list[QueuedOrder] = []
+        self.fair_queue = FairQueue(self.admission_config.default_weight)
         self.processing_orders: dict[str, QueuedOrder] = {}
         self.completed_orders: dict[str, QueuedOrder] = {}
 
@@ -114,15 +254,26 @@ class OrderQueue:
         self.workers: set[asyncio.Task[None]] = set()
         self.worker_semaphore = asyncio.Semaphore(max_concurrent_workers)
 
-        # Batch processing
-        self.batch_queue: dict[str, list[QueuedOrder]] = defaultdict(list)
+        # Batch processing: orders waiting for their account's batch window
+        self.batch_queue: dict[str | None, list[QueuedOrder]] = defaultdict(list)
+        self._batch_opened_at: dict[str | None, datetime] = {}
         self.batch_timer_task: asyncio.Task[None] | None = None
+        self.batch_processor: BatchProcessor | None = None
+        self.batch_completion_callbacks: list[Callable[..., Any]] = []
+        self._batch_sizes: Counter[int] = Counter()
 
         # Metrics
         self.metrics = QueueMetrics()
         self._processing_times: list[float] = []
         self._queue_wait_times: list[float] = []
 
+        # Per-account accounting for admission control and tenant metrics
+        self._account_depth: Counter[str | None] = Counter()
+        self._account_in_flight: Counter[str | None] = Counter()
+        self._account_wait_times: dict[str | None, deque[float]] = defaultdict(
+            lambda: deque(maxlen=500)
+        )
+
         # Control flags
         self.is_running = False
         self.is_draining = False
@@ -143,6 +294,16 @@ class OrderQueue:
             logger.warning("Order queue is already running")
             return
 
+        # Restore orders accepted before the last shutdown or crash
+        if self.wal is not None:
+            restored = await self.wal.open()
+            async with self._queue_lock:
+                for queued_order in restored:
+                    self._push_locked(queued_order)
+                    self.metrics.total_enqueued += 1
+            if restored:
+                logger.info(f"Restored {len(restored)} orders from write-ahead log")
+
         self.is_running = True
 
         # Start worker tasks
@@ -183,6 +344,9 @@ class OrderQueue:
             with contextlib.suppress(asyncio.CancelledError):
                 await self.batch_timer_task
 
+        if self.wal is not None:
+            await self.wal.close()
+
         logger.info("Order queue stopped")
 
     async def enqueue_order(
@@ -191,6 +355,7 @@ class OrderQueue:
         priority: QueuePriority = QueuePriority.NORMAL,
         callback: Callable[..., Any] | None = None,
         metadata: dict[str, Any] | None = None,
+        account_id: str | None = None,
     ) -> str:
         """
         Add an order to the processing queue.
@@ -200,9 +365,15 @@ class OrderQueue:
             priority: Processing priority
             callback: Optional completion callback
             metadata: Additional metadata
+            account_id: Owning account, used for batching and fair scheduling
 
         Returns:
             Queue entry ID for tracking
+
+        Raises:
+            TooManyRequestsError: If the queue or the account's share of it
+                is full; carries a Retry-After hint
+            WALError: If the write-ahead log could not persist the order
         """
         if not self.is_running:
             raise RuntimeError("Order queue is not running")
@@ -216,24 +387,49 @@ class OrderQueue:
             queued_at=datetime.now(UTC),
             callback=callback,
             metadata=metadata or {},
+            account_id=account_id,
         )
 
+        wal = self.wal
         async with self._queue_lock:
-            heapq.heappush(self.priority_queue, queued_order)
-            self.metrics.total_enqueued += 1
-            self.metrics.current_queue_depth += 1
+            self._check_admission_locked(account_id)
+            if wal is None:
+                self._push_locked(queued_order)
+                self.metrics.total_enqueued += 1
+            else:
+                # Hold the order's place in the queue while its record is
+                # fsynced; workers only see it once it is durable
+                durable = wal.log_enqueue(queued_order)
+                self._reserve_locked(queued_order)
+
+        if wal is not None:
+            try:
+                await durable
+            except BaseException:
+                async with self._queue_lock:
+                    self._release_locked(queued_order)
+                # The record may still have reached the disk; keep it from
+                # being replayed
+                wal.log_done(queued_order)
+                raise
+            async with self._queue_lock:
+                self._push_locked(queued_order, reserved=True)
+                self.metrics.total_enqueued += 1
 
         logger.debug(f"Enqueued order {order.id} with priority {priority.name}")
         return f"queue_{order.id}_{int(queued_order.queued_at.timestamp())}"
 
     async def enqueue_batch(
-        self, orders: list[Order], priority: QueuePriority = QueuePriority.BATCH
+        self,
+        orders: list[Order],
+        priority: QueuePriority = QueuePriority.BATCH,
+        account_id: str | None = None,
     ) -> list[str]:
         """Enqueue multiple orders as a batch."""
         queue_ids = []
 
         for order in orders:
-            queue_id = await self.enqueue_order(order, priority)
+            queue_id = await self.enqueue_order(order, priority, account_id=account_id)
             queue_ids.append(queue_id)
 
         logger.info(f"Enqueued batch of {len(orders)} orders")
@@ -250,16 +446,39 @@ class OrderQueue:
         """Register a callback for order completion events."""
         self.completion_callbacks.append(callback)
 
+    def register_batch_processor(self, processor: BatchProcessor) -> None:
+        """
+        Register a processor that executes a whole account batch at once.
+
+        This is an extension point only: the application registers no batch
+        processor, so orders are processed one at a time through
+        register_processor until a caller provides one.
+
+        Once registered (and batching is enabled), non-urgent orders are
+        collected per account until the batch is full or max_wait_time_ms has
+        passed, then handed to the processor together with a single database
+        session that the queue commits once.
+        """
+        self.batch_processor = processor
+        logger.info("Registered batch processor")
+
+    def set_account_weight(self, account_id: str | None, weight: int) -> None:
+        """Give an account a larger (or default) share of processing."""
+        self.fair_queue.set_weight(account_id, weight)
+
+    def register_batch_completion_callback(self, callback: Callable[..., Any]) -> None:
+        """Register a callback invoked once per processed batch."""
+        self.batch_completion_callbacks.append(callback)
+
     async def get_queue_status(self) -> dict[str, Any]:
         """Get current queue status and metrics."""
         async with self._queue_lock:
-            queue_depth = len(self.priority_queue)
+            queue_depth = len(self.fair_queue) + self._batched_count()
             processing_count = len(self.processing_orders)
+            accounts = self._account_status_locked()
 
         # Calculate recent throughput
-        recent_processed = self.metrics.total_processed
-        time_elapsed = (datetime.now(UTC) - self.metrics.last_reset).total_seconds()
-        throughput = recent_processed / time_elapsed if time_elapsed > 0 else 0
+        throughput = self._calculate_throughput()
 
         return {
             "is_running": self.is_running,
@@ -270,28 +489,63 @@ class OrderQueue:
             "total_enqueued": self.metrics.total_enqueued,
             "total_processed": self.metrics.total_processed,
             "total_failed": self.metrics.total_failed,
+            "total_rejected": self.metrics.total_rejected,
+            "max_queue_depth": self.admission_config.max_queue_depth,
             "throughput_orders_per_sec": throughput,
             "avg_processing_time_ms": self._calculate_avg_processing_time(),
             "avg_queue_wait_time_ms": self._calculate_avg_wait_time(),
             "active_workers": len([w for w in self.workers if not w.done()]),
+            "batching": {
+                "enabled": self._batching_active(),
+                "pending_batches": len(self.batch_queue),
+                "total_batches": self.metrics.total_batches,
+                "avg_batch_size": self._calculate_avg_batch_size(),
+                "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            },
+            "accounts": accounts,
+            "wal": self.wal.get_stats() if self.wal is not None else None,
         }
 
+    def _account_status_locked(self) -> dict[str, dict[str, Any]]:
+        """Per-account depth, in-flight count and wait times."""
+        accounts: dict[str, dict[str, Any]] = {}
+        keys = (
+            set(self._account_depth)
+            | set(self._account_in_flight)
+            | set(self._account_wait_times)
+        )
+        for key in keys:
+            waits = sorted(self._account_wait_times.get(key, ()))
+            accounts[key or "unassigned"] = {
+                "queued": self._account_depth.get(key, 0),
+                "in_flight": self._account_in_flight.get(key, 0),
+                "weight": self.fair_queue.weights.get(
+                    key, self.fair_queue.default_weight
+                ),
+                "avg_wait_time_ms": sum(waits) / len(waits) if waits else 0.0,
+                "p95_wait_time_ms": (
+                    waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+                ),
+            }
+        return accounts
+
     async def _worker_loop(self, worker_id: int) -> None:
         """Main worker loop for processing orders."""
         logger.info(f"Worker {worker_id} started")
 
-        while self.is_running or (self.is_draining and len(self.priority_queue) > 0):
+        while self.is_running or (self.is_draining and len(self.fair_queue) > 0):
             try:
-                async with self.worker_semaphore:
-                    # Get next order from queue
-                    queued_order = await self._get_next_order()
+                # Get next order from queue
+                queued_order = await self._get_next_order()
 
-                    if queued_order is None:
-                        # No orders available, wait a bit
-                        await asyncio.sleep(0.01)
-                        continue
+                if queued_order is None:
+                    # No orders available, wait a bit (without holding a slot
+                    # that batch tasks need)
+                    await asyncio.sleep(0.01)
+                    continue
 
-                    # Process the order
+                # Process the order
+                async with self.worker_semaphore:
                     await self._process_order(queued_order, worker_id)
 
             except asyncio.CancelledError:
@@ -303,29 +557,74 @@ class OrderQueue:
         logger.info(f"Worker {worker_id} stopped")
 
     async def _get_next_order(self) -> QueuedOrder | None:
-        """Get the next order from the priority queue."""
+        """Get the next order from the fair queue."""
         async with self._queue_lock:
-            if self.priority_queue:
-                queued_order = heapq.heappop(self.priority_queue)
-                self.metrics.current_queue_depth -= 1
-
-                # Track in processing
-                if queued_order.order.id:
-                    self.processing_orders[queued_order.order.id] = queued_order
-
-                queued_order.status = ProcessingStatus.PROCESSING
+            queued_order = self.fair_queue.pop(self._has_capacity)
+            if queued_order is not None:
+                self._take_locked(queued_order)
+            return queued_order
+
+    def _has_capacity(self, account_id: str | None) -> bool:
+        """Whether an account is below its in-flight limit."""
+        limit = self.admission_config.max_in_flight_per_account
+        return limit is None or self._account_in_flight[account_id] < limit
+
+    def _check_admission_locked(self, account_id: str | None) -> None:
+        """Reject new orders when the queue or account share is full."""
+        config = self.admission_config
+        if self.metrics.current_queue_depth >= config.max_queue_depth:
+            detail = "Order queue is full"
+        elif (
+            config.max_account_queue_depth is not None
+            and self._account_depth[account_id] >= config.max_account_queue_depth
+        ):
+            detail = f"Too many queued orders for account {account_id}"
+        else:
+            return
 
-                # Calculate queue wait time
-                wait_time = (
-                    datetime.now(UTC) - queued_order.queued_at
-                ).total_seconds() * 1000
-                self._queue_wait_times.append(wait_time)
-                if len(self._queue_wait_times) > 1000:
-                    self._queue_wait_times = self._queue_wait_times[-500:]
+        self.metrics.total_rejected += 1
+        throughput = self._calculate_throughput()
+        estimate = (
+            self.metrics.current_queue_depth / throughput
+            if throughput > 0
+            else config.max_retry_after_seconds
+        )
+        retry_after = max(1, min(config.max_retry_after_seconds, math.ceil(estimate)))
+        raise TooManyRequestsError(detail, retry_after=retry_after)
 
-                return queued_order
+    def _take_locked(self, queued_order: QueuedOrder) -> None:
+        """Move a dequeued order into processing and record its wait time.
 
-        return None
+        Must be called with the queue lock held.
+        """
+        account_id = queued_order.account_id
+        self.metrics.current_queue_depth -= 1
+        self._account_depth[account_id] -= 1
+        if self._account_depth[account_id] <= 0:
+            del self._account_depth[account_id]
+        self._account_in_flight[account_id] += 1
+
+        # Track in processing
+        if queued_order.order.id:
+            self.processing_orders[queued_order.order.id] = queued_order
+
+        queued_order.status = ProcessingStatus.PROCESSING
+
+        # Calculate queue wait time
+        wait_time = (datetime.now(UTC) - queued_order.queued_at).total_seconds() * 1000
+        self._queue_wait_times.append(wait_time)
+        if len(self._queue_wait_times) > 1000:
+            self._queue_wait_times = self._queue_wait_times[-500:]
+        self._account_wait_times[account_id].append(wait_time)
+
+    def _discard_locked(self, queued_order: QueuedOrder) -> None:
+        """Forget a queued order that will not be processed."""
+        if self.wal is not None:
+            self.wal.log_done(queued_order)
+        self.metrics.current_queue_depth -= 1
+        self._account_depth[queued_order.account_id] -= 1
+        if self._account_depth[queued_order.account_id] <= 0:
+            del self._account_depth[queued_order.account_id]
 
     async def _process_order(self, queued_order: QueuedOrder, worker_id: int) -> None:
         """Process a single order."""
@@ -367,70 +666,92 @@ class OrderQueue:
             logger.debug(f"Successfully processed order {queued_order.order.id}")
 
         except Exception as e:
-            # Handle processing error
-            queued_order.attempts += 1
-
-            if queued_order.attempts < queued_order.max_attempts:
-                # Retry with exponential backoff
-                queued_order.status = ProcessingStatus.RETRYING
-                delay = 2**queued_order.attempts  # 2, 4, 8 seconds
+            await self._handle_failure(queued_order, e)
 
-                logger.warning(
-                    f"Order {queued_order.order.id} failed, retrying in {delay}s (attempt {queued_order.attempts})"
-                )
+        finally:
+            await self._finish_order(queued_order, start_time)
 
-                # Re-queue after delay
-                self._background_tasks.add(
-                    task := asyncio.create_task(
-                        self._requeue_after_delay(queued_order, delay)
-                    )
+    async def _handle_failure(
+        self, queued_order: QueuedOrder, error: Exception
+    ) -> None:
+        """Schedule a retry for a failed order, or fail it permanently."""
+        queued_order.attempts += 1
+
+        if queued_order.attempts < queued_order.max_attempts:
+            # Retry with exponential backoff
+            queued_order.status = ProcessingStatus.RETRYING
+            delay = 2**queued_order.attempts  # 2, 4, 8 seconds
+
+            logger.warning(
+                f"Order {queued_order.order.id} failed, retrying in {delay}s (attempt {queued_order.attempts})"
+            )
+
+            # Re-queue after delay
+            self._background_tasks.add(
+                task := asyncio.create_task(
+                    self._requeue_after_delay(queued_order, delay)
                 )
-                task.add_done_callback(self._background_tasks.discard)
-            else:
-                # Max retries exceeded
-                queued_order.status = ProcessingStatus.FAILED
-                queued_order.metadata["error"] = str(e)
+            )
+            task.add_done_callback(self._background_tasks.discard)
+        else:
+            # Max retries exceeded
+            queued_order.status = ProcessingStatus.FAILED
+            queued_order.metadata["error"] = str(error)
 
-                self.metrics.total_failed += 1
+            self.metrics.total_failed += 1
 
-                logger.error(
-                    f"Order {queued_order.order.id} failed permanently after {queued_order.attempts} attempts: {e}"
-                )
+            logger.error(
+                f"Order {queued_order.order.id} failed permanently after {queued_order.attempts} attempts: {error}"
+            )
 
-                # Call error callback if provided
-                if queued_order.callback:
-                    try:
-                        if asyncio.iscoroutinefunction(queued_order.callback):
-                            await queued_order.callback(queued_order.order, None, e)
-                        else:
-                            queued_order.callback(queued_order.order, None, e)
-                    except Exception as callback_error:
-                        logger.error(f"Error in error callback: {callback_error}")
-
-        finally:
-            # Clean up processing tracking
-            if queued_order.order.id in self.processing_orders:
-                del self.processing_orders[queued_order.order.id]
-
-            # Store completed order for history
-            if queued_order.order.id:
-                self.completed_orders[queued_order.order.id] = queued_order
-
-            # Update processing time metrics
-            processing_time = (datetime.now(UTC) - start_time).total_seconds() * 1000
-            self._processing_times.append(processing_time)
-            if len(self._processing_times) > 1000:
-                self._processing_times = self._processing_times[-500:]
-
-            # Trigger completion callbacks
-            for callback in self.completion_callbacks:
+            # Call error callback if provided
+            if queued_order.callback:
                 try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(queued_order)
+                    if asyncio.iscoroutinefunction(queued_order.callback):
+                        await queued_order.callback(queued_order.order, None, error)
                     else:
-                        callback(queued_order)
-                except Exception as e:
-                    logger.error(f"Error in completion callback: {e}")
+                        queued_order.callback(queued_order.order, None, error)
+                except Exception as callback_error:
+                    logger.error(f"Error in error callback: {callback_error}")
+
+    async def _finish_order(
+        self, queued_order: QueuedOrder, start_time: datetime
+    ) -> None:
+        """Record history and metrics for an order that left processing."""
+        # Clean up processing tracking
+        if queued_order.order.id in self.processing_orders:
+            del self.processing_orders[queued_order.order.id]
+
+        account_id = queued_order.account_id
+        self._account_in_flight[account_id] -= 1
+        if self._account_in_flight[account_id] <= 0:
+            del self._account_in_flight[account_id]
+
+        if self.wal is not None and queued_order.status in (
+            ProcessingStatus.COMPLETED,
+            ProcessingStatus.FAILED,
+        ):
+            self.wal.log_done(queued_order)
+
+        # Store completed order for history
+        if queued_order.order.id:
+            self.completed_orders[queued_order.order.id] = queued_order
+
+        # Update processing time metrics
+        processing_time = (datetime.now(UTC) - start_time).total_seconds() * 1000
+        self._processing_times.append(processing_time)
+        if len(self._processing_times) > 1000:
+            self._processing_times = self._processing_times[-500:]
+
+        # Trigger completion callbacks
+        for callback in self.completion_callbacks:
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(queued_order)
+                else:
+                    callback(queued_order)
+            except Exception as e:
+                logger.error(f"Error in completion callback: {e}")
 
     async def _requeue_after_delay(
         self, queued_order: QueuedOrder, delay: float
@@ -443,8 +764,165 @@ class OrderQueue:
         queued_order.queued_at = datetime.now(UTC)
 
         async with self._queue_lock:
-            heapq.heappush(self.priority_queue, queued_order)
-            self.metrics.current_queue_depth += 1
+            self._push_locked(queued_order)
+
+    def _batching_active(self) -> bool:
+        """Whether orders are collected into account batches."""
+        return self.batch_config.enable_batching and self.batch_processor is not None
+
+    def _reserve_locked(self, queued_order: QueuedOrder) -> None:
+        """Count an order against the queue depth before it is routed.
+
+        Must be called with the queue lock held.
+        """
+        self.metrics.current_queue_depth += 1
+        self._account_depth[queued_order.account_id] += 1
+
+    def _release_locked(self, queued_order: QueuedOrder) -> None:
+        """Undo the reservation of an order that will not be routed.
+
+        Must be called with the queue lock held.
+        """
+        account_id = queued_order.account_id
+        self.metrics.current_queue_depth -= 1
+        self._account_depth[account_id] -= 1
+        if self._account_depth[account_id] <= 0:
+            del self._account_depth[account_id]
+
+    def _push_locked(self, queued_order: QueuedOrder, reserved: bool = False) -> None:
+        """Route an order to its account batch or the priority heap.
+
+        Must be called with the queue lock held.
+        """
+        if not reserved:
+            self._reserve_locked(queued_order)
+
+        if not self._batching_active() or queued_order.priority == QueuePriority.URGENT:
+            # Urgent orders never wait for a batch window
+            self.fair_queue.push(queued_order)
+            return
+
+        key = queued_order.account_id if self.batch_config.batch_by_account else None
+        batch = self.batch_queue[key]
+        if not batch:
+            self._batch_opened_at[key] = datetime.now(UTC)
+        batch.append(queued_order)
+
+        if len(batch) >= self.batch_config.max_batch_size:
+            self._dispatch_batch_locked(key)
+
+    def _batched_count(self) -> int:
+        """Number of orders waiting in account batches."""
+        return sum(len(batch) for batch in self.batch_queue.values())
+
+    def _dispatch_batch_locked(self, key: str | None) -> None:
+        """Hand an account's pending batch to a background batch task.
+
+        Must be called with the queue lock held. Orders are moved straight
+        into processing_orders so draining never sees them in neither place.
+        An account at its in-flight limit keeps collecting; the batch timer
+        dispatches it once capacity frees up.
+        """
+        pending = self.batch_queue.get(key)
+        if not pending:
+            return
+        if self.batch_config.batch_by_account and not self._has_capacity(key):
+            return
+
+        pending.sort()
+        batch = pending[: self.batch_config.max_batch_size]
+        del pending[: self.batch_config.max_batch_size]
+        if not pending:
+            del self.batch_queue[key]
+            self._batch_opened_at.pop(key, None)
+
+        for queued_order in batch:
+            self._take_locked(queued_order)
+
+        self._background_tasks.add(
+            task := asyncio.create_task(self._process_batch(key, batch))
+        )
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _process_batch(self, key: str | None, batch: list[QueuedOrder]) -> None:
+        """Execute one account batch in a single transaction with one commit."""
+        start_time = datetime.now(UTC)
+        assert self.batch_processor is not None
+
+        async with self.worker_semaphore:
+            self.metrics.total_batches += 1
+            self._batch_sizes[len(batch)] += 1
+
+            try:
+                results = await self._run_batch_transaction(
+                    key, [queued_order.order for queued_order in batch]
+                )
+                if len(results) != len(batch):
+                    raise ValueError(
+                        f"Batch processor returned {len(results)} results for {len(batch)} orders"
+                    )
+            except Exception as e:
+                # The transaction was rolled back; retry each order on its own merits
+                logger.error(f"Batch of {len(batch)} orders for {key} failed: {e}")
+                for queued_order in batch:
+                    await self._handle_failure(queued_order, e)
+                    await self._finish_order(queued_order, start_time)
+                return
+
+            for queued_order, result in zip(batch, results, strict=True):
+                if isinstance(result, Exception):
+                    await self._handle_failure(queued_order, result)
+                    continue
+
+                queued_order.status = ProcessingStatus.COMPLETED
+                queued_order.metadata["result"] = result
+                queued_order.metadata["batch_size"] = len(batch)
+                self.metrics.total_processed += 1
+
+                if queued_order.callback:
+                    try:
+                        if asyncio.iscoroutinefunction(queued_order.callback):
+                            await queued_order.callback(
+                                queued_order.order, result, None
+                            )
+                        else:
+                            queued_order.callback(queued_order.order, result, None)
+                    except Exception as e:
+                        logger.error(f"Error in order callback: {e}")
+
+            for queued_order in batch:
+                await self._finish_order(queued_order, start_time)
+
+            # One notification fan-out for the whole batch
+            for callback in self.batch_completion_callbacks:
+                try:
+                    if asyncio.iscoroutinefunction(callback):
+                        await callback(batch)
+                    else:
+                        callback(batch)
+                except Exception as e:
+                    logger.error(f"Error in batch completion callback: {e}")
+
+            logger.debug(f"Processed batch of {len(batch)} orders for {key}")
+
+    async def _run_batch_transaction(
+        self, account_id: str | None, orders: list[Order]
+    ) -> list[Any]:
+        """Run the batch processor inside one session and commit once."""
+        assert self.batch_processor is not None
+
+        session_provider = self._session_provider
+        if session_provider is None:
+            from ..storage.database import get_async_session
+
+            session_provider = get_async_session
+
+        async for db in session_provider():
+            results = await self.batch_processor(account_id, orders, db)
+            await db.commit()
+            return results
+
+        raise RuntimeError("No database session available for batch processing")
 
     async def _batch_timer_loop(self) -> None:
         """Timer loop for batch processing."""
@@ -461,22 +939,29 @@ class OrderQueue:
 
         logger.info("Batch timer stopped")
 
-    async def _process_pending_batches(self) -> None:
-        """Process any pending batches that have reached time limit."""
-        if not self.batch_config.enable_batching:
+    async def _process_pending_batches(self, force: bool = False) -> None:
+        """Dispatch pending batches whose wait window has elapsed."""
+        if not self._batching_active() and not self.batch_queue:
             return
 
-        # This is a simplified implementation
-        # In practice, would need more sophisticated batch management
-        pass
+        max_wait_s = self.batch_config.max_wait_time_ms / 1000.0
+        now = datetime.now(UTC)
+
+        async with self._queue_lock:
+            for key, opened_at in list(self._batch_opened_at.items()):
+                if force or (now - opened_at).total_seconds() >= max_wait_s:
+                    self._dispatch_batch_locked(key)
 
     async def _drain_queue(self) -> None:
         """Wait for all queued orders to be processed."""
         logger.info("Draining order queue...")
 
         while True:
+            # Don't wait out batch windows while draining
+            await self._process_pending_batches(force=True)
+
             async with self._queue_lock:
-                queue_empty = len(self.priority_queue) == 0
+                queue_empty = len(self.fair_queue) == 0 and not self.batch_queue
                 processing_empty = len(self.processing_orders) == 0
 
             if queue_empty and processing_empty:
@@ -498,49 +983,72 @@ class OrderQueue:
             return sum(self._queue_wait_times) / len(self._queue_wait_times)
         return 0.0
 
+    def _calculate_throughput(self) -> float:
+        """Calculate processed orders per second since the last reset."""
+        time_elapsed = (datetime.now(UTC) - self.metrics.last_reset).total_seconds()
+        return self.metrics.total_processed / time_elapsed if time_elapsed > 0 else 0
+
+    def _calculate_avg_batch_size(self) -> float:
+        """Calculate average dispatched batch size."""
+        total_batches = sum(self._batch_sizes.values())
+        if total_batches:
+            total_orders = sum(size * n for size, n in self._batch_sizes.items())
+            return total_orders / total_batches
+        return 0.0
+
     def reset_metrics(self) -> None:
         """Reset performance metrics."""
         self.metrics = QueueMetrics()
         self._processing_times.clear()
         self._queue_wait_times.clear()
+        self._batch_sizes.clear()
+        self._account_wait_times.clear()
 
     async def force_process_order(self, order_id: str) -> bool:
         """Force immediate processing of a specific order."""
         async with self._queue_lock:
-            # Find order in queue
-            for i, queued_order in enumerate(self.priority_queue):
-                if queued_order.order.id == order_id:
-                    # Remove from queue and process immediately
-                    self.priority_queue.pop(i)
-                    heapq.heapify(self.priority_queue)  # Re-heapify
-                    self.metrics.current_queue_depth -= 1
-
-                    # Process in background task
-                    self._background_tasks.add(
-                        task := asyncio.create_task(
-                            self._process_order(queued_order, -1)
-                        )
-                    )
-                    task.add_done_callback(self._background_tasks.discard)
-                    return True
-
-        return False
+            # Remove from queue and process immediately
+            queued_order = self.fair_queue.remove(order_id)
+            if queued_order is None:
+                return False
+            self._take_locked(queued_order)
+
+            # Process in background task
+            self._background_tasks.add(
+                task := asyncio.create_task(self._process_order(queued_order, -1))
+            )
+            task.add_done_callback(self._background_tasks.discard)
+            return True
 
     async def cancel_order(self, order_id: str) -> bool:
         """Cancel a queued order."""
         async with self._queue_lock:
             # Find and remove from queue
-            for i, queued_order in enumerate(self.priority_queue):
-                if queued_order.order.id == order_id:
-                    self.priority_queue.pop(i)
-                    heapq.heapify(self.priority_queue)
-                    self.metrics.current_queue_depth -= 1
+            queued_order = self.fair_queue.remove(order_id)
+            if queued_order is not None:
+                self._discard_locked(queued_order)
+
+                queued_order.status = ProcessingStatus.FAILED
+                queued_order.metadata["cancelled"] = True
 
-                    queued_order.status = ProcessingStatus.FAILED
-                    queued_order.metadata["cancelled"] = True
+                logger.info(f"Cancelled queued order {order_id}")
+                return True
 
-                    logger.info(f"Cancelled queued order {order_id}")
-                    return True
+            # Orders still waiting for their batch window can be cancelled too
+            for key, batch in list(self.batch_queue.items()):
+                for i, queued_order in enumerate(batch):
+                    if queued_order.order.id == order_id:
+                        batch.pop(i)
+                        if not batch:
+                            del self.batch_queue[key]
+                            self._batch_opened_at.pop(key, None)
+                        self._discard_locked(queued_order)
+
+                        queued_order.status = ProcessingStatus.FAILED
+                        queued_order.metadata["cancelled"] = True
+
+                        logger.info(f"Cancelled batched order {order_id}")
+                        return True
 
         return False
 
@@ -557,9 +1065,22 @@ def get_order_queue() -> OrderQueue:
 
 
 def initialize_order_queue(
-    max_workers: int = 10, batch_config: BatchConfig | None = None
+    max_workers: int = 10,
+    batch_config: BatchConfig | None = None,
+    session_provider: SessionProvider | None = None,
+    admission_config: AdmissionConfig | None = None,
+    wal: "OrderQueueWAL | None" = None,
 ) -> OrderQueue:
     """Initialize the global order queue."""
     global order_queue
-    order_queue = OrderQueue(max_workers, batch_config)
+    if wal is None and settings.ORDER_QUEUE_WAL_PATH:
+        from .order_queue_wal import OrderQueueWAL
+
+        wal = OrderQueueWAL(
+            settings.ORDER_QUEUE_WAL_PATH,
+            group_commit_window_ms=settings.ORDER_QUEUE_WAL_GROUP_COMMIT_MS,
+        )
+    order_queue = OrderQueue(
+        max_workers, batch_config, session_provider, admission_config, wal
+    )
     return order_queue
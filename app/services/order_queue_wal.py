@@ -0,0 +1,285 @@
+"""
+Write-ahead log for the order queue.
+
+Enqueued orders are appended to a local log file before the enqueue is
+acknowledged, so accepted orders survive a crash without a synchronous
+Postgres write in the request path. Appends from concurrent enqueues are
+written and fsynced together (group commit): while one fsync is running,
+new records accumulate and go out with the next one.
+
+Each record is framed as ``<length:uint32><crc32:uint32><json payload>``. A
+torn or corrupt tail (e.g. from a crash mid-write) ends the replay. Delivery
+is at-least-once: an order whose completion record was lost is replayed and
+processed again.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from ..schemas.orders import Order
+from .order_queue import QueuedOrder, QueuePriority
+
+logger = logging.getLogger(__name__)
+
+_FRAME = struct.Struct("<II")
+
+_OP_ENQUEUE = "enqueue"
+_OP_DONE = "done"
+
+
+class WALError(Exception):
+    """Raised when the write-ahead log cannot be used."""
+
+
+@dataclass
+class WALStats:
+    """Write-ahead log counters."""
+
+    records_written: int = 0
+    bytes_written: int = 0
+    fsyncs: int = 0
+    records_replayed: int = 0
+
+    @property
+    def avg_group_size(self) -> float:
+        return self.records_written / self.fsyncs if self.fsyncs else 0.0
+
+
+def _encode_frame(payload: dict[str, Any]) -> bytes:
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return _FRAME.pack(len(body), zlib.crc32(body)) + body
+
+
+def _read_frames(path: Path) -> list[dict[str, Any]]:
+    """Read all intact records, stopping at the first torn or corrupt one."""
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return []
+
+    records = []
+    offset = 0
+    while offset + _FRAME.size <= len(data):
+        length, crc = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        body = data[start : start + length]
+        if len(body) < length or zlib.crc32(body) != crc:
+            logger.warning(
+                f"Order queue WAL {path} has a damaged tail at byte {offset}, "
+                f"ignoring {len(data) - offset} bytes"
+            )
+            break
+        records.append(json.loads(body))
+        offset = start + length
+    return records
+
+
+def _ignore_result(future: asyncio.Future[None]) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+def _to_payload(queued_order: QueuedOrder) -> dict[str, Any]:
+    return {
+        "op": _OP_ENQUEUE,
+        "seq": queued_order.sequence,
+        "order": queued_order.order.model_dump(mode="json"),
+        "priority": int(queued_order.priority),
+        "queued_at": queued_order.queued_at.isoformat(),
+        "account_id": queued_order.account_id,
+        "metadata": queued_order.metadata,
+    }
+
+
+def _from_payload(payload: dict[str, Any]) -> QueuedOrder:
+    return QueuedOrder(
+        order=Order.model_validate(payload["order"]),
+        priority=QueuePriority(payload["priority"]),
+        queued_at=datetime.fromisoformat(payload["queued_at"]),
+        metadata=payload.get("metadata") or {},
+        account_id=payload.get("account_id"),
+        sequence=payload["seq"],
+    )
+
+
+class OrderQueueWAL:
+    """
+    Append-only, group-committed log of queued orders.
+
+    Args:
+        path: Log file location
+        group_commit_window_ms: Extra time to wait for more records before
+            each write; 0 relies on records piling up during the previous fsync
+        fsync: Whether to fsync after each group (disable only for testing)
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        group_commit_window_ms: float = 0.0,
+        fsync: bool = True,
+    ):
+        self.path = Path(path)
+        self.group_commit_window_ms = group_commit_window_ms
+        self.fsync = fsync
+        self.stats = WALStats()
+
+        self._file: IO[bytes] | None = None
+        self._next_sequence = 1
+        self._pending: list[tuple[bytes, asyncio.Future[None]]] = []
+        self._wakeup = asyncio.Event()
+        self._flush_task: asyncio.Task[None] | None = None
+        self._closing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    async def open(self) -> list[QueuedOrder]:
+        """
+        Replay the log, compact it and start accepting appends.
+
+        Returns:
+            Orders that were enqueued but never finished, in log order
+        """
+        if self.is_open:
+            raise WALError("Order queue WAL is already open")
+
+        records = await asyncio.to_thread(_read_frames, self.path)
+        live: dict[int, dict[str, Any]] = {}
+        for record in records:
+            self._next_sequence = max(self._next_sequence, record["seq"] + 1)
+            if record["op"] == _OP_ENQUEUE:
+                live[record["seq"]] = record
+            else:
+                live.pop(record["seq"], None)
+
+        # Rewrite the log with only the live records so it stays bounded
+        await asyncio.to_thread(self._compact, list(live.values()))
+        self._file = open(self.path, "ab")  # noqa: SIM115
+        self._closing = False
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+        restored = [_from_payload(record) for record in live.values()]
+        self.stats.records_replayed = len(restored)
+        if restored:
+            logger.info(f"Replayed {len(restored)} unfinished orders from {self.path}")
+        return restored
+
+    async def close(self) -> None:
+        """Flush outstanding records and close the log."""
+        if self._flush_task is None:
+            return
+
+        self._closing = True
+        self._wakeup.set()
+        await self._flush_task
+        self._flush_task = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def log_enqueue(self, queued_order: QueuedOrder) -> asyncio.Future[None]:
+        """
+        Assign the order a sequence number and append it to the log.
+
+        Returns:
+            Future that resolves once the record is on disk
+        """
+        queued_order.sequence = self._next_sequence
+        self._next_sequence += 1
+        return self._submit(_to_payload(queued_order))
+
+    def log_done(self, queued_order: QueuedOrder) -> None:
+        """Record that an order finished and must not be replayed."""
+        if queued_order.sequence is None or not self.is_open or self._closing:
+            return
+        future = self._submit({"op": _OP_DONE, "seq": queued_order.sequence})
+        # Nobody waits on completion records; losing one only causes a replay
+        future.add_done_callback(_ignore_result)
+
+    def _submit(self, payload: dict[str, Any]) -> asyncio.Future[None]:
+        if not self.is_open or self._closing:
+            raise WALError("Order queue WAL is not open")
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending.append((_encode_frame(payload), future))
+        self._wakeup.set()
+        return future
+
+    async def _flush_loop(self) -> None:
+        """Write pending records in groups, one fsync per group."""
+        while True:
+            await self._wakeup.wait()
+            if self.group_commit_window_ms > 0 and not self._closing:
+                await asyncio.sleep(self.group_commit_window_ms / 1000.0)
+            self._wakeup.clear()
+
+            group, self._pending = self._pending, []
+            if group:
+                await self._write_group(group)
+            if self._closing and not self._pending:
+                return
+
+    async def _write_group(
+        self, group: list[tuple[bytes, asyncio.Future[None]]]
+    ) -> None:
+        data = b"".join(frame for frame, _ in group)
+        try:
+            await asyncio.to_thread(self._write_and_sync, data)
+        except Exception as e:
+            logger.error(f"Order queue WAL write failed: {e}")
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(WALError(str(e)))
+            return
+
+        self.stats.records_written += len(group)
+        self.stats.bytes_written += len(data)
+        self.stats.fsyncs += 1
+        for _, future in group:
+            if not future.done():
+                future.set_result(None)
+
+    def _write_and_sync(self, data: bytes) -> None:
+        assert self._file is not None
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _compact(self, records: list[dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                for record in records:
+                    f.write(_encode_frame(record))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                tmp_path.unlink()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get write-ahead log statistics."""
+        return {
+            "path": str(self.path),
+            "records_written": self.stats.records_written,
+            "bytes_written": self.stats.bytes_written,
+            "fsyncs": self.stats.fsyncs,
+            "avg_group_size": self.stats.avg_group_size,
+            "records_replayed": self.stats.records_replayed,
+            "pending_records": len(self._pending),
+        }
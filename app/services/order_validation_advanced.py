@@ -13,6 +13,7 @@ from enum import Enum
 from ..models.assets import Asset, Option, Stock
 from ..schemas.orders import MultiLegOrder
 from ..schemas.positions import Portfolio
+from .payoff import PayoffProfile
 
 logger = logging.getLogger(__name__)
 
@@ -139,8 +140,9 @@ class ComplexOrderValidator:
 
         # Calculate strategy metrics
         margin_requirement = self._calculate_margin_requirement(order, portfolio)
-        max_profit, max_loss = self._calculate_max_profit_loss(order)
-        breakeven_points = self._calculate_breakeven_points(order)
+        payoff = PayoffProfile.from_order_legs(order.legs)
+        max_profit, max_loss = self._calculate_max_profit_loss(payoff)
+        breakeven_points = self._calculate_breakeven_points(payoff)
 
         # Generate strategy description
         strategy_description = self._generate_strategy_description(
@@ -693,174 +695,18 @@ class ComplexOrderValidator:
         return margin
 
     def _calculate_max_profit_loss(
-        self, order: MultiLegOrder
-    ) -> tuple[float | None, float | None]:
-        """Calculate maximum profit and loss for the strategy."""
-        strategy_type = self._detect_strategy(order)
-
-        if strategy_type == StrategyType.VERTICAL_SPREAD:
-            return self._calculate_vertical_spread_pnl(order)
-        elif strategy_type == StrategyType.IRON_CONDOR:
-            return self._calculate_iron_condor_pnl(order)
-        # Add more strategy calculations as needed
-
-        return None, None
-
-    def _calculate_vertical_spread_pnl(
-        self, order: MultiLegOrder
-    ) -> tuple[float | None, float | None]:
-        """Calculate P&L for vertical spread."""
-        if len(order.legs) != 2:
-            return None, None
-
-        leg1, leg2 = order.legs[0], order.legs[1]
-
-        # Ensure both are options
-        if not (isinstance(leg1.asset, Option) and isinstance(leg2.asset, Option)):
-            return None, None
-
-        if leg1.asset.strike is None or leg2.asset.strike is None:
-            return None, None
-
-        # Calculate spread width
-        spread_width = abs(leg1.asset.strike - leg2.asset.strike)
-
-        # Net credit/debit
-        net_credit = 0.0
-        if leg1.price and leg2.price:
-            net_credit = (leg1.price * leg1.quantity + leg2.price * leg2.quantity) * 100
-
-        # Determine if credit or debit spread
-        if net_credit > 0:
-            # Credit spread
-            max_profit: float | None = net_credit
-            max_loss: float | None = (spread_width * 100) - net_credit
-        else:
-            # Debit spread
-            max_profit = (spread_width * 100) + net_credit  # net_credit is negative
-            max_loss = -net_credit
-
-        return max_profit, max_loss
-
-    def _calculate_iron_condor_pnl(
-        self, order: MultiLegOrder
+        self, payoff: PayoffProfile | None
     ) -> tuple[float | None, float | None]:
-        """Calculate P&L for iron condor."""
-        if len(order.legs) != 4:
+        """Calculate maximum profit and loss at expiration (None if unbounded)."""
+        if payoff is None:
             return None, None
+        return payoff.max_profit, payoff.max_loss
 
-        # Sort legs by strike
-        sorted_legs = sorted(
-            order.legs,
-            key=lambda leg: (
-                leg.asset.strike
-                if isinstance(leg.asset, Option) and leg.asset.strike is not None
-                else 0.0
-            ),
-        )
-
-        # Calculate net credit
-        net_credit = 0.0
-        for leg in order.legs:
-            if leg.price:
-                net_credit += leg.price * leg.quantity * 100
-
-        # Calculate spread widths
-        put_leg_1_strike = (
-            sorted_legs[0].asset.strike
-            if isinstance(sorted_legs[0].asset, Option)
-            else None
-        )
-        put_leg_2_strike = (
-            sorted_legs[1].asset.strike
-            if isinstance(sorted_legs[1].asset, Option)
-            else None
-        )
-        call_leg_1_strike = (
-            sorted_legs[2].asset.strike
-            if isinstance(sorted_legs[2].asset, Option)
-            else None
-        )
-        call_leg_2_strike = (
-            sorted_legs[3].asset.strike
-            if isinstance(sorted_legs[3].asset, Option)
-            else None
-        )
-
-        if (
-            put_leg_1_strike is None
-            or put_leg_2_strike is None
-            or call_leg_1_strike is None
-            or call_leg_2_strike is None
-        ):
-            return None, None
-
-        put_spread_width = put_leg_2_strike - put_leg_1_strike
-        call_spread_width = call_leg_2_strike - call_leg_1_strike
-
-        max_spread_width = max(put_spread_width, call_spread_width)
-
-        max_profit: float | None = net_credit
-        max_loss: float | None = (max_spread_width * 100) - net_credit
-
-        return max_profit, max_loss
-
-    def _calculate_breakeven_points(self, order: MultiLegOrder) -> list[float]:
+    def _calculate_breakeven_points(self, payoff: PayoffProfile | None) -> list[float]:
         """Calculate breakeven points for the strategy."""
-        strategy_type = self._detect_strategy(order)
-        breakevens: list[float] = []
-
-        if strategy_type == StrategyType.VERTICAL_SPREAD:
-            # Single breakeven point
-            if len(order.legs) == 2:
-                leg1, leg2 = order.legs[0], order.legs[1]
-                if (
-                    isinstance(leg1.asset, Option)
-                    and isinstance(leg2.asset, Option)
-                    and leg1.asset.strike is not None
-                    and leg2.asset.strike is not None
-                ):
-                    net_credit = 0.0
-                    if leg1.price and leg2.price:
-                        net_credit = (
-                            leg1.price * leg1.quantity + leg2.price * leg2.quantity
-                        )
-
-                    if leg1.asset.option_type == "call":
-                        # Call spread
-                        if leg1.quantity > 0:
-                            # Bull call spread
-                            breakevens.append(leg1.asset.strike + net_credit)
-                        else:
-                            # Bear call spread
-                            breakevens.append(leg2.asset.strike + net_credit)
-                    else:
-                        # Put spread
-                        if leg1.quantity > 0:
-                            # Bull put spread
-                            breakevens.append(leg2.asset.strike - net_credit)
-                        else:
-                            # Bear put spread
-                            breakevens.append(leg1.asset.strike - net_credit)
-
-        elif (
-            strategy_type == StrategyType.STRADDLE
-            and
-            # Two breakeven points
-            len(order.legs) == 2
-        ):
-            leg1_asset = order.legs[0].asset
-            if isinstance(leg1_asset, Option) and leg1_asset.strike is not None:
-                strike = leg1_asset.strike
-                total_premium = 0.0
-                for leg in order.legs:
-                    if leg.price:
-                        total_premium += abs(leg.price)
-
-                breakevens.append(strike - total_premium)
-                breakevens.append(strike + total_premium)
-
-        return breakevens
+        if payoff is None:
+            return []
+        return payoff.breakevens
 
     def _generate_strategy_description(
         self, order: MultiLegOrder, strategy_type: StrategyType
@@ -0,0 +1,210 @@
+"""
+Expiration payoff engine for multi-leg positions.
+
+Stock and same-expiration option legs pay off at expiration as a
+piecewise-linear function of the underlying price with kinks only at the
+strikes. Evaluating that function at the kinks and taking its slope past
+the highest strike gives exact breakevens and maximum profit and loss, and
+the same leg arrays evaluate payoff curves on any price grid in one
+vectorized pass.
+"""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from ..models.assets import Option, Stock
+from ..schemas.orders import OrderLeg, OrderType
+
+OPTION_MULTIPLIER = 100
+# Upper bound of the default grid when no strike, breakeven or stock cost
+# above zero gives it a scale
+DEFAULT_CURVE_UPPER = 100.0
+
+_STOCK, _CALL, _PUT = 0, 1, 2
+
+_SELL_ORDER_TYPES = (OrderType.SELL, OrderType.STO, OrderType.STC)
+
+
+@dataclass(frozen=True)
+class PayoffLeg:
+    """One leg of a payoff: signed quantity, premium or cost, and strike."""
+
+    kind: str  # "stock", "call" or "put"
+    quantity: float  # shares or contracts, negative when short
+    price: float  # per share: premium for options, cost for stock
+    strike: float = 0.0
+
+
+class PayoffProfile:
+    """
+    Expiration payoff of a set of legs.
+
+    Args:
+        legs: Stock and option legs; all options must expire together
+    """
+
+    def __init__(self, legs: Sequence[PayoffLeg]) -> None:
+        if not legs:
+            raise ValueError("A payoff needs at least one leg")
+        codes = {"stock": _STOCK, "call": _CALL, "put": _PUT}
+        try:
+            self._kind = np.array([codes[leg.kind] for leg in legs])
+        except KeyError as e:
+            raise ValueError(f"Unknown leg kind: {e.args[0]}") from e
+        self._strike = np.array([leg.strike for leg in legs], dtype=float)
+        self._price = np.array([leg.price for leg in legs], dtype=float)
+        self._units = np.array(
+            [
+                leg.quantity * (1 if leg.kind == "stock" else OPTION_MULTIPLIER)
+                for leg in legs
+            ],
+            dtype=float,
+        )
+
+        # Payoff is linear between 0, the strikes, and beyond the last strike
+        self.nodes = np.unique(np.append(self._strike[self._kind != _STOCK], 0.0))
+        self.node_values = self.evaluate(self.nodes)
+        self.upside_slope = float(self._units[self._kind != _PUT].sum())
+
+    @classmethod
+    def from_order_legs(cls, legs: Iterable[OrderLeg]) -> "PayoffProfile | None":
+        """
+        Build a profile from order legs.
+
+        Direction comes from each leg's order type, and quantities and
+        prices are taken as magnitudes. Options without a price are taken at
+        zero premium.
+
+        Returns:
+            None when the legs have no single expiration payoff: options on
+            several expirations, stock without a price, or other assets
+        """
+        payoff_legs = []
+        expirations = set()
+        for leg in legs:
+            quantity = abs(leg.quantity)
+            if leg.order_type in _SELL_ORDER_TYPES:
+                quantity = -quantity
+            price = abs(leg.price or 0.0)
+            if isinstance(leg.asset, Option):
+                if leg.asset.strike is None:
+                    return None
+                expirations.add(leg.asset.expiration_date)
+                payoff_legs.append(
+                    PayoffLeg(
+                        kind=leg.asset.option_type,
+                        quantity=quantity,
+                        price=price,
+                        strike=leg.asset.strike,
+                    )
+                )
+            elif isinstance(leg.asset, Stock) and leg.price is not None:
+                payoff_legs.append(
+                    PayoffLeg(kind="stock", quantity=quantity, price=price)
+                )
+            else:
+                return None
+        if not payoff_legs or len(expirations) > 1:
+            return None
+        return cls(payoff_legs)
+
+    def evaluate(self, prices: ArrayLike) -> np.ndarray:
+        """Profit or loss at expiration for each underlying price."""
+        underlying = np.atleast_1d(np.asarray(prices, dtype=float))
+        moneyness = underlying[None, :] - self._strike[:, None]
+        kind = self._kind[:, None]
+        value = np.where(
+            kind == _CALL,
+            np.maximum(moneyness, 0.0),
+            np.where(kind == _PUT, np.maximum(-moneyness, 0.0), underlying[None, :]),
+        )
+        result: np.ndarray = self._units @ (value - self._price[:, None])
+        return result
+
+    @property
+    def net_premium(self) -> float:
+        """Cash received opening the legs, negative for a net debit."""
+        return float(-(self._units * self._price).sum())
+
+    @property
+    def max_profit(self) -> float | None:
+        """Largest profit at expiration, None when unbounded."""
+        if self.upside_slope > 0:
+            return None
+        return float(self.node_values.max())
+
+    @property
+    def max_loss(self) -> float | None:
+        """Largest loss at expiration as a positive amount, None when unbounded."""
+        if self.upside_slope < 0:
+            return None
+        return float(-self.node_values.min())
+
+    @property
+    def breakevens(self) -> list[float]:
+        """Underlying prices at which the payoff is exactly zero."""
+        x, y = self.nodes, self.node_values
+        zero = np.isclose(y, 0.0, atol=1e-9)
+        y0, y1 = y[:-1], y[1:]
+        crossing = (y0 * y1 < 0) & ~zero[:-1] & ~zero[1:]
+        roots = x[:-1][crossing] - y0[crossing] * (
+            (x[1:] - x[:-1])[crossing] / (y1 - y0)[crossing]
+        )
+        points = np.concatenate((x[zero], roots))
+
+        # Past the last strike the payoff keeps the upside slope
+        if self.upside_slope and not zero[-1]:
+            tail = x[-1] - y[-1] / self.upside_slope
+            if tail > x[-1]:
+                points = np.append(points, tail)
+        return sorted({round(float(p), 4) for p in points})
+
+    def curve(
+        self,
+        points: int = 101,
+        lower: float | None = None,
+        upper: float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Payoff on an evenly spaced price grid.
+
+        By default the grid spans half the lowest strike to one and a half
+        times the highest, widened to include every breakeven. Stock-only
+        legs are scaled by their cost instead. When none of these is above
+        zero, as for a flat payoff or stock taken at zero cost, the grid runs
+        from 0 to ``DEFAULT_CURVE_UPPER``.
+        """
+        if points < 2:
+            raise ValueError("A payoff curve needs at least two points")
+        anchors = np.append(self.nodes[1:], self.breakevens)
+        anchors = anchors[anchors > 0]
+        if anchors.size == 0:
+            anchors = self._price[(self._kind == _STOCK) & (self._price > 0)]
+        if anchors.size == 0:
+            default_lo, default_hi = 0.0, DEFAULT_CURVE_UPPER
+        else:
+            default_lo, default_hi = anchors.min() * 0.5, anchors.max() * 1.5
+        lo = float(default_lo) if lower is None else lower
+        hi = float(default_hi) if upper is None else upper
+        if hi <= lo:
+            raise ValueError("Upper price bound must exceed the lower bound")
+        prices = np.linspace(lo, hi, points)
+        return prices, self.evaluate(prices)
+
+    def to_dict(self, points: int = 101) -> dict[str, Any]:
+        """Summary and payoff curve for API responses."""
+        prices, payoff = self.curve(points)
+        return {
+            "net_premium": round(self.net_premium, 2),
+            "max_profit": self.max_profit,
+            "max_loss": self.max_loss,
+            "breakeven_points": self.breakevens,
+            "curve": {
+                "prices": np.round(prices, 4).tolist(),
+                "payoff": np.round(payoff, 2).tolist(),
+            },
+        }
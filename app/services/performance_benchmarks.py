@@ -271,6 +271,35 @@ class PerformanceMonitor:
 
         return duration_seconds
 
+    def record_timing(
+        self,
+        operation: str,
+        duration_ms: float,
+        success: bool = True,
+        metadata: dict[str, Any] | None = None,
+    ) -> PerformanceMetric:
+        """Record an operation timed elsewhere, such as by request middleware."""
+        end_time = time.perf_counter()
+        metric = PerformanceMetric(
+            operation=operation,
+            start_time=end_time - duration_ms / 1000,
+            end_time=end_time,
+            duration_ms=duration_ms,
+            success=success,
+            metadata=metadata or {},
+        )
+
+        with self._lock:
+            self.metrics[operation].append(metric)
+            self.counters[f"{operation}_total"] += 1
+            self.counters[f"{operation}_{'success' if success else 'error'}"] += 1
+
+            self.timing_buckets[operation].append(duration_ms)
+            if len(self.timing_buckets[operation]) > 1000:
+                self.timing_buckets[operation] = self.timing_buckets[operation][-1000:]
+
+        return metric
+
     def get_current_stats(self, operation: str) -> dict[str, Any]:
         """Get current statistics for an operation."""
         with self._lock:
@@ -16,6 +16,8 @@ from scipy import stats
 
 from ..models.assets import Option, Stock, asset_factory
 from ..schemas.positions import Portfolio, Position
+from .covariance_store import EWMACovarianceStore, get_covariance_store
+from .monte_carlo_var import SimulationBook, simulate_pnl, value_at_risk
 
 logger = logging.getLogger(__name__)
 
@@ -102,17 +104,19 @@ class PortfolioRiskCalculator:
     - Correlation analysis
     """
 
-    def __init__(self) -> None:
+    def __init__(self, covariance_store: EWMACovarianceStore | None = None) -> None:
         self.price_history: dict[str, list[float]] = {}
-        self.return_history: dict[str, list[float]] = {}
         self.sector_mappings = self._load_sector_mappings()
-        self.correlation_cache: dict[str, np.ndarray] = {}
+        self.covariance_store = covariance_store or get_covariance_store()
 
     def calculate_portfolio_risk(
         self,
         portfolio: Portfolio,
         historical_data: dict[str, list[float]] | None = None,
         confidence_levels: list[float] | None = None,
+        var_method: str = "historical",
+        simulation_paths: int = 10_000,
+        seed: int | None = None,
     ) -> PortfolioRiskSummary:
         """
         Calculate comprehensive portfolio risk metrics.
@@ -121,6 +125,10 @@ class PortfolioRiskCalculator:
             portfolio: Portfolio to analyze
             historical_data: Historical price data for positions
             confidence_levels: VaR confidence levels to calculate
+            var_method: "historical" (parametric without enough history) or
+                "monte_carlo"
+            simulation_paths: Monte Carlo paths
+            seed: Monte Carlo seed for reproducible results
 
         Returns:
             Complete portfolio risk summary
@@ -132,19 +140,31 @@ class PortfolioRiskCalculator:
             f"Calculating portfolio risk for {len(portfolio.positions)} positions"
         )
 
-        # Calculate historical returns if data provided
+        # Fold new bars into the shared covariance store
         if historical_data:
-            self._update_return_history(historical_data)
+            self.covariance_store.ingest(historical_data)
 
         # Calculate VaR for different confidence levels
         var_results = {}
-        for confidence in confidence_levels:
+        if var_method == "monte_carlo":
             try:
-                var_results[confidence] = self._calculate_var(
-                    portfolio, confidence, historical_data
+                var_results = self.calculate_monte_carlo_var(
+                    portfolio,
+                    confidence_levels,
+                    historical_data,
+                    paths=simulation_paths,
+                    seed=seed,
                 )
             except Exception as e:
-                logger.error(f"Error calculating VaR at {confidence}: {e}")
+                logger.error(f"Error calculating Monte Carlo VaR: {e}")
+        else:
+            for confidence in confidence_levels:
+                try:
+                    var_results[confidence] = self._calculate_var(
+                        portfolio, confidence, historical_data
+                    )
+                except Exception as e:
+                    logger.error(f"Error calculating VaR at {confidence}: {e}")
 
         # Calculate exposure metrics
         exposure_metrics = self._calculate_exposure_metrics(portfolio)
@@ -252,6 +272,64 @@ class PortfolioRiskCalculator:
             method="parametric",
         )
 
+    def calculate_monte_carlo_var(
+        self,
+        portfolio: Portfolio,
+        confidence_levels: list[float] | None = None,
+        historical_data: dict[str, list[float]] | None = None,
+        time_horizon: int = 1,
+        paths: int = 10_000,
+        seed: int | None = None,
+        underlying_prices: dict[str, float] | None = None,
+        workers: int | None = None,
+    ) -> dict[float, VaRResult]:
+        """
+        Calculate VaR and expected shortfall by Monte Carlo simulation.
+
+        Underlyings move together through the Cholesky factor of their
+        covariance and options are fully repriced at the horizon, so the
+        non-linear risk of option positions is captured. One simulation
+        serves every confidence level.
+
+        Args:
+            portfolio: Portfolio to analyze
+            confidence_levels: VaR confidence levels to calculate
+            historical_data: Historical prices for covariance and spot prices
+            time_horizon: Horizon in trading days
+            paths: Number of simulated paths
+            seed: Fixed seed for reproducible results
+            underlying_prices: Current underlying prices for option positions
+            workers: Worker processes for large books (see simulate_pnl)
+
+        Returns:
+            VaR result per confidence level
+        """
+        if confidence_levels is None:
+            confidence_levels = [0.95, 0.99]
+
+        book = SimulationBook.from_positions(
+            portfolio.positions,
+            historical_data,
+            underlying_prices,
+            covariance_store=self.covariance_store,
+        )
+        pnl = simulate_pnl(book, paths, time_horizon, seed=seed, workers=workers)
+
+        results = {}
+        for confidence in confidence_levels:
+            var_amount, expected_shortfall = value_at_risk(pnl, confidence)
+            results[confidence] = VaRResult(
+                confidence_level=confidence,
+                time_horizon=time_horizon,
+                var_amount=var_amount,
+                var_percent=(
+                    var_amount / portfolio.total_value if portfolio.total_value else 0.0
+                ),
+                expected_shortfall=expected_shortfall,
+                method="monte_carlo",
+            )
+        return results
+
     def _calculate_portfolio_returns(
         self, portfolio: Portfolio, historical_data: dict[str, list[float]]
     ) -> list[float]:
@@ -259,39 +337,27 @@ class PortfolioRiskCalculator:
         # Get the minimum data length across all positions
         min_length = min(len(prices) for prices in historical_data.values())
 
-        if min_length < 2:
+        if min_length < 2 or not portfolio.total_value:
             return []
 
-        portfolio_returns = []
-
-        for i in range(1, min_length):
-            daily_return = 0.0
-            total_weight = 0.0
-
-            for position in portfolio.positions:
-                symbol = position.symbol
-                if symbol in historical_data and position.current_price is not None:
-                    prices = historical_data[symbol]
-                    if i < len(prices):
-                        # Calculate return
-                        asset_return = (prices[i] - prices[i - 1]) / prices[i - 1]
-
-                        # Weight by position value
-                        position_weight = (
-                            abs(position.quantity) * position.current_price
-                        ) / portfolio.total_value
-
-                        # Account for long/short
-                        if position.quantity > 0:
-                            daily_return += asset_return * position_weight
-                        else:
-                            daily_return -= asset_return * position_weight
-
-                        total_weight += position_weight
-
-            if total_weight > 0:
-                portfolio_returns.append(daily_return)
+        # Signed weight by position value, one row of prices per position
+        held = [
+            p
+            for p in portfolio.positions
+            if p.symbol in historical_data and p.current_price is not None
+        ]
+        if not held:
+            return []
+        weights = np.array(
+            [
+                math.copysign(abs(p.quantity) * (p.current_price or 0.0), p.quantity)
+                for p in held
+            ]
+        ) / float(portfolio.total_value)
+        prices = np.array([historical_data[p.symbol][:min_length] for p in held])
 
+        asset_returns = np.diff(prices, axis=1) / prices[:, :-1]
+        portfolio_returns: list[float] = (weights @ asset_returns).tolist()
         return portfolio_returns
 
     def _calculate_exposure_metrics(self, portfolio: Portfolio) -> ExposureMetrics:
@@ -608,8 +674,8 @@ class PortfolioRiskCalculator:
 
             method = "historical"
         else:
-            # Parametric VaR
-            estimated_vol = 0.025  # 2.5% daily volatility
+            # Parametric VaR, 2.5% daily volatility unless the store has one
+            estimated_vol = self.covariance_store.volatility(position.symbol) or 0.025
             z_score = stats.norm.ppf(1 - confidence_level)
             var_return = z_score * estimated_vol
 
@@ -635,44 +701,21 @@ class PortfolioRiskCalculator:
     def calculate_correlation_matrix(
         self, symbols: list[str], historical_data: dict[str, list[float]]
     ) -> np.ndarray:
-        """Calculate correlation matrix for given symbols."""
-        # Calculate returns for each symbol
-        returns_data = {}
-
-        for symbol in symbols:
-            if symbol in historical_data:
-                prices = historical_data[symbol]
-                returns = [
-                    (prices[i] - prices[i - 1]) / prices[i - 1]
-                    for i in range(1, len(prices))
-                ]
-                returns_data[symbol] = returns
-
-        if not returns_data:
-            return np.eye(len(symbols))
-
-        # Create correlation matrix
-        min_length = min(len(returns) for returns in returns_data.values())
-
-        returns_matrix = []
-        for symbol in symbols:
-            if symbol in returns_data:
-                returns_matrix.append(returns_data[symbol][:min_length])
-            else:
-                # Use zeros if no data
-                returns_matrix.append([0.0] * min_length)
-
-        return np.corrcoef(returns_matrix)
-
-    def _update_return_history(self, historical_data: dict[str, list[float]]) -> None:
-        """Update internal return history cache."""
-        for symbol, prices in historical_data.items():
-            if len(prices) > 1:
-                returns = [
-                    (prices[i] - prices[i - 1]) / prices[i - 1]
-                    for i in range(1, len(prices))
-                ]
-                self.return_history[symbol] = returns
+        """
+        Calculate correlation matrix for given symbols.
+
+        Correlations are EWMA estimates from the shared covariance store,
+        which only folds in the bars of ``historical_data`` it has not seen.
+        Symbols without data are uncorrelated with the rest.
+        """
+        self.covariance_store.ingest(
+            {
+                symbol: historical_data[symbol]
+                for symbol in symbols
+                if symbol in historical_data
+            }
+        )
+        return self.covariance_store.correlation(symbols)
 
     def _load_sector_mappings(self) -> dict[str, str]:
         """Load sector mappings for symbols."""
@@ -0,0 +1,258 @@
+"""
+In-memory portfolio valuations.
+
+Keeps a per-account total of invested value and unrealized P&L so portfolio
+summaries can be served without re-reading and re-valuing every position.
+Positions are valued at the same latest cached quote price that
+``get_portfolio`` uses, so the summary and the full portfolio agree.
+
+The database stays authoritative: an account's valuation is rebuilt from
+its position rows whenever it is older than the reconcile interval or a
+committed transaction wrote to them, and any difference between the served
+totals and the rebuilt ones is recorded as drift.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import Any
+from weakref import WeakSet
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.database.trading import Position as DBPosition
+
+logger = logging.getLogger(__name__)
+
+# Session.info key for accounts whose positions a transaction has written
+_WRITTEN_ACCOUNTS = "portfolio_valuation.written_accounts"
+
+
+@dataclass
+class _PositionMark:
+    """One position's holdings and the price it is currently marked at."""
+
+    quantity: float
+    avg_price: float
+    price: float
+
+    @property
+    def market_value(self) -> float:
+        return self.quantity * self.price
+
+    @property
+    def cost_basis(self) -> float:
+        return self.quantity * self.avg_price
+
+
+@dataclass(frozen=True)
+class ValuationSnapshot:
+    """Point-in-time totals for one account."""
+
+    account_id: str
+    positions_count: int
+    invested_value: float
+    unrealized_pnl: float
+    age_seconds: float
+
+
+@dataclass
+class AccountValuation:
+    """Cached valuation of one account's positions."""
+
+    account_id: str
+    positions: dict[str, _PositionMark] = field(default_factory=dict)
+    invested_value: float = 0.0
+    cost_basis: float = 0.0
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return self.invested_value - self.cost_basis
+
+    def _remove(self, mark: _PositionMark) -> None:
+        self.invested_value -= mark.market_value
+        self.cost_basis -= mark.cost_basis
+
+    def _add(self, mark: _PositionMark) -> None:
+        self.invested_value += mark.market_value
+        self.cost_basis += mark.cost_basis
+
+    def set_position(
+        self, symbol: str, quantity: float, avg_price: float, price: float
+    ) -> None:
+        """Replace a position's holdings and mark."""
+        old = self.positions.pop(symbol, None)
+        if old is not None:
+            self._remove(old)
+        if quantity:
+            mark = _PositionMark(quantity, avg_price, price)
+            self.positions[symbol] = mark
+            self._add(mark)
+
+    def snapshot(self) -> ValuationSnapshot:
+        return ValuationSnapshot(
+            account_id=self.account_id,
+            positions_count=len(self.positions),
+            invested_value=self.invested_value,
+            unrealized_pnl=self.unrealized_pnl,
+            age_seconds=time.monotonic() - self.loaded_at,
+        )
+
+
+@dataclass
+class ValuationStats:
+    """Valuation store counters."""
+
+    hits: int = 0
+    misses: int = 0
+    reconciliations: int = 0
+    max_drift: float = 0.0
+    last_drift: float = 0.0
+
+
+class PortfolioValuationStore:
+    """
+    Thread-safe store of incrementally updated account valuations.
+
+    Args:
+        reconcile_interval: Seconds after which an account's valuation is
+            considered stale and must be rebuilt from the database
+        max_accounts: Accounts kept before the least recently loaded are
+            dropped
+    """
+
+    def __init__(self, reconcile_interval: float = 30.0, max_accounts: int = 10_000):
+        self.reconcile_interval = reconcile_interval
+        self.max_accounts = max_accounts
+        self.stats = ValuationStats()
+
+        self._accounts: dict[str, AccountValuation] = {}
+        self._lock = RLock()
+        _stores.add(self)
+
+    def get(self, account_id: str) -> ValuationSnapshot | None:
+        """
+        Get an account's current totals.
+
+        Returns:
+            The snapshot, or None if the account is not loaded or is due for
+            reconciliation
+        """
+        with self._lock:
+            valuation = self._accounts.get(account_id)
+            if (
+                valuation is None
+                or time.monotonic() - valuation.loaded_at > self.reconcile_interval
+            ):
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            return valuation.snapshot()
+
+    def load(
+        self,
+        account_id: str,
+        positions: list[tuple[str, float, float, float]],
+    ) -> ValuationSnapshot:
+        """
+        Rebuild an account's valuation from database rows.
+
+        Args:
+            account_id: Account the positions belong to
+            positions: (symbol, quantity, avg_price, current_price) per position
+
+        Returns:
+            Snapshot of the rebuilt valuation
+        """
+        valuation = AccountValuation(account_id=account_id)
+        for symbol, quantity, avg_price, price in positions:
+            valuation.set_position(symbol, quantity, avg_price, price)
+
+        with self._lock:
+            previous = self._accounts.pop(account_id, None)
+            if previous is not None:
+                drift = abs(previous.invested_value - valuation.invested_value)
+                self.stats.last_drift = drift
+                self.stats.max_drift = max(self.stats.max_drift, drift)
+                if drift > 0.01:
+                    logger.debug(
+                        f"Valuation for account {account_id} drifted by "
+                        f"{drift:.2f} since last reconciliation"
+                    )
+            self.stats.reconciliations += 1
+
+            if len(self._accounts) >= self.max_accounts:
+                # Dicts keep insertion order, and reloads re-insert at the end
+                del self._accounts[next(iter(self._accounts))]
+
+            self._accounts[account_id] = valuation
+            return valuation.snapshot()
+
+    def invalidate(self, account_id: str) -> None:
+        """Drop an account so its next read is rebuilt from the database."""
+        with self._lock:
+            self._accounts.pop(account_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._accounts.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get valuation store statistics."""
+        with self._lock:
+            lookups = self.stats.hits + self.stats.misses
+            return {
+                "accounts": len(self._accounts),
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "hit_rate": self.stats.hits / lookups if lookups else 0.0,
+                "reconciliations": self.stats.reconciliations,
+                "last_drift": self.stats.last_drift,
+                "max_drift": self.stats.max_drift,
+                "reconcile_interval": self.reconcile_interval,
+            }
+
+
+# Every live store, so committed position writes reach all of them
+_stores: "WeakSet[PortfolioValuationStore]" = WeakSet()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_position_writes(session: Session, flush_context: Any) -> None:
+    # The new/dirty/deleted collections still hold the pre-flush state here
+    written = {
+        obj.account_id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, DBPosition)
+    }
+    if written:
+        session.info.setdefault(_WRITTEN_ACCOUNTS, set()).update(written)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_accounts(session: Session) -> None:
+    # Invalidating only once the rows are committed keeps a concurrent read
+    # from caching the old positions again
+    for account_id in session.info.pop(_WRITTEN_ACCOUNTS, ()):
+        for store in list(_stores):
+            store.invalidate(account_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_position_writes(session: Session) -> None:
+    session.info.pop(_WRITTEN_ACCOUNTS, None)
+
+
+# Global valuation store
+portfolio_valuation_store = PortfolioValuationStore(
+    reconcile_interval=settings.PORTFOLIO_VALUATION_RECONCILE_SECONDS
+)
+
+
+def get_portfolio_valuation_store() -> PortfolioValuationStore:
+    """Get the global portfolio valuation store."""
+    return portfolio_valuation_store
@@ -13,6 +13,7 @@ from enum import Enum
 import numpy as np
 
 from ..schemas.positions import Portfolio
+from .covariance_store import EWMACovarianceStore, get_covariance_store
 
 logger = logging.getLogger(__name__)
 
@@ -79,9 +80,14 @@ class PositionSizingCalculator:
     market conditions, and portfolio constraints.
     """
 
-    def __init__(self, parameters: SizingParameters | None = None):
+    def __init__(
+        self,
+        parameters: SizingParameters | None = None,
+        covariance_store: EWMACovarianceStore | None = None,
+    ):
         self.parameters = parameters or SizingParameters()
         self.price_history: dict[str, list[float]] = {}  # Simplified price history
+        self.covariance_store = covariance_store or get_covariance_store()
 
     def calculate_position_size(
         self,
@@ -302,16 +308,10 @@ class PositionSizingCalculator:
         historical_prices: list[float] | None,
     ) -> PositionSizeResult:
         """Size position based on volatility targeting."""
-        if not historical_prices or len(historical_prices) < 2:
+        daily_vol = self._daily_volatility(symbol, historical_prices)
+        if daily_vol is None:
             raise ValueError("Insufficient price history for volatility calculation")
 
-        # Calculate historical volatility
-        returns = [
-            (historical_prices[i] - historical_prices[i - 1]) / historical_prices[i - 1]
-            for i in range(1, len(historical_prices))
-        ]
-
-        daily_vol = np.std(returns) if returns else 0.01
         annual_vol = daily_vol * math.sqrt(252)  # Annualize
 
         # Target position size to achieve target portfolio volatility
@@ -360,17 +360,10 @@ class PositionSizingCalculator:
         historical_prices: list[float] | None,
     ) -> PositionSizeResult:
         """Risk parity position sizing."""
-        if not historical_prices or len(historical_prices) < 2:
+        asset_vol = self._daily_volatility(symbol, historical_prices)
+        if asset_vol is None:
             raise ValueError("Insufficient price history for risk parity calculation")
 
-        # Calculate asset volatility
-        returns = [
-            (historical_prices[i] - historical_prices[i - 1]) / historical_prices[i - 1]
-            for i in range(1, len(historical_prices))
-        ]
-
-        asset_vol = np.std(returns) if returns else 0.01
-
         # Calculate position volatilities for existing positions
         position_risks = []
         total_risk = 0.0
@@ -380,10 +373,9 @@ class PositionSizingCalculator:
             if position.current_price is None:
                 continue
 
-            # Simplified - assume equal volatility for existing positions
-            pos_risk = (
-                abs(position.quantity) * position.current_price * 0.02
-            )  # 2% daily vol
+            # Volatility from the covariance store, else 2% daily
+            pos_vol = self.covariance_store.volatility(position.symbol) or 0.02
+            pos_risk = abs(position.quantity) * position.current_price * pos_vol
             position_risks.append(pos_risk)
             total_risk += pos_risk
 
@@ -524,6 +516,14 @@ class PositionSizingCalculator:
             ],
         )
 
+    def _daily_volatility(
+        self, symbol: str, historical_prices: list[float] | None
+    ) -> float | None:
+        """EWMA daily volatility from the covariance store, updated with history."""
+        if historical_prices:
+            self.covariance_store.ingest({symbol: historical_prices})
+        return self.covariance_store.volatility(symbol)
+
     def _apply_constraints(
         self, shares: int, price: float, portfolio: Portfolio
     ) -> int:
@@ -3,19 +3,30 @@ Pre-trade risk analysis and position impact simulation.
 
 This module provides comprehensive risk analysis before order execution,
 including position impact simulation, exposure limits, and risk metrics.
+Orders for an account with cached running exposure aggregates are checked as
+a delta against them; only orders that come near a limit get the full
+analysis over the portfolio.
 """
 
 import logging
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from threading import RLock
+from typing import Any
 
-from ..models.assets import Option, asset_factory
+from ..models.assets import Asset, Option, asset_factory
 from ..models.quotes import Quote
 from ..schemas.orders import Order, OrderType
 from ..schemas.positions import Portfolio, Position
 from ..services.greeks import calculate_option_greeks
 
+GREEKS = ("delta", "gamma", "theta", "vega", "rho")
+OPTION_MULTIPLIER = 100
+_BUY_TYPES = (OrderType.BUY, OrderType.BTO, OrderType.BTC)
+
 
 @dataclass
 class ExposureLimits:
@@ -124,6 +135,78 @@ class RiskLimits:
     max_volatility_exposure: float = 0.30  # 30% in high volatility
     options_trading_level: int = 2  # 0-4 scale
     margin_maintenance_buffer: float = 1.25  # 25% buffer
+    fast_path_headroom: float = 0.8  # Full analysis past 80% of a limit
+
+
+@dataclass
+class _Holding:
+    """One position as tracked by the running aggregates."""
+
+    quantity: int
+    avg_price: float
+    price: float
+    sector: str | None
+    high_volatility: bool
+    underlying: str | None  # Set for options
+    greeks: dict[str, float]  # Position-level, scaled by quantity
+
+    @property
+    def value(self) -> float:
+        return abs(self.quantity) * self.price
+
+
+@dataclass
+class AccountExposure:
+    """Running exposure aggregates for one account."""
+
+    version: Hashable
+    holdings: dict[str, _Holding] = field(default_factory=dict)
+    gross_exposure: float = 0.0
+    net_exposure: float = 0.0
+    high_volatility_exposure: float = 0.0
+    sector_exposure: dict[str, float] = field(default_factory=dict)
+    greeks: dict[str, float] = field(default_factory=lambda: dict.fromkeys(GREEKS, 0.0))
+    options_by_underlying: dict[str, set[str]] = field(default_factory=dict)
+
+    def add(self, symbol: str, holding: _Holding) -> None:
+        self.holdings[symbol] = holding
+        self._accumulate(symbol, holding, 1.0)
+
+    def remove(self, symbol: str) -> _Holding | None:
+        holding = self.holdings.pop(symbol, None)
+        if holding is not None:
+            self._accumulate(symbol, holding, -1.0)
+        return holding
+
+    def _accumulate(self, symbol: str, holding: _Holding, sign: float) -> None:
+        value = holding.value
+        self.gross_exposure += sign * value
+        self.net_exposure += sign * holding.quantity * holding.price
+        if holding.high_volatility:
+            self.high_volatility_exposure += sign * value
+        if holding.sector is not None:
+            self.sector_exposure[holding.sector] = (
+                self.sector_exposure.get(holding.sector, 0.0) + sign * value
+            )
+        for greek, amount in holding.greeks.items():
+            self.greeks[greek] += sign * amount
+        if holding.underlying is not None:
+            options = self.options_by_underlying.setdefault(holding.underlying, set())
+            if sign > 0:
+                options.add(symbol)
+            else:
+                options.discard(symbol)
+
+
+@dataclass
+class RiskAnalyzerStats:
+    """Pre-trade check counters."""
+
+    fast_path: int = 0
+    full_path: int = 0
+    exposure_hits: int = 0
+    exposure_builds: int = 0
+    fills_applied: int = 0
 
 
 class RiskAnalyzer:
@@ -132,6 +215,17 @@ class RiskAnalyzer:
 
     Performs various risk checks before order execution to ensure
     compliance with risk limits and prevent excessive exposure.
+
+    When ``analyze_order`` is given an account id, the account's gross and
+    net exposure, sector and high-volatility exposure, per-symbol holdings
+    and Greek totals are kept as running aggregates under a portfolio
+    version. An order is then checked as a delta against them, and the full
+    analysis only runs when the order would take a metric past
+    ``fast_path_headroom`` of its limit.
+
+    Args:
+        risk_limits: Risk limits to check against
+        max_accounts: Accounts whose aggregates are kept
     """
 
     def _get_safe_price(self, quote: Quote) -> float:
@@ -146,10 +240,14 @@ class RiskAnalyzer:
             return position.current_price
         return position.avg_price
 
-    def __init__(self, risk_limits: RiskLimits | None = None):
+    def __init__(self, risk_limits: RiskLimits | None = None, max_accounts: int = 256):
         self.risk_limits = risk_limits or RiskLimits()
         self.sector_mappings = self._load_sector_mappings()
         self.volatility_rankings = self._load_volatility_rankings()
+        self.max_accounts = max_accounts
+        self.stats = RiskAnalyzerStats()
+        self._accounts: OrderedDict[str, AccountExposure] = OrderedDict()
+        self._lock = RLock()
 
     def analyze_order(
         self,
@@ -157,6 +255,8 @@ class RiskAnalyzer:
         portfolio: Portfolio,
         current_quote: Quote,
         account_type: str = "cash",
+        account_id: str | None = None,
+        version: Hashable | None = None,
     ) -> RiskAnalysisResult:
         """
         Perform comprehensive risk analysis for an order.
@@ -166,6 +266,11 @@ class RiskAnalyzer:
             portfolio: Current portfolio state
             current_quote: Current market quote for the asset
             account_type: Account type (cash or margin)
+            account_id: Account the portfolio belongs to; enables the fast
+                path over its running exposure aggregates
+            version: Portfolio version, e.g. a counter bumped on every fill
+                or mark; computed from the holdings and their current prices
+                and Greeks when omitted
 
         Returns:
             Complete risk analysis result
@@ -173,34 +278,54 @@ class RiskAnalyzer:
         logger.info(
             f"Analyzing risk for order: {order.order_type} {order.quantity} {order.symbol}"
         )
+        asset = asset_factory(order.symbol)
+
+        if account_id is not None:
+            exposure = self.account_exposure(account_id, portfolio, version)
+            with self._lock:
+                result = self._analyze_against_exposure(
+                    order, portfolio, current_quote, account_type, asset, exposure
+                )
+            if result is not None:
+                self.stats.fast_path += 1
+                return result
+        self.stats.full_path += 1
+
+        existing_position = next(
+            (p for p in portfolio.positions if p.symbol == order.symbol), None
+        )
 
         # Calculate portfolio impact
         portfolio_impact = self._calculate_portfolio_impact(
-            order, portfolio, current_quote
+            order, portfolio, current_quote, existing_position
         )
 
         # Calculate position impacts
         position_impacts = self._calculate_position_impacts(
-            order, portfolio, current_quote
+            order, portfolio, current_quote, asset, existing_position
         )
 
         # Perform risk checks
         violations = self._perform_risk_checks(
-            order, portfolio, portfolio_impact, account_type
+            order,
+            portfolio,
+            portfolio_impact,
+            account_type,
+            asset,
+            self._value_change(order, current_quote, existing_position),
         )
 
         # Calculate estimated costs
         estimated_cost = self._calculate_order_cost(order, current_quote)
         margin_requirement = self._calculate_margin_requirement(
-            order, current_quote, account_type
+            order, current_quote, account_type, asset
         )
 
         # Calculate Greeks impact for options
         greeks_impact = None
-        asset = asset_factory(order.symbol)
         if isinstance(asset, Option):
             greeks_impact = self._calculate_greeks_impact(
-                order, portfolio, current_quote
+                order, current_quote, asset, self._portfolio_greeks(portfolio)
             )
 
         # Determine overall risk level
@@ -208,7 +333,7 @@ class RiskAnalyzer:
 
         # Generate warnings
         warnings = self._generate_warnings(
-            order, portfolio, portfolio_impact, violations
+            order, asset, portfolio_impact, self._is_day_trade(order, existing_position)
         )
 
         # Determine if order can be executed
@@ -227,8 +352,293 @@ class RiskAnalyzer:
             Greeks_impact=greeks_impact,
         )
 
+    def account_exposure(
+        self, account_id: str, portfolio: Portfolio, version: Hashable | None = None
+    ) -> AccountExposure:
+        """
+        Get an account's running exposure aggregates, rebuilding them from
+        the portfolio when its version has changed.
+
+        The default version covers each holding's price and Greeks as well as
+        its quantity, so aggregates are never reused at stale marks.
+        """
+        if version is None:
+            version = self._portfolio_version(portfolio)
+
+        with self._lock:
+            exposure = self._accounts.get(account_id)
+            if exposure is not None and exposure.version == version:
+                self._accounts.move_to_end(account_id)
+                self.stats.exposure_hits += 1
+                return exposure
+
+        exposure = AccountExposure(version=version)
+        for position in portfolio.positions:
+            if position.quantity != 0:
+                exposure.add(position.symbol, self._holding(position))
+
+        with self._lock:
+            self.stats.exposure_builds += 1
+            self._accounts[account_id] = exposure
+            self._accounts.move_to_end(account_id)
+            while len(self._accounts) > self.max_accounts:
+                self._accounts.popitem(last=False)
+        return exposure
+
+    def apply_fill(
+        self,
+        account_id: str,
+        symbol: str,
+        quantity: int,
+        price: float,
+        version: Hashable | None = None,
+    ) -> None:
+        """
+        Fold a fill into an account's running aggregates.
+
+        Args:
+            account_id: Account the fill belongs to
+            symbol: Symbol filled
+            quantity: Signed quantity filled (negative for sells)
+            price: Fill price
+            version: The account's new portfolio version; without one the
+                aggregates are rebuilt on the next analysis
+        """
+        with self._lock:
+            exposure = self._accounts.get(account_id)
+            if exposure is None:
+                return
+            held = exposure.remove(symbol)
+            current = held.quantity if held else 0
+            new_quantity = current + quantity
+            if new_quantity != 0:
+                if held is None:
+                    asset = asset_factory(symbol)
+                    holding = _Holding(
+                        quantity=new_quantity,
+                        avg_price=price,
+                        price=price,
+                        sector=self.sector_mappings.get(symbol),
+                        high_volatility=self._is_high_volatility(symbol),
+                        underlying=(
+                            asset.underlying.symbol
+                            if isinstance(asset, Option)
+                            else None
+                        ),
+                        greeks={},
+                    )
+                else:
+                    holding = held
+                    if current * new_quantity < 0:
+                        holding.avg_price = price
+                    elif abs(new_quantity) > abs(current):
+                        holding.avg_price = (
+                            abs(current) * held.avg_price + abs(quantity) * price
+                        ) / abs(new_quantity)
+                    holding.greeks = {
+                        greek: amount / current * new_quantity
+                        for greek, amount in held.greeks.items()
+                    }
+                    holding.quantity = new_quantity
+                    holding.price = price
+                if holding.underlying is None:
+                    holding.greeks["delta"] = float(new_quantity)
+                exposure.add(symbol, holding)
+            # Callers without a version of their own force a rebuild next time
+            exposure.version = version if version is not None else object()
+            self.stats.fills_applied += 1
+
+    def invalidate(self, account_id: str) -> None:
+        """Drop an account's running aggregates."""
+        with self._lock:
+            self._accounts.pop(account_id, None)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pre-trade check statistics."""
+        with self._lock:
+            checks = self.stats.fast_path + self.stats.full_path
+            return {
+                "accounts": len(self._accounts),
+                "fast_path": self.stats.fast_path,
+                "full_path": self.stats.full_path,
+                "fast_path_rate": self.stats.fast_path / checks if checks else 0.0,
+                "exposure_hits": self.stats.exposure_hits,
+                "exposure_builds": self.stats.exposure_builds,
+                "fills_applied": self.stats.fills_applied,
+            }
+
+    def _portfolio_version(self, portfolio: Portfolio) -> Hashable:
+        return frozenset(
+            (
+                p.symbol,
+                p.quantity,
+                self._get_safe_position_price(p),
+                *(getattr(p, greek) for greek in GREEKS),
+            )
+            for p in portfolio.positions
+            if p.quantity != 0
+        )
+
+    def _holding(self, position: Position) -> _Holding:
+        asset = position.asset
+        greeks = {greek: float(getattr(position, greek) or 0.0) for greek in GREEKS}
+        if not isinstance(asset, Option):
+            # Stocks carry one share of delta each
+            greeks = {"delta": float(position.quantity)}
+        return _Holding(
+            quantity=position.quantity,
+            avg_price=position.avg_price,
+            price=self._get_safe_position_price(position),
+            sector=self.sector_mappings.get(position.symbol),
+            high_volatility=self._is_high_volatility(position.symbol),
+            underlying=(asset.underlying.symbol if isinstance(asset, Option) else None),
+            greeks=greeks,
+        )
+
+    def _analyze_against_exposure(
+        self,
+        order: Order,
+        portfolio: Portfolio,
+        current_quote: Quote,
+        account_type: str,
+        asset: Asset | None,
+        exposure: AccountExposure,
+    ) -> RiskAnalysisResult | None:
+        """
+        Check an order as a delta against the running aggregates.
+
+        Returns None when the order comes within the headroom of any limit,
+        leaving it to the full analysis.
+        """
+        limits = self.risk_limits
+        headroom = limits.fast_path_headroom
+        price = self._get_safe_price(current_quote)
+        order_cost = self._calculate_order_cost(order, current_quote)
+
+        cash_before = portfolio.cash_balance
+        cash_after = self._cash_after(order, cash_before, order_cost)
+        if cash_after < 0 or cash_after * headroom < limits.min_buying_power:
+            return None
+        total_value_before = portfolio.total_value
+        total_value_after = self._total_value_after(
+            order, total_value_before, price, order_cost
+        )
+        if total_value_before <= 0 or total_value_after <= 0:
+            return None
+
+        holding = exposure.holdings.get(order.symbol)
+        current_quantity = holding.quantity if holding else 0
+        new_quantity = current_quantity + self._signed_quantity(order)
+        value_change = abs(new_quantity) * price - (holding.value if holding else 0.0)
+
+        if (
+            abs(new_quantity) * price / total_value_before
+            > headroom * limits.max_position_concentration
+        ):
+            return None
+        sector = self.sector_mappings.get(order.symbol)
+        if (
+            sector is not None
+            and (exposure.sector_exposure.get(sector, 0.0) + value_change)
+            / total_value_after
+            > headroom * limits.max_sector_exposure
+        ):
+            return None
+        high_volatility = exposure.high_volatility_exposure
+        if self._is_high_volatility(order.symbol):
+            high_volatility += value_change
+        if high_volatility / total_value_after > (
+            headroom * limits.max_volatility_exposure
+        ):
+            return None
+        leverage_after = self._leverage_after(
+            exposure.gross_exposure, cash_before, order, current_quote
+        )
+        if account_type == "margin" and leverage_after > headroom * limits.max_leverage:
+            return None
+        if isinstance(asset, Option) and (
+            self._get_required_options_level(order, asset)
+            > limits.options_trading_level
+        ):
+            return None
+
+        position_impacts = []
+        new_positions = []
+        closed_positions = []
+        if holding is not None:
+            position_impacts.append(
+                self._calculate_single_position_impact(
+                    order.symbol,
+                    holding.quantity,
+                    holding.avg_price,
+                    order,
+                    current_quote,
+                    total_value_before,
+                )
+            )
+            if new_quantity == 0:
+                closed_positions.append(order.symbol)
+        else:
+            new_positions.append(order.symbol)
+
+        portfolio_impact = PortfolioImpact(
+            total_value_before=total_value_before,
+            total_value_after=total_value_after,
+            cash_before=cash_before,
+            cash_after=cash_after,
+            buying_power_before=cash_before,
+            buying_power_after=cash_after,
+            leverage_before=(
+                exposure.gross_exposure / cash_before if cash_before > 0 else 0.0
+            ),
+            leverage_after=leverage_after,
+            positions_affected=list(position_impacts),
+            new_positions=new_positions,
+            closed_positions=closed_positions,
+        )
+
+        greeks_impact = None
+        if isinstance(asset, Option):
+            underlying = asset.underlying.symbol
+            for symbol in exposure.options_by_underlying.get(underlying, ()):
+                if symbol != order.symbol:
+                    related = exposure.holdings[symbol]
+                    position_impacts.append(
+                        self._calculate_related_position_impact(
+                            symbol,
+                            related.quantity,
+                            related.avg_price,
+                            related.value,
+                            total_value_before,
+                        )
+                    )
+            greeks_impact = self._calculate_greeks_impact(
+                order, current_quote, asset, exposure.greeks
+            )
+
+        return RiskAnalysisResult(
+            order=order,
+            risk_level=RiskLevel.LOW,
+            violations=[],
+            portfolio_impact=portfolio_impact,
+            position_impacts=position_impacts,
+            warnings=self._generate_warnings(
+                order, asset, portfolio_impact, self._is_day_trade(order, holding)
+            ),
+            can_execute=True,
+            estimated_cost=order_cost,
+            margin_requirement=self._calculate_margin_requirement(
+                order, current_quote, account_type, asset
+            ),
+            Greeks_impact=greeks_impact,
+        )
+
     def _calculate_portfolio_impact(
-        self, order: Order, portfolio: Portfolio, current_quote: Quote
+        self,
+        order: Order,
+        portfolio: Portfolio,
+        current_quote: Quote,
+        existing_position: Position | None,
     ) -> PortfolioImpact:
         """Calculate the impact of an order on the portfolio."""
         # Current state
@@ -241,18 +651,10 @@ class RiskAnalyzer:
         order_cost = self._calculate_order_cost(order, current_quote)
 
         # New state after order
-        cash_after = cash_before
-        if order.order_type in [OrderType.BUY, OrderType.BTO]:
-            cash_after -= order_cost
-        elif order.order_type in [OrderType.SELL, OrderType.STC]:
-            cash_after += order_cost
-
-        # Estimate new total value (simplified)
-        total_value_after = total_value_before
-        if order.order_type in [OrderType.BUY, OrderType.BTO]:
-            total_value_after += (
-                self._get_safe_price(current_quote) * abs(order.quantity) - order_cost
-            )
+        cash_after = self._cash_after(order, cash_before, order_cost)
+        total_value_after = self._total_value_after(
+            order, total_value_before, self._get_safe_price(current_quote), order_cost
+        )
 
         buying_power_after = cash_after  # Simplified
         leverage_after = self._calculate_leverage_after(portfolio, order, current_quote)
@@ -262,21 +664,20 @@ class RiskAnalyzer:
         new_positions = []
         closed_positions = []
 
-        # Check if this affects existing position
-        existing_position = next(
-            (p for p in portfolio.positions if p.symbol == order.symbol), None
-        )
-
         if existing_position:
             # Calculate impact on existing position
             impact = self._calculate_single_position_impact(
-                existing_position, order, current_quote, portfolio
+                existing_position.symbol,
+                existing_position.quantity,
+                existing_position.avg_price,
+                order,
+                current_quote,
+                portfolio.total_value,
             )
             positions_affected.append(impact)
 
             # Check if position will be closed
-            new_quantity = existing_position.quantity + order.quantity
-            if new_quantity == 0:
+            if impact.new_quantity == 0:
                 closed_positions.append(order.symbol)
         else:
             # New position
@@ -297,55 +698,65 @@ class RiskAnalyzer:
         )
 
     def _calculate_position_impacts(
-        self, order: Order, portfolio: Portfolio, current_quote: Quote
+        self,
+        order: Order,
+        portfolio: Portfolio,
+        current_quote: Quote,
+        asset: Asset | None,
+        existing_position: Position | None,
     ) -> list[PositionImpact]:
         """Calculate impacts on individual positions."""
         impacts = []
 
         # Direct impact on ordered symbol
-        existing_position = next(
-            (p for p in portfolio.positions if p.symbol == order.symbol), None
-        )
-
         if existing_position:
             impact = self._calculate_single_position_impact(
-                existing_position, order, current_quote, portfolio
+                existing_position.symbol,
+                existing_position.quantity,
+                existing_position.avg_price,
+                order,
+                current_quote,
+                portfolio.total_value,
             )
             impacts.append(impact)
 
         # Check for related positions (e.g., options on same underlying)
-        asset = asset_factory(order.symbol)
         if isinstance(asset, Option):
             # Find other options on same underlying
             for position in portfolio.positions:
                 if position.symbol != order.symbol:
-                    pos_asset = asset_factory(position.symbol)
+                    pos_asset = position.asset
                     if (
                         isinstance(pos_asset, Option)
                         and pos_asset.underlying.symbol == asset.underlying.symbol
                     ):
                         # Related position - calculate concentration impact
-                        related_impact = self._calculate_related_position_impact(
-                            position, order, portfolio
+                        impacts.append(
+                            self._calculate_related_position_impact(
+                                position.symbol,
+                                position.quantity,
+                                position.avg_price,
+                                abs(position.quantity)
+                                * self._get_safe_position_price(position),
+                                portfolio.total_value,
+                            )
                         )
-                        if related_impact:
-                            impacts.append(related_impact)
 
         return impacts
 
     def _calculate_single_position_impact(
         self,
-        position: Position,
+        symbol: str,
+        current_quantity: int,
+        current_avg_price: float,
         order: Order,
         current_quote: Quote,
-        portfolio: Portfolio,
+        total_value: float,
     ) -> PositionImpact:
         """Calculate impact on a single position."""
-        current_quantity = position.quantity
-        new_quantity = current_quantity + order.quantity
-
-        current_avg_price = position.avg_price
-        current_value = abs(current_quantity) * self._get_safe_price(current_quote)
+        new_quantity = current_quantity + self._signed_quantity(order)
+        price = self._get_safe_price(current_quote)
+        current_value = abs(current_quantity) * price
 
         # Calculate new average price
         if new_quantity == 0:
@@ -353,34 +764,28 @@ class RiskAnalyzer:
             new_value = 0.0
         elif abs(new_quantity) > abs(current_quantity):
             # Adding to position
-            total_cost = abs(current_quantity) * current_avg_price + abs(
-                order.quantity
-            ) * self._get_safe_price(current_quote)
+            total_cost = (
+                abs(current_quantity) * current_avg_price + abs(order.quantity) * price
+            )
             new_avg_price = total_cost / abs(new_quantity)
-            new_value = abs(new_quantity) * self._get_safe_price(current_quote)
+            new_value = abs(new_quantity) * price
         else:
             # Reducing position
             new_avg_price = current_avg_price
-            new_value = abs(new_quantity) * self._get_safe_price(current_quote)
+            new_value = abs(new_quantity) * price
 
         # P&L impact
         pnl_impact = 0.0
         if order.order_type in [OrderType.SELL, OrderType.STC]:
             # Realizing P&L
-            pnl_impact = (
-                self._get_safe_price(current_quote) - current_avg_price
-            ) * abs(order.quantity)
+            pnl_impact = (price - current_avg_price) * abs(order.quantity)
 
         # Concentration
-        concentration_before = (
-            current_value / portfolio.total_value if portfolio.total_value else 0
-        )
-        concentration_after = (
-            new_value / portfolio.total_value if portfolio.total_value else 0
-        )
+        concentration_before = current_value / total_value if total_value else 0
+        concentration_after = new_value / total_value if total_value else 0
 
         return PositionImpact(
-            symbol=position.symbol,
+            symbol=symbol,
             current_quantity=current_quantity,
             new_quantity=new_quantity,
             current_avg_price=current_avg_price,
@@ -398,6 +803,8 @@ class RiskAnalyzer:
         portfolio: Portfolio,
         portfolio_impact: PortfolioImpact,
         account_type: str,
+        asset: Asset | None,
+        value_change: float,
     ) -> list[RiskViolation]:
         """Perform all risk checks and return violations."""
         violations = []
@@ -410,7 +817,7 @@ class RiskAnalyzer:
 
         # Sector exposure check
         sector_violations = self._check_sector_exposure(
-            order, portfolio, portfolio_impact
+            order, portfolio, portfolio_impact, value_change
         )
         violations.extend(sector_violations)
 
@@ -424,14 +831,13 @@ class RiskAnalyzer:
         violations.extend(buying_power_violations)
 
         # Options level check
-        asset = asset_factory(order.symbol)
         if isinstance(asset, Option):
             options_violations = self._check_options_level(order, asset)
             violations.extend(options_violations)
 
         # Volatility exposure check
         volatility_violations = self._check_volatility_exposure(
-            order, portfolio, portfolio_impact
+            order, portfolio, portfolio_impact, value_change
         )
         violations.extend(volatility_violations)
 
@@ -462,7 +868,11 @@ class RiskAnalyzer:
         return violations
 
     def _check_sector_exposure(
-        self, order: Order, portfolio: Portfolio, portfolio_impact: PortfolioImpact
+        self,
+        order: Order,
+        portfolio: Portfolio,
+        portfolio_impact: PortfolioImpact,
+        value_change: float,
     ) -> list[RiskViolation]:
         """Check sector exposure limits."""
         violations: list[RiskViolation] = []
@@ -481,8 +891,7 @@ class RiskAnalyzer:
                 )
 
         # Add order impact
-        order_value = abs(order.quantity) * portfolio_impact.total_value_after
-        new_sector_value = sector_value + order_value
+        new_sector_value = sector_value + value_change
 
         sector_exposure = new_sector_value / portfolio_impact.total_value_after
 
@@ -559,7 +968,11 @@ class RiskAnalyzer:
         return violations
 
     def _check_volatility_exposure(
-        self, order: Order, portfolio: Portfolio, portfolio_impact: PortfolioImpact
+        self,
+        order: Order,
+        portfolio: Portfolio,
+        portfolio_impact: PortfolioImpact,
+        value_change: float,
     ) -> list[RiskViolation]:
         """Check exposure to high volatility assets."""
         violations = []
@@ -567,15 +980,14 @@ class RiskAnalyzer:
         # Calculate current high volatility exposure
         high_vol_value = 0.0
         for position in portfolio.positions:
-            if self.volatility_rankings.get(position.symbol, "normal") == "high":
+            if self._is_high_volatility(position.symbol):
                 high_vol_value += abs(
                     position.quantity
                 ) * self._get_safe_position_price(position)
 
         # Check if order is high volatility
-        if self.volatility_rankings.get(order.symbol, "normal") == "high":
-            order_value = abs(order.quantity) * portfolio_impact.total_value_after
-            high_vol_value += order_value
+        if self._is_high_volatility(order.symbol):
+            high_vol_value += value_change
 
         vol_exposure = high_vol_value / portfolio_impact.total_value_after
 
@@ -608,15 +1020,17 @@ class RiskAnalyzer:
         return base_cost + commission
 
     def _calculate_margin_requirement(
-        self, order: Order, current_quote: Quote, account_type: str
+        self,
+        order: Order,
+        current_quote: Quote,
+        account_type: str,
+        asset: Asset | None,
     ) -> float:
         """Calculate margin requirement for the order."""
         if account_type == "cash":
             return self._calculate_order_cost(order, current_quote)
 
         # Margin account - simplified calculation
-        asset = asset_factory(order.symbol)
-
         if isinstance(asset, Option):
             # Options margin is complex - simplified version
             if order.order_type in [OrderType.BTO, OrderType.BTC]:
@@ -659,45 +1073,100 @@ class RiskAnalyzer:
         if portfolio.cash_balance <= 0:
             return 0.0
 
-        total_position_value = sum(
-            abs(p.quantity) * self._get_safe_position_price(p)
-            for p in portfolio.positions
-        )
-
-        return total_position_value / portfolio.cash_balance
+        return self._gross_exposure(portfolio) / portfolio.cash_balance
 
     def _calculate_leverage_after(
         self, portfolio: Portfolio, order: Order, current_quote: Quote
     ) -> float:
         """Calculate portfolio leverage after order execution."""
+        return self._leverage_after(
+            self._gross_exposure(portfolio),
+            portfolio.cash_balance,
+            order,
+            current_quote,
+        )
+
+    def _leverage_after(
+        self,
+        gross_exposure: float,
+        cash_balance: float,
+        order: Order,
+        current_quote: Quote,
+    ) -> float:
+        """Leverage after the order from the gross exposure before it."""
         # This is simplified - real calculation would be more complex
-        order_value = abs(order.quantity) * self._get_safe_price(current_quote)
+        total_position_value = gross_exposure
+        cash_after = cash_balance
+        if order.order_type in [OrderType.BUY, OrderType.BTO]:
+            total_position_value += abs(order.quantity) * self._get_safe_price(
+                current_quote
+            )
+            cash_after -= self._calculate_order_cost(order, current_quote)
 
-        total_position_value = sum(
+        if cash_after <= 0:
+            return float("inf")
+
+        return total_position_value / cash_after
+
+    def _gross_exposure(self, portfolio: Portfolio) -> float:
+        return sum(
             abs(p.quantity) * self._get_safe_position_price(p)
             for p in portfolio.positions
         )
 
+    def _portfolio_greeks(self, portfolio: Portfolio) -> dict[str, float]:
+        """Greek totals of the portfolio, counting a share of delta per stock."""
+        totals = dict.fromkeys(GREEKS, 0.0)
+        for position in portfolio.positions:
+            for greek, amount in self._holding(position).greeks.items():
+                totals[greek] += amount
+        return totals
+
+    def _cash_after(self, order: Order, cash_before: float, order_cost: float) -> float:
         if order.order_type in [OrderType.BUY, OrderType.BTO]:
-            total_position_value += order_value
+            return cash_before - order_cost
+        if order.order_type in [OrderType.SELL, OrderType.STC]:
+            return cash_before + order_cost
+        return cash_before
 
-        cash_after = portfolio.cash_balance
+    def _total_value_after(
+        self, order: Order, total_value_before: float, price: float, order_cost: float
+    ) -> float:
+        # Estimate new total value (simplified)
         if order.order_type in [OrderType.BUY, OrderType.BTO]:
-            cash_after -= self._calculate_order_cost(order, current_quote)
+            return total_value_before + price * abs(order.quantity) - order_cost
+        return total_value_before
 
-        if cash_after <= 0:
-            return float("inf")
+    def _signed_quantity(self, order: Order) -> int:
+        """Order quantity, negative for sells."""
+        if order.order_type in _BUY_TYPES:
+            return order.quantity
+        return -order.quantity
 
-        return total_position_value / cash_after
+    def _value_change(
+        self, order: Order, current_quote: Quote, existing_position: Position | None
+    ) -> float:
+        """Change in the ordered symbol's gross position value."""
+        current_quantity = existing_position.quantity if existing_position else 0
+        new_quantity = current_quantity + self._signed_quantity(order)
+        current_value = (
+            abs(current_quantity) * self._get_safe_position_price(existing_position)
+            if existing_position
+            else 0.0
+        )
+        return abs(new_quantity) * self._get_safe_price(current_quote) - current_value
+
+    def _is_high_volatility(self, symbol: str) -> bool:
+        return self.volatility_rankings.get(symbol, "normal") == "high"
 
     def _calculate_greeks_impact(
-        self, order: Order, portfolio: Portfolio, current_quote: Quote
+        self,
+        order: Order,
+        current_quote: Quote,
+        asset: Option,
+        portfolio_greeks: dict[str, float],
     ) -> dict[str, float]:
         """Calculate the impact on portfolio Greeks for options orders."""
-        asset = asset_factory(order.symbol)
-        if not isinstance(asset, Option):
-            return {}
-
         # Calculate Greeks for the order
         try:
             greeks = calculate_option_greeks(
@@ -711,8 +1180,8 @@ class RiskAnalyzer:
             logger.error(f"Failed to calculate Greeks: {e}")
             return {}
 
-        # Scale by quantity
-        quantity_multiplier = order.quantity / 100  # Options are in 100 share contracts
+        # Scale by contracts, each on 100 shares
+        quantity_multiplier = self._signed_quantity(order) * OPTION_MULTIPLIER
 
         # Ensure we have non-None values for all greeks
         delta = greeks.get("delta", 0) or 0
@@ -721,13 +1190,18 @@ class RiskAnalyzer:
         vega = greeks.get("vega", 0) or 0
         rho = greeks.get("rho", 0) or 0
 
-        return {
+        impact = {
             "delta_change": delta * quantity_multiplier,
             "gamma_change": gamma * quantity_multiplier,
             "theta_change": theta * quantity_multiplier,
             "vega_change": vega * quantity_multiplier,
             "rho_change": rho * quantity_multiplier,
         }
+        for greek in GREEKS:
+            impact[f"{greek}_after"] = (
+                portfolio_greeks.get(greek, 0.0) + impact[f"{greek}_change"]
+            )
+        return impact
 
     def _determine_risk_level(self, violations: list[RiskViolation]) -> RiskLevel:
         """Determine overall risk level based on violations."""
@@ -749,9 +1223,9 @@ class RiskAnalyzer:
     def _generate_warnings(
         self,
         order: Order,
-        portfolio: Portfolio,
+        asset: Asset | None,
         portfolio_impact: PortfolioImpact,
-        violations: list[RiskViolation],
+        is_day_trade: bool,
     ) -> list[str]:
         """Generate warning messages for the order."""
         warnings = []
@@ -771,7 +1245,6 @@ class RiskAnalyzer:
             )
 
         # Options expiration warning
-        asset = asset_factory(order.symbol)
         if isinstance(asset, Option):
             days_to_expiry = (asset.expiration_date - datetime.now().date()).days
             if days_to_expiry < 7:
@@ -780,7 +1253,7 @@ class RiskAnalyzer:
                 )
 
         # Day trading warning
-        if self._is_day_trade(order, portfolio):
+        if is_day_trade:
             warnings.append("This order may count as a day trade under PDT rules")
 
         return warnings
@@ -815,13 +1288,11 @@ class RiskAnalyzer:
 
         return 2
 
-    def _is_day_trade(self, order: Order, portfolio: Portfolio) -> bool:
+    def _is_day_trade(
+        self, order: Order, existing_position: Position | _Holding | None
+    ) -> bool:
         """Check if order would constitute a day trade."""
         # Simplified check - real implementation would check transaction history
-        existing_position = next(
-            (p for p in portfolio.positions if p.symbol == order.symbol), None
-        )
-
         if not existing_position:
             return False
 
@@ -830,24 +1301,26 @@ class RiskAnalyzer:
         return False
 
     def _calculate_related_position_impact(
-        self, position: Position, order: Order, portfolio: Portfolio
-    ) -> PositionImpact | None:
+        self,
+        symbol: str,
+        quantity: int,
+        avg_price: float,
+        current_value: float,
+        total_value: float,
+    ) -> PositionImpact:
         """Calculate impact on related positions (e.g., same underlying)."""
         # Simplified - just return concentration impact
-        current_value = abs(position.quantity) * self._get_safe_position_price(position)
-        concentration_before = (
-            current_value / portfolio.total_value if portfolio.total_value else 0
-        )
+        concentration_before = current_value / total_value if total_value else 0
 
         # Assume minor impact on concentration
         concentration_after = concentration_before * 1.05  # 5% increase
 
         return PositionImpact(
-            symbol=position.symbol,
-            current_quantity=position.quantity,
-            new_quantity=position.quantity,  # No direct change
-            current_avg_price=position.avg_price,
-            new_avg_price=position.avg_price,
+            symbol=symbol,
+            current_quantity=quantity,
+            new_quantity=quantity,  # No direct change
+            current_avg_price=avg_price,
+            new_avg_price=avg_price,
             current_value=current_value,
             new_value=current_value,
             pnl_impact=0.0,
@@ -12,6 +12,7 @@ The module is organized into focused components:
 - models: Core strategy models and data structures
 - recognition: Basic strategy recognition and grouping
 - analyzer: Advanced analysis and complex strategy detection
+- detector: Strike-indexed matching of multi-leg option patterns
 """
 
 # Core models and enums
@@ -23,6 +24,7 @@ from .analyzer import (
     detect_complex_strategies,
     get_portfolio_optimization_recommendations,
 )
+from .detector import ComplexStrategyDetector
 from .models import (  # Base strategy models; Analysis models; Enums
     AssetStrategy,
     BasicStrategy,
@@ -42,6 +44,7 @@ from .recognition import (
     StrategyRecognitionService,
     analyze_strategy_portfolio,
     group_into_basic_strategies,
+    position_set_version,
 )
 
 # Public API - exposed at package level
@@ -51,6 +54,7 @@ __all__ = [
     # Strategy models
     "BasicStrategy",
     "ComplexStrategy",
+    "ComplexStrategyDetector",
     "ComplexStrategyType",
     "CoveredStrategy",
     "OffsetStrategy",
@@ -70,4 +74,5 @@ __all__ = [
     "get_portfolio_optimization_recommendations",
     # Convenience functions
     "group_into_basic_strategies",
+    "position_set_version",
 ]
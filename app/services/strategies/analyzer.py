@@ -8,9 +8,10 @@ Greeks aggregation, complex strategy detection, and optimization recommendations
 from datetime import date
 from typing import Any
 
-from ...models.assets import Call, Option, Put
+from ...models.assets import Option
 from ...models.quotes import OptionQuote, Quote
 from ...schemas.positions import Position
+from .detector import ComplexStrategyDetector
 from .models import (
     AssetStrategy,
     BasicStrategy,
@@ -329,57 +330,60 @@ class AdvancedStrategyAnalyzer:
         """Detect complex strategies for a specific underlying."""
         complex_strategies = []
 
-        # Group options by type and expiration
-        calls = [p for p in positions if isinstance(p.asset, Call)]
-        puts = [p for p in positions if isinstance(p.asset, Put)]
+        # Index legs by expiration, type and strike once for all patterns
+        detector = ComplexStrategyDetector(positions)
 
         # Detect iron condors (short call spread + short put spread)
-        iron_condors = self._detect_iron_condors(calls, puts, underlying_symbol)
+        iron_condors = self._detect_iron_condors(detector)
         complex_strategies.extend(iron_condors)
 
-        # Detect straddles and strangles
-        straddles_strangles = self._detect_straddles_strangles(
-            calls, puts, underlying_symbol
-        )
-        complex_strategies.extend(straddles_strangles)
-
         # Detect butterflies
-        butterflies = self._detect_butterflies(calls, puts, underlying_symbol)
+        butterflies = self._detect_butterflies(detector)
         complex_strategies.extend(butterflies)
 
         # Detect condors
-        condors = self._detect_condors(calls, puts, underlying_symbol)
+        condors = self._detect_condors(detector)
         complex_strategies.extend(condors)
 
+        # Detect straddles and strangles
+        straddles_strangles = self._detect_straddles_strangles(detector)
+        complex_strategies.extend(straddles_strangles)
+
+        # Detect calendar spreads from what is left across expirations
+        calendars = self._detect_calendar_spreads(detector)
+        complex_strategies.extend(calendars)
+
         return complex_strategies
 
     def _detect_iron_condors(
-        self, calls: list[Position], puts: list[Position], underlying_symbol: str
+        self, detector: ComplexStrategyDetector
     ) -> list[ComplexStrategy]:
-        """Detect iron condor strategies."""
-        # Simplified detection - in a real implementation this would be more sophisticated
-        return []
+        """Detect iron condor and iron butterfly strategies."""
+        return detector.iron_condors()
 
     def _detect_straddles_strangles(
-        self, calls: list[Position], puts: list[Position], underlying_symbol: str
+        self, detector: ComplexStrategyDetector
     ) -> list[ComplexStrategy]:
         """Detect straddle and strangle strategies."""
-        # Simplified detection - in a real implementation this would be more sophisticated
-        return []
+        return detector.straddles_strangles()
 
     def _detect_butterflies(
-        self, calls: list[Position], puts: list[Position], underlying_symbol: str
+        self, detector: ComplexStrategyDetector
     ) -> list[ComplexStrategy]:
         """Detect butterfly strategies."""
-        # Simplified detection - in a real implementation this would be more sophisticated
-        return []
+        return detector.butterflies()
 
     def _detect_condors(
-        self, calls: list[Position], puts: list[Position], underlying_symbol: str
+        self, detector: ComplexStrategyDetector
     ) -> list[ComplexStrategy]:
         """Detect condor strategies."""
-        # Simplified detection - in a real implementation this would be more sophisticated
-        return []
+        return detector.condors()
+
+    def _detect_calendar_spreads(
+        self, detector: ComplexStrategyDetector
+    ) -> list[ComplexStrategy]:
+        """Detect calendar spread strategies."""
+        return detector.calendar_spreads()
 
     def _generate_strategy_specific_recommendations(
         self,
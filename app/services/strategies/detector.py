@@ -0,0 +1,412 @@
+"""
+Complex strategy detection.
+
+Option legs are indexed once per call into strike-sorted ladders keyed by
+(underlying, expiration, option type). Multi-leg patterns are then matched
+with bisect, two-pointer and hash lookups over those ladders instead of
+enumerating every combination of legs. Matched quantity is consumed from the
+ladders, so a contract belongs to at most one detected strategy.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import pairwise
+
+from ...models.assets import Option
+from ...schemas.positions import Position
+from .models import ComplexStrategy, ComplexStrategyType
+
+CONTRACT_MULTIPLIER = 100
+
+
+@dataclass
+class _Ladder:
+    """Strike-indexed legs of one (underlying, expiration, option type)."""
+
+    strikes: list[float] = field(default_factory=list)
+    # strike -> remaining signed quantity
+    quantity: dict[float, int] = field(default_factory=dict)
+    # strike -> representative position for that contract
+    positions: dict[float, Position] = field(default_factory=dict)
+
+    def add(self, strike: float, position: Position) -> None:
+        if strike not in self.quantity:
+            self.quantity[strike] = 0
+            self.positions[strike] = position
+        self.quantity[strike] += position.quantity
+
+    def seal(self) -> None:
+        self.strikes = sorted(s for s, q in self.quantity.items() if q != 0)
+
+    def long(self, strike: float) -> int:
+        return max(self.quantity.get(strike, 0), 0)
+
+    def short(self, strike: float) -> int:
+        return max(-self.quantity.get(strike, 0), 0)
+
+    def shorts(self) -> list[float]:
+        return [s for s in self.strikes if self.quantity[s] < 0]
+
+    def longs_below(self, strike: float) -> Iterator[float]:
+        """Strikes below ``strike`` with long quantity left, nearest first."""
+        for i in range(bisect_left(self.strikes, strike) - 1, -1, -1):
+            if self.quantity[self.strikes[i]] > 0:
+                yield self.strikes[i]
+
+    def longs_above(self, strike: float) -> Iterator[float]:
+        """Strikes above ``strike`` with long quantity left, nearest first."""
+        for i in range(bisect_right(self.strikes, strike), len(self.strikes)):
+            if self.quantity[self.strikes[i]] > 0:
+                yield self.strikes[i]
+
+    def take(self, strike: float, quantity: int) -> Position:
+        """Consume signed ``quantity`` at ``strike`` and return it as a leg."""
+        self.quantity[strike] -= quantity
+        leg = self.positions[strike]
+        return leg.model_copy(update={"quantity": quantity})
+
+
+@dataclass
+class _Expiry:
+    """Call and put ladders for one (underlying, expiration)."""
+
+    calls: _Ladder = field(default_factory=_Ladder)
+    puts: _Ladder = field(default_factory=_Ladder)
+
+
+class ComplexStrategyDetector:
+    """
+    Detects multi-leg option strategies in a set of positions.
+
+    Patterns are matched widest first (iron condors and iron butterflies,
+    then butterflies, condors, straddles and strangles, and finally calendar
+    spreads across expirations), each consuming the contracts it uses.
+    """
+
+    def __init__(self, positions: list[Position]) -> None:
+        self.expiries: dict[tuple[str, date], _Expiry] = defaultdict(_Expiry)
+        for position in positions:
+            asset = position.asset
+            if not isinstance(asset, Option) or position.quantity == 0:
+                continue
+            expiry = self.expiries[(asset.underlying.symbol, asset.expiration_date)]
+            ladder = expiry.calls if asset.option_type == "call" else expiry.puts
+            ladder.add(asset.strike, position)
+        for expiry in self.expiries.values():
+            expiry.calls.seal()
+            expiry.puts.seal()
+
+    def detect(self) -> list[ComplexStrategy]:
+        """Detect every supported pattern, consuming matched contracts."""
+        return [
+            *self.iron_condors(),
+            *self.butterflies(),
+            *self.condors(),
+            *self.straddles_strangles(),
+            *self.calendar_spreads(),
+        ]
+
+    def iron_condors(self) -> list[ComplexStrategy]:
+        """
+        Short put spread plus short call spread at one expiration.
+
+        Each short put is paired with the nearest lower long put and the
+        lowest short call at or above it that has a long call wing; equal
+        short strikes make an iron butterfly.
+        """
+        found = []
+        for (underlying, _), expiry in self.expiries.items():
+            calls, puts = expiry.calls, expiry.puts
+            call_shorts = calls.shorts()
+            for short_put in reversed(puts.shorts()):
+                index = bisect_left(call_shorts, short_put)
+                while puts.short(short_put) and index < len(call_shorts):
+                    short_call = call_shorts[index]
+                    long_put = next(puts.longs_below(short_put), None)
+                    if long_put is None:
+                        break
+                    long_call = next(calls.longs_above(short_call), None)
+                    if long_call is None or not calls.short(short_call):
+                        index += 1
+                        continue
+                    count = min(
+                        puts.long(long_put),
+                        puts.short(short_put),
+                        calls.short(short_call),
+                        calls.long(long_call),
+                    )
+                    legs = [
+                        puts.take(long_put, count),
+                        puts.take(short_put, -count),
+                        calls.take(short_call, -count),
+                        calls.take(long_call, count),
+                    ]
+                    credit = _net_credit_per_share(legs, count)
+                    width = max(short_put - long_put, long_call - short_call)
+                    found.append(
+                        _strategy(
+                            ComplexStrategyType.IRON_BUTTERFLY
+                            if short_put == short_call
+                            else ComplexStrategyType.IRON_CONDOR,
+                            underlying,
+                            legs,
+                            count,
+                            max_profit=credit,
+                            max_loss=width - credit,
+                            breakevens=[short_put - credit, short_call + credit],
+                        )
+                    )
+        return found
+
+    def butterflies(self) -> list[ComplexStrategy]:
+        """
+        Long wings around a short body of twice the size, equally spaced.
+
+        For each short strike the lower wings are walked nearest first and
+        the mirrored upper wing is a hash lookup.
+        """
+        found = []
+        for (underlying, _), expiry in self.expiries.items():
+            for ladder in (expiry.calls, expiry.puts):
+                for body in ladder.shorts():
+                    if ladder.short(body) < 2:
+                        continue
+                    for lower in ladder.longs_below(body):
+                        upper = _strike(2 * body - lower)
+                        count = min(
+                            ladder.long(lower),
+                            ladder.short(body) // 2,
+                            ladder.long(upper),
+                        )
+                        if count <= 0:
+                            continue
+                        legs = [
+                            ladder.take(lower, count),
+                            ladder.take(body, -2 * count),
+                            ladder.take(upper, count),
+                        ]
+                        debit = -_net_credit_per_share(legs, count)
+                        found.append(
+                            _strategy(
+                                ComplexStrategyType.BUTTERFLY,
+                                underlying,
+                                legs,
+                                count,
+                                max_profit=(body - lower) - debit,
+                                max_loss=debit,
+                                breakevens=[lower + debit, upper - debit],
+                            )
+                        )
+                        if ladder.short(body) < 2:
+                            break
+        return found
+
+    def condors(self) -> list[ComplexStrategy]:
+        """
+        Long wings outside two adjacent short strikes of one option type.
+
+        The wings must be equally wide; the upper wing is found by hash
+        lookup from the lower one.
+        """
+        found = []
+        for (underlying, _), expiry in self.expiries.items():
+            for ladder in (expiry.calls, expiry.puts):
+                shorts = ladder.shorts()
+                for inner_low, inner_high in pairwise(shorts):
+                    for lower in ladder.longs_below(inner_low):
+                        upper = _strike(inner_high + inner_low - lower)
+                        count = min(
+                            ladder.long(lower),
+                            ladder.short(inner_low),
+                            ladder.short(inner_high),
+                            ladder.long(upper),
+                        )
+                        if count <= 0:
+                            continue
+                        legs = [
+                            ladder.take(lower, count),
+                            ladder.take(inner_low, -count),
+                            ladder.take(inner_high, -count),
+                            ladder.take(upper, count),
+                        ]
+                        debit = -_net_credit_per_share(legs, count)
+                        found.append(
+                            _strategy(
+                                ComplexStrategyType.CONDOR,
+                                underlying,
+                                legs,
+                                count,
+                                max_profit=(inner_low - lower) - debit,
+                                max_loss=debit,
+                                breakevens=[lower + debit, upper - debit],
+                            )
+                        )
+                        if not ladder.short(inner_low) or not ladder.short(inner_high):
+                            break
+        return found
+
+    def straddles_strangles(self) -> list[ComplexStrategy]:
+        """
+        A call and a put of the same direction at one expiration.
+
+        Same-strike pairs (straddles) are hash lookups; the rest are paired
+        into strangles by a two-pointer walk of the ascending put and call
+        strikes, each put with the lowest call strike above it.
+        """
+        found = []
+        for (underlying, _), expiry in self.expiries.items():
+            calls, puts = expiry.calls, expiry.puts
+            for sign in (1, -1):
+                for strike in puts.strikes:
+                    count = min(
+                        sign * puts.quantity[strike],
+                        sign * calls.quantity.get(strike, 0),
+                    )
+                    if count > 0:
+                        legs = [
+                            puts.take(strike, sign * count),
+                            calls.take(strike, sign * count),
+                        ]
+                        found.append(
+                            _straddle(
+                                ComplexStrategyType.STRADDLE,
+                                underlying,
+                                legs,
+                                count,
+                                sign,
+                                strike,
+                                strike,
+                            )
+                        )
+
+                put_strikes = [s for s in puts.strikes if sign * puts.quantity[s] > 0]
+                call_strikes = [
+                    s for s in calls.strikes if sign * calls.quantity[s] > 0
+                ]
+                i = j = 0
+                while i < len(put_strikes) and j < len(call_strikes):
+                    put_strike, call_strike = put_strikes[i], call_strikes[j]
+                    if call_strike <= put_strike:
+                        j += 1
+                        continue
+                    count = min(
+                        sign * puts.quantity[put_strike],
+                        sign * calls.quantity[call_strike],
+                    )
+                    legs = [
+                        puts.take(put_strike, sign * count),
+                        calls.take(call_strike, sign * count),
+                    ]
+                    found.append(
+                        _straddle(
+                            ComplexStrategyType.STRANGLE,
+                            underlying,
+                            legs,
+                            count,
+                            sign,
+                            put_strike,
+                            call_strike,
+                        )
+                    )
+                    if not puts.quantity[put_strike]:
+                        i += 1
+                    if not calls.quantity[call_strike]:
+                        j += 1
+        return found
+
+    def calendar_spreads(self) -> list[ComplexStrategy]:
+        """
+        Short a nearer and long a later expiration at the same strike.
+
+        Contracts are hashed by (underlying, option type, strike) across
+        expirations and paired nearest expirations first.
+        """
+        by_strike: dict[tuple[str, str, float], list[tuple[date, _Ladder]]] = (
+            defaultdict(list)
+        )
+        for (underlying, expiration), expiry in sorted(self.expiries.items()):
+            for option_type, ladder in (("call", expiry.calls), ("put", expiry.puts)):
+                for strike in ladder.strikes:
+                    if ladder.quantity[strike]:
+                        by_strike[(underlying, option_type, strike)].append(
+                            (expiration, ladder)
+                        )
+
+        found = []
+        for (underlying, _, strike), series in by_strike.items():
+            if len(series) < 2:
+                continue
+            for near_index, (_, near) in enumerate(series):
+                for _, far in series[near_index + 1 :]:
+                    if near.short(strike) == 0:
+                        break
+                    count = min(near.short(strike), far.long(strike))
+                    if count <= 0:
+                        continue
+                    legs = [near.take(strike, -count), far.take(strike, count)]
+                    debit = -_net_credit_per_share(legs, count)
+                    found.append(
+                        _strategy(
+                            ComplexStrategyType.CALENDAR_SPREAD,
+                            underlying,
+                            legs,
+                            count,
+                            max_profit=None,
+                            max_loss=debit,
+                            breakevens=[],
+                        )
+                    )
+        return found
+
+
+def _strike(value: float) -> float:
+    """Round a derived strike so it hashes like the parsed one."""
+    return round(value, 3)
+
+
+def _net_credit_per_share(legs: list[Position], count: int) -> float:
+    """Premium received per share of one strategy unit (negative for a debit)."""
+    return 0.0 - sum(leg.quantity * leg.avg_price for leg in legs) / count
+
+
+def _strategy(
+    complex_type: ComplexStrategyType,
+    underlying: str,
+    legs: list[Position],
+    count: int,
+    max_profit: float | None,
+    max_loss: float | None,
+    breakevens: list[float],
+) -> ComplexStrategy:
+    scale = count * CONTRACT_MULTIPLIER
+    return ComplexStrategy(
+        complex_type=complex_type,
+        legs=legs,
+        underlying_symbol=underlying,
+        quantity=count,
+        net_credit=_net_credit_per_share(legs, count) * scale,
+        max_profit=None if max_profit is None else max_profit * scale,
+        max_loss=None if max_loss is None else max_loss * scale,
+        breakeven_points=breakevens,
+    )
+
+
+def _straddle(
+    complex_type: ComplexStrategyType,
+    underlying: str,
+    legs: list[Position],
+    count: int,
+    sign: int,
+    put_strike: float,
+    call_strike: float,
+) -> ComplexStrategy:
+    premium = abs(_net_credit_per_share(legs, count))
+    breakevens = [put_strike - premium, call_strike + premium]
+    if sign > 0:
+        return _strategy(
+            complex_type, underlying, legs, count, None, premium, breakevens
+        )
+    return _strategy(complex_type, underlying, legs, count, premium, None, breakevens)
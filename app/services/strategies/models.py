@@ -73,9 +73,8 @@ class AssetStrategy(BasicStrategy):
         # Determine direction
         direction = "short" if quantity < 0 else "long"
 
+        data.update(asset=asset_obj, direction=direction)
         super().__init__(quantity=quantity, **data)
-        self.asset = asset_obj
-        self.direction = direction
 
 
 class OffsetStrategy(BasicStrategy):
@@ -89,8 +88,8 @@ class OffsetStrategy(BasicStrategy):
         if asset_obj is None:
             raise ValueError(f"Could not create asset from: {asset}")
 
+        data["asset"] = asset_obj
         super().__init__(quantity=quantity, **data)
-        self.asset = asset_obj
 
 
 class SpreadStrategy(BasicStrategy):
@@ -133,11 +132,13 @@ class SpreadStrategy(BasicStrategy):
                 else SpreadType.DEBIT
             )
 
+        data.update(
+            sell_option=sell_option,
+            buy_option=buy_option,
+            option_type=option_type,
+            spread_type=spread_type,
+        )
         super().__init__(quantity=abs(quantity), **data)
-        self.sell_option = sell_option
-        self.buy_option = buy_option
-        self.option_type = option_type
-        self.spread_type = spread_type
 
 
 class CoveredStrategy(BasicStrategy):
@@ -163,9 +164,8 @@ class CoveredStrategy(BasicStrategy):
         if asset_obj.symbol != sell_option.underlying.symbol:
             raise ValueError("CoveredStrategy: option underlying must match asset")
 
+        data.update(asset=asset_obj, sell_option=sell_option)
         super().__init__(quantity=abs(quantity), **data)
-        self.asset = asset_obj
-        self.sell_option = sell_option
 
 
 class ComplexStrategy(BasicStrategy):
@@ -2,9 +2,15 @@
 Strategy recognition service.
 
 This module handles grouping positions into basic trading strategies
-and provides analysis of strategy composition.
+and provides analysis of strategy composition. Positions are indexed by
+underlying once per call, and per-account groupings are cached so that a
+fill only regroups the underlying it touched.
 """
 
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass, field
+from threading import RLock
 from typing import Any
 
 from ...models.assets import Option, asset_factory
@@ -18,11 +24,65 @@ from .models import (
 )
 
 
+def position_set_version(positions: list[Position]) -> frozenset[tuple[str, float]]:
+    """A version for a set of positions that changes when any holding does."""
+    return frozenset(_holdings(positions))
+
+
+def _holdings(positions: list[Position]) -> list[tuple[str, float]]:
+    return [(p.symbol, p.quantity) for p in positions if p.asset is not None]
+
+
+def _underlying_symbol(position: Position) -> str | None:
+    if position.asset is None:
+        return None
+    if isinstance(position.asset, Option):
+        return position.asset.underlying.symbol
+    return position.asset.symbol
+
+
+@dataclass
+class _AccountStrategies:
+    """Cached grouping for one account."""
+
+    version: Hashable
+    # underlying -> holdings fingerprint and the strategies grouped from it
+    fingerprints: dict[str, frozenset[tuple[str, float]]] = field(default_factory=dict)
+    strategies: dict[str, list[BasicStrategy]] = field(default_factory=dict)
+
+    def flatten(self) -> list[BasicStrategy]:
+        return [s for group in self.strategies.values() for s in group]
+
+
+@dataclass
+class RecognitionStats:
+    """Cache counters for per-account strategy grouping."""
+
+    hits: int = 0
+    misses: int = 0
+    underlyings_regrouped: int = 0
+    underlyings_reused: int = 0
+
+
 class StrategyRecognitionService:
-    """Service for grouping positions into trading strategies."""
+    """
+    Service for grouping positions into trading strategies.
 
-    def __init__(self) -> None:
-        pass
+    Positions are indexed by underlying in one pass and each underlying is
+    grouped independently. ``group_account_positions`` caches the result per
+    account under a position-set version; when the version changes, only
+    underlyings whose holdings changed (typically the one a fill touched)
+    are regrouped.
+
+    Args:
+        max_accounts: Accounts kept in the grouping cache
+    """
+
+    def __init__(self, max_accounts: int = 256) -> None:
+        self.max_accounts = max_accounts
+        self.stats = RecognitionStats()
+        self._accounts: OrderedDict[str, _AccountStrategies] = OrderedDict()
+        self._lock = RLock()
 
     def group_positions_by_strategy(
         self, positions: list[Position]
@@ -36,47 +96,153 @@ class StrategyRecognitionService:
         Returns:
             List of strategy objects grouped by underlying
         """
-        if not positions:
-            return []
-
-        # Get unique underlying symbols
-        underlyings = self._get_underlying_symbols(positions)
-
-        # Group strategies for each underlying
-        all_strategies = []
-        for underlying_symbol in underlyings:
-            underlying_strategies = self._group_strategies_for_underlying(
-                underlying_symbol, positions
+        all_strategies: list[BasicStrategy] = []
+        for underlying_symbol, underlying_positions in self.index_positions(
+            positions
+        ).items():
+            all_strategies.extend(
+                self._group_strategies_for_underlying(
+                    underlying_symbol, underlying_positions
+                )
             )
-            all_strategies.extend(underlying_strategies)
-
         return all_strategies
 
-    def _get_underlying_symbols(self, positions: list[Position]) -> list[str]:
-        """Extract unique underlying symbols from positions."""
-        underlyings = set()
-
+    def index_positions(self, positions: list[Position]) -> dict[str, list[Position]]:
+        """Index positions by underlying symbol in a single pass."""
+        index: dict[str, list[Position]] = {}
         for position in positions:
-            if position.asset is None:
-                continue
-            if isinstance(position.asset, Option):
-                underlyings.add(position.asset.underlying.symbol)
-            else:
-                # Stock position - add its own symbol
-                underlyings.add(position.asset.symbol)
+            underlying = _underlying_symbol(position)
+            if underlying is not None:
+                index.setdefault(underlying, []).append(position)
+        return index
+
+    def group_account_positions(
+        self,
+        account_id: str,
+        positions: list[Position],
+        version: Hashable | None = None,
+    ) -> list[BasicStrategy]:
+        """
+        Group an account's positions, reusing cached groupings.
 
-        return list(underlyings)
+        Args:
+            account_id: Account the positions belong to
+            positions: The account's current positions
+            version: Position-set version, e.g. a counter bumped on every
+                fill; computed from the holdings when omitted
 
-    def _group_strategies_for_underlying(
-        self, underlying_symbol: str, all_positions: list[Position]
+        Returns:
+            The account's strategies, grouped by underlying
+        """
+        if version is None:
+            version = position_set_version(positions)
+
+        with self._lock:
+            cached = self._accounts.get(account_id)
+            if cached is not None and cached.version == version:
+                self._accounts.move_to_end(account_id)
+                self.stats.hits += 1
+                return cached.flatten()
+            self.stats.misses += 1
+
+        previous = cached or _AccountStrategies(version=version)
+        grouping = _AccountStrategies(version=version)
+        for underlying, underlying_positions in self.index_positions(positions).items():
+            fingerprint = frozenset(_holdings(underlying_positions))
+            if previous.fingerprints.get(underlying) == fingerprint:
+                strategies = previous.strategies[underlying]
+                self.stats.underlyings_reused += 1
+            else:
+                strategies = self._group_strategies_for_underlying(
+                    underlying, underlying_positions
+                )
+                self.stats.underlyings_regrouped += 1
+            grouping.fingerprints[underlying] = fingerprint
+            grouping.strategies[underlying] = strategies
+
+        with self._lock:
+            self._accounts[account_id] = grouping
+            self._accounts.move_to_end(account_id)
+            while len(self._accounts) > self.max_accounts:
+                self._accounts.popitem(last=False)
+        return grouping.flatten()
+
+    def regroup_underlyings(
+        self,
+        account_id: str,
+        positions: list[Position],
+        underlyings: Iterable[str],
+        version: Hashable | None = None,
     ) -> list[BasicStrategy]:
-        """Group strategies for a specific underlying asset."""
+        """
+        Incrementally regroup only the underlyings touched by a fill.
 
-        # Filter positions for this underlying
-        positions = self._filter_positions_for_underlying(
-            underlying_symbol, all_positions
-        )
+        Args:
+            account_id: Account the fill belongs to
+            positions: The account's current positions for those underlyings
+                (other positions may be included and are ignored)
+            underlyings: Underlying symbols whose holdings changed
+            version: New position-set version for the account
+
+        Returns:
+            The account's strategies after the update; only the touched
+            underlyings' if the account had no cached grouping
+        """
+        touched = set(underlyings)
+        index = {
+            underlying: underlying_positions
+            for underlying, underlying_positions in self.index_positions(
+                positions
+            ).items()
+            if underlying in touched
+        }
 
+        with self._lock:
+            grouping = self._accounts.get(account_id)
+            # Without a cached grouping only the touched underlyings are
+            # known, so the seeded entry must not satisfy a versioned lookup
+            complete = grouping is not None
+            if grouping is None:
+                grouping = _AccountStrategies(version=object())
+                self._accounts[account_id] = grouping
+            for underlying in touched:
+                grouping.fingerprints.pop(underlying, None)
+                grouping.strategies.pop(underlying, None)
+            for underlying, underlying_positions in index.items():
+                grouping.fingerprints[underlying] = frozenset(
+                    _holdings(underlying_positions)
+                )
+                grouping.strategies[underlying] = self._group_strategies_for_underlying(
+                    underlying, underlying_positions
+                )
+            self.stats.underlyings_regrouped += len(index)
+            # Callers without a version of their own force a full check next time
+            grouping.version = version if version is not None and complete else object()
+            self._accounts.move_to_end(account_id)
+            return grouping.flatten()
+
+    def invalidate(self, account_id: str) -> None:
+        """Drop an account's cached grouping."""
+        with self._lock:
+            self._accounts.pop(account_id, None)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get grouping cache statistics."""
+        with self._lock:
+            lookups = self.stats.hits + self.stats.misses
+            return {
+                "accounts": len(self._accounts),
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "hit_rate": self.stats.hits / lookups if lookups else 0.0,
+                "underlyings_regrouped": self.stats.underlyings_regrouped,
+                "underlyings_reused": self.stats.underlyings_reused,
+            }
+
+    def _group_strategies_for_underlying(
+        self, underlying_symbol: str, positions: list[Position]
+    ) -> list[BasicStrategy]:
+        """Group strategies for the positions of one underlying asset."""
         if not positions:
             return []
 
@@ -202,24 +368,6 @@ class StrategyRecognitionService:
 
         return strategies
 
-    def _filter_positions_for_underlying(
-        self, underlying_symbol: str, positions: list[Position]
-    ) -> list[Position]:
-        """Filter positions that relate to a specific underlying."""
-        filtered = []
-
-        for position in positions:
-            if position.asset is None:
-                continue
-            if isinstance(position.asset, Option):
-                if position.asset.underlying.symbol == underlying_symbol:
-                    filtered.append(position)
-            else:
-                if position.asset.symbol == underlying_symbol:
-                    filtered.append(position)
-
-        return filtered
-
     def _create_individual_option_strategies(
         self, positions: list[Position], option_type: str, negative: bool
     ) -> list[AssetStrategy]:
@@ -5,10 +5,11 @@ Groups positions into basic strategies.
 Special thanks to /u/EdKaim for the outline of this process.
 """
 
+from datetime import date
 from typing import Any, cast
 
-from ...schemas.positions import Position
 from ..models.assets import Option, asset_factory
+from ..schemas.positions import Position
 from .strategies.models import (
     AssetStrategy,
     BasicStrategy,
@@ -328,6 +329,11 @@ def identify_complex_strategies(
     if straddles:
         complex_strategies["straddles_strangles"] = straddles
 
+    # Look for calendar spreads
+    calendars = _find_calendar_spreads(strategies)
+    if calendars:
+        complex_strategies["calendar_spreads"] = calendars
+
     return complex_strategies
 
 
@@ -335,37 +341,29 @@ def _find_iron_condors(strategies: list[BasicStrategy]) -> list[dict[str, Any]]:
     """Find iron condor strategies."""
     iron_condors = []
 
-    # Iron condor = call spread + put spread with same expiration
-    call_spreads = [
-        s
-        for s in strategies
-        if (isinstance(s, SpreadStrategy) and s.sell_option.option_type == "call")
-    ]
-
-    put_spreads = [
-        s
-        for s in strategies
-        if (isinstance(s, SpreadStrategy) and s.sell_option.option_type == "put")
-    ]
-
-    for call_spread in call_spreads:
-        for put_spread in put_spreads:
-            if (
-                call_spread.sell_option.expiration_date
-                == put_spread.sell_option.expiration_date
-                and call_spread.sell_option.underlying.symbol
-                == put_spread.sell_option.underlying.symbol
-                and call_spread.quantity == put_spread.quantity
-            ):
-                iron_condors.append(
-                    {
-                        "type": "iron_condor",
-                        "call_spread": call_spread,
-                        "put_spread": put_spread,
-                        "quantity": call_spread.quantity,
-                        "expiration": call_spread.sell_option.expiration_date,
-                    }
-                )
+    # Iron condor = call spread + put spread with same expiration; put spreads
+    # are hashed by everything the pair must share
+    put_spreads: dict[tuple[str, date, int], list[SpreadStrategy]] = {}
+    for s in strategies:
+        if isinstance(s, SpreadStrategy) and s.sell_option.option_type == "put":
+            put_spreads.setdefault(_spread_key(s), []).append(s)
+
+    for call_spread in strategies:
+        if not (
+            isinstance(call_spread, SpreadStrategy)
+            and call_spread.sell_option.option_type == "call"
+        ):
+            continue
+        for put_spread in put_spreads.get(_spread_key(call_spread), []):
+            iron_condors.append(
+                {
+                    "type": "iron_condor",
+                    "call_spread": call_spread,
+                    "put_spread": put_spread,
+                    "quantity": call_spread.quantity,
+                    "expiration": call_spread.sell_option.expiration_date,
+                }
+            )
 
     return iron_condors
 
@@ -374,8 +372,44 @@ def _find_butterflies(strategies: list[BasicStrategy]) -> list[dict[str, Any]]:
     """Find butterfly strategies."""
     butterflies: list[dict[str, Any]] = []
 
-    # Butterfly = buy 2 middle strikes, sell 1 lower + 1 higher
-    # This is complex to detect from spreads, would need position-level analysis
+    # Butterfly = a spread on each side of a shared short strike with wings
+    # equally far away, so the upper spread is a hash lookup from the lower
+    spreads: dict[tuple[str, date, int, str, float, float], list[SpreadStrategy]] = {}
+    for s in strategies:
+        if isinstance(s, SpreadStrategy):
+            key = (
+                *_spread_key(s),
+                s.sell_option.option_type,
+                s.sell_option.strike,
+                s.buy_option.strike,
+            )
+            spreads.setdefault(key, []).append(s)
+
+    for key, lower_spreads in spreads.items():
+        underlying, expiration, quantity, option_type, body, wing = key
+        if wing >= body:
+            continue
+        upper_key = (
+            underlying,
+            expiration,
+            quantity,
+            option_type,
+            body,
+            round(2 * body - wing, 3),
+        )
+        for lower_spread, upper_spread in zip(
+            lower_spreads, spreads.get(upper_key, []), strict=False
+        ):
+            butterflies.append(
+                {
+                    "type": "butterfly",
+                    "lower_spread": lower_spread,
+                    "upper_spread": upper_spread,
+                    "quantity": lower_spread.quantity,
+                    "expiration": lower_spread.sell_option.expiration_date,
+                    "strike": body,
+                }
+            )
 
     return butterflies
 
@@ -384,49 +418,98 @@ def _find_straddles_strangles(strategies: list[BasicStrategy]) -> list[dict[str,
     """Find straddle and strangle strategies."""
     straddles_strangles = []
 
-    # Group option strategies by expiration and underlying
-    option_groups: dict[tuple[str, str], list[AssetStrategy]] = {}
+    # Group long option strategies by underlying, expiration and quantity
+    calls: dict[tuple[str, date, int], list[AssetStrategy]] = {}
+    puts: dict[tuple[str, date, int], list[AssetStrategy]] = {}
 
     for strategy in strategies:
-        if isinstance(strategy, AssetStrategy) and isinstance(strategy.asset, Option):
+        if (
+            isinstance(strategy, AssetStrategy)
+            and isinstance(strategy.asset, Option)
+            and strategy.quantity > 0
+        ):
             option = strategy.asset  # Already confirmed to be Option via isinstance
-            key = (option.underlying.symbol, option.expiration_date.isoformat())
-            if key not in option_groups:
-                option_groups[key] = []
-            option_groups[key].append(strategy)
+            key = (option.underlying.symbol, option.expiration_date, strategy.quantity)
+            group = calls if option.option_type == "call" else puts
+            group.setdefault(key, []).append(strategy)
 
     # Look for straddles (same strike) and strangles (different strikes)
-    for _key, group in option_groups.items():
-        calls = [s for s in group if cast(Option, s.asset).option_type == "call"]
-        puts = [s for s in group if cast(Option, s.asset).option_type == "put"]
-
-        for call in calls:
-            for put in puts:
+    for key, group_calls in calls.items():
+        for call in group_calls:
+            for put in puts.get(key, []):
                 call_option = cast(Option, call.asset)
                 put_option = cast(Option, put.asset)
-                if call.quantity == put.quantity and call.quantity > 0:  # Both long
-                    if call_option.strike == put_option.strike:
-                        # Long straddle
-                        straddles_strangles.append(
-                            {
-                                "type": "long_straddle",
-                                "call": call,
-                                "put": put,
-                                "quantity": call.quantity,
-                                "strike": call_option.strike,
-                            }
-                        )
-                    else:
-                        # Long strangle
-                        straddles_strangles.append(
-                            {
-                                "type": "long_strangle",
-                                "call": call,
-                                "put": put,
-                                "quantity": call.quantity,
-                                "call_strike": call_option.strike,
-                                "put_strike": put_option.strike,
-                            }
-                        )
+                if call_option.strike == put_option.strike:
+                    # Long straddle
+                    straddles_strangles.append(
+                        {
+                            "type": "long_straddle",
+                            "call": call,
+                            "put": put,
+                            "quantity": call.quantity,
+                            "strike": call_option.strike,
+                        }
+                    )
+                else:
+                    # Long strangle
+                    straddles_strangles.append(
+                        {
+                            "type": "long_strangle",
+                            "call": call,
+                            "put": put,
+                            "quantity": call.quantity,
+                            "call_strike": call_option.strike,
+                            "put_strike": put_option.strike,
+                        }
+                    )
 
     return straddles_strangles
+
+
+def _find_calendar_spreads(strategies: list[BasicStrategy]) -> list[dict[str, Any]]:
+    """Find calendar spread strategies."""
+    calendars = []
+
+    # Calendar = short a nearer and long a later expiration at one strike
+    longs: dict[tuple[str, str, float, int], list[AssetStrategy]] = {}
+    shorts: list[AssetStrategy] = []
+    for strategy in strategies:
+        if isinstance(strategy, AssetStrategy) and isinstance(strategy.asset, Option):
+            if strategy.quantity > 0:
+                longs.setdefault(_option_key(strategy), []).append(strategy)
+            elif strategy.quantity < 0:
+                shorts.append(strategy)
+
+    for short in shorts:
+        near = cast(Option, short.asset)
+        for long in longs.get(_option_key(short), []):
+            far = cast(Option, long.asset)
+            if far.expiration_date > near.expiration_date:
+                calendars.append(
+                    {
+                        "type": "calendar_spread",
+                        "short": short,
+                        "long": long,
+                        "quantity": long.quantity,
+                        "strike": near.strike,
+                        "near_expiration": near.expiration_date,
+                        "far_expiration": far.expiration_date,
+                    }
+                )
+
+    return calendars
+
+
+def _spread_key(spread: SpreadStrategy) -> tuple[str, date, int]:
+    option = spread.sell_option
+    return (option.underlying.symbol, option.expiration_date, spread.quantity)
+
+
+def _option_key(strategy: AssetStrategy) -> tuple[str, str, float, int]:
+    option = cast(Option, strategy.asset)
+    return (
+        option.underlying.symbol,
+        option.option_type,
+        option.strike,
+        abs(strategy.quantity),
+    )
@@ -1,24 +1,47 @@
 import asyncio
+import base64
+import binascii
+import functools
+import inspect
+import json
+import logging
+import math
 import os
-from datetime import date, datetime, timedelta
-from typing import Any
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, Concatenate, ParamSpec, TypeVar
 from uuid import uuid4
 
-from sqlalchemy import delete, select
+from sqlalchemy import (
+    ColumnElement,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    true,
+    tuple_,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import InputValidationError, NotFoundError
+from app.core.request_timing import timed_phase
 from app.models.assets import Option, asset_factory
 from app.models.database.trading import Account as DBAccount
+from app.models.database.trading import DevStockQuote
 from app.models.database.trading import Order as DBOrder
 from app.models.database.trading import Position as DBPosition
 from app.models.database.trading import User as DBUser
 from app.models.quotes import OptionQuote, OptionsChain, Quote
 from app.schemas.accounts import AccountSummaryList
 from app.schemas.orders import (
+    BulkOrderResult,
     Order,
+    OrderAssetClass,
     OrderCondition,
     OrderCreate,
+    OrderPage,
     OrderStatus,
     OrderType,
 )
@@ -27,6 +50,7 @@ from app.schemas.trading import StockQuote
 from app.schemas.users import UserCreate, UserProfile, UserProfileSummary, UserUpdate
 
 # Import schema converters
+from app.utils.chain_shaping import parse_fields, shape_rows, strikes_near
 from app.utils.schema_converters import (
     AccountConverter,
     OrderConverter,
@@ -36,13 +60,95 @@ from app.utils.schema_converters import (
 # Database imports removed - using async patterns only
 from ..adapters.base import QuoteAdapter
 from ..adapters.synthetic_data import DevDataQuoteAdapter
-from .greeks import calculate_option_greeks
+from .event_stream import EventStreamHub
+from .greeks import calculate_option_greeks, calculate_option_greeks_batch
+from .operation_scope import (
+    OperationQueryStats,
+    OperationScope,
+    current_operation_scope,
+    enter_operation_scope,
+    exit_operation_scope,
+)
 
 # Import new services
 from .order_execution import OrderExecutionEngine
+from .portfolio_valuation import PortfolioValuationStore, ValuationSnapshot
 from .strategies import StrategyRecognitionService
 from .validation import AccountValidator
 
+logger = logging.getLogger(__name__)
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+MAX_ORDER_PAGE_SIZE = 1000
+DEFAULT_ORDER_PAGE_SIZE = 100
+MAX_BULK_ORDERS = 500
+MAX_BATCH_QUOTE_SYMBOLS = 500
+
+
+def _encode_order_cursor(created_at: datetime, order_id: str) -> str:
+    """Encode an order's (created_at, id) keyset position as an opaque cursor."""
+    payload = json.dumps([created_at.isoformat(), order_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def _decode_order_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, order_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), str(order_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InputValidationError(f"Invalid order cursor: {cursor}") from e
+
+
+def _option_symbol_clause() -> ColumnElement[bool]:
+    """Match option symbols (OCC-style or underscore-separated) in SQL."""
+    return or_(func.length(DBOrder.symbol) > 5, DBOrder.symbol.contains("_"))
+
+
+def _unit_of_work(
+    method: Callable[Concatenate["TradingService", _P], Awaitable[_R]],
+) -> Callable[Concatenate["TradingService", _P], Awaitable[_R]]:
+    """Run a TradingService method inside an operation scope.
+
+    Nested calls join the caller's scope, so one logical operation shares a
+    session and identity map and its queries are counted together.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(
+        self: "TradingService", *args: _P.args, **kwargs: _P.kwargs
+    ) -> _R:
+        async with self.operation_scope(method.__name__):
+            return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _read_only(
+    method: Callable[Concatenate["TradingService", _P], Awaitable[_R]],
+) -> Callable[Concatenate["TradingService", _P], Awaitable[_R]]:
+    """Like _unit_of_work, but the scope's session may come from a read replica.
+
+    The method's ``account_id`` argument, if any, is the account whose recent
+    writes keep the read on the primary.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    async def wrapper(
+        self: "TradingService", *args: _P.args, **kwargs: _P.kwargs
+    ) -> _R:
+        account_id = signature.bind_partial(self, *args, **kwargs).arguments.get(
+            "account_id"
+        )
+        async with self.operation_scope(
+            method.__name__, read_only=True, account_id=account_id
+        ):
+            return await method(self, *args, **kwargs)
+
+    return wrapper
+
 
 class TradingService:
     def __init__(
@@ -50,6 +156,8 @@ class TradingService:
         quote_adapter: QuoteAdapter | None = None,
         account_owner: str = "default",
         db_session: AsyncSession | None = None,
+        valuation_store: PortfolioValuationStore | None = None,
+        event_hub: EventStreamHub | None = None,
     ) -> None:
         # Validate account_owner input
         if account_owner is None:
@@ -98,6 +206,18 @@ class TradingService:
         self.account_owner = account_owner.strip()
         self._db_session = db_session  # Optional injected session
 
+        # Incrementally maintained totals; without a store they are summed in SQL
+        self.valuation_store = valuation_store
+
+        # Order created/filled/cancelled events for streaming clients
+        self.event_hub = event_hub
+
+        # Id of the owner's account once loaded, to key read routing by
+        self._owner_account_id: str | None = None
+
+        # Query counts per operation name, recorded when a scope ends
+        self.query_stats: dict[str, OperationQueryStats] = {}
+
         # Service components
 
         # Initialize database account
@@ -114,11 +234,83 @@ class TradingService:
             "No database session available - ensure proper dependency injection"
         )
 
+    @asynccontextmanager
+    async def operation_scope(
+        self, name: str, read_only: bool = False, account_id: str | None = None
+    ) -> AsyncIterator[OperationScope]:
+        """
+        Open a unit-of-work scope for one logical operation.
+
+        Inside the scope all database work shares one session, accounts and
+        positions are loaded at most once, and executed queries are counted.
+        If a scope is already active it is reused.
+
+        Args:
+            name: Operation name under which query counts are recorded
+            read_only: Route the scope's session to a read replica, unless
+                the account read wrote recently
+            account_id: Account the operation targets; defaults to the
+                owner's account
+
+        Yields:
+            The active OperationScope
+        """
+        scope = current_operation_scope()
+        if scope is not None:
+            yield scope
+            return
+
+        scope = OperationScope(name=name, read_only=read_only, account_id=account_id)
+        token = enter_operation_scope(scope)
+        try:
+            yield scope
+        finally:
+            exit_operation_scope(token)
+            if scope.session is not None:
+                await scope.session.close()
+            if scope.written_accounts:
+                # Keep the written accounts' reads on the primary until
+                # replicas have caught up with the writes
+                from app.storage.database import replica_router
+
+                for written in scope.written_accounts:
+                    replica_router.record_write(written)
+            self.query_stats.setdefault(name, OperationQueryStats()).record(
+                scope.query_count
+            )
+
+    def get_query_stats(self) -> dict[str, dict[str, Any]]:
+        """Get per-operation query counts recorded by operation scopes."""
+        return {name: stats.to_dict() for name, stats in self.query_stats.items()}
+
     async def _execute_with_session(self, operation):
         """Execute a database operation with proper session management."""
         if self._db_session is not None:
             # Use injected session (testing)
             return await operation(self._db_session)
+
+        scope = current_operation_scope()
+        if scope is not None:
+            # Share one session across the whole operation scope
+            if scope.session is None:
+                from app.storage.database import (
+                    get_async_session_factory,
+                    get_read_session_factory,
+                )
+
+                read_key = scope.account_id or self._owner_account_id
+                if scope.read_only and read_key is not None:
+                    factory = get_read_session_factory(read_key)
+                else:
+                    # Until the owner's account id is known its recent writes
+                    # cannot be checked, so such reads stay on the primary
+                    factory = get_async_session_factory()
+                scope.session = factory()
+            try:
+                return await operation(scope.session)
+            except Exception:
+                await scope.session.rollback()
+                raise
         else:
             # Use dependency injection pattern (production)
             from app.storage.database import get_async_session
@@ -130,12 +322,24 @@ class TradingService:
         """Ensure the account exists in the database."""
         from sqlalchemy import select
 
-        async def _operation(db: AsyncSession):
+        scope = current_operation_scope()
+        if scope is not None and scope.get_account(owner=self.account_owner):
+            return
+
+        # Replicas cannot take the insert, so a read-only scope that finds no
+        # account leaves creating it to a primary session
+        create_here = (
+            scope is None or not scope.read_only or self._db_session is not None
+        )
+
+        async def _operation(db: AsyncSession, create: bool = True):
             stmt = select(DBAccount).where(DBAccount.owner == self.account_owner)
             result = await db.execute(stmt)
             account = result.scalar_one_or_none()
 
             if not account:
+                if not create:
+                    return None
                 account = DBAccount(
                     owner=self.account_owner,
                     cash_balance=10000.0,  # Starting balance
@@ -163,7 +367,19 @@ class TradingService:
                     db.add(pos)
                 await db.commit()
 
-        await self._execute_with_session(_operation)
+            self._owner_account_id = account.id
+            if scope is not None:
+                scope.remember_account(account)
+            return account
+
+        account = await self._execute_with_session(
+            functools.partial(_operation, create=create_here)
+        )
+        if account is None:
+            from app.storage.database import get_async_session
+
+            async for db in get_async_session():
+                await _operation(db)
 
     async def _get_account(self, account_id: str | None = None) -> DBAccount:
         """Get account from database by ID or by owner."""
@@ -174,9 +390,20 @@ class TradingService:
         # Validate account_id format if provided
         account_id = validate_optional_account_id(account_id)
 
+        # Reuse a row already loaded in this operation
+        scope = current_operation_scope()
+        if scope is not None:
+            cached = scope.get_account(account_id, owner=self.account_owner)
+            if cached is not None:
+                return cached
+
         if account_id is None:
-            # Ensure account exists first
+            # Ensure account exists first (loads it into the scope, if any)
             await self._ensure_account_exists()
+            if scope is not None:
+                cached = scope.get_account(owner=self.account_owner)
+                if cached is not None:
+                    return cached
 
         async def _operation(db: AsyncSession):
             if account_id is not None:
@@ -195,37 +422,43 @@ class TradingService:
                     raise NotFoundError(
                         f"Account for owner {self.account_owner} not found"
                     )
+            if scope is not None:
+                scope.remember_account(account)
             return account
 
         return await self._execute_with_session(_operation)
 
+    @_read_only
     async def get_account_balance(self, account_id: str | None = None) -> float:
         """Get current account balance from database."""
         account = await self._get_account(account_id)
         return float(account.cash_balance)
 
+    @_read_only
     async def get_account_info(self, account_id: str | None = None) -> dict[str, Any]:
         """Get comprehensive account information."""
-        account = await self._get_account(account_id)
-        portfolio = await self.get_portfolio(account_id)
 
-        return {
-            "account_id": account.id,
-            "owner": account.owner,
-            "cash_balance": float(account.cash_balance),
-            "starting_balance": float(account.starting_balance),
-            "created_at": account.created_at.isoformat(),
-            "updated_at": account.updated_at.isoformat(),
-            "total_value": portfolio.cash_balance
-            + sum(
-                pos.quantity * (pos.current_price or 0) for pos in portfolio.positions
-            ),
-            "positions_count": len(portfolio.positions),
-            "invested_value": sum(
-                pos.quantity * (pos.current_price or 0) for pos in portfolio.positions
-            ),
-        }
+        async def _operation(db: AsyncSession):
+            account = await self._get_account(account_id)
+            positions_count, invested_value, _ = await self._get_valuation_totals(
+                db, account.id
+            )
 
+            return {
+                "account_id": account.id,
+                "owner": account.owner,
+                "cash_balance": float(account.cash_balance),
+                "starting_balance": float(account.starting_balance),
+                "created_at": account.created_at.isoformat(),
+                "updated_at": account.updated_at.isoformat(),
+                "total_value": float(account.cash_balance) + invested_value,
+                "positions_count": positions_count,
+                "invested_value": invested_value,
+            }
+
+        return await self._execute_with_session(_operation)
+
+    @_read_only
     async def get_all_accounts_summary(self) -> AccountSummaryList:
         """Get summary of all accounts with ID, created date, starting balance, and current balance."""
         from sqlalchemy import select
@@ -435,7 +668,8 @@ class TradingService:
                 raise NotFoundError(f"Invalid symbol: {symbol}")
 
             # Use the quote adapter to get real market data
-            quote = await self.quote_adapter.get_quote(asset)
+            with timed_phase("adapter"):
+                quote = await self.quote_adapter.get_quote(asset)
             if quote is None:
                 raise NotFoundError(f"Symbol {symbol} not found")
 
@@ -452,6 +686,7 @@ class TradingService:
             # If adapter fails, raise a not found error
             raise NotFoundError(f"Symbol {symbol} not found: {e!s}") from e
 
+    @_unit_of_work
     async def create_order(self, order_data: OrderCreate) -> Order:
         """Create a new trading order."""
         # Validate symbol exists
@@ -478,12 +713,117 @@ class TradingService:
             db.add(db_order)
             await db.commit()
             await db.refresh(db_order)
+            self.publish_order_event("created", db_order, account.id)
 
             # Use converter to convert to schema
             return await self.order_converter.to_schema(db_order)
 
         return await self._execute_with_session(_operation)
 
+    @_unit_of_work
+    async def create_orders_bulk(
+        self, orders_data: list[OrderCreate]
+    ) -> list[BulkOrderResult]:
+        """
+        Create many orders with one quote batch and one insert.
+
+        Symbols are validated in a single pass and quoted with one
+        get_quotes call for all distinct symbols. The accepted orders are
+        written with one multi-row INSERT ... RETURNING and one commit. An
+        order whose symbol is invalid or unquoted is rejected on its own;
+        the rest of the batch is still created.
+
+        Returns:
+            One result per submitted order, in request order
+        """
+        if len(orders_data) > MAX_BULK_ORDERS:
+            raise InputValidationError(
+                f"Bulk submissions are limited to {MAX_BULK_ORDERS} orders"
+            )
+
+        results: list[BulkOrderResult | None] = [None] * len(orders_data)
+        assets = {}
+        for index, order_data in enumerate(orders_data):
+            symbol = order_data.symbol.upper()
+            if symbol not in assets:
+                try:
+                    assets[symbol] = asset_factory(symbol)
+                except ValueError:
+                    assets[symbol] = None
+            if assets[symbol] is None:
+                results[index] = BulkOrderResult(
+                    index=index, success=False, error=f"Invalid symbol: {symbol}"
+                )
+
+        valid_assets = [asset for asset in assets.values() if asset is not None]
+        try:
+            with timed_phase("adapter"):
+                quotes = (
+                    await self.quote_adapter.get_quotes(valid_assets)
+                    if valid_assets
+                    else {}
+                )
+        except Exception as e:
+            quotes = {}
+            logger.warning(f"Quote batch for bulk order submission failed: {e}")
+        quoted_symbols = {asset.symbol for asset in quotes}
+
+        accepted: list[tuple[int, dict[str, Any]]] = []
+        created_at = datetime.now()
+        for index, order_data in enumerate(orders_data):
+            if results[index] is not None:
+                continue
+            symbol = order_data.symbol.upper()
+            if symbol not in quoted_symbols:
+                results[index] = BulkOrderResult(
+                    index=index, success=False, error=f"Symbol {symbol} not found"
+                )
+                continue
+            accepted.append(
+                (
+                    index,
+                    {
+                        "id": f"order_{uuid4().hex[:8]}",
+                        "symbol": symbol,
+                        "order_type": order_data.order_type,
+                        "quantity": order_data.quantity,
+                        "price": order_data.price,
+                        "condition": order_data.condition,
+                        "stop_price": order_data.stop_price,
+                        "trail_percent": order_data.trail_percent,
+                        "trail_amount": order_data.trail_amount,
+                        "status": OrderStatus.PENDING,
+                        "created_at": created_at,
+                    },
+                )
+            )
+
+        async def _operation(db: AsyncSession):
+            account = await self._get_account()
+            for _, values in accepted:
+                values["account_id"] = account.id
+
+            stmt = (
+                insert(DBOrder)
+                .values([values for _, values in accepted])
+                .returning(DBOrder)
+            )
+            result = await db.execute(stmt)
+            db_orders = {db_order.id: db_order for db_order in result.scalars().all()}
+            await db.commit()
+
+            for index, values in accepted:
+                db_order = db_orders[values["id"]]
+                self.publish_order_event("created", db_order, account.id)
+                order = await self.order_converter.to_schema(db_order)
+                results[index] = BulkOrderResult(index=index, success=True, order=order)
+
+        if accepted:
+            await self._execute_with_session(_operation)
+
+        return [result for result in results if result is not None]
+
+    @_read_only
     async def get_orders(self) -> list[Order]:
         """Get all orders."""
         from sqlalchemy import select
@@ -504,6 +844,114 @@ class TradingService:
 
         return await self._execute_with_session(_operation)
 
+    @_read_only
+    async def get_orders_page(
+        self,
+        limit: int | None = None,
+        cursor: str | None = None,
+        status: list[OrderStatus] | None = None,
+        asset_class: OrderAssetClass | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> OrderPage:
+        """
+        Get one page of order history, newest first.
+
+        Pages are keyed on (created_at, id), so each page is a range scan of
+        idx_orders_account_created no matter how deep into the history it is.
+        All filters are applied in SQL. Without a limit or cursor the whole
+        matching history is returned as a single page, as before pagination.
+
+        Args:
+            limit: Maximum orders per page (capped at MAX_ORDER_PAGE_SIZE);
+                DEFAULT_ORDER_PAGE_SIZE when only a cursor is given
+            cursor: next_cursor from the previous page
+            status: Only return orders in these statuses
+            asset_class: Only return stock or option orders
+            created_after: Only orders created at or after this time
+            created_before: Only orders created before this time
+        """
+        if limit is None and cursor is not None:
+            limit = DEFAULT_ORDER_PAGE_SIZE
+        if limit is not None:
+            if limit < 1:
+                raise InputValidationError("limit must be at least 1")
+            limit = min(limit, MAX_ORDER_PAGE_SIZE)
+
+        async def _operation(db: AsyncSession):
+            account = await self._get_account()
+
+            stmt = select(DBOrder).where(DBOrder.account_id == account.id)
+            if cursor is not None:
+                cursor_created_at, cursor_id = _decode_order_cursor(cursor)
+                stmt = stmt.where(
+                    tuple_(DBOrder.created_at, DBOrder.id)
+                    < tuple_(cursor_created_at, cursor_id)
+                )
+            if status:
+                stmt = stmt.where(DBOrder.status.in_(status))
+            if asset_class == OrderAssetClass.OPTION:
+                stmt = stmt.where(_option_symbol_clause())
+            elif asset_class == OrderAssetClass.STOCK:
+                stmt = stmt.where(~_option_symbol_clause())
+            if created_after is not None:
+                stmt = stmt.where(DBOrder.created_at >= created_after)
+            if created_before is not None:
+                stmt = stmt.where(DBOrder.created_at < created_before)
+
+            stmt = stmt.order_by(DBOrder.created_at.desc(), DBOrder.id.desc())
+            if limit is not None:
+                # Fetch one extra row to learn whether another page follows
+                stmt = stmt.limit(limit + 1)
+            result = await db.execute(stmt)
+            db_orders = list(result.scalars().all())
+
+            has_more = limit is not None and len(db_orders) > limit
+            db_orders = db_orders[:limit]
+            orders = [
+                await self.order_converter.to_schema(db_order) for db_order in db_orders
+            ]
+
+            next_cursor = None
+            if has_more:
+                last = db_orders[-1]
+                next_cursor = _encode_order_cursor(last.created_at, last.id)  # type: ignore[arg-type]
+            return OrderPage(orders=orders, next_cursor=next_cursor, has_more=has_more)
+
+        return await self._execute_with_session(_operation)
+
+    async def stream_orders(
+        self,
+        batch_size: int = MAX_ORDER_PAGE_SIZE,
+        status: list[OrderStatus] | None = None,
+        asset_class: OrderAssetClass | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> AsyncIterator[Order]:
+        """
+        Stream an account's full order history, newest first.
+
+        Walks the keyset pages one batch at a time; each batch is its own
+        short query, so exports hold neither a transaction nor the whole
+        history in memory.
+        """
+        cursor = None
+        while True:
+            page = await self.get_orders_page(
+                limit=batch_size,
+                cursor=cursor,
+                status=status,
+                asset_class=asset_class,
+                created_after=created_after,
+                created_before=created_before,
+            )
+            for order in page.orders:
+                yield order
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
+    @_read_only
     async def get_order(self, order_id: str) -> Order:
         """Get a specific order by ID."""
         from sqlalchemy import select
@@ -525,6 +973,7 @@ class TradingService:
 
         return await self._execute_with_session(_operation)
 
+    @_unit_of_work
     async def cancel_order(self, order_id: str) -> dict[str, str]:
         """Cancel a specific order."""
         from sqlalchemy import select
@@ -543,11 +992,13 @@ class TradingService:
 
             db_order.status = OrderStatus.CANCELLED
             await db.commit()
+            self.publish_order_event("cancelled", db_order, account.id)
 
             return {"message": "Order cancelled successfully"}
 
         return await self._execute_with_session(_operation)
 
+    @_unit_of_work
     async def cancel_all_stock_orders(self) -> dict[str, Any]:
         """Cancel all open stock orders."""
         from sqlalchemy import select
@@ -580,6 +1031,8 @@ class TradingService:
                 )
 
             await db.commit()
+            for order in open_stock_orders:
+                self.publish_order_event("cancelled", order, account.id)
 
             return {
                 "message": f"Cancelled {len(cancelled_orders)} stock orders",
@@ -589,6 +1042,7 @@ class TradingService:
 
         return await self._execute_with_session(_operation)
 
+    @_unit_of_work
     async def cancel_all_option_orders(self) -> dict[str, Any]:
         """Cancel all open option orders."""
         from sqlalchemy import select
@@ -626,6 +1080,8 @@ class TradingService:
                 )
 
             await db.commit()
+            for order in open_option_orders:
+                self.publish_order_event("cancelled", order, account.id)
 
             return {
                 "message": f"Cancelled {len(cancelled_orders)} option orders",
@@ -635,134 +1091,181 @@ class TradingService:
 
         return await self._execute_with_session(_operation)
 
-    async def get_portfolio(self, account_id: str | None = None) -> Portfolio:
-        """Get complete portfolio information."""
-        from sqlalchemy import select
+    def publish_order_event(
+        self, event: str, order: Order | DBOrder, account_id: str
+    ) -> None:
+        """Stream a committed order change to subscribers, if a hub is set."""
+        if self.event_hub is not None:
+            self.event_hub.publish_order(event, order, account_id)
 
-        async def _operation(db: AsyncSession):
-            account = await self._get_account(account_id)
+    def _latest_quote_price(self) -> Any:
+        """
+        Lateral subquery yielding a position's latest cached quote price.
 
-            stmt = select(DBPosition).where(DBPosition.account_id == account.id)
-            result = await db.execute(stmt)
-            db_positions = result.scalars().all()
+        Picks the symbol's most recent test_stock_quotes price from the last
+        24 hours (served by idx_test_stock_symbol_date); joins as NULL when
+        no recent quote exists.
+        """
+        cutoff_date = (datetime.now(UTC) - timedelta(hours=24)).date()
+        return (
+            select(DevStockQuote.price)
+            .where(
+                DevStockQuote.symbol == DBPosition.symbol,
+                DevStockQuote.quote_date >= cutoff_date,
+            )
+            .order_by(DevStockQuote.quote_date.desc())
+            .limit(1)
+            .correlate(DBPosition)
+            .lateral("latest_quote")
+        )
 
-            # Convert database positions to schema positions using converter
-            # Fetch all quotes concurrently for better performance
-            import asyncio
+    async def _fetch_positions_with_prices(
+        self, db: AsyncSession, account_id: str, symbol: str | None = None
+    ) -> list[tuple[DBPosition, float | None]]:
+        """
+        Load an account's positions joined with the latest cached quote price.
 
-            positions = []
-            if not db_positions:
-                # No positions to process
-                pass
-            else:
-                # Get unique symbols
-                symbols = list({db_pos.symbol for db_pos in db_positions})
-
-                # For portfolio calculations, use cached prices to avoid slow API calls
-                async def get_cached_price_safe(symbol: str):
-                    try:
-                        # Try to get cached price from test_stock_quotes table
-                        from datetime import datetime, timedelta, timezone
-
-                        from sqlalchemy import text
-
-                        # Check for recent cached quote (within last 24 hours)
-                        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-
-                        # Use raw query since test_stock_quotes might not have ORM model
-                        cached_stmt = text("""
-                            SELECT symbol, price, quote_date 
-                            FROM test_stock_quotes 
-                            WHERE symbol = :symbol 
-                            AND quote_date >= :cutoff_time
-                            ORDER BY quote_date DESC 
-                            LIMIT 1
-                        """)
-
-                        cached_result = await db.execute(
-                            cached_stmt, {"symbol": symbol, "cutoff_time": cutoff_time}
-                        )
-                        cached_row = cached_result.fetchone()
+        One round-trip: each position is paired with its symbol's most recent
+        cached price via a lateral join. The price is None when no recent
+        quote exists. With ``symbol`` only that position is read, through
+        idx_positions_account_symbol. Full results are kept in the active
+        operation scope.
+        """
+        scope = current_operation_scope()
+        if scope is not None and account_id in scope.positions:
+            rows = scope.positions[account_id]
+            if symbol is None:
+                return rows
+            return [row for row in rows if row[0].symbol == symbol.upper()]
+
+        latest_quote = self._latest_quote_price()
+        stmt = (
+            select(DBPosition, latest_quote.c.price)
+            .outerjoin(latest_quote, true())
+            .where(DBPosition.account_id == account_id)
+        )
+        if symbol is not None:
+            stmt = stmt.where(DBPosition.symbol == symbol.upper())
+
+        result = await db.execute(stmt)
+        rows = [
+            (db_pos, float(price) if price is not None else None)
+            for db_pos, price in result.all()
+        ]
+        if scope is not None and symbol is None:
+            scope.positions[account_id] = rows
+        return rows
+
+    async def _fetch_position_totals(
+        self, db: AsyncSession, account_id: str
+    ) -> tuple[int, float, float]:
+        """
+        Aggregate an account's positions in the database.
 
-                        if cached_row:
-                            # Use cached price
-                            from app.schemas.quotes import (
-                                StockQuote as StockQuoteSchema,
-                            )
+        Returns:
+            (position count, invested value, unrealized P&L), valuing each
+            position at its latest cached price or its average price
+        """
+        scope = current_operation_scope()
+        if scope is not None and account_id in scope.positions:
+            # Rows already loaded in this operation; sum them in memory
+            rows = scope.positions[account_id]
+            invested_value = 0.0
+            unrealized_pnl = 0.0
+            for db_pos, price in rows:
+                mark = price if price is not None else db_pos.avg_price
+                invested_value += db_pos.quantity * mark
+                unrealized_pnl += (mark - db_pos.avg_price) * db_pos.quantity
+            return len(rows), invested_value, unrealized_pnl
+
+        latest_quote = self._latest_quote_price()
+        mark_price = func.coalesce(latest_quote.c.price, DBPosition.avg_price)
+        stmt = (
+            select(
+                func.count(DBPosition.id),
+                func.coalesce(func.sum(DBPosition.quantity * mark_price), 0),
+                func.coalesce(
+                    func.sum((mark_price - DBPosition.avg_price) * DBPosition.quantity),
+                    0,
+                ),
+            )
+            .select_from(DBPosition)
+            .outerjoin(latest_quote, true())
+            .where(DBPosition.account_id == account_id)
+        )
+        result = await db.execute(stmt)
+        count, invested_value, unrealized_pnl = result.one()
+        return int(count), float(invested_value), float(unrealized_pnl)
+
+    def _load_valuation(
+        self, account_id: str, rows: list[tuple[DBPosition, float | None]]
+    ) -> ValuationSnapshot | None:
+        """Rebuild the account's in-memory valuation from position rows."""
+        if self.valuation_store is None:
+            return None
+        return self.valuation_store.load(account_id, self._valuation_rows(rows))
+
+    @staticmethod
+    def _valuation_rows(
+        rows: list[tuple[DBPosition, float | None]],
+    ) -> list[tuple[str, float, float, float]]:
+        return [
+            (
+                db_pos.symbol,
+                db_pos.quantity,
+                db_pos.avg_price,
+                price if price is not None else db_pos.avg_price,
+            )
+            for db_pos, price in rows
+        ]
 
-                            quote = StockQuoteSchema(
-                                symbol=cached_row[0],  # symbol
-                                price=float(cached_row[1]),  # price
-                                quote_date=cached_row[2],  # quote_date
-                                asset=None,
-                            )
-                            return symbol, quote
-                        else:
-                            # No cached data available, return None (will use avg_price)
-                            return symbol, None
-                    except Exception:
-                        return symbol, None
-
-                quote_tasks = [get_cached_price_safe(symbol) for symbol in symbols]
-                quote_results = await asyncio.gather(
-                    *quote_tasks, return_exceptions=True
-                )
+    async def _get_valuation_totals(
+        self, db: AsyncSession, account_id: str
+    ) -> tuple[int, float, float]:
+        """
+        Get (position count, invested value, unrealized P&L) for an account.
 
-                # Build quote lookup dict
-                quotes: dict[str, Any] = {}
-                for quote_result in quote_results:
-                    if (
-                        not isinstance(quote_result, BaseException)
-                        and isinstance(quote_result, tuple)
-                        and len(quote_result) == 2
-                    ):
-                        symbol, quote = quote_result
-                        if isinstance(symbol, str):
-                            quotes[symbol] = quote
-
-                # Process positions with fetched quotes
-                for db_pos in db_positions:
-                    # Use pre-fetched quote data
-                    quote = quotes.get(db_pos.symbol, None)
-                    try:
-                        if quote and hasattr(quote, "price"):
-                            current_price = quote.price
-                        else:
-                            current_price = db_pos.avg_price
+        Served from the valuation store when it holds a fresh valuation;
+        otherwise the positions are re-read to reconcile it. Without a store
+        the totals are aggregated in SQL.
+        """
+        if self.valuation_store is None:
+            return await self._fetch_position_totals(db, account_id)
+
+        snapshot = self.valuation_store.get(account_id)
+        if snapshot is None:
+            rows = await self._fetch_positions_with_prices(db, account_id)
+            snapshot = self.valuation_store.load(account_id, self._valuation_rows(rows))
+        return (
+            snapshot.positions_count,
+            snapshot.invested_value,
+            snapshot.unrealized_pnl,
+        )
 
-                        # Use position converter with current price
-                        position = await self.position_converter.to_schema(
-                            db_pos, current_price
-                        )
-                        positions.append(position)
-                    except Exception as convert_error:
-                        # If position conversion fails, log error but don't skip
-                        print(
-                            f"⚠️ Position conversion failed for {db_pos.symbol}: {convert_error}"
-                        )
-                        # Try to create a basic position with minimal data to avoid data loss
-                        try:
-                            from app.schemas.positions import Position
-
-                            # Truncate symbol if too long for validation
-                            symbol = db_pos.symbol[:20] if len(db_pos.symbol) > 20 else db_pos.symbol
-
-                            basic_position = Position(
-                                symbol=symbol,
-                                quantity=db_pos.quantity,
-                                avg_price=db_pos.avg_price,
-                                current_price=db_pos.avg_price,
-                                unrealized_pnl=0.0,
-                                realized_pnl=0.0,
-                                asset=None,
-                            )
-                            positions.append(basic_position)
-                        except Exception as validation_error:
-                            # If even basic position creation fails, log and skip this position
-                            print(
-                                f"⚠️ Basic position creation failed for {db_pos.symbol}: {validation_error}"
-                            )
-                            # Skip this position entirely to avoid breaking portfolio calculation
+    async def _to_positions(
+        self, rows: list[tuple[DBPosition, float | None]]
+    ) -> list[Position]:
+        """Convert position rows, falling back to average price when unquoted."""
+        return await self.position_converter.to_schema_many(
+            [
+                (db_pos, price if price is not None else db_pos.avg_price)
+                for db_pos, price in rows
+            ]
+        )
+
+    @_read_only
+    async def get_portfolio(self, account_id: str | None = None) -> Portfolio:
+        """Get complete portfolio information."""
+
+        async def _operation(db: AsyncSession):
+            account = await self._get_account(account_id)
+
+            # Positions and their latest cached prices in a single query,
+            # converted in one pass
+            rows = await self._fetch_positions_with_prices(db, account.id)
+            # A full read doubles as a reconciliation of the running totals
+            self._load_valuation(account.id, rows)
+            positions = await self._to_positions(rows)
 
             total_invested = sum(
                 pos.quantity * (pos.current_price or 0) for pos in positions
@@ -780,45 +1283,68 @@ class TradingService:
 
         return await self._execute_with_session(_operation)
 
+    @_read_only
     async def get_portfolio_summary(
         self, account_id: str | None = None
     ) -> PortfolioSummary:
         """Get portfolio summary."""
-        # Use get_portfolio to get updated positions from database
-        portfolio = await self.get_portfolio(account_id)
 
-        invested_value = sum(
-            pos.quantity * (pos.current_price or 0) for pos in portfolio.positions
-        )
-        total_value = portfolio.cash_balance + invested_value
-        total_pnl = sum(pos.unrealized_pnl or 0 for pos in portfolio.positions)
-
-        return PortfolioSummary(
-            total_value=total_value,
-            cash_balance=portfolio.cash_balance,
-            invested_value=invested_value,
-            daily_pnl=total_pnl,
-            daily_pnl_percent=(total_pnl / total_value) * 100 if total_value > 0 else 0,
-            total_pnl=total_pnl,
-            total_pnl_percent=(total_pnl / total_value) * 100 if total_value > 0 else 0,
-        )
+        async def _operation(db: AsyncSession):
+            account = await self._get_account(account_id)
+            # Totals are summed in the database; no positions are converted
+            _, invested_value, total_pnl = await self._get_valuation_totals(
+                db, account.id
+            )
+            cash_balance = float(account.cash_balance)
+            total_value = cash_balance + invested_value
 
+            return PortfolioSummary(
+                total_value=total_value,
+                cash_balance=cash_balance,
+                invested_value=invested_value,
+                daily_pnl=total_pnl,
+                daily_pnl_percent=(total_pnl / total_value) * 100
+                if total_value > 0
+                else 0,
+                total_pnl=total_pnl,
+                total_pnl_percent=(total_pnl / total_value) * 100
+                if total_value > 0
+                else 0,
+            )
+
+        return await self._execute_with_session(_operation)
+
+    @_read_only
     async def get_positions(self) -> list[Position]:
         """Get all portfolio positions."""
-        # Use get_portfolio to get updated positions from database
-        portfolio = await self.get_portfolio()
-        return portfolio.positions
 
+        async def _operation(db: AsyncSession):
+            account = await self._get_account()
+            rows = await self._fetch_positions_with_prices(db, account.id)
+            return await self._to_positions(rows)
+
+        return await self._execute_with_session(_operation)
+
+    @_read_only
     async def get_position(self, symbol: str) -> Position:
         """Get a specific position by symbol."""
-        portfolio = await self.get_portfolio()
-        for position in portfolio.positions:
-            if position.symbol.upper() == symbol.upper():
-                return position
-        raise NotFoundError(f"Position for symbol {symbol} not found")
+
+        async def _operation(db: AsyncSession):
+            account = await self._get_account()
+            # Reads and values only the requested position
+            rows = await self._fetch_positions_with_prices(
+                db, account.id, symbol=symbol
+            )
+            for position in await self._to_positions(rows):
+                if position.symbol.upper() == symbol.upper():
+                    return position
+            raise NotFoundError(f"Position for symbol {symbol} not found")
+
+        return await self._execute_with_session(_operation)
 
     # Enhanced Options Trading Methods
 
+    @_read_only
     async def get_portfolio_greeks(self) -> dict[str, Any]:
         """Get aggregated Greeks for entire portfolio."""
         from .strategies import aggregate_portfolio_greeks
@@ -864,6 +1390,7 @@ class TradingService:
             },
         }
 
+    @_read_only
     async def get_position_greeks(self, symbol: str) -> dict[str, Any]:
         """Get Greeks for a specific position."""
         position = await self.get_position(symbol)
@@ -956,7 +1483,8 @@ class TradingService:
             raise NotFoundError(f"Invalid symbol: {symbol}")
 
         # Use the quote adapter to get real market data
-        quote = await self.quote_adapter.get_quote(asset)
+        with timed_phase("adapter"):
+            quote = await self.quote_adapter.get_quote(asset)
         if quote:
             return quote
 
@@ -972,7 +1500,8 @@ class TradingService:
             if expiration_date
             else None
         )
-        chain = await self.quote_adapter.get_options_chain(underlying, exp_datetime)
+        with timed_phase("adapter"):
+            chain = await self.quote_adapter.get_options_chain(underlying, exp_datetime)
         if chain is None:
             raise NotFoundError(f"No options chain found for {underlying}")
         return chain
@@ -1002,6 +1531,7 @@ class TradingService:
             option_price=option_quote.price,
         )
 
+    @_read_only
     async def validate_account_state(self) -> bool:
         """Validate current account state."""
         cash_balance = await self.get_account_balance()
@@ -1013,14 +1543,15 @@ class TradingService:
     async def get_expiration_dates(self, underlying: str) -> list[date]:
         """Get available expiration dates for an underlying symbol."""
         if hasattr(self.quote_adapter, "get_expiration_dates"):
-            if asyncio.iscoroutinefunction(self.quote_adapter.get_expiration_dates):
-                return await self.quote_adapter.get_expiration_dates(underlying)
-            else:
+            with timed_phase("adapter"):
+                if asyncio.iscoroutinefunction(self.quote_adapter.get_expiration_dates):
+                    return await self.quote_adapter.get_expiration_dates(underlying)
                 return self.quote_adapter.get_expiration_dates(underlying)
         else:
             # Fallback to empty list if adapter doesn't support expiration dates
             return []
 
+    @_unit_of_work
     async def create_multi_leg_order(self, order_data: Any) -> Order:
         """Create a multi-leg order."""
         # For now, create a simple order representation
@@ -1063,6 +1594,7 @@ class TradingService:
             db.add(db_order)
             await db.commit()
             await db.refresh(db_order)
+            self.publish_order_event("filled", order, account.id)
 
         await self._execute_with_session(_operation)
 
@@ -1073,12 +1605,18 @@ class TradingService:
         symbol: str,
         expiration_date: str | None = None,
         option_type: str | None = None,
+        fields: str | list[str] | None = None,
+        strike_window: int | None = None,
+        encoding: str = "records",
     ) -> dict[str, Any]:
         """
         Find tradable options for a symbol with optional filtering.
 
         This method provides a unified interface that works with both
         test data and live market data adapters.
+
+        ``fields``, ``strike_window`` and ``encoding`` shape the options the
+        same way as in get_formatted_options_chain.
         """
         try:
             # Get the full options chain
@@ -1111,10 +1649,21 @@ class TradingService:
             if option_type is None or option_type.lower() == "put":
                 target_options.extend(chain.puts)
 
+            keep_strikes = strikes_near(
+                (q.asset.strike for q in target_options if isinstance(q.asset, Option)),
+                chain.underlying_price,
+                strike_window,
+            )
+
             # Convert to API format
             for option_quote in target_options:
                 if not isinstance(option_quote.asset, Option):
                     continue
+                if (
+                    keep_strikes is not None
+                    and option_quote.asset.strike not in keep_strikes
+                ):
+                    continue
 
                 option_data = {
                     "symbol": option_quote.asset.symbol,
@@ -1140,7 +1689,8 @@ class TradingService:
                     "expiration_date": expiration_date,
                     "option_type": option_type,
                 },
-                "options": options,
+                "encoding": encoding,
+                "options": shape_rows(options, parse_fields(fields), encoding),
                 "total_found": len(options),
             }
 
@@ -1267,7 +1817,8 @@ class TradingService:
 
             # For now, use the adapter's extended functionality if available
             if hasattr(self.quote_adapter, "get_stock_info"):
-                result = await self.quote_adapter.get_stock_info(symbol)
+                with timed_phase("adapter"):
+                    result = await self.quote_adapter.get_stock_info(symbol)
                 return dict(result) if result else {}
             else:
                 # Fallback to basic quote data
@@ -1296,6 +1847,121 @@ class TradingService:
         except Exception as e:
             return {"error": str(e)}
 
+    async def get_stock_info_batch(
+        self, symbols: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Get company information for many stocks concurrently, keyed by symbol."""
+        if len(symbols) > MAX_BATCH_QUOTE_SYMBOLS:
+            raise InputValidationError(
+                f"At most {MAX_BATCH_QUOTE_SYMBOLS} symbols can be looked up at once"
+            )
+        unique = list(dict.fromkeys(s.strip().upper() for s in symbols))
+        results = await asyncio.gather(*(self.get_stock_info(s) for s in unique))
+        return dict(zip(unique, results, strict=True))
+
+    async def get_quotes_batch(
+        self, symbols: list[str], include_greeks: bool = True
+    ) -> dict[str, Any]:
+        """
+        Get quotes for many stocks and options with a single adapter call.
+
+        Underlyings of requested options are quoted in the same call, and
+        option Greeks are computed in one vectorized pass.
+
+        Args:
+            symbols: Stock and/or option symbols
+            include_greeks: Whether to compute Greeks for option symbols
+
+        Returns:
+            Dict with ``columns`` (one list per field, one entry per quoted
+            symbol, in request order) and ``errors`` keyed by symbol
+        """
+        if len(symbols) > MAX_BATCH_QUOTE_SYMBOLS:
+            raise InputValidationError(
+                f"At most {MAX_BATCH_QUOTE_SYMBOLS} symbols can be quoted at once"
+            )
+
+        errors: dict[str, str] = {}
+        assets: dict[str, Any] = {}
+        for symbol in dict.fromkeys(s.strip().upper() for s in symbols):
+            try:
+                asset = asset_factory(symbol)
+            except ValueError:
+                asset = None
+            if asset is None:
+                errors[symbol] = "Invalid symbol"
+            else:
+                assets[symbol] = asset
+
+        options = {s: a for s, a in assets.items() if isinstance(a, Option)}
+        underlyings = {
+            a.underlying.symbol: a.underlying
+            for a in options.values()
+            if a.underlying.symbol not in assets
+        }
+        with timed_phase("adapter"):
+            quotes = await self.quote_adapter.get_quotes(
+                [*assets.values(), *underlyings.values()]
+            )
+        prices = {asset.symbol: quote.price for asset, quote in quotes.items()}
+
+        quoted: list[tuple[str, Quote]] = []
+        for symbol, asset in assets.items():
+            quote = quotes.get(asset)
+            if quote is None:
+                errors[symbol] = "No quote available"
+                continue
+            quoted.append((symbol, quote))
+
+        columns: dict[str, list[Any]] = {
+            "symbol": [symbol for symbol, _ in quoted],
+            "price": [quote.price for _, quote in quoted],
+            "bid": [quote.bid for _, quote in quoted],
+            "ask": [quote.ask for _, quote in quoted],
+            "volume": [quote.volume for _, quote in quoted],
+        }
+
+        if options:
+            # None in the stock rows of each option column
+            option_assets = [options.get(symbol) for symbol, _ in quoted]
+            underlying_prices = [
+                (
+                    getattr(quote, "underlying_price", None)
+                    or prices.get(asset.underlying.symbol)
+                )
+                if asset is not None
+                else None
+                for asset, (_, quote) in zip(option_assets, quoted, strict=True)
+            ]
+            columns["underlying_price"] = underlying_prices
+            columns["strike"] = [a.strike if a else None for a in option_assets]
+            columns["expiration"] = [
+                a.expiration_date.isoformat() if a else None for a in option_assets
+            ]
+            columns["option_type"] = [
+                a.option_type.lower() if a else None for a in option_assets
+            ]
+
+            if include_greeks:
+                today = datetime.now().date()
+                greeks = calculate_option_greeks_batch(
+                    option_types=[a.option_type if a else "" for a in option_assets],
+                    strikes=[a.strike if a else 0.0 for a in option_assets],
+                    underlying_prices=underlying_prices,
+                    days_to_expiration=[
+                        a.get_days_to_expiration(today) if a else None
+                        for a in option_assets
+                    ],
+                    option_prices=[quote.price for _, quote in quoted],
+                )
+                for name, values in greeks.items():
+                    columns[name] = [
+                        None if math.isnan(value) else round(float(value), 6)
+                        for value in values
+                    ]
+
+        return {"count": len(quoted), "columns": columns, "errors": errors}
+
     async def get_price_history(
         self, symbol: str, period: str = "week"
     ) -> dict[str, Any]:
@@ -1312,7 +1978,8 @@ class TradingService:
 
             # For now, use the adapter's extended functionality if available
             if hasattr(self.quote_adapter, "get_price_history"):
-                result = await self.quote_adapter.get_price_history(symbol, period)
+                with timed_phase("adapter"):
+                    result = await self.quote_adapter.get_price_history(symbol, period)
                 return dict(result) if result else {}
             else:
                 # Fallback to current quote only
@@ -1401,6 +2068,9 @@ class TradingService:
         min_strike: float | None = None,
         max_strike: float | None = None,
         include_greeks: bool = True,
+        fields: str | list[str] | None = None,
+        strike_window: int | None = None,
+        encoding: str = "records",
     ) -> dict[str, Any]:
         """
         Get formatted options chain with filtering and optional Greeks.
@@ -1411,6 +2081,11 @@ class TradingService:
             min_strike: Minimum strike price filter
             max_strike: Maximum strike price filter
             include_greeks: Whether to include Greeks in response
+            fields: Contract fields to return, e.g. "symbol,strike,bid,ask,delta"
+            strike_window: Keep only this many strikes below and at/above the
+                underlying price
+            encoding: "records" (one dict per contract) or "table" (one list
+                per field)
 
         Returns:
             Dict containing formatted options chain data
@@ -1418,6 +2093,16 @@ class TradingService:
         try:
             # Get the raw options chain
             chain = await self.get_options_chain(symbol, expiration_date)
+            selected_fields = parse_fields(fields)
+            keep_strikes = strikes_near(
+                (
+                    q.asset.strike
+                    for q in [*chain.calls, *chain.puts]
+                    if isinstance(q.asset, Option)
+                ),
+                chain.underlying_price,
+                strike_window,
+            )
 
             # Format the response
             formatted_calls = []
@@ -1435,6 +2120,8 @@ class TradingService:
                     continue
                 if max_strike is not None and strike > max_strike:
                     continue
+                if keep_strikes is not None and strike not in keep_strikes:
+                    continue
 
                 call_data = {
                     "symbol": call_quote.asset.symbol,
@@ -1473,6 +2160,8 @@ class TradingService:
                     continue
                 if max_strike is not None and strike > max_strike:
                     continue
+                if keep_strikes is not None and strike not in keep_strikes:
+                    continue
 
                 put_data = {
                     "symbol": put_quote.asset.symbol,
@@ -1506,8 +2195,9 @@ class TradingService:
                     chain.expiration_date.isoformat() if chain.expiration_date else None
                 ),
                 "quote_time": datetime.now().isoformat(),
-                "calls": formatted_calls,
-                "puts": formatted_puts,
+                "encoding": encoding,
+                "calls": shape_rows(formatted_calls, selected_fields, encoding),
+                "puts": shape_rows(formatted_puts, selected_fields, encoding),
             }
 
         except Exception as e:
@@ -1572,6 +2262,7 @@ class TradingService:
         except Exception as e:
             raise ValueError(f"Failed to create multi-leg order: {e!s}") from e
 
+    @_unit_of_work
     async def simulate_expiration(
         self, processing_date: str | None = None, dry_run: bool = True
     ) -> dict[str, Any]:
@@ -1592,14 +2283,14 @@ class TradingService:
             else:
                 process_date = datetime.now().date()
 
-            # Get current portfolio positions
-            portfolio = await self.get_portfolio()
+            # Only positions are needed; skip building the full portfolio
+            positions = await self.get_positions()
 
             expiring_positions = []
             non_expiring_positions = []
             total_impact = 0.0
 
-            for position in portfolio.positions:
+            for position in positions:
                 try:
                     # Check if position is an option
                     asset = asset_factory(position.symbol)
@@ -1712,7 +2403,7 @@ class TradingService:
             results = {
                 "processing_date": process_date.isoformat(),
                 "dry_run": dry_run,
-                "total_positions": len(portfolio.positions),
+                "total_positions": len(positions),
                 "expiring_positions": len(expiring_positions),
                 "non_expiring_positions": len(non_expiring_positions),
                 "total_impact": total_impact,
@@ -1753,7 +2444,8 @@ class TradingService:
         try:
             # Use the adapter's extended functionality if available
             if hasattr(self.quote_adapter, "get_market_hours"):
-                result = await self.quote_adapter.get_market_hours()
+                with timed_phase("adapter"):
+                    result = await self.quote_adapter.get_market_hours()
                 return dict(result) if result else {}
             else:
                 # Fallback to basic market status check
@@ -0,0 +1,147 @@
+"""
+Per-account pool of TradingService instances.
+
+Building a TradingService creates a quote adapter, execution engine,
+validators and converters, and a cold adapter has empty caches. MCP tool
+calls therefore lease a warm service for their account from this pool
+instead of constructing one per call.
+
+Pooled services never hold a database session of their own. Each service
+call opens one through its own operation scope, so a service can be shared
+by concurrent calls and reused after its session is closed.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING, Any
+
+from ..core.config import settings
+
+if TYPE_CHECKING:
+    from .trading_service import TradingService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PooledService:
+    service: "TradingService"
+    last_used: float
+
+
+@dataclass
+class ServicePoolStats:
+    """Service pool counters."""
+
+    hits: int = 0
+    misses: int = 0
+    constructions: int = 0
+    idle_evictions: int = 0
+    capacity_evictions: int = 0
+
+
+class TradingServicePool:
+    """
+    Bounded LRU pool of TradingService instances keyed by account owner.
+
+    Args:
+        factory: Builds a service for an account owner
+        max_size: Services kept before the least recently used is dropped
+        idle_timeout: Seconds a service may go unused before it is dropped
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], "TradingService"],
+        max_size: int = 64,
+        idle_timeout: float = 600.0,
+    ):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.stats = ServicePoolStats()
+
+        self._services: OrderedDict[str, _PooledService] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, account_owner: str) -> "TradingService":
+        """Get the pooled service for an account owner, building it if needed."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._services.get(account_owner)
+            if entry is not None:
+                entry.last_used = now
+                self._services.move_to_end(account_owner)
+                self.stats.hits += 1
+                return entry.service
+            self.stats.misses += 1
+
+        # Construct outside the lock; adapter creation can be slow
+        service = self.factory(account_owner)
+
+        with self._lock:
+            entry = self._services.get(account_owner)
+            if entry is not None:
+                # Another caller built one first; keep theirs
+                entry.last_used = now
+                return entry.service
+            self.stats.constructions += 1
+            self._services[account_owner] = _PooledService(service, now)
+            while len(self._services) > self.max_size:
+                evicted, _ = self._services.popitem(last=False)
+                self.stats.capacity_evictions += 1
+                logger.debug(f"Evicted trading service for {evicted} (pool full)")
+            return service
+
+    def _evict_idle(self, now: float) -> None:
+        # Entries are in least-recently-used order, so stop at the first live one
+        while self._services:
+            owner, entry = next(iter(self._services.items()))
+            if now - entry.last_used <= self.idle_timeout:
+                break
+            del self._services[owner]
+            self.stats.idle_evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._services.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool size, hit rate and construction counts."""
+        with self._lock:
+            lookups = self.stats.hits + self.stats.misses
+            return {
+                "size": len(self._services),
+                "max_size": self.max_size,
+                "idle_timeout": self.idle_timeout,
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "hit_rate": self.stats.hits / lookups if lookups else 0.0,
+                "constructions": self.stats.constructions,
+                "idle_evictions": self.stats.idle_evictions,
+                "capacity_evictions": self.stats.capacity_evictions,
+            }
+
+
+def _create_service(account_owner: str) -> "TradingService":
+    from ..core.service_factory import create_trading_service
+
+    return create_trading_service(account_owner)
+
+
+# Global pool used by MCP tools
+trading_service_pool = TradingServicePool(
+    _create_service,
+    max_size=settings.TRADING_SERVICE_POOL_SIZE,
+    idle_timeout=settings.TRADING_SERVICE_POOL_IDLE_SECONDS,
+)
+
+
+def get_trading_service_pool() -> TradingServicePool:
+    """Get the global trading service pool."""
+    return trading_service_pool
@@ -0,0 +1,195 @@
+"""
+Compact on-disk snapshots of the order execution engine's trigger book.
+
+Rebuilding the trigger book from the database means re-reading every pending
+trigger order on startup. A snapshot stores just what the engine needs to
+monitor an order (id, symbol, trigger type, trigger price and water marks) in
+a small binary file, together with the database watermark it was synced to.
+On restart the engine restores the snapshot and only catches up on orders
+changed after that watermark.
+
+File layout (little-endian):
+    header:  magic (4s) | version (H) | watermark (d) | record count (I)
+    record:  id length (H) | symbol length (H) | trigger type (B) |
+             order type (B) | trigger price (d) | high water mark (d) |
+             low water mark (d) | created at (d) | id bytes | symbol bytes
+    trailer: CRC32 of header and records (I)
+
+Missing water marks are stored as NaN.
+"""
+
+import logging
+import math
+import os
+import struct
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..schemas.orders import OrderType
+
+if TYPE_CHECKING:
+    from .order_execution_engine import TriggerCondition
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"OTBK"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHdI")
+_RECORD = struct.Struct("<HHBBdddd")
+_TRAILER = struct.Struct("<I")
+
+# Trigger types and order types are both OrderType values; store their index.
+_ORDER_TYPES: list[str] = [order_type.value for order_type in OrderType]
+_ORDER_TYPE_CODES: dict[str, int] = {
+    value: code for code, value in enumerate(_ORDER_TYPES)
+}
+
+
+class SnapshotError(Exception):
+    """Snapshot file is missing, truncated or corrupt."""
+
+    pass
+
+
+@dataclass
+class TriggerBookSnapshot:
+    """Trigger conditions restored from a snapshot file."""
+
+    watermark: datetime
+    conditions: list["TriggerCondition"]
+
+
+def _encode_optional(value: float | None) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _decode_optional(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+def write_snapshot(
+    path: str | Path,
+    conditions: Iterable["TriggerCondition"],
+    watermark: datetime,
+) -> int:
+    """
+    Atomically write a trigger book snapshot.
+
+    The file is written to a temporary sibling, fsynced and renamed over the
+    target so a crash never leaves a half-written snapshot behind.
+
+    Returns:
+        Number of trigger conditions written
+    """
+    path = Path(path)
+    records = bytearray()
+    count = 0
+
+    for condition in conditions:
+        order_id = condition.order_id.encode("utf-8")
+        symbol = condition.symbol.encode("utf-8")
+        records += _RECORD.pack(
+            len(order_id),
+            len(symbol),
+            _ORDER_TYPE_CODES[condition.trigger_type],
+            _ORDER_TYPE_CODES[condition.order_type.value],
+            float(condition.trigger_price),
+            _encode_optional(condition.high_water_mark),
+            _encode_optional(condition.low_water_mark),
+            condition.created_at.timestamp(),
+        )
+        records += order_id
+        records += symbol
+        count += 1
+
+    payload = (
+        _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, watermark.timestamp(), count)
+        + records
+    )
+    payload += _TRAILER.pack(zlib.crc32(payload))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    logger.debug(f"Wrote trigger book snapshot with {count} conditions to {path}")
+    return count
+
+
+def read_snapshot(path: str | Path) -> TriggerBookSnapshot:
+    """
+    Read a trigger book snapshot.
+
+    Raises:
+        SnapshotError: If the file does not exist or fails validation
+    """
+    from .order_execution_engine import TriggerCondition
+
+    try:
+        data = Path(path).read_bytes()
+    except OSError as e:
+        raise SnapshotError(f"Cannot read snapshot {path}: {e}") from e
+
+    if len(data) < _HEADER.size + _TRAILER.size:
+        raise SnapshotError(f"Snapshot {path} is truncated")
+
+    body, trailer = data[: -_TRAILER.size], data[-_TRAILER.size :]
+    (checksum,) = _TRAILER.unpack(trailer)
+    if zlib.crc32(body) != checksum:
+        raise SnapshotError(f"Snapshot {path} failed checksum validation")
+
+    magic, version, watermark_ts, count = _HEADER.unpack_from(body, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"{path} is not a trigger book snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+
+    conditions: list[TriggerCondition] = []
+    offset = _HEADER.size
+    try:
+        for _ in range(count):
+            (
+                id_len,
+                symbol_len,
+                trigger_code,
+                order_type_code,
+                trigger_price,
+                high_water_mark,
+                low_water_mark,
+                created_at_ts,
+            ) = _RECORD.unpack_from(body, offset)
+            offset += _RECORD.size
+            order_id = body[offset : offset + id_len].decode("utf-8")
+            offset += id_len
+            symbol = body[offset : offset + symbol_len].decode("utf-8")
+            offset += symbol_len
+
+            condition = TriggerCondition(
+                order_id=order_id,
+                symbol=symbol,
+                trigger_type=_ORDER_TYPES[trigger_code],
+                trigger_price=trigger_price,
+                order_type=OrderType(_ORDER_TYPES[order_type_code]),
+            )
+            condition.created_at = datetime.fromtimestamp(created_at_ts)
+            condition.high_water_mark = _decode_optional(high_water_mark)
+            condition.low_water_mark = _decode_optional(low_water_mark)
+            conditions.append(condition)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise SnapshotError(f"Snapshot {path} is corrupt: {e}") from e
+
+    if offset != len(body):
+        raise SnapshotError(f"Snapshot {path} has trailing data")
+
+    return TriggerBookSnapshot(
+        watermark=datetime.fromtimestamp(watermark_ts), conditions=conditions
+    )
@@ -1,10 +1,19 @@
+import itertools
 import os
 import threading
+import time
+from collections import Counter
 from collections.abc import AsyncGenerator, Generator
 from contextlib import contextmanager
+from typing import Any
 
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
@@ -30,31 +39,140 @@ sync_engine = create_engine(
     echo=False,  # Set to True for SQL query debugging
 )
 
+
+def _to_async_url(url: str) -> str:
+    if "+asyncpg" not in url:
+        return url.replace("postgresql://", "postgresql+asyncpg://")
+    return url
+
+
 # Async engine - lazy initialization to avoid MissingGreenlet error
-if "+asyncpg" not in database_url:
-    ASYNC_DATABASE_URL = database_url.replace("postgresql://", "postgresql+asyncpg://")
-else:
-    ASYNC_DATABASE_URL = database_url
+ASYNC_DATABASE_URL = _to_async_url(database_url)
+
+# Read replicas (optional); reads fall back to the primary when none are set
+ASYNC_REPLICA_URLS = [
+    _to_async_url(url.strip())
+    for url in settings.DATABASE_REPLICA_URLS.split(",")
+    if url.strip()
+]
 
 # Thread-local storage for async database components
 _thread_local = threading.local()
 
 
+def _create_async_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        pool_size=5,  # Maximum number of permanent connections
+        max_overflow=10,  # Maximum number of overflow connections
+        pool_timeout=30,  # Timeout for getting connection from pool
+        pool_recycle=3600,  # Recycle connections after 1 hour
+        pool_pre_ping=True,  # Verify connections before use
+        echo=False,  # Set to True for SQL query debugging
+    )
+
+
 def get_async_engine():
     """Get or create the async engine (thread-local lazy initialization)."""
     if not hasattr(_thread_local, "async_engine") or _thread_local.async_engine is None:
-        _thread_local.async_engine = create_async_engine(
-            ASYNC_DATABASE_URL,
-            pool_size=5,  # Maximum number of permanent connections
-            max_overflow=10,  # Maximum number of overflow connections
-            pool_timeout=30,  # Timeout for getting connection from pool
-            pool_recycle=3600,  # Recycle connections after 1 hour
-            pool_pre_ping=True,  # Verify connections before use
-            echo=False,  # Set to True for SQL query debugging
-        )
+        _thread_local.async_engine = _create_async_engine(ASYNC_DATABASE_URL)
+        _register_engine("primary", _thread_local.async_engine)
     return _thread_local.async_engine
 
 
+def get_replica_engines() -> list[AsyncEngine]:
+    """Get or create the read-replica engines (thread-local lazy initialization)."""
+    if not hasattr(_thread_local, "replica_engines"):
+        _thread_local.replica_engines = []
+        for index, url in enumerate(ASYNC_REPLICA_URLS):
+            engine = _create_async_engine(url)
+            _register_engine(f"replica-{index}", engine)
+            _thread_local.replica_engines.append(engine)
+    return _thread_local.replica_engines
+
+
+class ReplicaRouter:
+    """
+    Routing policy for read-only sessions.
+
+    Reads are spread round-robin over the replicas. After an account writes,
+    its reads stay on the primary for ``sticky_seconds`` so it always sees
+    its own writes despite replication lag.
+    """
+
+    def __init__(self, sticky_seconds: float = 5.0):
+        self.sticky_seconds = sticky_seconds
+        self._last_write: dict[str, float] = {}
+        self._round_robin = itertools.count()
+        self._lock = threading.Lock()
+        self.routed: Counter[str] = Counter()
+
+    def record_write(self, key: str) -> None:
+        """Pin ``key``'s reads to the primary for the stickiness window."""
+        with self._lock:
+            self._last_write[key] = time.monotonic()
+
+    def is_sticky(self, key: str | None) -> bool:
+        if key is None:
+            return False
+        with self._lock:
+            last_write = self._last_write.get(key)
+            if last_write is None:
+                return False
+            if time.monotonic() - last_write > self.sticky_seconds:
+                del self._last_write[key]
+                return False
+            return True
+
+    def choose(self, key: str | None, replica_count: int) -> int | None:
+        """
+        Pick the engine for a read.
+
+        Returns:
+            Index of the replica to use, or None for the primary
+        """
+        if replica_count == 0:
+            self.routed["primary"] += 1
+            return None
+        if self.is_sticky(key):
+            self.routed["primary_sticky"] += 1
+            return None
+        index = next(self._round_robin) % replica_count
+        self.routed[f"replica-{index}"] += 1
+        return index
+
+
+replica_router = ReplicaRouter(sticky_seconds=settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+# Every engine created in any thread, for pool metrics
+_engines: list[tuple[str, AsyncEngine]] = []
+_engines_lock = threading.Lock()
+
+
+def _register_engine(name: str, engine: AsyncEngine) -> None:
+    with _engines_lock:
+        _engines.append((name, engine))
+
+
+def get_pool_metrics() -> dict[str, Any]:
+    """Get connection pool usage per engine and read routing counts."""
+    pools: dict[str, dict[str, int]] = {}
+    with _engines_lock:
+        engines = list(_engines)
+    for name, engine in engines:
+        pool: Any = engine.pool
+        metrics = pools.setdefault(
+            name,
+            {"engines": 0, "size": 0, "checked_in": 0, "checked_out": 0, "overflow": 0},
+        )
+        metrics["engines"] += 1
+        metrics["size"] += pool.size()
+        metrics["checked_in"] += pool.checkedin()
+        metrics["checked_out"] += pool.checkedout()
+        metrics["overflow"] += max(pool.overflow(), 0)
+    return {"pools": pools, "read_routing": dict(replica_router.routed)}
+
+
 def get_async_session_factory():
     """Get or create the async session factory (thread-local lazy initialization)."""
     if (
@@ -68,6 +186,29 @@ def get_async_session_factory():
     return _thread_local.async_session_factory
 
 
+def get_read_session_factory(
+    key: str | None = None,
+) -> async_sessionmaker[AsyncSession]:
+    """
+    Get a session factory for read-only work.
+
+    Args:
+        key: Id of the account being read, for read-your-writes stickiness
+    """
+    replicas = get_replica_engines()
+    index = replica_router.choose(key, len(replicas))
+    if index is None:
+        return get_async_session_factory()
+
+    factories = getattr(_thread_local, "replica_session_factories", None)
+    if factories is None:
+        factories = _thread_local.replica_session_factories = [
+            async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in replicas
+        ]
+    return factories[index]
+
+
 # For backward compatibility, create module-level variables that get initialized lazily
 async_engine = None
 AsyncSessionLocal = None
@@ -84,8 +225,12 @@ __all__ = [
     "get_async_engine",
     "get_async_session",
     "get_async_session_factory",
+    "get_pool_metrics",
+    "get_read_session_factory",
+    "get_replica_engines",
     "get_sync_session",
     "init_db",
+    "replica_router",
     "sync_engine",
 ]
 
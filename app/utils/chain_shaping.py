@@ -0,0 +1,145 @@
+"""
+Shaping of option chain payloads.
+
+Wide chains repeat every field for every contract, which makes responses
+large and slow to serialize. These helpers cut a chain down before it is
+serialized: strike windowing keeps only the strikes nearest the underlying
+price, field projection keeps only the requested keys, and the "table"
+encoding sends one array per field instead of one object per contract.
+"""
+
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from app.core.exceptions import InputValidationError
+from app.models.quotes import OptionQuote, OptionsChain
+
+CHAIN_ENCODINGS = ("records", "table")
+
+
+def parse_fields(fields: str | Sequence[str] | None) -> list[str] | None:
+    """
+    Normalize a field selection.
+
+    Args:
+        fields: Comma-separated string (``"symbol,strike,delta"``) or list
+
+    Returns:
+        Field names in request order without duplicates, or None for all fields
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    names = [name.strip() for name in fields if name.strip()]
+    return list(dict.fromkeys(names)) or None
+
+
+def strikes_near(
+    strikes: Iterable[float], spot: float | None, strike_window: int | None
+) -> set[float] | None:
+    """
+    Select the strikes around the underlying price.
+
+    Args:
+        strikes: Strikes present in the chain
+        spot: Underlying price
+        strike_window: Strikes to keep below the spot and at or above it
+
+    Returns:
+        Strikes to keep, or None to keep all of them
+    """
+    if strike_window is None or spot is None:
+        return None
+    if strike_window < 1:
+        raise InputValidationError("strike_window must be at least 1")
+    ordered = sorted(set(strikes))
+    index = bisect_left(ordered, spot)
+    return set(ordered[max(0, index - strike_window) : index + strike_window])
+
+
+def shape_rows(
+    rows: list[dict[str, Any]],
+    fields: list[str] | None = None,
+    encoding: str = "records",
+) -> list[dict[str, Any]] | dict[str, list[Any]]:
+    """
+    Project and encode contract rows.
+
+    Args:
+        rows: One dict per contract, all with the same keys
+        fields: Keys to keep, in output order; None keeps all
+        encoding: "records" for a list of dicts, "table" for one list per field
+
+    Returns:
+        The rows in the requested encoding
+    """
+    if encoding not in CHAIN_ENCODINGS:
+        raise InputValidationError(
+            f"Unknown encoding '{encoding}'; expected one of {', '.join(CHAIN_ENCODINGS)}"
+        )
+    if fields and rows:
+        unknown = [name for name in fields if name not in rows[0]]
+        if unknown:
+            raise InputValidationError(
+                f"Unknown fields: {', '.join(unknown)}; available: {', '.join(rows[0])}"
+            )
+
+    keys = fields or (list(rows[0]) if rows else [])
+    if encoding == "table":
+        return {key: [row[key] for row in rows] for key in keys}
+    if fields:
+        return [{key: row[key] for key in keys} for row in rows]
+    return rows
+
+
+def _contract_row(option_quote: OptionQuote) -> dict[str, Any]:
+    return {
+        "symbol": option_quote.symbol,
+        "strike": option_quote.strike,
+        "expiration": option_quote.expiration_date.isoformat()
+        if option_quote.expiration_date
+        else None,
+        "price": option_quote.price,
+        "bid": option_quote.bid,
+        "ask": option_quote.ask,
+        "volume": option_quote.volume,
+        "open_interest": option_quote.open_interest,
+        "implied_volatility": option_quote.iv,
+    }
+
+
+def shape_chain(
+    chain: OptionsChain,
+    fields: str | Sequence[str] | None = None,
+    strike_window: int | None = None,
+    encoding: str = "records",
+) -> dict[str, Any]:
+    """
+    Window, project and encode a chain for the option chain route and tool.
+
+    Returns:
+        Dict with the encoding, the shaped calls and puts, and their counts
+    """
+    selected_fields = parse_fields(fields)
+    keep_strikes = strikes_near(
+        (q.strike for q in [*chain.calls, *chain.puts] if q.strike is not None),
+        chain.underlying_price,
+        strike_window,
+    )
+    calls, puts = (
+        [
+            _contract_row(option_quote)
+            for option_quote in quotes
+            if keep_strikes is None or option_quote.strike in keep_strikes
+        ]
+        for quotes in (chain.calls, chain.puts)
+    )
+    return {
+        "encoding": encoding,
+        "calls": shape_rows(calls, selected_fields, encoding),
+        "puts": shape_rows(puts, selected_fields, encoding),
+        "calls_count": len(calls),
+        "puts_count": len(puts),
+    }
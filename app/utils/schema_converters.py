@@ -5,7 +5,9 @@ Provides converters between API schemas and database models to handle
 field mapping differences and maintain clean separation of concerns.
 """
 
+import logging
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar, cast
 
@@ -20,6 +22,8 @@ from app.schemas.positions import Position
 if TYPE_CHECKING:
     from app.services.trading_service import TradingService
 
+logger = logging.getLogger(__name__)
+
 T = TypeVar("T")
 U = TypeVar("U")
 
@@ -244,14 +248,71 @@ class PositionConverter(SchemaConverter[DBPosition, Position]):
         Returns:
             Position API schema with calculated fields
         """
-        current_price = current_price or db_position.avg_price
+        return self._build_position(
+            db_position,
+            current_price or db_position.avg_price,
+            asset_factory(db_position.symbol),
+        )
+
+    async def to_schema_many(
+        self, rows: Sequence[tuple[DBPosition, float | None]]
+    ) -> list[Position]:
+        """
+        Convert many positions at once using prices that were already fetched.
+
+        No quotes are looked up; a missing price falls back to the average
+        price. Symbols are parsed into assets once each. A row that cannot be
+        converted is returned with its raw values rather than dropped.
+
+        Args:
+            rows: Database positions paired with their current market price
 
+        Returns:
+            Position API schemas in the same order as ``rows``
+        """
+        assets: dict[str, Any] = {}
+        positions = []
+        for db_position, current_price in rows:
+            symbol = db_position.symbol
+            try:
+                if symbol not in assets:
+                    assets[symbol] = asset_factory(symbol)
+                positions.append(
+                    self._build_position(
+                        db_position,
+                        current_price or db_position.avg_price,
+                        assets[symbol],
+                    )
+                )
+            except Exception as convert_error:
+                logger.warning(
+                    f"Position conversion failed for {symbol}: {convert_error}"
+                )
+                try:
+                    positions.append(
+                        Position(
+                            symbol=symbol[:20],
+                            quantity=db_position.quantity,
+                            avg_price=db_position.avg_price,
+                            current_price=db_position.avg_price,
+                            unrealized_pnl=0.0,
+                            realized_pnl=0.0,
+                            asset=None,
+                        )
+                    )
+                except Exception as validation_error:
+                    logger.warning(
+                        f"Basic position creation failed for {symbol}: {validation_error}"
+                    )
+        return positions
+
+    def _build_position(
+        self, db_position: DBPosition, current_price: float, asset: Any
+    ) -> Position:
+        """Build a Position schema from a database row, price and parsed asset."""
         # Calculate unrealized P&L
         unrealized_pnl = (current_price - db_position.avg_price) * db_position.quantity
 
-        # Create asset object
-        asset = asset_factory(db_position.symbol)
-
         # Determine if it's an option and extract option fields safely
         option_type = None
         strike = None
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark option chain payload size and build/serialization time for the
+field projection, strike window and table encoding options of
+get_formatted_options_chain.
+
+Usage:
+    python scripts/benchmark_chain_payload.py [--strikes N] [--runs R]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+# Add the app directory to the Python path
+app_dir = Path(__file__).parent.parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from app.models.assets import Option  # noqa: E402
+from app.models.quotes import OptionQuote, OptionsChain  # noqa: E402
+from app.services.trading_service import TradingService  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+
+SPOT = 150.0
+
+
+def build_chain(strikes: int) -> OptionsChain:
+    """A synthetic chain with one call and one put per strike around SPOT."""
+    expiration = date.today() + timedelta(days=30)
+    now = datetime.now()
+    quotes: dict[str, list[OptionQuote]] = {"C": [], "P": []}
+    for i in range(strikes):
+        strike = SPOT - strikes // 2 + i
+        for kind, contracts in quotes.items():
+            symbol = f"SPY{expiration:%y%m%d}{kind}{int(strike * 1000):08d}"
+            contracts.append(
+                OptionQuote(
+                    asset=Option(symbol=symbol),
+                    quote_date=now,
+                    price=2.5,
+                    bid=2.45,
+                    ask=2.55,
+                    volume=1200,
+                    underlying_price=SPOT,
+                    delta=0.5,
+                    gamma=0.02,
+                    theta=-0.03,
+                    vega=0.12,
+                    rho=0.04,
+                    iv=0.25,
+                    open_interest=5000,
+                )
+            )
+    return OptionsChain(
+        underlying_symbol="SPY",
+        expiration_date=expiration,
+        underlying_price=SPOT,
+        calls=quotes["C"],
+        puts=quotes["P"],
+    )
+
+
+async def measure(
+    service: TradingService, runs: int, **options: Any
+) -> tuple[float, float, int]:
+    build = serialize = 0.0
+    size = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        payload = await service.get_formatted_options_chain("SPY", **options)
+        built = time.perf_counter()
+        size = len(json.dumps(payload))
+        build += built - start
+        serialize += time.perf_counter() - built
+    return build / runs * 1000, serialize / runs * 1000, size
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--strikes", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    service = TradingService(quote_adapter=AsyncMock())
+    service.get_options_chain = AsyncMock(return_value=build_chain(args.strikes))  # type: ignore[method-assign]
+
+    variants: list[tuple[str, dict[str, Any]]] = [
+        ("records (default)", {}),
+        ("table", {"encoding": "table"}),
+        ("fields=5", {"fields": "symbol,strike,bid,ask,delta"}),
+        (
+            "fields=5 table",
+            {"fields": "symbol,strike,bid,ask,delta", "encoding": "table"},
+        ),
+        ("window=10", {"strike_window": 10}),
+        (
+            "window=10 fields=5 table",
+            {
+                "strike_window": 10,
+                "fields": "symbol,strike,bid,ask,delta",
+                "encoding": "table",
+            },
+        ),
+    ]
+
+    print(f"{args.strikes * 2} contracts, {args.runs} runs each\n")
+    baseline = None
+    for name, options in variants:
+        build_ms, serialize_ms, size = await measure(service, args.runs, **options)
+        baseline = baseline or size
+        print(
+            f"{name:<26} {size / 1024:9.1f} KiB ({size / baseline:6.1%})  "
+            f"build {build_ms:7.2f}ms  json {serialize_ms:7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
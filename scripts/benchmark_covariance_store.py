@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming EWMA covariance store.
+
+Seeds the store from a synthetic price history, then times folding in one
+new daily bar against re-estimating the correlation matrix from the whole
+history, as PortfolioRiskCalculator did before the store.
+
+Usage:
+    python scripts/benchmark_covariance_store.py [--symbols N] [--days T]
+        [--runs R]
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the app directory to the Python path
+app_dir = Path(__file__).parent.parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from app.services.covariance_store import EWMACovarianceStore  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+
+SEED = 7
+
+
+def build_history(symbols: int, days: int) -> dict[str, list[float]]:
+    """Correlated synthetic prices from one market factor plus noise."""
+    rng = np.random.default_rng(SEED)
+    market = rng.normal(0, 0.01, days)
+    return {
+        f"S{i:04d}": (
+            100 * np.exp(np.cumsum(0.8 * market + rng.normal(0, 0.012, days)))
+        ).tolist()
+        for i in range(symbols)
+    }
+
+
+def full_recompute(history: dict[str, list[float]]) -> np.ndarray:
+    """Simple returns and np.corrcoef over the whole history."""
+    returns = [
+        [(p[i] - p[i - 1]) / p[i - 1] for i in range(1, len(p))]
+        for p in history.values()
+    ]
+    result: np.ndarray = np.corrcoef(returns)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--symbols", type=int, default=500, help="Symbols")
+    parser.add_argument("--days", type=int, default=250, help="Days of history")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per mode")
+    args = parser.parse_args()
+
+    history = build_history(args.symbols, args.days + args.runs)
+    symbols = list(history)
+    print(f"{args.symbols} symbols, {args.days} days of history")
+
+    store = EWMACovarianceStore()
+    start = time.perf_counter()
+    store.ingest({s: p[: args.days] for s, p in history.items()})
+    print(f"{'backfill':<16} {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+    incremental = []
+    recompute = []
+    for run in range(args.runs):
+        end = args.days + run + 1
+        window = {s: p[end - args.days : end] for s, p in history.items()}
+
+        start = time.perf_counter()
+        store.ingest(window)
+        store.correlation(symbols)
+        incremental.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        full_recompute(window)
+        recompute.append((time.perf_counter() - start) * 1000)
+
+    for name, durations in (("new bar", incremental), ("full recompute", recompute)):
+        print(
+            f"{name:<16} avg {statistics.mean(durations):9.1f} ms"
+            f"   p50 {statistics.median(durations):9.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark response encoding of a 1,000-contract option chain: FastAPI's
+default path (jsonable_encoder + JSONResponse) versus FastJSONResponse.
+
+Usage:
+    python scripts/benchmark_json_encoding.py [--strikes N] [--runs R]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+# Add the app directory to the Python path
+app_dir = Path(__file__).parent.parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.api.responses import FastJSONResponse  # noqa: E402
+from app.services.trading_service import TradingService  # noqa: E402
+from scripts.benchmark_chain_payload import build_chain  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def default_encode(content: Any) -> bytes:
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast_encode(content: Any) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def run(name: str, encode: Callable[[Any], bytes], content: Any, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        body = encode(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    avg = statistics.mean(timings)
+    print(
+        f"{name:<28} avg {avg:8.3f}ms  p50 {statistics.median(timings):8.3f}ms  "
+        f"{len(body) / 1024:8.1f} KiB"
+    )
+    return avg
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--strikes", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    chain = build_chain(args.strikes)
+    service = TradingService(quote_adapter=AsyncMock())
+    service.get_options_chain = AsyncMock(return_value=chain)  # type: ignore[method-assign]
+    formatted = await service.get_formatted_options_chain("SPY")
+
+    payloads = {
+        "formatted chain (dicts)": formatted,
+        "OptionsChain model": {"chain": chain},
+    }
+    print(f"{args.strikes * 2} contracts, {args.runs} runs each\n")
+    for label, content in payloads.items():
+        print(label)
+        default_ms = run(
+            "  jsonable_encoder + json", default_encode, content, args.runs
+        )
+        fast_ms = run("  FastJSONResponse", fast_encode, content, args.runs)
+        print(f"  speedup {default_ms / fast_ms:.1f}x\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
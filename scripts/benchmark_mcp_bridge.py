@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-call overhead of running async work from synchronous MCP
+tools: a new thread and event loop per call versus the persistent bridge.
+
+Each call runs one query on a thread-local async engine, as the tools do
+through get_async_engine, so per-thread engine and connection setup is
+included in the cost. SQLite is used so no database server is needed.
+
+Usage:
+    python scripts/benchmark_mcp_bridge.py [--calls N]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the app directory to the Python path
+app_dir = Path(__file__).parent.parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app.core.async_bridge import AsyncLoopBridge  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+
+_thread_local = threading.local()
+
+
+def get_engine():
+    """Thread-local engine, mirroring app.storage.database.get_async_engine."""
+    if getattr(_thread_local, "engine", None) is None:
+        _thread_local.engine = create_async_engine("sqlite+aiosqlite://")
+    return _thread_local.engine
+
+
+async def cheap_tool_call() -> int:
+    async with get_engine().connect() as conn:
+        result = await conn.execute(text("SELECT 1"))
+        return result.scalar_one()
+
+
+def run_in_new_thread(coro):
+    """The previous run_async_safely: a fresh thread and loop per call."""
+    results = []
+
+    def run() -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            results.append(loop.run_until_complete(coro))
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join(timeout=30)
+    return results[0]
+
+
+def run_benchmark(name: str, runner, calls: int) -> None:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        call_start = time.perf_counter()
+        runner(cheap_tool_call())
+        latencies.append((time.perf_counter() - call_start) * 1000)
+    total_time = time.perf_counter() - start
+
+    latencies.sort()
+    print(
+        f"{name:<22} {calls / total_time:>10.0f} ops/s  "
+        f"avg {statistics.mean(latencies):7.3f}ms  "
+        f"p50 {latencies[calls // 2]:7.3f}ms  "
+        f"p99 {latencies[int(calls * 0.99)]:7.3f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{args.calls} sequential tool calls\n")
+    run_benchmark("thread per call", run_in_new_thread, args.calls)
+
+    bridge = AsyncLoopBridge()
+    try:
+        run_benchmark("persistent bridge", bridge.run, args.calls)
+    finally:
+        bridge.shutdown()
+
+
+if __name__ == "__main__":
+    main()
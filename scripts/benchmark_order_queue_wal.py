@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark OrderQueue enqueue latency and throughput with and without the
+write-ahead log.
+
+Usage:
+    python scripts/benchmark_order_queue_wal.py [--orders N] [--concurrency C]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the app directory to the Python path
+app_dir = Path(__file__).parent.parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from app.schemas.orders import Order, OrderType  # noqa: E402
+from app.services.order_queue import AdmissionConfig, OrderQueue  # noqa: E402
+from app.services.order_queue_wal import OrderQueueWAL  # noqa: E402
+from app.services.performance_benchmarks import (  # noqa: E402
+    BenchmarkResult,
+    PerformanceMonitor,
+)
+
+logging.basicConfig(level=logging.WARNING)
+
+
+async def run_enqueue_benchmark(
+    name: str, wal: OrderQueueWAL | None, orders: int, concurrency: int
+) -> BenchmarkResult:
+    """Enqueue orders into a queue without workers and measure each enqueue."""
+    queue = OrderQueue(
+        max_concurrent_workers=0,
+        admission_config=AdmissionConfig(max_queue_depth=orders + 1),
+        wal=wal,
+    )
+    queue.batch_config.enable_batching = False
+    await queue.start()
+
+    async def enqueue(op_id: int) -> None:
+        order = Order(
+            id=f"bench_{op_id}", symbol="AAPL", order_type=OrderType.BUY, quantity=1
+        )
+        await queue.enqueue_order(order, account_id=f"acct_{op_id % 50}")
+
+    try:
+        return await PerformanceMonitor().run_benchmark(
+            name, enqueue, num_operations=orders, concurrency=concurrency
+        )
+    finally:
+        await queue.stop(drain=False)
+
+
+def print_result(result: BenchmarkResult, extra: str = "") -> None:
+    print(
+        f"{result.test_name:<22} {result.throughput_ops_sec:>10.0f} ops/s  "
+        f"avg {result.avg_latency_ms:7.3f}ms  p95 {result.p95_latency_ms:7.3f}ms  "
+        f"p99 {result.p99_latency_ms:7.3f}ms  {extra}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--group-commit-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(f"{args.orders} enqueues, {args.concurrency} concurrent\n")
+    print_result(
+        await run_enqueue_benchmark("wal disabled", None, args.orders, args.concurrency)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        wal = OrderQueueWAL(
+            Path(tmp_dir) / "order_queue.wal",
+            group_commit_window_ms=args.group_commit_ms,
+        )
+        result = await run_enqueue_benchmark(
+            "wal enabled", wal, args.orders, args.concurrency
+        )
+        print_result(
+            result,
+            f"fsyncs {wal.stats.fsyncs}, avg group {wal.stats.avg_group_size:.1f}",
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark pre-trade risk checks.
+
+Builds a synthetic book of stock and option positions and times
+RiskAnalyzer.analyze_order for small orders with the full analysis and with
+the fast path over the account's running exposure aggregates.
+
+Usage:
+    python scripts/benchmark_pre_trade_risk.py [--positions N] [--orders M]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add the app directory to the Python path
+app_dir = Path(__file__).parent.parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from app.models.assets import Stock  # noqa: E402
+from app.models.quotes import Quote  # noqa: E402
+from app.schemas.orders import Order, OrderType  # noqa: E402
+from app.schemas.positions import Portfolio, Position  # noqa: E402
+from app.services.risk_analysis import RiskAnalyzer  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+
+SEED = 5
+
+
+def build_book(positions: int) -> Portfolio:
+    """Stocks plus calls and puts on them."""
+    rng = random.Random(SEED)
+    stocks = max(1, positions // 5)
+    book = [
+        Position(
+            symbol=f"S{i:04d}",
+            quantity=rng.choice((50, 100, 200)),
+            avg_price=50.0,
+            current_price=50.0,
+            asset=f"S{i:04d}",
+        )
+        for i in range(stocks)
+    ]
+    seen = {p.symbol for p in book}
+    while len(book) < positions:
+        underlying = f"S{rng.randrange(stocks):04d}"
+        expiration = date.today() + timedelta(days=rng.choice((30, 60, 90)))
+        strike = rng.randrange(40, 61)
+        symbol = f"{underlying}{expiration:%y%m%d}{rng.choice('CP')}{strike * 1000:08d}"
+        if symbol in seen:
+            continue
+        seen.add(symbol)
+        book.append(
+            Position(
+                symbol=symbol,
+                quantity=rng.choice((-2, -1, 1, 2)),
+                avg_price=2.0,
+                current_price=2.0,
+                asset=symbol,
+                delta=rng.uniform(-100, 100),
+            )
+        )
+
+    invested = sum(abs(p.quantity) * (p.current_price or 0.0) for p in book)
+    cash = invested * 4
+    return Portfolio(
+        cash_balance=cash,
+        total_value=cash + invested,
+        positions=book,
+        daily_pnl=0.0,
+        total_pnl=0.0,
+    )
+
+
+def run(
+    analyzer: RiskAnalyzer,
+    portfolio: Portfolio,
+    orders: list[tuple[Order, Quote]],
+    account_id: str | None,
+) -> list[float]:
+    durations = []
+    for order, quote in orders:
+        start = time.perf_counter()
+        analyzer.analyze_order(
+            order, portfolio, quote, account_id=account_id, version=1
+        )
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--positions", type=int, default=2000, help="Book size")
+    parser.add_argument("--orders", type=int, default=200, help="Orders per mode")
+    args = parser.parse_args()
+
+    portfolio = build_book(args.positions)
+    rng = random.Random(SEED)
+    orders = []
+    for _ in range(args.orders):
+        position = rng.choice(portfolio.positions)
+        order_type = (
+            OrderType.BUY if isinstance(position.asset, Stock) else OrderType.BTO
+        )
+        orders.append(
+            (
+                Order(symbol=position.symbol, quantity=1, order_type=order_type),
+                Quote(
+                    asset=position.symbol,
+                    quote_date=datetime.now(),
+                    price=position.current_price,
+                ),
+            )
+        )
+    print(f"{len(portfolio.positions)} positions, {args.orders} orders")
+
+    analyzer = RiskAnalyzer()
+    start = time.perf_counter()
+    analyzer.account_exposure("bench", portfolio, version=1)
+    print(f"{'build aggregates':<16} {(time.perf_counter() - start) * 1000:9.3f} ms")
+
+    for name, account_id in (("full analysis", None), ("fast path", "bench")):
+        durations = run(analyzer, portfolio, orders, account_id)
+        print(
+            f"{name:<16} avg {statistics.mean(durations):9.3f} ms"
+            f"   p50 {statistics.median(durations):9.3f} ms"
+            f"   p99 {statistics.quantiles(durations, n=100)[98]:9.3f} ms"
+        )
+    print(f"fast path taken for {analyzer.stats.fast_path} of {args.orders} orders")
+
+
+if __name__ == "__main__":
+    main()
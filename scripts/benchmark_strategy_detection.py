@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark complex strategy detection on a synthetic option book.
+
+Compares the strike-indexed ComplexStrategyDetector with brute-force
+enumeration of every 2-, 3- and 4-leg combination within each underlying
+and expiration, which is what matching condors and butterflies without an
+index amounts to.
+
+Usage:
+    python scripts/benchmark_strategy_detection.py [--legs N] [--runs R]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from itertools import combinations
+from pathlib import Path
+
+# Add the app directory to the Python path
+app_dir = Path(__file__).parent.parent
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from app.models.assets import Option  # noqa: E402
+from app.schemas.positions import Position  # noqa: E402
+from app.services.strategies import ComplexStrategyDetector  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+
+UNDERLYINGS = ("SPY", "QQQ", "IWM", "AAPL", "MSFT")
+EXPIRATIONS = 4
+SEED = 7
+
+
+def build_book(legs: int) -> list[Position]:
+    """Random long and short calls and puts spread over a strike grid."""
+    rng = random.Random(SEED)
+    first = date.today() + timedelta(days=7)
+    expirations = [first + timedelta(days=7 * i) for i in range(EXPIRATIONS)]
+    per_group = max(1, legs // (len(UNDERLYINGS) * EXPIRATIONS * 2))
+
+    book = []
+    for underlying in UNDERLYINGS:
+        for expiration in expirations:
+            for kind in ("C", "P"):
+                strikes = rng.sample(range(50, 50 + 5 * per_group * 2, 5), per_group)
+                for strike in strikes:
+                    symbol = f"{underlying}{expiration:%y%m%d}{kind}{strike * 1000:08d}"
+                    quantity = rng.choice((-2, -1, 1, 2))
+                    book.append(
+                        Position(
+                            symbol=symbol,
+                            quantity=quantity,
+                            avg_price=round(rng.uniform(0.5, 10.0), 2),
+                            asset=symbol,
+                        )
+                    )
+    return book[:legs]
+
+
+def brute_force(positions: list[Position]) -> int:
+    """Count candidate patterns by enumerating leg combinations."""
+    groups: dict[tuple[str, date], list[Option]] = defaultdict(list)
+    for position in positions:
+        asset = position.asset
+        if isinstance(asset, Option):
+            groups[(asset.underlying.symbol, asset.expiration_date)].append(asset)
+
+    found = 0
+    for options in groups.values():
+        for a, b in combinations(options, 2):
+            if a.option_type != b.option_type:
+                found += 1
+        for a, b, c in combinations(options, 3):
+            if a.option_type == b.option_type == c.option_type:
+                strikes = sorted((a.strike, b.strike, c.strike))
+                found += strikes[1] - strikes[0] == strikes[2] - strikes[1]
+        for legs in combinations(options, 4):
+            strikes = sorted(leg.strike for leg in legs)
+            found += strikes[1] - strikes[0] == strikes[3] - strikes[2]
+    return found
+
+
+def time_runs(func, book: list[Position], runs: int) -> list[float]:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(book)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def report(name: str, durations: list[float]) -> None:
+    print(
+        f"{name:<18} avg {statistics.mean(durations):9.2f} ms"
+        f"   p50 {statistics.median(durations):9.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--legs", type=int, default=1000, help="Legs in the book")
+    parser.add_argument("--runs", type=int, default=20, help="Detector runs")
+    parser.add_argument(
+        "--brute-force-runs",
+        type=int,
+        default=1,
+        help="Brute-force runs (0 to skip)",
+    )
+    args = parser.parse_args()
+
+    book = build_book(args.legs)
+    print(
+        f"{len(book)} legs, {len(UNDERLYINGS)} underlyings, {EXPIRATIONS} expirations"
+    )
+
+    detected = ComplexStrategyDetector(book).detect()
+    counts: dict[str, int] = defaultdict(int)
+    for strategy in detected:
+        counts[strategy.complex_type] += 1
+    print("detected: " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+
+    report(
+        "indexed detector",
+        time_runs(lambda b: ComplexStrategyDetector(b).detect(), book, args.runs),
+    )
+    if args.brute_force_runs:
+        report("brute force", time_runs(brute_force, book, args.brute_force_runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Tests for batch quotes and vectorized Greeks.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models.quotes import OptionQuote, Quote
+from app.services.greeks import calculate_option_greeks, calculate_option_greeks_batch
+from app.services.trading_service import TradingService
+
+pytestmark = pytest.mark.journey_market_data
+
+EXPIRATION = (datetime.now() + timedelta(days=60)).strftime("%y%m%d")
+CALL = f"AAPL{EXPIRATION}C00150000"
+
+
+def _make_service(prices: dict[str, float]) -> tuple[TradingService, AsyncMock]:
+    quote_adapter = AsyncMock()
+
+    async def get_quotes(assets):
+        quotes = {}
+        for asset in assets:
+            if asset.symbol not in prices:
+                continue
+            quote_type = OptionQuote if asset.symbol == CALL else Quote
+            quotes[asset] = quote_type(
+                asset=asset, quote_date=datetime.now(), price=prices[asset.symbol]
+            )
+        return quotes
+
+    quote_adapter.get_quotes.side_effect = get_quotes
+    return TradingService(quote_adapter=quote_adapter), quote_adapter
+
+
+class TestBatchQuotes:
+    """Test one-call quoting and the columnar payload."""
+
+    @pytest.mark.asyncio
+    async def test_single_quote_call_includes_underlyings(self):
+        """Options' underlyings are quoted in the same adapter call."""
+        service, quote_adapter = _make_service(
+            {"AAPL": 155.0, "MSFT": 400.0, CALL: 9.5}
+        )
+
+        result = await service.get_quotes_batch(["msft", CALL, "MSFT", "ZZZZ"])
+
+        quote_adapter.get_quotes.assert_awaited_once()
+        (assets,) = quote_adapter.get_quotes.await_args.args
+        assert {a.symbol for a in assets} == {"MSFT", CALL, "ZZZZ", "AAPL"}
+
+        columns = result["columns"]
+        assert result["count"] == 2
+        assert columns["symbol"] == ["MSFT", CALL]
+        assert columns["price"] == [400.0, 9.5]
+        assert columns["underlying_price"] == [None, 155.0]
+        assert columns["strike"] == [None, 150.0]
+        assert columns["delta"][0] is None
+        assert 0 < columns["delta"][1] < 1
+        assert result["errors"] == {"ZZZZ": "No quote available"}
+
+    @pytest.mark.asyncio
+    async def test_stock_only_batch_has_no_option_columns(self):
+        service, _ = _make_service({"AAPL": 155.0})
+
+        result = await service.get_quotes_batch(["AAPL", "NOT A SYMBOL!"])
+
+        assert set(result["columns"]) == {"symbol", "price", "bid", "ask", "volume"}
+        assert result["errors"] == {"NOT A SYMBOL!": "Invalid symbol"}
+
+
+def test_batch_greeks_match_scalar_calculation():
+    """The vectorized pass agrees with the per-option calculation."""
+    cases = [
+        ("call", 150.0, 155.0, 60, 9.5),
+        ("put", 150.0, 155.0, 60, 4.0),
+        ("put", 90.0, 100.0, 5, 0.2),
+        ("call", 100.0, 100.0, 0, 5.0),  # expired: no Greeks
+    ]
+
+    batch = calculate_option_greeks_batch(*zip(*cases, strict=True))
+
+    for i, case in enumerate(cases):
+        scalar = calculate_option_greeks(*case)
+        for name in ("iv", "delta", "gamma", "theta", "vega", "rho"):
+            if scalar[name] is None:
+                assert batch[name][i] != batch[name][i]  # NaN
+            else:
+                assert batch[name][i] == pytest.approx(scalar[name], rel=1e-6)
@@ -0,0 +1,126 @@
+"""
+Tests for bulk order submission.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.exceptions import InputValidationError
+from app.models.database.trading import Account as DBAccount
+from app.models.database.trading import Order as DBOrder
+from app.schemas.orders import OrderCreate, OrderStatus, OrderType
+from app.services.trading_service import MAX_BULK_ORDERS, TradingService
+
+pytestmark = pytest.mark.journey_basic_trading
+
+
+def _make_service(quoted: set[str]) -> tuple[TradingService, AsyncMock, AsyncMock]:
+    """Service with a mocked session that echoes inserted rows back."""
+    account = DBAccount(id="TEST123456", owner="test_user", cash_balance=1000.0)
+
+    async def execute(stmt):
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = account
+        if getattr(stmt, "is_insert", False):
+            (rows,) = stmt._multi_values
+            result.scalars.return_value.all.return_value = [
+                DBOrder(**{column.key: value for column, value in row.items()})
+                for row in rows
+            ]
+        return result
+
+    db = AsyncMock()
+    db.execute.side_effect = execute
+
+    quote_adapter = AsyncMock()
+
+    async def get_quotes(assets):
+        return {
+            asset: MagicMock(price=100.0) for asset in assets if asset.symbol in quoted
+        }
+
+    quote_adapter.get_quotes.side_effect = get_quotes
+    service = TradingService(
+        quote_adapter=quote_adapter, account_owner="test_user", db_session=db
+    )
+    return service, db, quote_adapter
+
+
+def _order(symbol: str, quantity: int = 10) -> OrderCreate:
+    return OrderCreate(symbol=symbol, order_type=OrderType.BUY, quantity=quantity)
+
+
+class TestBulkOrders:
+    """Test one-pass validation, batched quoting and a single insert."""
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_one_quote_call_and_one_insert(self):
+        """Distinct symbols are quoted once and all orders go in one statement."""
+        service, db, quote_adapter = _make_service({"AAPL", "MSFT"})
+
+        results = await service.create_orders_bulk(
+            [_order("AAPL", 1), _order("msft", 2), _order("AAPL", 3)]
+        )
+
+        quote_adapter.get_quotes.assert_awaited_once()
+        (assets,) = quote_adapter.get_quotes.await_args.args
+        assert sorted(asset.symbol for asset in assets) == ["AAPL", "MSFT"]
+        inserts = [
+            call.args[0]
+            for call in db.execute.await_args_list
+            if getattr(call.args[0], "is_insert", False)
+        ]
+        assert len(inserts) == 1
+        db.commit.assert_awaited_once()
+
+        assert [result.index for result in results] == [0, 1, 2]
+        assert all(result.success for result in results)
+        assert [result.order.quantity for result in results] == [1, 2, 3]
+        assert results[1].order.symbol == "MSFT"
+        assert results[0].order.status == OrderStatus.PENDING
+
+    @pytest.mark.asyncio
+    async def test_unquoted_symbols_fail_individually(self):
+        """An order without a quote is rejected while the rest are created."""
+        service, _, _ = _make_service({"AAPL"})
+
+        results = await service.create_orders_bulk([_order("ZZZZ"), _order("AAPL")])
+
+        assert not results[0].success
+        assert "ZZZZ" in results[0].error
+        assert results[1].success
+
+    @pytest.mark.asyncio
+    async def test_malformed_symbols_fail_individually(self):
+        """A symbol the asset factory rejects fails only its own entry."""
+        service, _, quote_adapter = _make_service({"AAPL"})
+
+        results = await service.create_orders_bulk(
+            [_order("AAPL"), _order("AAPL240119C0015")]
+        )
+
+        assert [result.index for result in results] == [0, 1]
+        assert results[0].success
+        assert not results[1].success
+        assert results[1].error == "Invalid symbol: AAPL240119C0015"
+        (assets,) = quote_adapter.get_quotes.await_args.args
+        assert [asset.symbol for asset in assets] == ["AAPL"]
+
+    @pytest.mark.asyncio
+    async def test_nothing_written_when_all_rejected(self):
+        """A batch with no valid orders never opens a transaction."""
+        service, db, _ = _make_service(set())
+
+        results = await service.create_orders_bulk([_order("ZZZZ")])
+
+        assert not results[0].success
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_size_is_limited(self):
+        """Oversized submissions are refused up front."""
+        service, _, _ = _make_service({"AAPL"})
+
+        with pytest.raises(InputValidationError):
+            await service.create_orders_bulk([_order("AAPL")] * (MAX_BULK_ORDERS + 1))
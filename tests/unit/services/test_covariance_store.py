@@ -0,0 +1,174 @@
+"""
+Tests for the streaming EWMA covariance store.
+"""
+
+import numpy as np
+import pytest
+
+from app.schemas.positions import Portfolio
+from app.services.covariance_store import EWMACovarianceStore
+from app.services.portfolio_risk_metrics import PortfolioRiskCalculator
+from app.services.position_sizing import PositionSizingCalculator, SizingStrategy
+
+pytestmark = pytest.mark.journey_performance
+
+
+def _history(symbols: int = 3, days: int = 60, seed: int = 0) -> dict[str, list[float]]:
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, days)
+    return {
+        f"S{i}": (100 * np.exp(np.cumsum(market + rng.normal(0, 0.01, days)))).tolist()
+        for i in range(symbols)
+    }
+
+
+def _ewma(history: dict[str, list[float]], decay: float) -> np.ndarray:
+    """Bias-corrected EWMA covariance computed directly from the whole history."""
+    returns = np.diff(np.log(np.array(list(history.values()))), axis=1)
+    weights = (1 - decay) * decay ** np.arange(returns.shape[1] - 1, -1, -1)
+    cov: np.ndarray = (returns * weights) @ returns.T / weights.sum()
+    return cov
+
+
+class TestEWMACovarianceStore:
+    """Test incremental updates, backfill and persistence."""
+
+    def test_bar_updates_match_batch_estimate(self):
+        history = _history()
+        store = EWMACovarianceStore(decay=0.9)
+
+        for day in range(60):
+            store.update({s: prices[day] for s, prices in history.items()})
+
+        np.testing.assert_allclose(
+            store.covariance(list(history)), _ewma(history, 0.9), rtol=1e-9
+        )
+
+    def test_backfill_matches_bar_updates(self):
+        history = _history()
+        streamed = EWMACovarianceStore()
+        for day in range(60):
+            streamed.update({s: prices[day] for s, prices in history.items()})
+        backfilled = EWMACovarianceStore()
+
+        backfilled.ingest(history)
+
+        symbols = list(history)
+        np.testing.assert_allclose(
+            backfilled.covariance(symbols), streamed.covariance(symbols), rtol=1e-9
+        )
+        assert backfilled.observations("S0") == 59
+
+    def test_ingest_applies_only_new_bars(self):
+        history = _history(days=61)
+        store = EWMACovarianceStore()
+        store.ingest({s: prices[:60] for s, prices in history.items()})
+
+        assert store.ingest({s: prices[:60] for s, prices in history.items()}) == 0
+        assert store.ingest({s: prices[-30:] for s, prices in history.items()}) == 1
+        np.testing.assert_allclose(
+            store.covariance(list(history)), _ewma(history, 0.94), rtol=1e-9
+        )
+
+    def test_new_symbol_is_backfilled_against_known_ones(self):
+        history = _history()
+        store = EWMACovarianceStore()
+        store.ingest({"S0": history["S0"], "S1": history["S1"]})
+
+        store.ingest(history)
+
+        np.testing.assert_allclose(
+            store.covariance(list(history)), _ewma(history, 0.94), rtol=1e-9
+        )
+
+    def test_bars_missing_a_symbol_update_the_rest(self):
+        history = _history()
+        store = EWMACovarianceStore()
+
+        for day in range(60):
+            bar = {s: prices[day] for s, prices in history.items()}
+            if day == 30:
+                del bar["S2"]
+            store.update(bar)
+
+        pair = {s: history[s] for s in ("S0", "S1")}
+        np.testing.assert_allclose(
+            store.covariance(["S0", "S1"]), _ewma(pair, 0.94), rtol=1e-9
+        )
+        assert store.observations("S2") == 58
+
+    def test_unknown_symbols(self):
+        store = EWMACovarianceStore()
+        store.ingest(_history(symbols=1))
+
+        cov = store.covariance(["S0", "XYZ"], default_variance=0.0004)
+        corr = store.correlation(["S0", "XYZ"])
+
+        assert cov[1, 1] == 0.0004
+        assert cov[0, 1] == 0.0
+        assert corr.tolist() == [[1.0, 0.0], [0.0, 1.0]]
+        assert store.volatility("XYZ") is None
+
+    def test_persists_between_restarts(self, tmp_path):
+        path = tmp_path / "covariance.npz"
+        history = _history(days=61)
+        store = EWMACovarianceStore(path=path)
+        store.ingest({s: prices[:60] for s, prices in history.items()})
+
+        restarted = EWMACovarianceStore(path=path)
+        assert restarted.load()
+        assert restarted.ingest(history) == 1
+
+        np.testing.assert_allclose(
+            restarted.covariance(list(history)), _ewma(history, 0.94), rtol=1e-9
+        )
+        assert not EWMACovarianceStore(decay=0.97, path=path).load()
+
+
+class TestSharedStore:
+    """Test the calculators reading volatility and correlation from the store."""
+
+    def test_correlation_matrix(self):
+        prices = _history(symbols=1)["S0"]
+        calculator = PortfolioRiskCalculator(covariance_store=EWMACovarianceStore())
+
+        corr = calculator.calculate_correlation_matrix(
+            ["AAPL", "MSFT", "XYZ"], {"AAPL": prices, "MSFT": prices}
+        )
+
+        np.testing.assert_allclose(
+            corr, [[1.0, 1.0, 0.0], [1.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+        )
+
+    def test_sizing_uses_stored_volatility(self):
+        store = EWMACovarianceStore()
+        calculator = PositionSizingCalculator(covariance_store=store)
+        portfolio = Portfolio(
+            cash_balance=100000.0,
+            total_value=100000.0,
+            positions=[],
+            daily_pnl=0.0,
+            total_pnl=0.0,
+        )
+
+        with pytest.raises(ValueError):
+            calculator.calculate_position_size(
+                "S0", 100.0, portfolio, SizingStrategy.VOLATILITY_BASED
+            )
+
+        history = _history(symbols=1)["S0"]
+        with_history = calculator.calculate_position_size(
+            "S0",
+            100.0,
+            portfolio,
+            SizingStrategy.RISK_PARITY,
+            historical_prices=history,
+        )
+        from_store = calculator.calculate_position_size(
+            "S0", 100.0, portfolio, SizingStrategy.RISK_PARITY
+        )
+
+        assert from_store.recommended_shares == with_history.recommended_shares
+        assert store.volatility("S0") == pytest.approx(
+            float(np.sqrt(_ewma({"S0": history}, 0.94)[0, 0]))
+        )
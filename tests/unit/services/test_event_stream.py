@@ -0,0 +1,195 @@
+"""
+Tests for WebSocket/SSE streaming of order events and quotes.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.v1 import trading
+from app.models.database.base import Base
+from app.models.database.trading import Account as DBAccount
+from app.models.database.trading import Order as DBOrder
+from app.schemas.orders import Order, OrderCreate, OrderStatus, OrderType
+from app.services.event_stream import EventStreamHub
+from app.services.trading_service import TradingService
+
+pytestmark = pytest.mark.journey_market_data
+
+
+def _quote(price: float) -> dict[str, float]:
+    return {"price": price, "bid": price - 0.01, "ask": price + 0.01, "volume": 100}
+
+
+class TestStreamSubscriber:
+    """Test per-client buffering."""
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_drops_oldest(self):
+        """Overflow discards the oldest messages and reports how many."""
+        hub = EventStreamHub(quote_fetcher=AsyncMock(return_value={}))
+        subscriber = hub.subscribe(max_buffer=3)
+
+        for i in range(5):
+            subscriber.push({"type": "order", "n": i})
+        batch = await subscriber.next_batch(timeout=0.1)
+
+        assert batch[0] == {"type": "dropped", "count": 2}
+        assert [message["n"] for message in batch[1:]] == [2, 3, 4]
+        assert subscriber.stats.dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_quote_ticks_coalesced(self):
+        """Undelivered ticks for a symbol collapse into the latest one."""
+        hub = EventStreamHub(quote_fetcher=AsyncMock(return_value={}))
+        subscriber = hub.subscribe(symbols=["aapl", "MSFT"])
+
+        hub.publish_quote("AAPL", _quote(100.0))
+        hub.publish_quote("MSFT", _quote(300.0))
+        hub.publish_quote("AAPL", _quote(101.0))
+        hub.publish_quote("AAPL", _quote(102.0))
+        batch = await subscriber.next_batch(timeout=0.1)
+
+        assert [(m["symbol"], m["price"]) for m in batch] == [
+            ("AAPL", 102.0),
+            ("MSFT", 300.0),
+        ]
+        assert subscriber.stats.coalesced == 2
+        hub.unsubscribe(subscriber)
+
+    @pytest.mark.asyncio
+    async def test_next_batch_times_out_empty(self):
+        hub = EventStreamHub(quote_fetcher=AsyncMock(return_value={}))
+        subscriber = hub.subscribe()
+
+        assert await subscriber.next_batch(timeout=0.01) == []
+
+    @pytest.mark.asyncio
+    async def test_push_from_another_thread_wakes_consumer(self):
+        """Lifecycle callbacks may fire off the event loop thread."""
+        hub = EventStreamHub(quote_fetcher=AsyncMock(return_value={}))
+        subscriber = hub.subscribe()
+
+        threading.Timer(0.05, subscriber.push, [{"type": "order"}]).start()
+        batch = await subscriber.next_batch(timeout=2.0)
+
+        assert batch == [{"type": "order"}]
+
+
+class TestEventStreamHub:
+    """Test fan-out of order events and quotes."""
+
+    @pytest.mark.asyncio
+    async def test_service_order_changes_streamed_per_account(self):
+        """Orders the service creates and cancels reach their account's subscribers."""
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[DBAccount.__table__, DBOrder.__table__],
+            )
+        hub = EventStreamHub(quote_fetcher=AsyncMock(return_value={}))
+
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            db.add(DBAccount(id="TEST123456", owner="test_user", cash_balance=1000.0))
+            await db.commit()
+            service = TradingService(
+                quote_adapter=AsyncMock(),
+                account_owner="test_user",
+                db_session=db,
+                event_hub=hub,
+            )
+            mine = hub.subscribe(account_id="TEST123456")
+            other = hub.subscribe(account_id="OTHER12345")
+            everyone = hub.subscribe()
+
+            order = await service.create_order(
+                OrderCreate(symbol="AAPL", order_type=OrderType.BUY, quantity=10)
+            )
+            await service.cancel_order(order.id)
+        await engine.dispose()
+
+        batch = await mine.next_batch(timeout=0.1)
+        assert [(m["event"], m["status"]) for m in batch] == [
+            ("created", "pending"),
+            ("cancelled", "cancelled"),
+        ]
+        assert batch[0]["order_id"] == order.id
+        assert batch[0]["account_id"] == "TEST123456"
+        assert batch[0]["symbol"] == "AAPL"
+        assert await other.next_batch(timeout=0.01) == []
+        assert len(await everyone.next_batch(timeout=0.1)) == 2
+
+    @pytest.mark.asyncio
+    async def test_poller_publishes_only_changed_quotes(self):
+        """One fetch serves every subscriber; unchanged quotes are skipped."""
+        fetcher = AsyncMock(return_value={"AAPL": _quote(100.0)})
+        hub = EventStreamHub(quote_fetcher=fetcher, quote_interval=60)
+        first = hub.subscribe(symbols=["AAPL"])
+        second = hub.subscribe(symbols=["AAPL"])
+
+        assert await hub.poll_quotes_once() == 1
+        assert await hub.poll_quotes_once() == 0
+        fetcher.assert_awaited_with(["AAPL"])
+        assert len(await first.next_batch(timeout=0.1)) == 1
+        assert len(await second.next_batch(timeout=0.1)) == 1
+
+        hub.unsubscribe(first)
+        hub.unsubscribe(second)
+        assert hub.subscribed_symbols() == []
+        await asyncio.sleep(0)
+
+
+class TestStreamEndpoints:
+    """Test the WebSocket endpoint end to end."""
+
+    def test_websocket_streams_order_events(self, monkeypatch):
+        hub = EventStreamHub(quote_fetcher=AsyncMock(return_value={}))
+        monkeypatch.setattr(trading, "get_event_stream_hub", lambda: hub)
+        app = FastAPI()
+        app.include_router(trading.router)
+
+        with TestClient(app).websocket_connect(
+            "/api/v1/trading/stream/ws?account_id=TEST123456"
+        ) as websocket:
+            deadline = time.monotonic() + 5
+            while not hub.get_stats()["subscribers"]:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+            order = Order(
+                id="o1",
+                symbol="AAPL",
+                order_type=OrderType.BUY,
+                quantity=5,
+                status=OrderStatus.CANCELLED,
+            )
+            hub.publish_order("cancelled", order, "TEST123456")
+
+            message = websocket.receive_json(mode="binary")
+
+        assert message["type"] == "order"
+        assert message["event"] == "cancelled"
+        assert message["status"] == "cancelled"
+
+    def test_websocket_rejects_invalid_account(self, monkeypatch):
+        hub = EventStreamHub(quote_fetcher=AsyncMock(return_value={}))
+        monkeypatch.setattr(trading, "get_event_stream_hub", lambda: hub)
+        app = FastAPI()
+        app.include_router(trading.router)
+
+        with (
+            pytest.raises(WebSocketDisconnect),
+            TestClient(app).websocket_connect(
+                "/api/v1/trading/stream/ws?account_id=bad"
+            ) as websocket,
+        ):
+            websocket.receive_json()
+        assert hub.get_stats()["subscribers"] == 0
@@ -0,0 +1,149 @@
+"""
+Tests for Monte Carlo VaR with full option repricing.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from app.schemas.positions import Portfolio, Position
+from app.services import monte_carlo_var
+from app.services.covariance_store import EWMACovarianceStore
+from app.services.monte_carlo_var import (
+    SimulationBook,
+    black_scholes_prices,
+    simulate_pnl,
+)
+from app.services.portfolio_risk_metrics import PortfolioRiskCalculator
+
+pytestmark = pytest.mark.journey_performance
+
+
+def _expiry(days: int = 30) -> str:
+    return (date.today() + timedelta(days=days)).strftime("%y%m%d")
+
+
+def _portfolio(*positions: Position) -> Portfolio:
+    total = sum(abs(p.quantity) * (p.current_price or 0.0) for p in positions)
+    return Portfolio(
+        cash_balance=0.0,
+        total_value=total,
+        positions=list(positions),
+        daily_pnl=0.0,
+        total_pnl=0.0,
+    )
+
+
+def _stock(symbol: str = "AAPL", quantity: int = 100) -> Position:
+    return Position(
+        symbol=symbol,
+        quantity=quantity,
+        avg_price=100.0,
+        current_price=100.0,
+        asset=symbol,
+    )
+
+
+def _put(quantity: int = 1) -> Position:
+    symbol = f"AAPL{_expiry()}P00100000"
+    return Position(
+        symbol=symbol,
+        quantity=quantity,
+        avg_price=2.5,
+        current_price=2.5,
+        iv=0.3,
+        asset=symbol,
+    )
+
+
+def _calculator() -> PortfolioRiskCalculator:
+    return PortfolioRiskCalculator(covariance_store=EWMACovarianceStore())
+
+
+class TestMonteCarloVaR:
+    """Test simulated VaR and expected shortfall."""
+
+    def test_stock_var_matches_normal_quantile(self):
+        calculator = _calculator()
+
+        result = calculator.calculate_monte_carlo_var(
+            _portfolio(_stock()), [0.99], paths=200_000, seed=1
+        )[0.99]
+
+        # 100 shares at $100 with the default 2% daily volatility
+        expected = -stats.norm.ppf(0.01) * 0.02 * 10_000
+        assert result.method == "monte_carlo"
+        assert result.var_amount == pytest.approx(expected, rel=0.05)
+        assert result.expected_shortfall > result.var_amount
+
+    def test_protective_put_reduces_var(self):
+        calculator = _calculator()
+        naked = calculator.calculate_monte_carlo_var(
+            _portfolio(_stock()), [0.99], paths=50_000, seed=2
+        )[0.99]
+        hedged = calculator.calculate_monte_carlo_var(
+            _portfolio(_stock(), _put()), [0.99], paths=50_000, seed=2
+        )[0.99]
+
+        assert hedged.var_amount < naked.var_amount
+
+    def test_correlation_from_history(self):
+        """Opposite positions in perfectly correlated stocks cancel out."""
+        rng = np.random.default_rng(0)
+        prices = (100 * np.exp(np.cumsum(rng.normal(0, 0.01, 100)))).tolist()
+        history = {"AAPL": prices, "MSFT": prices}
+        calculator = _calculator()
+
+        result = calculator.calculate_monte_carlo_var(
+            _portfolio(_stock("AAPL", 100), _stock("MSFT", -100)),
+            [0.99],
+            history,
+            underlying_prices={"AAPL": 100.0, "MSFT": 100.0},
+            paths=10_000,
+            seed=3,
+        )[0.99]
+
+        assert result.var_amount == pytest.approx(0.0, abs=1.0)
+
+    def test_seeded_runs_reproduce_across_workers(self, monkeypatch):
+        monkeypatch.setattr(monte_carlo_var, "CHUNK_CELLS", 1000)
+        book = SimulationBook.from_positions([_stock(), _put()])
+
+        in_process = simulate_pnl(book, 5000, seed=42, workers=1)
+        pooled = simulate_pnl(book, 5000, seed=42, workers=2)
+
+        np.testing.assert_array_equal(in_process, pooled)
+        assert not np.array_equal(in_process, simulate_pnl(book, 5000, seed=43))
+
+    def test_options_without_underlying_price_are_skipped(self):
+        book = SimulationBook.from_positions([_put()])
+
+        assert book.legs == 0
+        assert not simulate_pnl(book, 10).any()
+
+    def test_black_scholes_grid_uses_intrinsic_after_expiry(self):
+        values = black_scholes_prices(
+            np.array([[90.0, 90.0], [110.0, 110.0]]),
+            np.array([100.0, 100.0]),
+            np.array([0.0, 0.5]),
+            np.array([0.3, 0.3]),
+            np.array([False, True]),
+        )
+
+        assert values[:, 0].tolist() == [10.0, 0.0]
+        assert values[1, 1] > 10.0
+
+
+class TestPortfolioReturns:
+    """Test the vectorized historical portfolio returns."""
+
+    def test_signed_value_weighted_returns(self):
+        calculator = _calculator()
+        portfolio = _portfolio(_stock("AAPL", 100), _stock("MSFT", -100))
+        history = {"AAPL": [100.0, 110.0, 99.0], "MSFT": [100.0, 100.0, 110.0]}
+
+        returns = calculator._calculate_portfolio_returns(portfolio, history)
+
+        assert returns == pytest.approx([0.05, -0.1])
@@ -0,0 +1,197 @@
+"""
+Tests for operation scopes: the per-operation identity map and query counts.
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.exceptions import NotFoundError
+from app.models.database.base import Base
+from app.models.database.trading import Account as DBAccount
+from app.models.database.trading import Position as DBPosition
+from app.services.operation_scope import (
+    OperationScope,
+    current_operation_scope,
+    enter_operation_scope,
+    exit_operation_scope,
+)
+from app.services.trading_service import TradingService
+
+pytestmark = pytest.mark.journey_basic_trading
+
+
+def _make_service() -> tuple[TradingService, AsyncMock]:
+    account = DBAccount(
+        id="TEST123456",
+        owner="test_user",
+        cash_balance=1000.0,
+        starting_balance=1000.0,
+        created_at=datetime(2026, 1, 1),
+        updated_at=datetime(2026, 1, 1),
+    )
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = account
+    result.all.return_value = []
+    result.one.return_value = (0, 0, 0)
+
+    db = AsyncMock()
+    db.execute.return_value = result
+    service = TradingService(
+        quote_adapter=AsyncMock(), account_owner="test_user", db_session=db
+    )
+    return service, db
+
+
+class TestOperationScope:
+    """Test identity map reuse and query accounting."""
+
+    @pytest.mark.asyncio
+    async def test_account_info_loads_account_once(self):
+        """Nested lookups in one operation reuse the loaded account row."""
+        service, db = _make_service()
+
+        info = await service.get_account_info()
+
+        # One account lookup and one position totals query for the operation
+        assert db.execute.await_count == 2
+        assert info["account_id"] == "TEST123456"
+        assert current_operation_scope() is None
+
+    @pytest.mark.asyncio
+    async def test_separate_operations_do_not_share_rows(self):
+        """Each top-level call starts with an empty identity map."""
+        service, db = _make_service()
+
+        await service.get_account_balance()
+        await service.get_account_balance()
+
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_explicit_scope_spans_calls(self):
+        """Calls made inside an explicit scope share one identity map."""
+        service, db = _make_service()
+
+        async with service.operation_scope("dashboard") as scope:
+            await service.get_account_balance()
+            await service.get_portfolio_summary()
+            assert scope.get_account(owner="test_user") is not None
+
+        assert db.execute.await_count == 2
+        assert service.get_query_stats()["dashboard"]["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_position_lookup_filters_by_symbol(self):
+        """A single-position read queries only that symbol's row."""
+        service, db = _make_service()
+
+        with pytest.raises(NotFoundError):
+            await service.get_position("aapl")
+
+        stmt = db.execute.await_args_list[-1].args[0]
+        params = stmt.compile().params
+        assert db.execute.await_count == 2
+        assert "AAPL" in params.values()
+
+    @pytest.mark.asyncio
+    async def test_query_counts_recorded_per_operation(self):
+        """Statements executed in a scope are counted and reported."""
+        service, _ = _make_service()
+        engine = create_engine("sqlite://")
+
+        async with service.operation_scope("report") as scope:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+        assert scope.query_count == 2
+        stats = service.get_query_stats()["report"]
+        assert stats["last_queries"] == 2
+        assert stats["max_queries"] == 2
+
+    def test_queries_outside_scope_are_not_counted(self):
+        """Only the scope current in the executing context is charged."""
+        engine = create_engine("sqlite://")
+        scope = OperationScope(name="outer")
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            token = enter_operation_scope(scope)
+            try:
+                conn.execute(text("SELECT 2"))
+            finally:
+                exit_operation_scope(token)
+
+        assert scope.query_count == 1
+
+    @pytest.mark.asyncio
+    async def test_position_writes_drop_cached_positions(self):
+        """Flushing a position row forgets only that account's cached rows."""
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[DBAccount.__table__, DBPosition.__table__],
+            )
+        scope = OperationScope(name="trade")
+        scope.positions = {"TEST123456": [], "OTHER12345": []}
+
+        token = enter_operation_scope(scope)
+        try:
+            async with AsyncSession(engine) as db:
+                db.add(DBAccount(id="TEST123456", owner="test_user", cash_balance=0.0))
+                await db.flush()
+                assert "TEST123456" in scope.positions
+
+                db.add(
+                    DBPosition(
+                        account_id="TEST123456",
+                        symbol="AAPL",
+                        quantity=1,
+                        avg_price=1.0,
+                    )
+                )
+                await db.flush()
+        finally:
+            exit_operation_scope(token)
+        await engine.dispose()
+
+        assert list(scope.positions) == ["OTHER12345"]
+
+    @pytest.mark.asyncio
+    async def test_flushes_record_written_accounts(self):
+        """Every account whose rows were flushed is recorded as written."""
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[DBAccount.__table__, DBPosition.__table__],
+            )
+        scope = OperationScope(name="trade")
+
+        token = enter_operation_scope(scope)
+        try:
+            async with AsyncSession(engine) as db:
+                db.add(DBAccount(id="TEST123456", owner="test_user", cash_balance=0.0))
+                db.add(DBAccount(id="OTHER12345", owner="other", cash_balance=0.0))
+                await db.commit()
+                scope.written_accounts.clear()
+
+                db.add(
+                    DBPosition(
+                        account_id="OTHER12345",
+                        symbol="AAPL",
+                        quantity=1,
+                        avg_price=1.0,
+                    )
+                )
+                await db.flush()
+        finally:
+            exit_operation_scope(token)
+        await engine.dispose()
+
+        assert scope.written_accounts == {"OTHER12345"}
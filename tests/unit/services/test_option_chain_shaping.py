@@ -0,0 +1,134 @@
+"""
+Tests for option chain field projection, strike windowing and table encoding.
+"""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.exceptions import InputValidationError
+from app.models.assets import Option
+from app.models.quotes import OptionQuote, OptionsChain
+from app.services.trading_service import TradingService
+from app.utils.chain_shaping import parse_fields, shape_chain, shape_rows, strikes_near
+
+pytestmark = pytest.mark.journey_options_trading
+
+
+def _service(strikes: list[float], spot: float = 100.0) -> TradingService:
+    expiration = date.today() + timedelta(days=30)
+    calls = [
+        OptionQuote(
+            asset=Option(symbol=f"XYZ{expiration:%y%m%d}C{int(k * 1000):08d}"),
+            quote_date=datetime.now(),
+            price=1.0,
+            bid=0.9,
+            ask=1.1,
+            underlying_price=spot,
+        )
+        for k in strikes
+    ]
+    chain = OptionsChain(
+        underlying_symbol="XYZ",
+        expiration_date=expiration,
+        underlying_price=spot,
+        calls=calls,
+    )
+    service = TradingService(quote_adapter=AsyncMock())
+    service.get_options_chain = AsyncMock(return_value=chain)  # type: ignore[method-assign]
+    return service
+
+
+class TestChainShaping:
+    """Test the shaping helpers."""
+
+    def test_parse_fields(self):
+        assert parse_fields(" symbol, strike,,symbol ") == ["symbol", "strike"]
+        assert parse_fields(["delta"]) == ["delta"]
+        assert parse_fields("") is None
+        assert parse_fields(None) is None
+
+    def test_strikes_near_spot(self):
+        """The window keeps N strikes below the spot and N at or above it."""
+        strikes = [90.0, 95.0, 100.0, 105.0, 110.0, 115.0]
+
+        assert strikes_near(strikes, 101.0, 1) == {100.0, 105.0}
+        assert strikes_near(strikes, 100.0, 2) == {90.0, 95.0, 100.0, 105.0}
+        assert strikes_near(strikes, 200.0, 2) == {110.0, 115.0}
+        assert strikes_near(strikes, 100.0, None) is None
+
+    def test_table_encoding_and_projection(self):
+        rows = [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
+
+        assert shape_rows(rows, ["b"]) == [{"b": 2}, {"b": 4}]
+        assert shape_rows(rows, encoding="table") == {"a": [1, 3], "b": [2, 4]}
+        with pytest.raises(InputValidationError):
+            shape_rows(rows, ["c"])
+        with pytest.raises(InputValidationError):
+            shape_rows(rows, encoding="csv")
+
+    @pytest.mark.asyncio
+    async def test_shape_chain(self):
+        """The route and MCP tool payload: windowed, projected contract rows."""
+        chain = await _service([80.0, 90.0, 100.0, 110.0]).get_options_chain("XYZ")
+
+        shaped = shape_chain(chain, "strike,price", strike_window=1)
+
+        assert shaped == {
+            "encoding": "records",
+            "calls": [
+                {"strike": 90.0, "price": 1.0},
+                {"strike": 100.0, "price": 1.0},
+            ],
+            "puts": [],
+            "calls_count": 2,
+            "puts_count": 0,
+        }
+        assert set(shape_chain(chain)["calls"][0]) == {
+            "symbol",
+            "strike",
+            "expiration",
+            "price",
+            "bid",
+            "ask",
+            "volume",
+            "open_interest",
+            "implied_volatility",
+        }
+
+
+class TestFormattedChainShaping:
+    """Test shaping through get_formatted_options_chain and find_tradable_options."""
+
+    @pytest.mark.asyncio
+    async def test_formatted_chain_window_fields_table(self):
+        service = _service([80.0, 90.0, 100.0, 110.0, 120.0])
+
+        result = await service.get_formatted_options_chain(
+            "XYZ", fields="strike,bid", strike_window=1, encoding="table"
+        )
+
+        assert result["encoding"] == "table"
+        assert result["calls"] == {"strike": [90.0, 100.0], "bid": [0.9, 0.9]}
+        assert result["puts"] == {"strike": [], "bid": []}
+
+    @pytest.mark.asyncio
+    async def test_defaults_keep_records(self):
+        service = _service([90.0, 100.0])
+
+        result = await service.get_formatted_options_chain("XYZ")
+
+        assert len(result["calls"]) == 2
+        assert {"symbol", "strike", "bid", "ask", "delta"} <= set(result["calls"][0])
+
+    @pytest.mark.asyncio
+    async def test_find_tradable_options_shaping(self):
+        service = _service([80.0, 90.0, 100.0, 110.0, 120.0])
+
+        result = await service.find_tradable_options(
+            "XYZ", fields=["strike_price"], strike_window=2, encoding="table"
+        )
+
+        assert result["options"] == {"strike_price": [80.0, 90.0, 100.0, 110.0]}
+        assert result["total_found"] == 4
@@ -0,0 +1,163 @@
+"""
+Tests for keyset-paginated and streamed order history.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import InputValidationError
+from app.models.database.trading import Account as DBAccount
+from app.models.database.trading import Order as DBOrder
+from app.schemas.orders import OrderAssetClass, OrderStatus, OrderType
+from app.services.trading_service import DEFAULT_ORDER_PAGE_SIZE, TradingService
+
+pytestmark = pytest.mark.journey_basic_trading
+
+
+def _make_service(order_count: int) -> tuple[TradingService, list]:
+    """
+    Service whose database serves ``order_count`` orders newest first.
+
+    Each page query returns the rows following the previous page, up to the
+    statement's LIMIT, mimicking the keyset range scan.
+    """
+    account = DBAccount(id="TEST123456", owner="test_user", cash_balance=1000.0)
+    orders = [
+        DBOrder(
+            id=f"order_{i:04d}",
+            account_id=account.id,
+            symbol="AAPL",
+            order_type=OrderType.BUY,
+            quantity=1,
+            status=OrderStatus.FILLED,
+            created_at=datetime(2026, 1, 1) - timedelta(minutes=i),
+        )
+        for i in range(order_count)
+    ]
+    page_statements: list = []
+    offset = 0
+
+    async def execute(stmt):
+        nonlocal offset
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = account
+        if stmt.column_descriptions[0]["entity"] is DBOrder:
+            page_statements.append(stmt)
+            limit = len(orders) + 1 if stmt._limit is None else stmt._limit
+            result.scalars.return_value.all.return_value = orders[
+                offset : offset + limit
+            ]
+            offset += limit - 1
+        return result
+
+    db = AsyncMock()
+    db.execute.side_effect = execute
+    service = TradingService(
+        quote_adapter=AsyncMock(), account_owner="test_user", db_session=db
+    )
+    return service, page_statements
+
+
+class TestOrderHistoryPagination:
+    """Test keyset pages, filters and streaming."""
+
+    @pytest.mark.asyncio
+    async def test_pages_walk_full_history(self):
+        """Following next_cursor visits every order exactly once."""
+        service, _ = _make_service(5)
+
+        first = await service.get_orders_page(limit=2)
+        second = await service.get_orders_page(limit=2, cursor=first.next_cursor)
+        third = await service.get_orders_page(limit=2, cursor=second.next_cursor)
+
+        ids = [order.id for page in (first, second, third) for order in page.orders]
+        assert ids == [f"order_{i:04d}" for i in range(5)]
+        assert first.has_more and second.has_more
+        assert not third.has_more and third.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_no_limit_or_cursor_returns_full_history(self):
+        """Callers that do not page get every order, as before pagination."""
+        service, statements = _make_service(150)
+
+        page = await service.get_orders_page()
+
+        assert len(page.orders) == 150
+        assert not page.has_more and page.next_cursor is None
+        assert statements[-1]._limit is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_without_limit_uses_default_page_size(self):
+        service, statements = _make_service(3)
+        first = await service.get_orders_page(limit=1)
+
+        await service.get_orders_page(cursor=first.next_cursor)
+
+        assert statements[-1]._limit == DEFAULT_ORDER_PAGE_SIZE + 1
+
+    @pytest.mark.asyncio
+    async def test_history_payload(self):
+        """The payload shared by the REST routes and MCP tools."""
+        service, _ = _make_service(3)
+
+        payload = (await service.get_orders_page(limit=2)).to_history_payload()
+
+        assert payload["count"] == 2
+        assert payload["has_more"] is True
+        assert payload["next_cursor"] is not None
+        assert set(payload["orders"][0]) == {
+            "id",
+            "symbol",
+            "quantity",
+            "order_type",
+            "condition",
+            "price",
+            "stop_price",
+            "status",
+            "created_at",
+            "filled_at",
+        }
+
+    @pytest.mark.asyncio
+    async def test_filters_are_applied_in_sql(self):
+        """Cursor, status, asset class and time range become WHERE clauses."""
+        service, statements = _make_service(3)
+        first = await service.get_orders_page(limit=1)
+
+        await service.get_orders_page(
+            limit=1,
+            cursor=first.next_cursor,
+            status=[OrderStatus.PENDING],
+            asset_class=OrderAssetClass.OPTION,
+            created_after=datetime(2025, 1, 1),
+            created_before=datetime(2027, 1, 1),
+        )
+
+        sql = str(statements[-1].compile(dialect=postgresql.dialect()))
+        assert "(orders.created_at, orders.id) <" in sql
+        assert "orders.status IN" in sql
+        assert "length(orders.symbol) >" in sql
+        assert "orders.created_at >=" in sql
+        assert "ORDER BY orders.created_at DESC, orders.id DESC" in sql
+        assert "LIMIT" in sql
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_rejected(self):
+        """A cursor that does not decode is an input error."""
+        service, _ = _make_service(1)
+
+        with pytest.raises(InputValidationError):
+            await service.get_orders_page(cursor="not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_stream_orders_yields_every_order(self):
+        """Streaming reads the history in batches of the requested size."""
+        service, statements = _make_service(7)
+
+        ids = [order.id async for order in service.stream_orders(batch_size=3)]
+
+        assert ids == [f"order_{i:04d}" for i in range(7)]
+        assert len(statements) == 3
@@ -0,0 +1,172 @@
+"""
+Tests for account micro-batching in the OrderQueue.
+
+Batches are executed by a registered batch processor inside a single
+session that is committed once per account group.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.schemas.orders import Order, OrderType
+from app.services.order_queue import (
+    BatchConfig,
+    OrderQueue,
+    ProcessingStatus,
+    QueuePriority,
+)
+
+pytestmark = pytest.mark.journey_basic_trading
+
+
+def _make_order(order_id: str, symbol: str = "AAPL") -> Order:
+    return Order(id=order_id, symbol=symbol, order_type=OrderType.BUY, quantity=10)
+
+
+class _SessionRecorder:
+    """Session provider that hands out mock sessions and records them."""
+
+    def __init__(self) -> None:
+        self.sessions: list[AsyncMock] = []
+
+    async def __call__(self):
+        session = AsyncMock()
+        self.sessions.append(session)
+        yield session
+
+
+async def _wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached in time")
+        await asyncio.sleep(0.01)
+
+
+class TestOrderQueueBatching:
+    """Test batching orders by account."""
+
+    @pytest.mark.asyncio
+    async def test_full_batches_commit_once_per_account(self):
+        """Orders are grouped per account with one session and one commit each."""
+        sessions = _SessionRecorder()
+        queue = OrderQueue(
+            max_concurrent_workers=2,
+            batch_config=BatchConfig(max_batch_size=3, max_wait_time_ms=10_000),
+            session_provider=sessions,
+        )
+        calls: list[tuple[str | None, list[str]]] = []
+
+        async def processor(account_id, orders, db):
+            calls.append((account_id, [o.id for o in orders]))
+            return [f"filled_{o.id}" for o in orders]
+
+        batches: list[int] = []
+        queue.register_batch_processor(processor)
+        queue.register_batch_completion_callback(
+            lambda batch: batches.append(len(batch))
+        )
+
+        await queue.start()
+        try:
+            for i in range(3):
+                await queue.enqueue_order(_make_order(f"a{i}"), account_id="acct_a")
+                await queue.enqueue_order(_make_order(f"b{i}"), account_id="acct_b")
+
+            await _wait_until(lambda: queue.metrics.total_processed == 6)
+        finally:
+            await queue.stop()
+
+        assert sorted(calls) == [
+            ("acct_a", ["a0", "a1", "a2"]),
+            ("acct_b", ["b0", "b1", "b2"]),
+        ]
+        assert len(sessions.sessions) == 2
+        for session in sessions.sessions:
+            session.commit.assert_awaited_once()
+        assert batches == [3, 3]
+        assert queue.completed_orders["a1"].metadata["result"] == "filled_a1"
+
+        status = await queue.get_queue_status()
+        assert status["batching"]["total_batches"] == 2
+        assert status["batching"]["batch_size_histogram"] == {3: 2}
+        assert status["batching"]["avg_batch_size"] == 3.0
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushes_after_wait_window(self):
+        """A batch that never fills is dispatched once max_wait_time_ms passes."""
+        queue = OrderQueue(
+            max_concurrent_workers=1,
+            batch_config=BatchConfig(max_batch_size=10, max_wait_time_ms=20),
+            session_provider=_SessionRecorder(),
+        )
+        queue.register_batch_processor(
+            AsyncMock(side_effect=lambda account_id, orders, db: [None] * len(orders))
+        )
+
+        await queue.start()
+        try:
+            await queue.enqueue_order(_make_order("o1"), account_id="acct")
+            await queue.enqueue_order(_make_order("o2"), account_id="acct")
+            assert (await queue.get_queue_status())["queue_depth"] == 2
+
+            await _wait_until(lambda: queue.metrics.total_processed == 2)
+        finally:
+            await queue.stop()
+
+        assert queue.metrics.total_batches == 1
+        assert queue.metrics.current_queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_per_order_failures_and_urgent_bypass(self):
+        """Exception results fail single orders; urgent orders skip batching."""
+        queue = OrderQueue(
+            max_concurrent_workers=1,
+            batch_config=BatchConfig(max_batch_size=2, max_wait_time_ms=10_000),
+            session_provider=_SessionRecorder(),
+        )
+
+        async def processor(account_id, orders, db):
+            return [ValueError("rejected") if o.id == "bad" else "ok" for o in orders]
+
+        urgent = AsyncMock(return_value="urgent_ok")
+        queue.register_batch_processor(processor)
+        queue.register_processor(OrderType.BUY, urgent)
+
+        await queue.start()
+        try:
+            await queue.enqueue_order(
+                _make_order("urgent"), QueuePriority.URGENT, account_id="acct"
+            )
+            for order_id in ("good", "bad"):
+                await queue.enqueue_order(_make_order(order_id), account_id="acct")
+            await _wait_until(lambda: "bad" in queue.completed_orders)
+        finally:
+            await queue.stop(drain=False)
+
+        queued = queue.completed_orders
+        urgent.assert_awaited_once()
+        assert queued["good"].status == ProcessingStatus.COMPLETED
+        assert queued["bad"].status == ProcessingStatus.RETRYING
+        assert queued["bad"].attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_order_waiting_in_batch(self):
+        """Orders waiting for their batch window can be cancelled."""
+        queue = OrderQueue(
+            max_concurrent_workers=1,
+            batch_config=BatchConfig(max_batch_size=10, max_wait_time_ms=10_000),
+            session_provider=_SessionRecorder(),
+        )
+        queue.register_batch_processor(AsyncMock(return_value=[]))
+
+        await queue.start()
+        try:
+            await queue.enqueue_order(_make_order("o1"), account_id="acct")
+            assert await queue.cancel_order("o1") is True
+            assert queue.batch_queue == {}
+            assert queue.metrics.current_queue_depth == 0
+        finally:
+            await queue.stop()
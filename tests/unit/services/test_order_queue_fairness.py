@@ -0,0 +1,146 @@
+"""
+Tests for fair scheduling and admission control in the OrderQueue.
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core.exceptions import TooManyRequestsError
+from app.schemas.orders import Order, OrderType
+from app.services.order_queue import (
+    AdmissionConfig,
+    FairQueue,
+    OrderQueue,
+    QueuedOrder,
+    QueuePriority,
+)
+
+pytestmark = pytest.mark.journey_basic_trading
+
+
+def _queued(
+    order_id: str,
+    account_id: str | None,
+    priority: QueuePriority = QueuePriority.NORMAL,
+) -> QueuedOrder:
+    return QueuedOrder(
+        order=Order(id=order_id, symbol="AAPL", order_type=OrderType.BUY, quantity=1),
+        priority=priority,
+        queued_at=datetime.now(UTC),
+        account_id=account_id,
+    )
+
+
+def _drain(queue: FairQueue, eligible=None) -> list[str]:
+    served = []
+    while (queued_order := queue.pop(eligible)) is not None:
+        served.append(queued_order.order.id)
+    return served
+
+
+class TestFairQueue:
+    """Test deficit round robin scheduling across accounts."""
+
+    def test_noisy_account_does_not_starve_others(self):
+        """Accounts alternate even when one enqueued far more orders first."""
+        queue = FairQueue()
+        for i in range(5):
+            queue.push(_queued(f"noisy{i}", "noisy"))
+        queue.push(_queued("quiet0", "quiet"))
+        queue.push(_queued("quiet1", "quiet"))
+
+        assert _drain(queue)[:4] == ["noisy0", "quiet0", "noisy1", "quiet1"]
+        assert len(queue) == 0
+
+    def test_weights_and_strict_priority(self):
+        """Weighted accounts get larger turns; higher priority always first."""
+        queue = FairQueue()
+        queue.set_weight("big", 2)
+        for i in range(4):
+            queue.push(_queued(f"big{i}", "big"))
+            queue.push(_queued(f"small{i}", "small"))
+        queue.push(_queued("urgent", "small", QueuePriority.URGENT))
+
+        assert _drain(queue)[:7] == [
+            "urgent",
+            "big0",
+            "big1",
+            "small0",
+            "big2",
+            "big3",
+            "small1",
+        ]
+
+    def test_ineligible_accounts_are_skipped(self):
+        """Accounts rejected by the eligibility filter are passed over."""
+        queue = FairQueue()
+        queue.push(_queued("a0", "a"))
+        queue.push(_queued("b0", "b"))
+
+        assert queue.pop(lambda account_id: account_id != "a").order.id == "b0"
+        assert queue.pop(lambda account_id: account_id != "a") is None
+        assert queue.remove("a0").order.id == "a0"
+        assert len(queue) == 0
+
+
+class TestAdmissionControl:
+    """Test queue depth limits and per-account in-flight limits."""
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_with_retry_after(self):
+        """Enqueueing past max_queue_depth raises a 429 with Retry-After."""
+        queue = OrderQueue(
+            max_concurrent_workers=1,
+            admission_config=AdmissionConfig(
+                max_queue_depth=2, max_retry_after_seconds=30
+            ),
+        )
+        queue.is_running = True  # accept orders without starting workers
+
+        await queue.enqueue_order(_queued("o1", "a").order, account_id="a")
+        await queue.enqueue_order(_queued("o2", "b").order, account_id="b")
+        with pytest.raises(TooManyRequestsError) as exc_info:
+            await queue.enqueue_order(_queued("o3", "c").order, account_id="c")
+
+        assert exc_info.value.status_code == 429
+        assert 1 <= exc_info.value.retry_after <= 30
+        assert exc_info.value.headers["Retry-After"] == str(exc_info.value.retry_after)
+        assert queue.metrics.total_rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_account_depth_limit(self):
+        """One account cannot fill more than its share of the queue."""
+        queue = OrderQueue(admission_config=AdmissionConfig(max_account_queue_depth=1))
+        queue.is_running = True
+
+        await queue.enqueue_order(_queued("o1", "a").order, account_id="a")
+        with pytest.raises(TooManyRequestsError):
+            await queue.enqueue_order(_queued("o2", "a").order, account_id="a")
+        await queue.enqueue_order(_queued("o3", "b").order, account_id="b")
+
+    @pytest.mark.asyncio
+    async def test_in_flight_limit_and_tenant_metrics(self):
+        """Accounts at their in-flight limit wait; wait times are per account."""
+        queue = OrderQueue(
+            admission_config=AdmissionConfig(max_in_flight_per_account=1)
+        )
+        queue.is_running = True
+        for order_id in ("a0", "a1"):
+            await queue.enqueue_order(_queued(order_id, "a").order, account_id="a")
+        await queue.enqueue_order(_queued("b0", "b").order, account_id="b")
+
+        first = await queue._get_next_order()
+        second = await queue._get_next_order()
+        assert [first.order.id, second.order.id] == ["a0", "b0"]
+        assert await queue._get_next_order() is None
+
+        await queue._finish_order(first, datetime.now(UTC))
+        assert (await queue._get_next_order()).order.id == "a1"
+
+        status = await queue.get_queue_status()
+        assert status["accounts"]["a"]["in_flight"] == 1
+        assert status["accounts"]["b"]["in_flight"] == 1
+        assert status["accounts"]["a"]["queued"] == 0
+        assert status["accounts"]["a"]["avg_wait_time_ms"] >= 0
+        assert "p95_wait_time_ms" in status["accounts"]["b"]
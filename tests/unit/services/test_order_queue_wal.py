@@ -0,0 +1,137 @@
+"""
+Tests for the order queue write-ahead log.
+
+Covers group commit, replay of unfinished orders, compaction and
+tolerance of a torn tail after a crash.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.schemas.orders import Order, OrderType
+from app.services import order_queue_wal
+from app.services.order_queue import OrderQueue, QueuePriority
+from app.services.order_queue_wal import OrderQueueWAL, WALError
+
+pytestmark = pytest.mark.journey_basic_trading
+
+
+def _make_order(order_id: str) -> Order:
+    return Order(id=order_id, symbol="AAPL", order_type=OrderType.BUY, quantity=5)
+
+
+async def _start_without_workers(queue: OrderQueue) -> None:
+    """Start the queue but leave orders unprocessed."""
+    queue.max_workers = 0
+    queue.batch_config.enable_batching = False
+    await queue.start()
+
+
+class TestOrderQueueWAL:
+    """Test the write-ahead log on its own and wired into the queue."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_enqueues_share_fsyncs(self, tmp_path):
+        """Enqueues issued together are written with fewer fsyncs than records."""
+        wal = OrderQueueWAL(tmp_path / "queue.wal", group_commit_window_ms=5)
+        queue = OrderQueue(wal=wal)
+        await _start_without_workers(queue)
+        try:
+            await asyncio.gather(
+                *(
+                    queue.enqueue_order(_make_order(f"o{i}"), account_id="acct")
+                    for i in range(20)
+                )
+            )
+        finally:
+            await queue.stop(drain=False)
+
+        assert wal.stats.records_written == 20
+        assert wal.stats.fsyncs < 20
+        assert wal.stats.avg_group_size > 1
+
+    @pytest.mark.asyncio
+    async def test_unfinished_orders_are_replayed(self, tmp_path):
+        """Orders still queued at shutdown come back on the next start."""
+        path = tmp_path / "queue.wal"
+        queue = OrderQueue(wal=OrderQueueWAL(path))
+        await _start_without_workers(queue)
+        await queue.enqueue_order(
+            _make_order("o1"), QueuePriority.HIGH, metadata={"source": "api"}
+        )
+        await queue.enqueue_order(_make_order("o2"), account_id="acct")
+        await queue.enqueue_order(_make_order("o3"), account_id="acct")
+        assert await queue.cancel_order("o3") is True
+        await queue.stop(drain=False)
+
+        restored_queue = OrderQueue(wal=OrderQueueWAL(path))
+        await _start_without_workers(restored_queue)
+        try:
+            status = await restored_queue.get_queue_status()
+            first = restored_queue.fair_queue.pop()
+            second = restored_queue.fair_queue.pop()
+        finally:
+            await restored_queue.stop(drain=False)
+
+        assert status["queue_depth"] == 2
+        assert status["wal"]["records_replayed"] == 2
+        assert (first.order.id, first.priority) == ("o1", QueuePriority.HIGH)
+        assert first.metadata == {"source": "api"}
+        assert (second.order.id, second.account_id) == ("o2", "acct")
+
+    @pytest.mark.asyncio
+    async def test_processed_orders_are_not_replayed(self, tmp_path):
+        """Completed orders are dropped from the log when it is compacted."""
+        path = tmp_path / "queue.wal"
+        queue = OrderQueue(max_concurrent_workers=1, wal=OrderQueueWAL(path))
+        queue.register_processor(OrderType.BUY, AsyncMock(return_value="filled"))
+        await queue.start()
+        await queue.enqueue_order(_make_order("o1"))
+        await queue.stop(drain=True)
+
+        wal = OrderQueueWAL(path)
+        assert await wal.open() == []
+        await wal.close()
+        assert path.stat().st_size == 0
+
+    @pytest.mark.asyncio
+    async def test_torn_tail_is_ignored(self, tmp_path):
+        """A partially written final record does not prevent replay."""
+        path = tmp_path / "queue.wal"
+        queue = OrderQueue(wal=OrderQueueWAL(path))
+        await _start_without_workers(queue)
+        await queue.enqueue_order(_make_order("o1"))
+        await queue.stop(drain=False)
+
+        with open(path, "ab") as f:
+            f.write(b"\x40\x00\x00\x00\x01\x02")
+
+        wal = OrderQueueWAL(path)
+        restored = await wal.open()
+        await wal.close()
+        assert [queued_order.order.id for queued_order in restored] == ["o1"]
+
+    @pytest.mark.asyncio
+    async def test_failed_fsync_leaves_order_unqueued(self, tmp_path, monkeypatch):
+        """An order whose record cannot be made durable never reaches workers."""
+        queue = OrderQueue(wal=OrderQueueWAL(tmp_path / "queue.wal"))
+        await _start_without_workers(queue)
+
+        def failing_fsync(fd: int) -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(order_queue_wal.os, "fsync", failing_fsync)
+        try:
+            with pytest.raises(WALError):
+                await queue.enqueue_order(_make_order("o1"), account_id="acct")
+            status = await queue.get_queue_status()
+        finally:
+            monkeypatch.undo()
+            await queue.stop(drain=False)
+
+        assert status["queue_depth"] == 0
+        assert queue.metrics.total_enqueued == 0
+        assert queue.metrics.current_queue_depth == 0
+        assert len(queue.fair_queue) == 0
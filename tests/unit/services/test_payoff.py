@@ -0,0 +1,152 @@
+"""
+Tests for the piecewise-linear expiration payoff engine.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.schemas.orders import MultiLegOrder
+from app.schemas.positions import Portfolio
+from app.services.order_validation_advanced import ComplexOrderValidator
+from app.services.payoff import PayoffLeg, PayoffProfile
+
+pytestmark = pytest.mark.journey_options_trading
+
+
+def _iron_condor() -> PayoffProfile:
+    return PayoffProfile(
+        [
+            PayoffLeg("put", 1, 1.0, 390.0),
+            PayoffLeg("put", -1, 2.0, 400.0),
+            PayoffLeg("call", -1, 2.0, 420.0),
+            PayoffLeg("call", 1, 1.0, 430.0),
+        ]
+    )
+
+
+class TestPayoffProfile:
+    """Test exact metrics and vectorized evaluation."""
+
+    def test_iron_condor_metrics(self):
+        profile = _iron_condor()
+
+        assert profile.net_premium == pytest.approx(200.0)
+        assert profile.max_profit == pytest.approx(200.0)
+        assert profile.max_loss == pytest.approx(800.0)
+        assert profile.breakevens == [398.0, 422.0]
+
+    def test_evaluate_matches_leg_by_leg_payoff(self):
+        profile = _iron_condor()
+        prices = np.array([350.0, 395.0, 410.0, 425.0, 500.0])
+
+        expected = [
+            100
+            * (
+                max(390 - s, 0)
+                - 1
+                - (max(400 - s, 0) - 2)
+                - (max(s - 420, 0) - 2)
+                + max(s - 430, 0)
+                - 1
+            )
+            for s in prices
+        ]
+
+        np.testing.assert_allclose(profile.evaluate(prices), expected)
+
+    def test_unbounded_sides(self):
+        long_call = PayoffProfile([PayoffLeg("call", 1, 3.0, 100.0)])
+        short_call = PayoffProfile([PayoffLeg("call", -1, 3.0, 100.0)])
+
+        assert long_call.max_profit is None
+        assert long_call.max_loss == pytest.approx(300.0)
+        assert long_call.breakevens == [103.0]
+        assert short_call.max_loss is None
+        assert short_call.max_profit == pytest.approx(300.0)
+
+    def test_covered_call_with_stock(self):
+        profile = PayoffProfile(
+            [PayoffLeg("stock", 100, 150.0), PayoffLeg("call", -1, 3.0, 160.0)]
+        )
+
+        assert profile.max_profit == pytest.approx(1300.0)
+        assert profile.max_loss == pytest.approx(14700.0)
+        assert profile.breakevens == [147.0]
+
+    def test_curve_spans_breakevens(self):
+        prices, payoff = _iron_condor().curve(points=11)
+
+        assert prices.size == payoff.size == 11
+        assert prices[0] <= 398.0
+        assert prices[-1] >= 422.0
+
+    @pytest.mark.parametrize(
+        ("legs", "grid"),
+        [
+            # Stock at zero cost and a flat payoff have nothing above zero
+            ([PayoffLeg("stock", 100, 0.0)], [0.0, 50.0, 100.0]),
+            (
+                [PayoffLeg("stock", 100, 0.0), PayoffLeg("stock", -100, 0.0)],
+                [0.0, 50.0, 100.0],
+            ),
+            # Otherwise stock-only legs are scaled by their cost
+            (
+                [PayoffLeg("stock", 100, 150.0), PayoffLeg("stock", -100, 150.0)],
+                [75.0, 150.0, 225.0],
+            ),
+        ],
+    )
+    def test_curve_without_strikes(self, legs, grid):
+        prices, payoff = PayoffProfile(legs).curve(points=3)
+
+        assert prices.tolist() == grid
+        assert payoff.size == 3
+
+    def test_rejects_unknown_leg(self):
+        with pytest.raises(ValueError):
+            PayoffProfile([PayoffLeg("future", 1, 1.0)])
+
+
+class TestValidatorPayoff:
+    """Test ComplexOrderValidator metrics from the payoff engine."""
+
+    def _validate(self, order: MultiLegOrder):
+        portfolio = Portfolio(
+            cash_balance=100000.0,
+            total_value=100000.0,
+            positions=[],
+            daily_pnl=0.0,
+            total_pnl=0.0,
+        )
+        return ComplexOrderValidator().validate_order(order, portfolio, 4)
+
+    def test_butterfly_metrics(self):
+        expiry = (date.today() + timedelta(days=30)).strftime("%y%m%d")
+        order = (
+            MultiLegOrder(legs=[])
+            .buy_to_open(f"AAPL{expiry}C00140000", 1, 6.0)
+            .sell_to_open(f"AAPL{expiry}C00150000", 2, 3.0)
+            .buy_to_open(f"AAPL{expiry}C00160000", 1, 1.0)
+        )
+
+        result = self._validate(order)
+
+        assert result.max_loss == pytest.approx(100.0)
+        assert result.max_profit == pytest.approx(900.0)
+        assert result.breakeven_points == [141.0, 159.0]
+
+    def test_mixed_expirations_have_no_payoff(self):
+        near = (date.today() + timedelta(days=30)).strftime("%y%m%d")
+        far = (date.today() + timedelta(days=60)).strftime("%y%m%d")
+        order = (
+            MultiLegOrder(legs=[])
+            .sell_to_open(f"AAPL{near}C00150000", 1, 3.0)
+            .buy_to_open(f"AAPL{far}C00150000", 1, 5.0)
+        )
+
+        result = self._validate(order)
+
+        assert (result.max_profit, result.max_loss) == (None, None)
+        assert result.breakeven_points == []
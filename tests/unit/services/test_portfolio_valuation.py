@@ -0,0 +1,126 @@
+"""
+Tests for in-memory portfolio valuations.
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.database.base import Base
+from app.models.database.trading import Account as DBAccount
+from app.models.database.trading import Position as DBPosition
+from app.services.portfolio_valuation import PortfolioValuationStore
+from app.services.trading_service import TradingService
+
+pytestmark = pytest.mark.journey_basic_trading
+
+
+class TestPortfolioValuationStore:
+    """Test serving totals and reconciliation."""
+
+    def test_totals(self):
+        """Totals value each position at its cached price."""
+        store = PortfolioValuationStore()
+        store.load("ACC1", [("AAPL", 10, 100.0, 110.0), ("MSFT", 5, 300.0, 290.0)])
+
+        snapshot = store.get("ACC1")
+        assert snapshot is not None
+        assert snapshot.positions_count == 2
+        assert snapshot.invested_value == 10 * 110.0 + 5 * 290.0
+        assert snapshot.unrealized_pnl == pytest.approx(10 * 10.0 - 5 * 10.0)
+
+    def test_stale_valuation_requires_reconciliation(self):
+        """Valuations past the reconcile interval are not served."""
+        store = PortfolioValuationStore(reconcile_interval=0.0)
+        store.load("ACC1", [("AAPL", 10, 100.0, 110.0)])
+
+        assert store.get("ACC1") is None
+
+        store.load("ACC1", [("AAPL", 10, 100.0, 120.0)])
+        stats = store.get_stats()
+        assert stats["reconciliations"] == 2
+        assert stats["last_drift"] == pytest.approx(100.0)
+
+    @pytest.mark.asyncio
+    async def test_committed_position_writes_invalidate(self):
+        """Accounts whose positions a transaction wrote are rebuilt on next read."""
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[DBAccount.__table__, DBPosition.__table__],
+            )
+        store = PortfolioValuationStore()
+
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            account = DBAccount(owner="test_user", cash_balance=1000.0)
+            db.add(account)
+            await db.commit()
+            store.load(account.id, [])
+            store.load("OTHER", [])
+
+            db.add(
+                DBPosition(
+                    account_id=account.id, symbol="AAPL", quantity=10, avg_price=1.0
+                )
+            )
+            await db.flush()
+            # Not committed yet, so reads may still be served
+            assert store.get(account.id) is not None
+
+            await db.commit()
+            assert store.get(account.id) is None
+            assert store.get("OTHER") is not None
+        await engine.dispose()
+
+
+class TestTradingServiceValuation:
+    """Test TradingService serving totals from the valuation store."""
+
+    @pytest.mark.asyncio
+    async def test_summary_served_from_store_after_first_load(self):
+        """Only the first summary reads positions; later ones use the store."""
+        account = DBAccount(
+            id="TEST123456",
+            owner="test_user",
+            cash_balance=1000.0,
+            starting_balance=1000.0,
+            created_at=datetime(2026, 1, 1),
+            updated_at=datetime(2026, 1, 1),
+        )
+        position = DBPosition(
+            id="POS0000001", account_id=account.id, symbol="AAPL", quantity=10
+        )
+        position.avg_price = 100.0
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = account
+        result.all.return_value = [(position, 110.0)]
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        store = PortfolioValuationStore()
+        service = TradingService(
+            quote_adapter=AsyncMock(),
+            account_owner="test_user",
+            db_session=db,
+            valuation_store=store,
+        )
+
+        first = await service.get_portfolio_summary()
+        second = await service.get_portfolio_summary()
+
+        assert first == second
+        assert second.invested_value == 1100.0
+        assert second.total_pnl == 100.0
+        # Account + positions for the first call, only the account afterwards
+        assert db.execute.await_count == 3
+
+        # Quotes from the adapter do not re-mark the cached totals, which stay
+        # at the same cached price the full portfolio is valued at
+        service.quote_adapter.get_quote.return_value = MagicMock(price=120.0)
+        await service.get_quote("AAPL")
+        portfolio = await service.get_portfolio()
+        summary = await service.get_portfolio_summary()
+        assert summary.invested_value == portfolio.total_value - 1000.0
@@ -0,0 +1,197 @@
+"""
+Tests for the pre-trade risk fast path over running exposure aggregates.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.quotes import Quote
+from app.schemas.orders import Order, OrderType
+from app.schemas.positions import Portfolio, Position
+from app.services.risk_analysis import RiskAnalyzer, RiskCheckType
+
+pytestmark = pytest.mark.journey_performance
+
+
+def _position(symbol: str, quantity: int, price: float, **greeks: float) -> Position:
+    return Position(
+        symbol=symbol,
+        quantity=quantity,
+        avg_price=price,
+        current_price=price,
+        asset=symbol,
+        **greeks,
+    )
+
+
+def _portfolio(*positions: Position, cash: float = 100_000.0) -> Portfolio:
+    invested = sum(abs(p.quantity) * (p.current_price or 0.0) for p in positions)
+    return Portfolio(
+        cash_balance=cash,
+        total_value=cash + invested,
+        positions=list(positions),
+        daily_pnl=0.0,
+        total_pnl=0.0,
+    )
+
+
+def _book() -> Portfolio:
+    return _portfolio(
+        _position("AAPL", 100, 150.0),
+        _position("JPM", 50, 140.0),
+        _position("XOM", 80, 100.0),
+    )
+
+
+def _order(symbol: str, quantity: int, order_type: OrderType) -> Order:
+    return Order(symbol=symbol, quantity=quantity, order_type=order_type)
+
+
+def _quote(symbol: str, price: float) -> Quote:
+    return Quote(asset=symbol, quote_date=datetime.now(), price=price)
+
+
+class TestFastPath:
+    """Test orders checked against the running aggregates."""
+
+    @pytest.mark.parametrize(
+        "order",
+        [
+            _order("AAPL", 10, OrderType.BUY),
+            _order("AAPL", 40, OrderType.SELL),
+            _order("MSFT", 5, OrderType.BUY),
+        ],
+    )
+    def test_matches_full_analysis(self, order: Order):
+        portfolio = _book()
+        quote = _quote(order.symbol, 150.0)
+        analyzer = RiskAnalyzer()
+
+        fast = analyzer.analyze_order(order, portfolio, quote, account_id="acct")
+        full = RiskAnalyzer().analyze_order(order, portfolio, quote)
+
+        assert analyzer.stats.fast_path == 1
+        assert fast == full
+
+    def test_order_near_a_limit_gets_full_analysis(self):
+        analyzer = RiskAnalyzer()
+        portfolio = _book()
+
+        result = analyzer.analyze_order(
+            _order("AAPL", 60, OrderType.BUY),
+            portfolio,
+            _quote("AAPL", 150.0),
+            account_id="acct",
+        )
+
+        # 160 shares at $150 is 18.5% of the book: within the 20% limit but
+        # past the fast path's headroom
+        assert analyzer.stats.full_path == 1
+        assert not result.violations
+
+        result = analyzer.analyze_order(
+            _order("AAPL", 100, OrderType.BUY),
+            portfolio,
+            _quote("AAPL", 150.0),
+            account_id="acct",
+        )
+        assert [v.check_type for v in result.violations] == [
+            RiskCheckType.POSITION_CONCENTRATION
+        ]
+
+    def test_price_moves_rebuild_the_aggregates(self):
+        analyzer = RiskAnalyzer()
+        order = _order("MSFT", 1, OrderType.BUY)
+        quote = _quote("MSFT", 300.0)
+
+        def book(aapl: float) -> Portfolio:
+            return _portfolio(
+                _position("AAPL", 100, aapl),
+                _position("JPM", 50, 140.0),
+                _position("XOM", 80, 100.0),
+                cash=20_000.0,
+            )
+
+        analyzer.analyze_order(order, book(150.0), quote, account_id="acct")
+        moved = book(400.0)
+        fast = analyzer.analyze_order(order, moved, quote, account_id="acct")
+        full = RiskAnalyzer().analyze_order(order, moved, quote)
+
+        assert analyzer.stats.exposure_builds == 2
+        assert fast.violations == full.violations
+        assert RiskCheckType.SECTOR_EXPOSURE in [v.check_type for v in fast.violations]
+
+    def test_sells_reduce_the_position(self):
+        result = RiskAnalyzer().analyze_order(
+            _order("AAPL", 100, OrderType.SELL),
+            _book(),
+            _quote("AAPL", 150.0),
+            account_id="acct",
+        )
+
+        assert result.portfolio_impact.closed_positions == ["AAPL"]
+        assert result.position_impacts[0].new_quantity == 0
+
+
+class TestAccountExposure:
+    """Test building, caching and updating the aggregates."""
+
+    def test_aggregates(self):
+        analyzer = RiskAnalyzer()
+        exposure = analyzer.account_exposure("acct", _book())
+
+        assert exposure.gross_exposure == pytest.approx(30_000.0)
+        assert exposure.net_exposure == pytest.approx(30_000.0)
+        assert exposure.sector_exposure == {
+            "Technology": 15_000.0,
+            "Financials": 7_000.0,
+            "Energy": 8_000.0,
+        }
+        assert exposure.greeks["delta"] == pytest.approx(230.0)
+
+    def test_cached_per_version(self):
+        analyzer = RiskAnalyzer()
+        portfolio = _book()
+
+        first = analyzer.account_exposure("acct", portfolio)
+        assert analyzer.account_exposure("acct", portfolio) is first
+        assert analyzer.account_exposure("acct", _portfolio()) is not first
+        assert analyzer.stats.exposure_builds == 2
+
+    def test_apply_fill(self):
+        analyzer = RiskAnalyzer()
+        analyzer.account_exposure("acct", _book(), version=1)
+
+        analyzer.apply_fill("acct", "AAPL", -40, 160.0, version=2)
+        analyzer.apply_fill("acct", "MSFT", 10, 300.0, version=3)
+        exposure = analyzer.account_exposure("acct", _book(), version=3)
+
+        assert exposure.holdings["AAPL"].quantity == 60
+        assert exposure.holdings["AAPL"].avg_price == 150.0
+        assert exposure.sector_exposure["Technology"] == pytest.approx(12_600.0)
+        assert exposure.gross_exposure == pytest.approx(27_600.0)
+        assert exposure.greeks["delta"] == pytest.approx(200.0)
+        assert analyzer.stats.exposure_builds == 1
+
+    def test_option_order_greeks(self):
+        expiry = (date.today() + timedelta(days=30)).strftime("%y%m%d")
+        held = f"AAPL{expiry}C00160000"
+        ordered = f"AAPL{expiry}C00150000"
+        portfolio = _portfolio(
+            _position("AAPL", 100, 150.0), _position(held, -1, 2.0, delta=-40.0)
+        )
+        analyzer = RiskAnalyzer()
+
+        result = analyzer.analyze_order(
+            _order(ordered, 1, OrderType.BTO),
+            portfolio,
+            _quote(ordered, 5.0),
+            account_id="acct",
+        )
+
+        assert analyzer.stats.fast_path == 1
+        assert [i.symbol for i in result.position_impacts] == [held]
+        greeks = result.Greeks_impact
+        assert greeks is not None
+        assert greeks["delta_after"] == pytest.approx(60.0 + greeks["delta_change"])
@@ -0,0 +1,146 @@
+"""
+Tests for read-replica routing and read-your-writes stickiness.
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.database.trading import Account as DBAccount
+from app.services.trading_service import TradingService
+from app.storage import database
+from app.storage.database import ReplicaRouter
+
+pytestmark = pytest.mark.journey_basic_trading
+
+
+def _session_factory(account: DBAccount) -> tuple[MagicMock, AsyncMock]:
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = account
+    result.one.return_value = (0, 0, 0)
+    session = AsyncMock()
+    session.execute.return_value = result
+    return MagicMock(return_value=session), session
+
+
+class TestReplicaRouter:
+    """Test the routing policy."""
+
+    def test_reads_rotate_over_replicas(self):
+        """Reads without recent writes are spread round-robin."""
+        router = ReplicaRouter(sticky_seconds=5.0)
+
+        chosen = [router.choose("alice", 2) for _ in range(4)]
+
+        assert chosen == [0, 1, 0, 1]
+        assert router.routed["replica-0"] == 2
+
+    def test_reads_stick_to_primary_after_write(self):
+        """An account that just wrote reads from the primary; others do not."""
+        router = ReplicaRouter(sticky_seconds=5.0)
+        router.record_write("alice")
+
+        assert router.choose("alice", 2) is None
+        assert router.choose("bob", 2) == 0
+        assert router.routed["primary_sticky"] == 1
+
+    def test_stickiness_expires(self):
+        """Once the window passes, reads go back to the replicas."""
+        router = ReplicaRouter(sticky_seconds=0.0)
+        router.record_write("alice")
+
+        assert router.choose("alice", 1) == 0
+
+    def test_no_replicas_uses_primary(self):
+        router = ReplicaRouter()
+
+        assert router.choose("alice", 0) is None
+        assert router.routed["primary"] == 1
+
+
+class TestTradingServiceRouting:
+    """Test which session factory TradingService scopes use."""
+
+    @pytest.fixture
+    def routing(self, monkeypatch):
+        account = DBAccount(
+            id="TEST123456",
+            owner="test_user",
+            cash_balance=1000.0,
+            starting_balance=1000.0,
+            created_at=datetime(2026, 1, 1),
+            updated_at=datetime(2026, 1, 1),
+        )
+        replica_factory, replica_session = _session_factory(account)
+        primary_factory, primary_session = _session_factory(account)
+        router = ReplicaRouter(sticky_seconds=60.0)
+        keys = []
+
+        def read_factory(key=None):
+            keys.append(key)
+            return primary_factory if router.is_sticky(key) else replica_factory
+
+        monkeypatch.setattr(database, "replica_router", router)
+        monkeypatch.setattr(database, "get_read_session_factory", read_factory)
+        monkeypatch.setattr(
+            database, "get_async_session_factory", lambda: primary_factory
+        )
+        return router, keys, replica_session, primary_session
+
+    @pytest.mark.asyncio
+    async def test_reads_are_keyed_by_account_id(self, routing):
+        """Reads use the targeted account's id once the owner's is known."""
+        _, keys, replica_session, primary_session = routing
+        service = TradingService(quote_adapter=AsyncMock(), account_owner="test_user")
+
+        # The owner's account id is unknown until loaded, so this read and
+        # its lookup stay on the primary
+        await service.get_account_balance()
+        assert primary_session.execute.await_count == 1
+
+        await service.get_account_balance()
+        await service.get_account_balance(account_id="OTHER12345")
+        assert keys == ["TEST123456", "OTHER12345"]
+        assert replica_session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_only_flushed_accounts_pin_reads(self, routing):
+        """A write scope pins the accounts it flushed and nothing else."""
+        router, _, replica_session, primary_session = routing
+        service = TradingService(quote_adapter=AsyncMock(), account_owner="test_user")
+
+        async with service.operation_scope("noop"):
+            await service._execute_with_session(AsyncMock())
+        assert not router.is_sticky("TEST123456")
+
+        async with service.operation_scope("deposit") as scope:
+            await service._execute_with_session(AsyncMock())
+            # Stands in for the after_flush listener
+            scope.written_accounts.add("OTHER12345")
+
+        await service.get_account_balance(account_id="OTHER12345")
+        assert router.is_sticky("OTHER12345")
+        assert not router.is_sticky("TEST123456")
+        assert primary_session.execute.await_count == 1
+        assert replica_session.execute.await_count == 0
+
+
+def test_pool_metrics_cover_registered_engines(monkeypatch):
+    """Pool metrics are reported per engine name."""
+    pool = MagicMock()
+    pool.size.return_value = 5
+    pool.checkedin.return_value = 4
+    pool.checkedout.return_value = 1
+    pool.overflow.return_value = -4
+    monkeypatch.setattr(
+        database,
+        "_engines",
+        [("primary", MagicMock(pool=pool)), ("replica-0", MagicMock(pool=pool))],
+    )
+
+    metrics = database.get_pool_metrics()
+
+    assert set(metrics["pools"]) == {"primary", "replica-0"}
+    assert metrics["pools"]["primary"]["checked_out"] == 1
+    assert metrics["pools"]["primary"]["overflow"] == 0
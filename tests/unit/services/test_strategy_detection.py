@@ -0,0 +1,166 @@
+"""
+Tests for strike-indexed complex strategy detection.
+"""
+
+import pytest
+
+from app.schemas.positions import Position
+from app.services.strategies import (
+    ComplexStrategyDetector,
+    ComplexStrategyType,
+    detect_complex_strategies,
+)
+from app.services.strategy_grouping import (
+    group_into_basic_strategies,
+    identify_complex_strategies,
+)
+
+pytestmark = pytest.mark.journey_complex_strategies
+
+
+def _position(symbol: str, quantity: int, avg_price: float = 1.0) -> Position:
+    return Position(symbol=symbol, quantity=quantity, avg_price=avg_price, asset=symbol)
+
+
+def _legs(strategy) -> list[tuple[str, int]]:
+    return [(leg.symbol, leg.quantity) for leg in strategy.legs]
+
+
+class TestComplexStrategyDetector:
+    """Test pattern matching over strike ladders."""
+
+    def test_iron_condor_metrics(self):
+        book = [
+            _position("SPY250117P00390000", 1, 1.0),
+            _position("SPY250117P00400000", -1, 2.0),
+            _position("SPY250117C00420000", -1, 2.0),
+            _position("SPY250117C00430000", 1, 1.0),
+        ]
+
+        (condor,) = detect_complex_strategies(book)
+
+        assert condor.complex_type == ComplexStrategyType.IRON_CONDOR
+        assert condor.net_credit == pytest.approx(200.0)
+        assert condor.max_profit == pytest.approx(200.0)
+        assert condor.max_loss == pytest.approx(800.0)
+        assert condor.breakeven_points == [398.0, 422.0]
+
+    def test_iron_butterfly_shares_short_strike(self):
+        book = [
+            _position("SPY250117P00390000", 1),
+            _position("SPY250117P00400000", -1),
+            _position("SPY250117C00400000", -1),
+            _position("SPY250117C00410000", 1),
+        ]
+
+        (strategy,) = detect_complex_strategies(book)
+
+        assert strategy.complex_type == ComplexStrategyType.IRON_BUTTERFLY
+
+    def test_butterfly_needs_symmetric_wings(self):
+        book = [
+            _position("AAPL250117C00140000", 2, 6.0),
+            _position("AAPL250117C00150000", -4, 3.0),
+            _position("AAPL250117C00160000", 2, 1.0),
+            # An asymmetric wing is left alone
+            _position("AAPL250117C00145000", 1, 4.0),
+        ]
+
+        (butterfly,) = detect_complex_strategies(book)
+
+        assert butterfly.complex_type == ComplexStrategyType.BUTTERFLY
+        assert butterfly.quantity == 2
+        assert _legs(butterfly) == [
+            ("AAPL250117C00140000", 2),
+            ("AAPL250117C00150000", -4),
+            ("AAPL250117C00160000", 2),
+        ]
+        assert butterfly.max_loss == pytest.approx(200.0)
+        assert butterfly.max_profit == pytest.approx(1800.0)
+
+    def test_condor(self):
+        book = [
+            _position("IWM250117P00180000", 1),
+            _position("IWM250117P00185000", -1),
+            _position("IWM250117P00190000", -1),
+            _position("IWM250117P00195000", 1),
+        ]
+
+        (condor,) = detect_complex_strategies(book)
+
+        assert condor.complex_type == ComplexStrategyType.CONDOR
+
+    def test_straddles_and_strangles_by_direction(self):
+        book = [
+            _position("MSFT250117P00300000", 1, 4.0),
+            _position("MSFT250117C00300000", 1, 4.0),
+            _position("MSFT250117P00290000", -2, 2.0),
+            _position("MSFT250117C00320000", -2, 2.0),
+        ]
+
+        strategies = {s.complex_type: s for s in detect_complex_strategies(book)}
+
+        straddle = strategies[ComplexStrategyType.STRADDLE]
+        assert straddle.max_loss == pytest.approx(800.0)
+        assert straddle.max_profit is None
+        assert straddle.breakeven_points == [292.0, 308.0]
+
+        strangle = strategies[ComplexStrategyType.STRANGLE]
+        assert strangle.quantity == 2
+        assert strangle.max_profit == pytest.approx(800.0)
+        assert strangle.max_loss is None
+
+    def test_calendar_spread_across_expirations(self):
+        book = [
+            _position("QQQ250117C00350000", -1, 3.0),
+            _position("QQQ250221C00350000", 1, 5.0),
+        ]
+
+        (calendar,) = detect_complex_strategies(book)
+
+        assert calendar.complex_type == ComplexStrategyType.CALENDAR_SPREAD
+        assert calendar.net_credit == pytest.approx(-200.0)
+
+    def test_contracts_used_once(self):
+        """Legs claimed by an iron condor are not reused for a strangle."""
+        book = [
+            _position("SPY250117P00390000", 1),
+            _position("SPY250117P00400000", -1),
+            _position("SPY250117C00420000", -1),
+            _position("SPY250117C00430000", 1),
+        ]
+        detector = ComplexStrategyDetector(book)
+
+        assert len(detector.iron_condors()) == 1
+        assert detector.straddles_strangles() == []
+
+
+class TestStrategyGroupingComplex:
+    """Test complex strategy lookup over basic strategies."""
+
+    def test_iron_condor_and_butterfly_from_spreads(self):
+        book = [
+            _position("SPY250117P00390000", 1),
+            _position("SPY250117P00400000", -1),
+            _position("SPY250117C00420000", -1),
+            _position("SPY250117C00430000", 1),
+            _position("AAPL250117C00140000", 1),
+            _position("AAPL250117C00150000", -2),
+            _position("AAPL250117C00160000", 1),
+        ]
+
+        found = identify_complex_strategies(group_into_basic_strategies(book))
+
+        assert len(found["iron_condors"]) == 1
+        (butterfly,) = found["butterflies"]
+        assert butterfly["strike"] == 150.0
+
+    def test_long_straddle(self):
+        book = [
+            _position("MSFT250117P00300000", 1),
+            _position("MSFT250117C00300000", 1),
+        ]
+
+        found = identify_complex_strategies(group_into_basic_strategies(book))
+
+        assert [s["type"] for s in found["straddles_strangles"]] == ["long_straddle"]
@@ -0,0 +1,123 @@
+"""
+Tests for indexed and incremental strategy recognition.
+"""
+
+import pytest
+
+from app.schemas.positions import Position
+from app.services.strategies import (
+    CoveredStrategy,
+    SpreadStrategy,
+    StrategyRecognitionService,
+    position_set_version,
+)
+
+pytestmark = pytest.mark.journey_complex_strategies
+
+
+def _position(symbol: str, quantity: int) -> Position:
+    return Position(symbol=symbol, quantity=quantity, avg_price=1.0, asset=symbol)
+
+
+def _book() -> list[Position]:
+    return [
+        _position("AAPL", 100),
+        _position("AAPL250117C00150000", -1),
+        _position("MSFT250117C00300000", -1),
+        _position("MSFT250117C00310000", 1),
+        _position("SPY250117P00400000", -2),
+    ]
+
+
+def _describe(strategies) -> list[tuple[str, str]]:
+    return sorted(
+        (type(s).__name__, s.model_dump_json(exclude={"quantity"})) for s in strategies
+    )
+
+
+class TestStrategyRecognition:
+    """Test grouping, caching and incremental regrouping."""
+
+    def test_groups_per_underlying(self):
+        strategies = StrategyRecognitionService().group_positions_by_strategy(_book())
+
+        kinds = [type(s) for s in strategies]
+        assert kinds.count(CoveredStrategy) == 1
+        assert kinds.count(SpreadStrategy) == 1
+        # Two naked short SPY puts
+        assert len(strategies) == 4
+
+    def test_index_built_in_one_pass(self):
+        index = StrategyRecognitionService().index_positions(_book())
+
+        assert {u: len(ps) for u, ps in index.items()} == {
+            "AAPL": 2,
+            "MSFT": 2,
+            "SPY": 1,
+        }
+
+    def test_account_cache_hit_for_same_version(self):
+        service = StrategyRecognitionService()
+        first = service.group_account_positions("ACC1", _book())
+        second = service.group_account_positions("ACC1", _book())
+
+        assert _describe(first) == _describe(second)
+        stats = service.get_stats()
+        assert stats["hits"] == 1
+        assert stats["underlyings_regrouped"] == 3
+
+    def test_changed_version_regroups_only_changed_underlyings(self):
+        service = StrategyRecognitionService()
+        service.group_account_positions("ACC1", _book())
+
+        positions = _book()
+        positions[-1] = _position("SPY250117P00400000", -3)
+        result = service.group_account_positions("ACC1", positions)
+
+        assert service.get_stats()["underlyings_regrouped"] == 4
+        assert service.get_stats()["underlyings_reused"] == 2
+        assert _describe(result) == _describe(
+            StrategyRecognitionService().group_positions_by_strategy(positions)
+        )
+
+    def test_regroup_touched_underlyings_after_fill(self):
+        service = StrategyRecognitionService()
+        service.group_account_positions("ACC1", _book(), version=1)
+
+        # A fill closes the MSFT spread and opens a TSLA position
+        positions = [p for p in _book() if not p.symbol.startswith("MSFT")]
+        positions.append(_position("TSLA", 10))
+        result = service.regroup_underlyings(
+            "ACC1", positions, ["MSFT", "TSLA"], version=2
+        )
+
+        assert _describe(result) == _describe(
+            StrategyRecognitionService().group_positions_by_strategy(positions)
+        )
+        assert service.group_account_positions("ACC1", positions, version=2) == result
+        assert service.get_stats()["hits"] == 1
+
+    def test_regroup_without_cached_grouping_is_not_served(self):
+        """A grouping seeded from a fill is partial, so it is never a hit."""
+        service = StrategyRecognitionService()
+        service.regroup_underlyings("ACC1", _book(), ["MSFT"], version=2)
+
+        result = service.group_account_positions("ACC1", _book(), version=2)
+
+        assert service.get_stats()["hits"] == 0
+        assert service.get_stats()["underlyings_reused"] == 1
+        assert _describe(result) == _describe(
+            StrategyRecognitionService().group_positions_by_strategy(_book())
+        )
+
+    def test_version_tracks_holdings(self):
+        assert position_set_version(_book()) == position_set_version(_book()[::-1])
+        changed = [*_book()[:-1], _position("SPY250117P00400000", -1)]
+        assert position_set_version(changed) != position_set_version(_book())
+
+    def test_least_recent_accounts_evicted(self):
+        service = StrategyRecognitionService(max_accounts=2)
+        for account_id in ("A", "B", "C"):
+            service.group_account_positions(account_id, _book())
+
+        assert service.get_stats()["accounts"] == 2
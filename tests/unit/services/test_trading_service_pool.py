@@ -0,0 +1,58 @@
+"""
+Tests for the per-account TradingService pool used by MCP tools.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.trading_service import TradingService
+from app.services.trading_service_pool import TradingServicePool
+
+pytestmark = pytest.mark.journey_performance
+
+
+def _factory(account_owner: str) -> TradingService:
+    return TradingService(quote_adapter=AsyncMock(), account_owner=account_owner)
+
+
+class TestTradingServicePool:
+    """Test reuse, eviction and statistics."""
+
+    def test_services_reused_per_account(self):
+        """Repeat calls for an account get the same warm service."""
+        factory = MagicMock(side_effect=_factory)
+        pool = TradingServicePool(factory)
+
+        first = pool.get("alice")
+        second = pool.get("alice")
+        other = pool.get("bob")
+
+        assert first is second
+        assert other is not first
+        assert other.account_owner == "bob"
+        stats = pool.get_stats()
+        assert stats["constructions"] == 2
+        assert stats["hits"] == 1
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    def test_least_recently_used_evicted_when_full(self):
+        pool = TradingServicePool(_factory, max_size=2)
+
+        alice = pool.get("alice")
+        pool.get("bob")
+        pool.get("alice")
+        pool.get("carol")
+
+        assert pool.get("alice") is alice
+        assert pool.get_stats()["capacity_evictions"] == 1
+        assert pool.get_stats()["size"] == 2
+
+    def test_idle_services_evicted(self):
+        pool = TradingServicePool(_factory, idle_timeout=0.0)
+
+        first = pool.get("alice")
+        second = pool.get("alice")
+
+        assert first is not second
+        assert pool.get_stats()["idle_evictions"] == 1
@@ -20,7 +20,7 @@ Functions Tested:
 - TradingService.get_enhanced_quote() - app/services/trading_service.py:604-618
 """
 
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -28,6 +28,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.models.database.trading import Account as DBAccount
+from app.models.database.trading import DevStockQuote
 from app.models.database.trading import Position as DBPosition
 from app.schemas.positions import Portfolio, PortfolioSummary, Position
 from app.services.trading_service import TradingService
@@ -107,7 +108,7 @@ class TestGetPortfolio:
             unrealized_pnl=500.0,  # (155-150) * 100
             realized_pnl=0.0,
         )
-        mock_position_converter.to_schema.return_value = mock_schema_position
+        mock_position_converter.to_schema_many.return_value = [mock_schema_position]
 
         service = TradingService(
             quote_adapter=mock_quote_adapter,
@@ -188,7 +189,9 @@ class TestGetPortfolio:
                         realized_pnl=0.0,
                     )
 
-        mock_position_converter.to_schema.side_effect = mock_to_schema
+        mock_position_converter.to_schema_many.side_effect = lambda rows: [
+            mock_to_schema(db_pos, price) for db_pos, price in rows
+        ]
 
         service = TradingService(
             quote_adapter=mock_quote_adapter,
@@ -322,7 +325,9 @@ class TestGetPortfolio:
                     realized_pnl=0.0,
                 )
 
-        mock_position_converter.to_schema.side_effect = mock_to_schema
+        mock_position_converter.to_schema_many.side_effect = lambda rows: [
+            mock_to_schema(db_pos, price) for db_pos, price in rows
+        ]
 
         service = TradingService(
             quote_adapter=mock_quote_adapter,
@@ -345,6 +350,61 @@ class TestGetPortfolio:
         assert option.current_price == 8.0
         assert result.total_pnl == 2500.0  # 1000 + 1500
 
+    @pytest.mark.asyncio
+    async def test_get_portfolio_uses_latest_cached_quote(
+        self, db_session: AsyncSession
+    ):
+        """Positions are valued at the newest recent test_stock_quotes price."""
+        account = DBAccount(
+            id="TEST123456",
+            owner="test_user",
+            cash_balance=10000.0,
+        )
+        db_session.add(account)
+        db_session.add_all(
+            [
+                DBPosition(
+                    id="QUOTED0001",
+                    account_id=account.id,
+                    symbol="NVDA",
+                    quantity=10,
+                    avg_price=150.0,
+                ),
+                DBPosition(
+                    id="UNQUOTED01",
+                    account_id=account.id,
+                    symbol="TSLA",
+                    quantity=5,
+                    avg_price=200.0,
+                ),
+                DevStockQuote(
+                    symbol="NVDA",
+                    quote_date=date.today() - timedelta(days=1),
+                    price=155.0,
+                ),
+                DevStockQuote(symbol="NVDA", quote_date=date.today(), price=160.0),
+                DevStockQuote(
+                    symbol="TSLA",
+                    quote_date=date.today() - timedelta(days=30),
+                    price=250.0,
+                ),
+            ]
+        )
+        await db_session.commit()
+
+        service = TradingService(
+            quote_adapter=AsyncMock(),
+            account_owner="test_user",
+            db_session=db_session,
+        )
+
+        result = await service.get_portfolio()
+
+        prices = {pos.symbol: pos.current_price for pos in result.positions}
+        assert prices == {"NVDA": 160.0, "TSLA": 200.0}  # stale quote ignored
+        assert result.total_pnl == 100.0
+        assert result.total_value == 10000.0 + 10 * 160.0 + 5 * 200.0
+
 
 @pytest.mark.journey_portfolio_management
 @pytest.mark.database
@@ -400,31 +460,17 @@ class TestGetPortfolioSummary:
             avg_price=150.0,
         )
         db_session.add(position)
-        await db_session.commit()
-
-        # Mock dependencies
-        mock_quote_adapter = AsyncMock()
-        mock_quote = MagicMock()
-        mock_quote.price = 165.0
-        mock_quote_adapter.get_quote.return_value = mock_quote
-
-        mock_position_converter = AsyncMock()
-        mock_schema_position = Position(
-            symbol="NVDA",
-            quantity=100,
-            avg_price=150.0,
-            current_price=165.0,
-            unrealized_pnl=1500.0,  # (165-150) * 100
-            realized_pnl=0.0,
+        # Totals are computed in SQL from the latest cached quote
+        db_session.add(
+            DevStockQuote(symbol="NVDA", quote_date=date.today(), price=165.0)
         )
-        mock_position_converter.to_schema.return_value = mock_schema_position
+        await db_session.commit()
 
         service = TradingService(
-            quote_adapter=mock_quote_adapter,
+            quote_adapter=AsyncMock(),
             account_owner="test_user",
             db_session=db_session,
         )
-        service.position_converter = mock_position_converter
 
         result = await service.get_portfolio_summary()
 
@@ -458,31 +504,17 @@ class TestGetPortfolioSummary:
             avg_price=250.0,
         )
         db_session.add(position)
-        await db_session.commit()
-
-        # Mock for loss position
-        mock_quote_adapter = AsyncMock()
-        mock_quote = MagicMock()
-        mock_quote.price = 220.0  # Down $30 per share
-        mock_quote_adapter.get_quote.return_value = mock_quote
-
-        mock_position_converter = AsyncMock()
-        mock_schema_position = Position(
-            symbol="TSLA",
-            quantity=50,
-            avg_price=250.0,
-            current_price=220.0,
-            unrealized_pnl=-1500.0,  # (220-250) * 50 = -1500
-            realized_pnl=0.0,
+        # Down $30 per share: (220-250) * 50 = -1500
+        db_session.add(
+            DevStockQuote(symbol="TSLA", quote_date=date.today(), price=220.0)
         )
-        mock_position_converter.to_schema.return_value = mock_schema_position
+        await db_session.commit()
 
         service = TradingService(
-            quote_adapter=mock_quote_adapter,
+            quote_adapter=AsyncMock(),
             account_owner="test_user",
             db_session=db_session,
         )
-        service.position_converter = mock_position_converter
 
         result = await service.get_portfolio_summary()
 
@@ -601,7 +633,9 @@ class TestGetPositions:
                 realized_pnl=0.0,
             )
 
-        mock_position_converter.to_schema.side_effect = mock_to_schema
+        mock_position_converter.to_schema_many.side_effect = lambda rows: [
+            mock_to_schema(db_pos, price) for db_pos, price in rows
+        ]
 
         service = TradingService(
             quote_adapter=mock_quote_adapter,
@@ -675,7 +709,9 @@ class TestGetPositions:
                 realized_pnl=0.0,
             )
         
-        mock_position_converter.to_schema.side_effect = mock_to_schema
+        mock_position_converter.to_schema_many.side_effect = lambda rows: [
+            mock_to_schema(db_pos, price) for db_pos, price in rows
+        ]
 
         service = TradingService(
             quote_adapter=mock_quote_adapter,
@@ -734,7 +770,7 @@ class TestGetPosition:
             unrealized_pnl=1000.0,
             realized_pnl=0.0,
         )
-        mock_position_converter.to_schema.return_value = mock_schema_position
+        mock_position_converter.to_schema_many.return_value = [mock_schema_position]
 
         service = TradingService(
             quote_adapter=mock_quote_adapter,
@@ -784,7 +820,7 @@ class TestGetPosition:
             unrealized_pnl=1000.0,
             realized_pnl=0.0,
         )
-        mock_position_converter.to_schema.return_value = mock_schema_position
+        mock_position_converter.to_schema_many.return_value = [mock_schema_position]
 
         service = TradingService(
             quote_adapter=mock_quote_adapter,
@@ -856,7 +892,7 @@ class TestGetPosition:
             unrealized_pnl=2000.0,  # (12-8) * 5 * 100
             realized_pnl=0.0,
         )
-        mock_position_converter.to_schema.return_value = mock_schema_position
+        mock_position_converter.to_schema_many.return_value = [mock_schema_position]
 
         service = TradingService(
             quote_adapter=mock_quote_adapter,
@@ -0,0 +1,146 @@
+"""
+Tests for trigger book snapshots used by the OrderExecutionEngine.
+
+Covers the binary snapshot round trip, corruption handling and restoring
+an engine's trigger book from a snapshot file.
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.schemas.orders import OrderType
+from app.services.order_execution_engine import OrderExecutionEngine, TriggerCondition
+from app.services.trigger_book_snapshot import (
+    SnapshotError,
+    read_snapshot,
+    write_snapshot,
+)
+
+pytestmark = pytest.mark.journey_basic_trading
+
+
+def _make_condition(
+    order_id: str, symbol: str, trigger_type: str = "sell", price: float = 145.0
+) -> TriggerCondition:
+    return TriggerCondition(
+        order_id=order_id,
+        symbol=symbol,
+        trigger_type=trigger_type,
+        trigger_price=price,
+        order_type=OrderType.SELL,
+    )
+
+
+class TestTriggerBookSnapshotFile:
+    """Test writing and reading snapshot files."""
+
+    def test_round_trip(self, tmp_path):
+        """Conditions and watermark survive a write/read cycle."""
+        trailing = _make_condition("order_2", "MSFT", "trailing_stop", 300.0)
+        trailing.high_water_mark = 320.5
+        conditions = [_make_condition("order_1", "AAPL"), trailing]
+        watermark = datetime(2026, 1, 2, 9, 30, 15)
+
+        path = tmp_path / "trigger_book.snap"
+        assert write_snapshot(path, conditions, watermark) == 2
+
+        snapshot = read_snapshot(path)
+        assert snapshot.watermark == watermark
+        assert [c.order_id for c in snapshot.conditions] == ["order_1", "order_2"]
+
+        restored = snapshot.conditions[1]
+        assert restored.symbol == "MSFT"
+        assert restored.trigger_type == "trailing_stop"
+        assert restored.trigger_price == 300.0
+        assert restored.order_type == OrderType.SELL
+        assert restored.high_water_mark == 320.5
+        assert restored.low_water_mark is None
+
+    def test_empty_book(self, tmp_path):
+        """An empty trigger book produces a valid snapshot."""
+        path = tmp_path / "empty.snap"
+        write_snapshot(path, [], datetime(2026, 1, 1))
+
+        assert read_snapshot(path).conditions == []
+
+    def test_missing_file(self, tmp_path):
+        """Reading a missing snapshot raises SnapshotError."""
+        with pytest.raises(SnapshotError):
+            read_snapshot(tmp_path / "missing.snap")
+
+    def test_corrupt_file(self, tmp_path):
+        """Flipped bytes are detected by the checksum."""
+        path = tmp_path / "corrupt.snap"
+        write_snapshot(path, [_make_condition("order_1", "AAPL")], datetime.now())
+
+        data = bytearray(path.read_bytes())
+        data[20] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError):
+            read_snapshot(path)
+
+
+class TestEngineSnapshotRestore:
+    """Test restoring the OrderExecutionEngine from a snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_restore_populates_book_and_catches_up(self, tmp_path):
+        """Restoring loads conditions by symbol and runs a catch-up query."""
+        path = tmp_path / "trigger_book.snap"
+        write_snapshot(
+            path,
+            [_make_condition("order_1", "AAPL"), _make_condition("order_2", "AAPL")],
+            datetime(2026, 1, 2, 9, 30),
+        )
+
+        engine = OrderExecutionEngine(MagicMock(), snapshot_path=path)
+        with patch.object(
+            engine, "_catch_up_orders", new=AsyncMock(return_value=0)
+        ) as catch_up:
+            assert await engine._restore_from_snapshot() is True
+
+        catch_up.assert_awaited_once()
+        assert engine.monitored_symbols == {"AAPL"}
+        assert len(engine.trigger_conditions["AAPL"]) == 2
+        assert engine._synced_at == datetime(2026, 1, 2, 9, 30)
+
+    @pytest.mark.asyncio
+    async def test_restore_falls_back_when_catch_up_fails(self, tmp_path):
+        """A failed catch-up clears the book so a full load happens instead."""
+        path = tmp_path / "trigger_book.snap"
+        write_snapshot(path, [_make_condition("order_1", "AAPL")], datetime.now())
+
+        engine = OrderExecutionEngine(MagicMock(), snapshot_path=path)
+        with patch.object(
+            engine,
+            "_catch_up_orders",
+            new=AsyncMock(side_effect=RuntimeError("db down")),
+        ):
+            assert await engine._restore_from_snapshot() is False
+
+        assert engine.monitored_symbols == set()
+        assert engine._synced_at is None
+
+    @pytest.mark.asyncio
+    async def test_restore_without_snapshot(self, tmp_path):
+        """Without a snapshot file the engine requests a full load."""
+        engine = OrderExecutionEngine(
+            MagicMock(), snapshot_path=tmp_path / "missing.snap"
+        )
+        assert await engine._restore_from_snapshot() is False
+
+    @pytest.mark.asyncio
+    async def test_save_snapshot_requires_sync(self, tmp_path):
+        """Nothing is written until the book has been synced with the DB."""
+        path = tmp_path / "trigger_book.snap"
+        engine = OrderExecutionEngine(MagicMock(), snapshot_path=path)
+        assert await engine.save_snapshot() == 0
+        assert not path.exists()
+
+        engine._synced_at = datetime(2026, 1, 2, 9, 30)
+        engine.trigger_conditions["AAPL"].append(_make_condition("order_1", "AAPL"))
+        assert await engine.save_snapshot() == 1
+        assert read_snapshot(path).watermark == datetime(2026, 1, 2, 9, 30)
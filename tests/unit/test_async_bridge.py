@@ -0,0 +1,60 @@
+"""
+Tests for the persistent event loop bridge used by synchronous MCP tools.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.async_bridge import AsyncLoopBridge
+
+pytestmark = pytest.mark.journey_performance
+
+
+@pytest.fixture
+def bridge():
+    bridge = AsyncLoopBridge(timeout=1.0)
+    yield bridge
+    bridge.shutdown()
+
+
+class TestAsyncLoopBridge:
+    """Test running coroutines on the shared background loop."""
+
+    def test_calls_share_one_loop_and_thread(self, bridge):
+        """Every call runs on the same loop, so thread-local state is reused."""
+
+        async def where() -> tuple[int, int]:
+            return id(asyncio.get_running_loop()), threading.get_ident()
+
+        first = bridge.run(where())
+        second = bridge.run(where())
+
+        assert first == second
+        assert first[1] != threading.get_ident()
+        assert bridge.get_stats()["calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_runs_from_inside_a_running_loop(self, bridge):
+        """Sync tools called from async code do not need their own loop."""
+
+        async def add(a: int, b: int) -> int:
+            return a + b
+
+        assert bridge.run(add(2, 3)) == 5
+
+    def test_exceptions_propagate(self, bridge):
+        async def fail() -> None:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            bridge.run(fail())
+        assert bridge.get_stats()["errors"] == 1
+
+    def test_timeout_cancels_coroutine(self, bridge):
+        bridge.timeout = 0.05
+
+        with pytest.raises(TimeoutError):
+            bridge.run(asyncio.sleep(5))
+        assert bridge.get_stats()["timeouts"] == 1
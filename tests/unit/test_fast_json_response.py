@@ -0,0 +1,57 @@
+"""
+Tests for the orjson-backed response class used by large API routes.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.api.responses import FastJSONResponse, dumps, fast_json
+from app.schemas.orders import Order, OrderStatus, OrderType
+
+pytestmark = pytest.mark.journey_performance
+
+
+class TestFastJSONResponse:
+    """Test output parity with FastAPI's default encoding."""
+
+    def test_matches_jsonable_encoder(self):
+        """Native datetime, enum and model handling agrees with the default path."""
+        order = Order(
+            id="order_1",
+            symbol="AAPL",
+            order_type=OrderType.BUY,
+            quantity=10,
+            price=150.5,
+            status=OrderStatus.FILLED,
+            created_at=datetime(2026, 1, 2, 9, 30, 0, 123456),
+        )
+        content = {
+            "order": order,
+            "expiration": date(2026, 1, 16),
+            "status": OrderStatus.PENDING,
+            "price": Decimal("1.25"),
+            "tags": {"a"},
+        }
+
+        assert json.loads(dumps(content)) == jsonable_encoder(content)
+
+    def test_numpy_values_serialized(self):
+        content = {"greeks": np.array([0.5, 0.25]), "count": np.int64(2)}
+
+        assert json.loads(dumps(content)) == {"greeks": [0.5, 0.25], "count": 2}
+
+    @pytest.mark.asyncio
+    async def test_decorated_endpoint_returns_response(self):
+        @fast_json
+        async def endpoint(symbol: str) -> dict[str, str]:
+            return {"symbol": symbol}
+
+        response = await endpoint("AAPL")
+
+        assert isinstance(response, FastJSONResponse)
+        assert response.body == b'{"symbol":"AAPL"}'
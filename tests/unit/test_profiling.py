@@ -0,0 +1,238 @@
+"""
+Tests for per-route phase timing and the sampling profiler.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import route_timing
+from app.api.responses import FastJSONResponse, fast_json
+from app.api.route_timing import RouteTimingMiddleware, route_breakdown
+from app.api.v1 import admin
+from app.core.request_timing import (
+    current_request_timing,
+    finish_request_timing,
+    start_request_timing,
+    timed_phase,
+)
+from app.core.sampling_profiler import SamplingProfiler
+from app.services.performance_benchmarks import PerformanceMonitor
+
+pytestmark = pytest.mark.journey_performance
+
+
+class TestTimedPhase:
+    """Test phase attribution."""
+
+    def test_noop_outside_request(self):
+        with timed_phase("db"):
+            pass
+        assert current_request_timing() is None
+
+    def test_nested_phases_are_exclusive(self):
+        """Time in a nested phase is not also counted in its parent."""
+        timing, token = start_request_timing()
+        try:
+            with timed_phase("adapter"):
+                time.sleep(0.02)
+                with timed_phase("db"):
+                    time.sleep(0.03)
+        finally:
+            finish_request_timing(token)
+
+        assert timing.phases["db"] == pytest.approx(0.03, abs=0.015)
+        assert timing.phases["adapter"] == pytest.approx(0.02, abs=0.015)
+
+    def test_decorator_form(self):
+        @timed_phase("greeks")
+        def compute() -> int:
+            return 42
+
+        timing, token = start_request_timing()
+        try:
+            assert compute() == 42
+            assert compute() == 42
+        finally:
+            finish_request_timing(token)
+        assert "greeks" in timing.phases
+
+    def test_breakdown_includes_remainder(self):
+        timing, token = start_request_timing()
+        finish_request_timing(token)
+        timing.add("db", 0.010)
+
+        breakdown = timing.breakdown_ms(0.025)
+
+        assert breakdown["db"] == pytest.approx(10.0)
+        assert breakdown["other"] == pytest.approx(15.0)
+        assert breakdown["greeks"] == 0.0
+
+
+class TestRouteTimingMiddleware:
+    """Test per-route reporting to the performance monitor."""
+
+    def test_phases_reported_per_route_template(self):
+        monitor = PerformanceMonitor()
+        app = FastAPI()
+        app.add_middleware(RouteTimingMiddleware, monitor=monitor)
+
+        @app.get("/api/quote/{symbol}", response_class=FastJSONResponse)
+        @fast_json
+        async def quote(symbol: str) -> dict[str, str]:
+            with timed_phase("adapter"):
+                await asyncio.sleep(0.01)
+            return {"symbol": symbol}
+
+        client = TestClient(app)
+        client.get("/api/quote/AAPL")
+        client.get("/api/quote/MSFT")
+
+        routes = route_breakdown(monitor)
+        entry = routes["GET /api/quote/{symbol}"]
+        assert entry["requests"] == 2
+        assert entry["phases_ms"]["adapter"] >= 10.0
+        assert entry["phases_ms"]["serialization"] > 0.0
+        assert entry["avg_ms"] >= entry["phases_ms"]["adapter"]
+
+    def test_server_errors_recorded_as_failures(self):
+        monitor = PerformanceMonitor()
+        app = FastAPI()
+        app.add_middleware(RouteTimingMiddleware, monitor=monitor)
+
+        @app.get("/api/broken")
+        async def broken() -> None:
+            raise RuntimeError("boom")
+
+        TestClient(app, raise_server_exceptions=False).get("/api/broken")
+
+        assert route_breakdown(monitor)["GET /api/broken"]["error_rate"] == 1.0
+
+    def test_unmatched_paths_share_one_entry(self):
+        monitor = PerformanceMonitor()
+        app = FastAPI()
+        app.add_middleware(RouteTimingMiddleware, monitor=monitor)
+
+        client = TestClient(app)
+        for i in range(5):
+            assert client.get(f"/api/missing/{i}").status_code == 404
+
+        routes = route_breakdown(monitor)
+        assert list(routes) == ["GET <unmatched>"]
+        assert routes["GET <unmatched>"]["requests"] == 5
+
+
+def _busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler:
+    """Test stack sampling."""
+
+    def test_collects_collapsed_stacks_of_other_threads(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy")
+        worker.start()
+        try:
+            result = SamplingProfiler(interval=0.001).profile(0.2)
+        finally:
+            stop.set()
+            worker.join()
+
+        assert result.samples > 0
+        lines = result.collapsed().splitlines()
+        busy = [line for line in lines if line.startswith("busy;")]
+        assert busy
+        assert any("test_profiling:_busy_loop" in line for line in busy)
+        assert int(busy[0].rsplit(" ", 1)[1]) > 0
+
+    def test_rejects_concurrent_and_overlong_runs(self):
+        profiler = SamplingProfiler(max_seconds=1.0)
+
+        with pytest.raises(ValueError):
+            profiler.profile(5.0)
+
+        async def overlap() -> None:
+            first = asyncio.create_task(profiler.profile_async(0.2))
+            await asyncio.sleep(0.05)
+            with pytest.raises(RuntimeError):
+                await profiler.profile_async(0.1)
+            await first
+
+        asyncio.run(overlap())
+        assert not profiler.is_running
+
+    def test_cancelled_async_run_releases_lock(self):
+        profiler = SamplingProfiler()
+
+        async def cancel() -> None:
+            task = asyncio.create_task(profiler.profile_async(0.2))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel())
+        deadline = time.monotonic() + 5
+        while profiler.is_running:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert profiler.profile(0.01).duration_seconds > 0
+
+
+class TestAdminEndpoints:
+    """Test the admin router's token guard and profile endpoint."""
+
+    @pytest.fixture
+    def client(self) -> TestClient:
+        app = FastAPI()
+        app.include_router(admin.router)
+        return TestClient(app)
+
+    def test_disabled_without_configured_token(self, client, monkeypatch):
+        monkeypatch.setattr(admin.settings, "ADMIN_API_TOKEN", "")
+
+        assert client.get("/api/v1/admin/timing").status_code == 403
+
+    def test_wrong_token_rejected(self, client, monkeypatch):
+        monkeypatch.setattr(admin.settings, "ADMIN_API_TOKEN", "secret")
+
+        response = client.get(
+            "/api/v1/admin/timing", headers={"X-Admin-Token": "wrong"}
+        )
+
+        assert response.status_code == 401
+
+    def test_profile_returns_collapsed_stacks(self, client, monkeypatch):
+        monkeypatch.setattr(admin.settings, "ADMIN_API_TOKEN", "secret")
+
+        response = client.post(
+            "/api/v1/admin/profile?seconds=0.1&include_idle=true",
+            headers={"X-Admin-Token": "secret"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert int(response.headers["x-profile-samples"]) > 0
+        first_line = response.text.splitlines()[0]
+        assert int(first_line.rsplit(" ", 1)[1]) > 0
+
+    def test_timing_lists_routes(self, client, monkeypatch):
+        monkeypatch.setattr(admin.settings, "ADMIN_API_TOKEN", "secret")
+        monitor = PerformanceMonitor()
+        monitor.record_timing("route:GET /api/x", 12.0)
+        monitor.record_timing("route:GET /api/x:db", 5.0)
+        monkeypatch.setattr(route_timing, "get_performance_monitor", lambda: monitor)
+
+        response = client.get(
+            "/api/v1/admin/timing", headers={"X-Admin-Token": "secret"}
+        )
+
+        entry = response.json()["routes"]["GET /api/x"]
+        assert entry["avg_ms"] == 12.0
+        assert entry["phases_ms"]["db"] == 5.0
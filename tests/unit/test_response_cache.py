@@ -0,0 +1,181 @@
+"""
+Tests for the response cache middleware on polled market-data routes.
+"""
+
+import re
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+
+from app.api.response_cache import (
+    DEFAULT_CACHED_ROUTES,
+    CachedRoute,
+    ResponseCache,
+    ResponseCacheMiddleware,
+    chain_ttl,
+    quote_ttl,
+    reference_ttl,
+)
+
+pytestmark = pytest.mark.journey_performance
+
+
+@pytest.fixture
+def calls() -> dict[str, int]:
+    return {"price": 0, "orders": 0}
+
+
+@pytest.fixture
+def cache() -> ResponseCache:
+    return ResponseCache(max_size=100)
+
+
+@pytest.fixture
+def client(calls: dict[str, int], cache: ResponseCache) -> TestClient:
+    app = FastAPI()
+    routes = [
+        CachedRoute(re.compile(r"^/price/[^/]+$"), lambda: 60.0),
+        CachedRoute(re.compile(r"^/short/[^/]+$"), lambda: 0.05),
+    ]
+    app.add_middleware(ResponseCacheMiddleware, routes=routes, cache=cache)
+    # Registered after the cache, as in app.main, so CORS wraps it
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000", "http://localhost:3001"],
+        allow_credentials=True,
+    )
+
+    @app.get("/price/{symbol}")
+    async def price(symbol: str, detail: bool = False) -> dict[str, object]:
+        calls["price"] += 1
+        if symbol == "MISSING":
+            raise HTTPException(status_code=404, detail="not found")
+        return {"symbol": symbol, "detail": detail, "call": calls["price"]}
+
+    @app.get("/short/{symbol}")
+    async def short(symbol: str) -> dict[str, object]:
+        calls["price"] += 1
+        return {"symbol": symbol, "call": calls["price"]}
+
+    @app.get("/orders")
+    async def orders() -> dict[str, int]:
+        calls["orders"] += 1
+        return {"call": calls["orders"]}
+
+    return TestClient(app)
+
+
+class TestResponseCache:
+    """Test caching, validators and conditional requests."""
+
+    def test_repeat_served_from_cache(self, client, calls):
+        """A second identical request does not reach the endpoint."""
+        first = client.get("/price/AAPL")
+        second = client.get("/price/AAPL")
+
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert calls["price"] == 1
+
+    def test_strong_etag_and_cache_control(self, client):
+        """Responses carry a quoted ETag and a max-age."""
+        response = client.get("/price/AAPL")
+
+        etag = response.headers["etag"]
+        assert etag.startswith('"') and not etag.startswith("W/")
+        assert response.headers["cache-control"] == "max-age=60"
+
+    def test_if_none_match_returns_304(self, client, cache):
+        """A matching If-None-Match gets an empty 304 with the same ETag."""
+        etag = client.get("/price/AAPL").headers["etag"]
+
+        response = client.get("/price/AAPL", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert cache.get_stats()["not_modified"] == 1
+
+    def test_stale_etag_returns_body(self, client):
+        """A non-matching If-None-Match gets the full response."""
+        response = client.get("/price/AAPL", headers={"If-None-Match": '"stale"'})
+
+        assert response.status_code == 200
+        assert response.json()["symbol"] == "AAPL"
+
+    def test_key_includes_path_and_sorted_params(self, client, calls):
+        """Different params miss; reordered params hit."""
+        client.get("/price/AAPL")
+        client.get("/price/MSFT")
+        client.get("/price/AAPL?detail=true&x=1")
+        client.get("/price/AAPL?x=1&detail=true")
+
+        assert calls["price"] == 3
+
+    def test_entries_expire(self, client, calls):
+        """Entries are refetched after their route TTL."""
+        client.get("/short/AAPL")
+        time.sleep(0.1)
+        client.get("/short/AAPL")
+
+        assert calls["price"] == 2
+
+    def test_cors_headers_follow_each_origin(self, client, calls):
+        """A cache hit carries the requesting origin, not the one that filled it."""
+        first = client.get("/price/AAPL", headers={"Origin": "http://localhost:3000"})
+        second = client.get("/price/AAPL", headers={"Origin": "http://localhost:3001"})
+
+        assert calls["price"] == 1
+        assert first.headers["access-control-allow-origin"] == "http://localhost:3000"
+        assert second.headers["access-control-allow-origin"] == "http://localhost:3001"
+
+    def test_app_registers_cache_inside_cors(self):
+        from app.main import app
+
+        # user_middleware lists the outermost middleware first
+        classes = [middleware.cls for middleware in app.user_middleware]
+        assert classes.index(CORSMiddleware) < classes.index(ResponseCacheMiddleware)
+
+    def test_errors_not_cached(self, client, calls):
+        """Non-200 responses pass through uncached."""
+        assert client.get("/price/MISSING").status_code == 404
+        assert client.get("/price/MISSING").status_code == 404
+
+        assert calls["price"] == 2
+
+    def test_unlisted_routes_bypass(self, client, calls):
+        """Routes without a TTL are never cached."""
+        response = client.get("/orders")
+        client.get("/orders")
+
+        assert "etag" not in response.headers
+        assert calls["orders"] == 2
+
+
+class TestRouteTTLs:
+    """Test alignment with the quote cache TTLs."""
+
+    def test_ttls_follow_quote_cache(self):
+        assert chain_ttl() <= 30.0
+        assert reference_ttl() >= 300.0
+        assert chain_ttl() <= quote_ttl() <= reference_ttl()
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/v1/trading/stock/price/AAPL",
+            "/api/v1/trading/stock/info/AAPL",
+            "/api/v1/trading/options/expirations/SPY",
+            "/api/v1/trading/options/strikes/SPY",
+            "/api/v1/trading/market/hours",
+        ],
+    )
+    def test_default_routes_cached(self, path):
+        assert any(route.pattern.match(path) for route in DEFAULT_CACHED_ROUTES)
+
+    def test_account_routes_not_cached(self):
+        path = "/api/v1/trading/portfolio"
+        assert not any(route.pattern.match(path) for route in DEFAULT_CACHED_ROUTES)